@@ -16,6 +16,7 @@ import logging
 from app.database import get_db
 from app.services.auth_service import AuthService, GoogleOAuthService
 from app.repositories.user_repo import UserRepository
+from app.services.user_cache import user_cache
 from app.schemas import GoogleLoginRequest, AuthTokenResponse, RefreshTokenRequest
 
 logger = logging.getLogger(__name__)
@@ -291,14 +292,14 @@ async def get_current_user(
         logger.warning("[GET_CURRENT_USER] Invalid token")
         raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다")
     
-    # 사용자 조회
-    user = UserRepository.get_by_id(db, payload['user_id'])
+    # 사용자 조회 (짧은 TTL 캐시, User 행이 바뀌면 무효화됨)
+    user = user_cache.get(db, payload['user_id'])
     
     if not user:
         logger.warning(f"[GET_CURRENT_USER] User not found: {payload['user_id']}")
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
     
-    logger.info(f"[GET_CURRENT_USER] User authenticated: {user.email}")
+    logger.debug(f"[GET_CURRENT_USER] User authenticated: {user.email}")
     return user
 
 
@@ -421,11 +422,14 @@ async def delete_current_user(
         logger.info(f"[DELETE_USER] Starting account deletion for user: {user_email}")
 
         # 1. 관련 데이터 모두 삭제 (cascade 설정되어 있지만 명시적으로 삭제)
-        from app.models.models import Todo, FamilyMember, Rule, Notification, Receipt, Memo, Routine, AudioFile, ImageFile
+        from app.models.models import Todo, FamilyMember, Rule, Notification, Receipt, Memo, Routine, AudioFile, ImageFile, ReminderJob, ReminderDelivery, DeviceToken
 
         # 각 테이블에서 사용자 데이터 삭제
         deleted_counts = {}
 
+        deleted_counts['device_tokens'] = db.query(DeviceToken).filter(DeviceToken.user_id == user_id).delete()
+        deleted_counts['reminder_deliveries'] = db.query(ReminderDelivery).filter(ReminderDelivery.user_id == user_id).delete()
+        deleted_counts['reminder_jobs'] = db.query(ReminderJob).filter(ReminderJob.user_id == user_id).delete()
         deleted_counts['todos'] = db.query(Todo).filter(Todo.user_id == user_id).delete()
         deleted_counts['family_members'] = db.query(FamilyMember).filter(FamilyMember.user_id == user_id).delete()
         deleted_counts['rules'] = db.query(Rule).filter(Rule.user_id == user_id).delete()
@@ -4,17 +4,19 @@
 import json
 import logging
 from typing import List, Optional
-from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
 from pydantic import BaseModel
 
 from app.database import get_db
-from app.models.models import Todo, Notification, FamilyMember
+from app.config import get_admin_emails
+from app.models.models import Notification, ReminderJob
 from app.models.user import User
 from app.api.routes.auth import get_current_user
-from app.services.email_service import EmailService
+from app.services.reminder_dispatcher import reminder_dispatcher
+from app.services.device_token_service import DeviceTokenService
+from app.services.reminder_digest import DIGEST_MODES
+from app.services.reminder_job_service import ReminderJobService
 
 logger = logging.getLogger(__name__)
 
@@ -25,197 +27,6 @@ router = APIRouter(
 )
 
 
-def send_scheduled_emails(db: Session):
-    """
-    예정된 알림 이메일 발송 (백그라운드 작업)
-    """
-    try:
-        # 현재 시간 (한국 시간대 사용)
-        from zoneinfo import ZoneInfo
-        kst = ZoneInfo("Asia/Seoul")
-        now = datetime.now(kst).replace(tzinfo=None)  # naive datetime으로 변환하여 비교
-        
-        # 알림이 필요한 일정 조회 (알림 설정이 있고, 삭제되지 않은 일정)
-        todos = db.query(Todo).filter(
-            and_(
-                Todo.has_notification == True,
-                Todo.deleted_at.is_(None),
-                Todo.status != "completed"
-            )
-        ).all()
-        
-        sent_count = 0
-        for todo in todos:
-            try:
-                # 알림 리마인더 파싱
-                notification_reminders = []
-                if todo.notification_reminders:
-                    try:
-                        parsed = json.loads(todo.notification_reminders) if isinstance(todo.notification_reminders, str) else todo.notification_reminders
-                        if isinstance(parsed, list):
-                            notification_reminders = parsed
-                    except:
-                        pass
-                
-                if not notification_reminders:
-                    continue
-                
-                # 일정 날짜/시간 계산
-                todo_date = todo.date
-                todo_datetime = None
-                
-                if todo.all_day:
-                    # 하루종일 일정
-                    todo_datetime = datetime.combine(todo_date, datetime.min.time())
-                elif todo.start_time:
-                    # 시간이 있는 일정
-                    todo_datetime = datetime.combine(todo_date, todo.start_time)
-                
-                if not todo_datetime:
-                    continue
-                
-                # 각 알림 리마인더에 대해 이메일 발송
-                for reminder in notification_reminders:
-                    value = reminder.get('value', 30)
-                    unit = reminder.get('unit', 'minutes')
-                    
-                    # 알림 시간 계산
-                    if unit == 'minutes':
-                        reminder_datetime = todo_datetime - timedelta(minutes=value)
-                    elif unit == 'hours':
-                        reminder_datetime = todo_datetime - timedelta(hours=value)
-                    elif unit == 'days':
-                        reminder_datetime = todo_datetime - timedelta(days=value)
-                    elif unit == 'weeks':
-                        reminder_datetime = todo_datetime - timedelta(weeks=value)
-                    else:
-                        continue
-                    
-                    # 알림 시간이 현재 시간과 가까운지 확인 (1분 이내)
-                    time_diff = abs((reminder_datetime - now).total_seconds())
-                    if time_diff <= 60:  # 1분 이내
-                        # 이미 발송된 알림인지 확인
-                        existing_notification = db.query(Notification).filter(
-                            and_(
-                                Notification.user_id == todo.user_id,
-                                Notification.todo_id == todo.id,
-                                Notification.scheduled_time.between(
-                                    reminder_datetime - timedelta(minutes=1),
-                                    reminder_datetime + timedelta(minutes=1)
-                                ),
-                                Notification.channels.contains('email')
-                            )
-                        ).first()
-                        
-                        if not existing_notification:
-                            # 사용자 정보 가져오기
-                            user = db.query(User).filter(User.id == todo.user_id).first()
-                            if not user or not user.email:
-                                continue
-                            
-                            # 이메일 발송
-                            time_str = todo.start_time.strftime("%H:%M") if todo.start_time else None
-                            reminder_str = f"{value} {unit} 전" if unit != 'minutes' else f"{value}분 전"
-                            
-                            # 체크리스트 가져오기
-                            checklist_items = []
-                            if hasattr(todo, 'checklist_items'):
-                                checklist_items = [item.text for item in todo.checklist_items if hasattr(item, 'text')]
-                            
-                            # 담당 프로필 정보 가져오기
-                            assigned_members = []
-                            if todo.family_member_ids:
-                                try:
-                                    member_ids = json.loads(todo.family_member_ids) if isinstance(todo.family_member_ids, str) else todo.family_member_ids
-                                    if isinstance(member_ids, list) and len(member_ids) > 0:
-                                        # "me"가 포함되어 있으면 사용자 정보 추가
-                                        if "me" in member_ids:
-                                            assigned_members.append({"emoji": user.avatar_emoji or "👤", "name": user.name})
-                                        # FamilyMember 조회 (me 제외)
-                                        filtered_member_ids = [mid for mid in member_ids if mid != "me"]
-                                        if filtered_member_ids:
-                                            members = db.query(FamilyMember).filter(FamilyMember.id.in_(filtered_member_ids)).all()
-                                            for m in members:
-                                                assigned_members.append({"emoji": m.emoji or "👤", "name": m.name})
-                                except:
-                                    pass
-                            
-                            # 하루종일 여부
-                            is_all_day = todo.all_day if hasattr(todo, 'all_day') else False
-                            
-                            # 사용자 알림 설정 확인
-                            notification_pref = getattr(user, 'notification_preference', 'email')
-                            channels_sent = []
-
-                            # 이메일 알림 발송 (email 또는 both)
-                            if notification_pref in ['email', 'both']:
-                                success = EmailService.send_notification_email(
-                                    to_email=user.email,
-                                    todo_title=todo.title,
-                                    todo_date=todo_date.strftime("%Y년 %m월 %d일"),
-                                    todo_time=time_str,
-                                    todo_end_time=todo.end_time.strftime("%H:%M") if todo.end_time else None,
-                                    is_all_day=is_all_day,
-                                    reminder_time=reminder_str,
-                                    todo_location=todo.location if hasattr(todo, 'location') else None,
-                                    todo_category=todo.category if hasattr(todo, 'category') else None,
-                                    todo_checklist=checklist_items if checklist_items else None,
-                                    todo_memo=todo.memo if hasattr(todo, 'memo') and todo.memo else None,
-                                    assigned_members=assigned_members if assigned_members else None
-                                )
-                                if success:
-                                    channels_sent.append("email")
-                                    logger.info(f"[EMAIL_NOTIFICATION] 이메일 발송 성공: {user.email}, 일정: {todo.title}")
-
-                            # FCM 푸시 알림 발송 (push 또는 both)
-                            if notification_pref in ['push', 'both']:
-                                try:
-                                    from app.services.fcm_service import FCMService
-                                    import asyncio
-
-                                    # FCM 토큰이 있는 경우에만 발송
-                                    if user.fcm_token:
-                                        loop = asyncio.get_event_loop()
-                                        push_success = loop.run_until_complete(
-                                            FCMService.send_todo_reminder(
-                                                user=user,
-                                                todo_title=todo.title,
-                                                reminder_time=reminder_str,
-                                                todo_id=str(todo.id)
-                                            )
-                                        )
-                                        if push_success:
-                                            channels_sent.append("push")
-                                            logger.info(f"[FCM_NOTIFICATION] 푸시 알림 발송 성공: {user.email}, 일정: {todo.title}")
-                                except Exception as fcm_error:
-                                    logger.error(f"[FCM_NOTIFICATION] 푸시 알림 발송 실패: {fcm_error}")
-
-                            if channels_sent:
-                                # 알림 기록 저장
-                                notification = Notification(
-                                    user_id=todo.user_id,
-                                    todo_id=todo.id,
-                                    type="reminder",
-                                    title=f"일정 알림: {todo.title}",
-                                    message=f"{reminder_str} 알림",
-                                    scheduled_time=reminder_datetime,
-                                    sent_at=now,
-                                    channels=json.dumps(channels_sent)
-                                )
-                                db.add(notification)
-                                sent_count += 1
-                            
-            except Exception as e:
-                logger.error(f"[EMAIL_NOTIFICATION] 일정 알림 발송 실패: {todo.id}, 오류: {e}", exc_info=True)
-        
-        db.commit()
-        logger.info(f"[EMAIL_NOTIFICATION] 총 {sent_count}개의 이메일 알림 발송 완료")
-        
-    except Exception as e:
-        logger.error(f"[EMAIL_NOTIFICATION] 알림 발송 프로세스 실패: {e}", exc_info=True)
-        db.rollback()
-
-
 @router.post("/send-scheduled")
 async def send_scheduled_notifications(
     background_tasks: BackgroundTasks,
@@ -228,7 +39,7 @@ async def send_scheduled_notifications(
     """
     try:
         # 백그라운드 작업으로 이메일 발송
-        background_tasks.add_task(send_scheduled_emails, db)
+        background_tasks.add_task(reminder_dispatcher.dispatch_due)
         
         return {
             "success": True,
@@ -291,6 +102,9 @@ class FcmTokenRequest(BaseModel):
 class NotificationPreferenceRequest(BaseModel):
     preference: str  # email, push, both, none
 
+class NotificationDigestRequest(BaseModel):
+    digest: str  # off, hourly, daily
+
 
 @router.post("/fcm-token")
 async def save_fcm_token(
@@ -301,14 +115,13 @@ async def save_fcm_token(
     """
     FCM 토큰 저장
 
-    프론트엔드에서 Firebase Cloud Messaging 토큰을 받아 저장합니다.
-    웹 푸시 알림 발송 시 이 토큰을 사용합니다.
+    프론트엔드에서 Firebase Cloud Messaging 토큰을 받아 기기별로 저장합니다.
+    웹 푸시 알림은 사용자가 등록한 모든 기기로 발송됩니다.
     """
     try:
         logger.info(f"[FCM_TOKEN] FCM 토큰 저장 - user: {current_user.email}")
 
-        current_user.fcm_token = request.token
-        db.commit()
+        DeviceTokenService.register(db, current_user.id, request.token)
 
         logger.info(f"[FCM_TOKEN] FCM 토큰 저장 완료")
 
@@ -327,12 +140,17 @@ async def save_fcm_token(
 
 @router.delete("/fcm-token")
 async def delete_fcm_token(
+    token: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """FCM 토큰 삭제 (로그아웃 시 호출)"""
+    """
+    FCM 토큰 삭제 (로그아웃 시 호출)
+
+    token을 주면 해당 기기만, 없으면 사용자의 모든 기기 토큰을 삭제합니다.
+    """
     try:
-        current_user.fcm_token = None
+        DeviceTokenService.unregister(db, current_user.id, token)
         db.commit()
 
         return {
@@ -398,6 +216,156 @@ async def get_notification_preference(
     """현재 알림 설정 조회"""
     return {
         "preference": current_user.notification_preference or "email",
-        "has_fcm_token": bool(current_user.fcm_token)
+        "digest": current_user.notification_digest or "off",
+        "has_fcm_token": DeviceTokenService.has_tokens(db, current_user.id)
     }
 
+
+@router.post("/digest")
+async def update_notification_digest(
+    request: NotificationDigestRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    알림 묶음(digest) 설정 변경 (이메일 알림에만 적용, 푸시는 알림마다 발송)
+
+    - off: 알림마다 이메일 발송
+    - hourly: 매시 정각에 그 시간의 알림을 한 통으로
+    - daily: 매일 아침 앞으로 24시간의 알림을 한 통으로
+    """
+    try:
+        if request.digest not in DIGEST_MODES:
+            raise HTTPException(
+                status_code=400,
+                detail="유효하지 않은 알림 묶음 설정입니다. (off, hourly, daily 중 선택)"
+            )
+
+        logger.info(f"[NOTIFICATION_PREF] 알림 묶음 설정 변경 - user: {current_user.email}, digest: {request.digest}")
+
+        current_user.notification_digest = request.digest
+        db.commit()
+
+        return {
+            "success": True,
+            "digest": request.digest,
+            "message": f"알림 묶음 설정이 '{request.digest}'(으)로 변경되었습니다."
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[NOTIFICATION_PREF] 알림 묶음 설정 변경 실패: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"알림 묶음 설정 변경 실패: {str(e)}"
+        )
+
+
+# ============================================================
+# 관리자: 발송 실패 알림 확인/재시도
+# ============================================================
+
+# 관리자가 다시 발송할 수 있는 알림 상태 (failed는 받을 곳이 없는 알림이라 다시 보내도 소용없음)
+REQUEUE_STATUSES = ('dead', 'retrying')
+
+
+def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
+    """ADMIN_EMAILS에 등록된 사용자만 허용"""
+    if (current_user.email or "").lower() not in get_admin_emails():
+        raise HTTPException(status_code=403, detail="관리자만 사용할 수 있습니다.")
+    return current_user
+
+
+class RequeueRequest(BaseModel):
+    job_ids: Optional[List[str]] = None  # 없으면 statuses 상태인 알림 전체
+    statuses: List[str] = ['dead']
+
+
+@router.get("/admin/reminder-jobs/stats")
+async def get_reminder_job_stats(
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_admin_user)
+):
+    """상태별 알림 수 (pending, claimed, retrying, sent, failed, expired, dead)"""
+    return {"counts": ReminderJobService.status_counts(db)}
+
+
+@router.get("/admin/reminder-jobs")
+async def get_failed_reminder_jobs(
+    status: str = 'dead',
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_admin_user)
+):
+    """
+    발송 실패/재시도 중인 알림 목록 (최근 실패 순)
+    """
+    jobs = db.query(ReminderJob).filter(
+        ReminderJob.status == status
+    ).order_by(
+        ReminderJob.updated_at.desc()
+    ).offset(skip).limit(min(limit, 500)).all()
+
+    return [
+        {
+            "id": job.id,
+            "user_id": job.user_id,
+            "todo_id": job.todo_id,
+            "reminder": f"{job.reminder_value} {job.reminder_unit}",
+            "fire_at": job.fire_at.isoformat() if job.fire_at else None,
+            "status": job.status,
+            "attempts": job.attempts,
+            "next_attempt_at": job.next_attempt_at.isoformat() if job.next_attempt_at else None,
+            "last_error": job.last_error,
+            "updated_at": job.updated_at.isoformat() if job.updated_at else None
+        }
+        for job in jobs
+    ]
+
+
+@router.post("/admin/reminder-jobs/requeue")
+async def requeue_reminder_jobs(
+    request: RequeueRequest,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_admin_user)
+):
+    """
+    실패한 알림을 바로 다시 발송 (시도 수 초기화)
+
+    job_ids를 주면 해당 알림만, 없으면 statuses 상태인 알림 전체를 되돌립니다.
+    발송 시각보다 REMINDER_REQUEUE_MAX_LATENESS_MINUTES 넘게 지난 알림은 보내지 않고 만료합니다.
+    """
+    try:
+        invalid = [status for status in request.statuses if status not in REQUEUE_STATUSES]
+        if invalid or not request.statuses:
+            raise HTTPException(
+                status_code=400,
+                detail=f"다시 발송할 수 없는 상태입니다. ({', '.join(REQUEUE_STATUSES)} 중 선택)"
+            )
+
+        count, expired = ReminderJobService.requeue(db, request.job_ids, tuple(request.statuses))
+        db.commit()
+
+        logger.info(f"[REMINDER_ADMIN] 알림 {count}개 재시도 예약, {expired}개 만료 - admin: {admin.email}, statuses: {request.statuses}")
+
+        message = f"알림 {count}개를 다시 발송합니다."
+        if expired:
+            message += f" (발송 시각이 너무 지난 알림 {expired}개는 만료)"
+        return {
+            "success": True,
+            "requeued": count,
+            "expired": expired,
+            "message": message
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[REMINDER_ADMIN] 알림 재시도 예약 실패: {e}", exc_info=True)
+        db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"알림 재시도 예약 실패: {str(e)}"
+        )
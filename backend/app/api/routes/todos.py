@@ -15,7 +15,7 @@ from app.schemas import (
     TodoCreate, TodoUpdate, TodoResponse, TodoStatsResponse
 )
 from app.api.routes.auth import get_current_user
-from app.api.routes.notifications import send_scheduled_emails
+from app.services.recurring_series_service import RecurringSeriesService
 
 router = APIRouter(
     prefix="/todos",
@@ -675,7 +675,20 @@ async def create_todo(
                             end_datetime = start_datetime + timedelta(hours=1)
                         logger.info(f"[CREATE_TODO] 시간 지정 이벤트 (하루): {db_todo.date} {db_todo.start_time} ~ {db_todo.end_time or '1시간 후'}")
             
-            if start_datetime:
+            series_result = None
+            if start_datetime and RecurringSeriesService.is_series(db_todo):
+                # 반복 일정은 행마다 이벤트를 만들지 않고 시리즈 전체를 반복 이벤트 하나로 내보냄
+                series = RecurringSeriesService.load_series(db, current_user.id, db_todo.todo_group_id)
+                series_result = await RecurringSeriesService.export_series(db, current_user, series)
+                if series_result:
+                    for series_todo in series:
+                        if series_todo.bulk_synced is None:
+                            series_todo.bulk_synced = False
+                    db.commit()
+                    db.refresh(db_todo)
+                    logger.info(f"[CREATE_TODO] Google Calendar 반복 이벤트 동기화 성공 - todo_group_id={db_todo.todo_group_id}, event_id={series_result['event_id']}, 일정 {len(series)}개")
+            
+            if start_datetime and not series_result:
                 logger.info(f"[CREATE_TODO] Google Calendar 이벤트 생성 시도 - start={start_datetime}, end={end_datetime}")
                 # Google Calendar에 이벤트 생성
                 event = await GoogleCalendarService.create_event(
@@ -685,7 +698,8 @@ async def create_todo(
                     start_datetime=start_datetime,
                     end_datetime=end_datetime,
                     location=db_todo.location or "",
-                    all_day=db_todo.all_day
+                    all_day=db_todo.all_day,
+                    source_id=db_todo.id  # Always Plan의 Todo ID 저장 (중복 제거용)
                 )
                 
                 if event and event.get('id'):
@@ -700,7 +714,7 @@ async def create_todo(
                     logger.info(f"[CREATE_TODO] Google Calendar 동기화 성공 - todo_id={db_todo.id}, event_id={event.get('id')}, bulk_synced={db_todo.bulk_synced}")
                 else:
                     logger.warning(f"[CREATE_TODO] Google Calendar 이벤트 생성 실패 - event가 None이거나 ID가 없음")
-            else:
+            elif not start_datetime:
                 logger.warning(f"[CREATE_TODO] Google Calendar 동기화 건너뜀 - start_datetime이 None")
         except Exception as e:
             # Google Calendar 동기화 실패해도 Todo 생성은 성공으로 처리
@@ -853,19 +867,22 @@ async def update_todo(
             logger.info(f"[UPDATE_TODO] 기존 반복 일정 삭제: {len(existing_repeated_todos)}개 (todo_group_id={todo.todo_group_id})")
             
             # Google Calendar 이벤트 삭제
+            # 반복 이벤트로 내보낸 시리즈는 시리즈 이벤트 한 번만 삭제 (현재 일정의 인스턴스도 함께 삭제되므로 새로 내보냄)
             db.refresh(current_user)
             export_enabled = getattr(current_user, 'google_calendar_export_enabled', 'false')
-            for repeated_todo in existing_repeated_todos:
-                if (current_user.google_calendar_enabled == "true" and 
-                    current_user.google_calendar_token and 
-                    export_enabled == "true" and 
-                    repeated_todo.google_calendar_event_id):
+            if (current_user.google_calendar_enabled == "true" and 
+                current_user.google_calendar_token and 
+                export_enabled == "true"):
+                for event_id, calendar_id in RecurringSeriesService.delete_targets(existing_repeated_todos):
                     try:
                         from app.services.calendar_service import GoogleCalendarService
                         await GoogleCalendarService.delete_event(
                             token_json=current_user.google_calendar_token,
-                            event_id=repeated_todo.google_calendar_event_id
+                            event_id=event_id,
+                            calendar_id=calendar_id
                         )
+                        if todo.google_calendar_event_id and todo.google_calendar_event_id.startswith(f"{event_id}_"):
+                            todo.google_calendar_event_id = None
                     except Exception as e:
                         logger.warning(f"[UPDATE_TODO] Google Calendar 이벤트 삭제 실패: {e}")
             
@@ -1325,8 +1342,22 @@ async def update_todo(
             from datetime import timedelta
             logger.info(f"[UPDATE_TODO] Google Calendar 동기화 시작 - todo_id={todo.id}, title={todo.title}")
             
+            series_result = None
+            if repeat_needs_recreate and RecurringSeriesService.is_series(todo) and not todo.google_calendar_event_id:
+                # 반복 설정이 바뀌어 새로 만든 시리즈는 반복 이벤트 하나로 내보냄
+                series = RecurringSeriesService.load_series(db, current_user.id, todo.todo_group_id)
+                series_result = await RecurringSeriesService.export_series(db, current_user, series)
+                if series_result:
+                    for series_todo in series:
+                        if series_todo.bulk_synced is None:
+                            series_todo.bulk_synced = False
+                    db.commit()
+            
+            if series_result:
+                logger.info(f"[UPDATE_TODO] Google Calendar 반복 이벤트 생성 성공 - todo_group_id={todo.todo_group_id}, event_id={series_result['event_id']}")
             # 기존 Google Calendar 이벤트가 있는 경우 업데이트
-            if todo.google_calendar_event_id:
+            # (반복 이벤트 인스턴스 ID면 이 날짜만 바뀐 예외 인스턴스로 저장됨)
+            elif todo.google_calendar_event_id:
                 # 날짜/시간 정보 구성
                 start_datetime = None
                 end_datetime = None
@@ -1373,6 +1404,7 @@ async def update_todo(
                     updated_event = await GoogleCalendarService.update_event(
                         token_json=current_user.google_calendar_token,
                         event_id=todo.google_calendar_event_id,
+                        calendar_id=todo.google_calendar_id or 'primary',
                         title=todo.title,
                         description=todo.memo or todo.description or "",
                         start_datetime=start_datetime,
@@ -1430,7 +1462,8 @@ async def update_todo(
                         start_datetime=start_datetime,
                         end_datetime=end_datetime,
                         location=todo.location or "",
-                        all_day=todo.all_day
+                        all_day=todo.all_day,
+                        source_id=todo.id  # Always Plan의 Todo ID 저장 (중복 제거용)
                     )
                     
                     if event and event.get('id'):
@@ -1536,22 +1569,23 @@ async def delete_todo(
         export_enabled = getattr(current_user, 'google_calendar_export_enabled', 'false')
         logger.info(f"[DELETE_TODO] Google Calendar 삭제 체크 - enabled={current_user.google_calendar_enabled}, token_exists={bool(current_user.google_calendar_token)}, export_enabled={export_enabled}")
         
-        # 각 일정에 대해 Google Calendar 삭제 처리
-        for todo_item in todos_to_delete:
-            if current_user.google_calendar_enabled == "true" and current_user.google_calendar_token and export_enabled == "true" and todo_item.google_calendar_event_id:
+        # Google Calendar 삭제 처리 (반복 이벤트로 내보낸 시리즈는 시리즈 이벤트 한 번만 삭제)
+        if current_user.google_calendar_enabled == "true" and current_user.google_calendar_token and export_enabled == "true":
+            for event_id, calendar_id in RecurringSeriesService.delete_targets(todos_to_delete):
                 try:
                     from app.services.calendar_service import GoogleCalendarService
                     
                     # Google Calendar에서 이벤트 삭제
                     deleted = await GoogleCalendarService.delete_event(
                         token_json=current_user.google_calendar_token,
-                        event_id=todo_item.google_calendar_event_id
+                        event_id=event_id,
+                        calendar_id=calendar_id
                     )
                     
                     if deleted:
-                        logger.info(f"[DELETE-TODO] Google Calendar 이벤트 삭제 성공: {todo_item.google_calendar_event_id}")
+                        logger.info(f"[DELETE-TODO] Google Calendar 이벤트 삭제 성공: {event_id}")
                     else:
-                        logger.warning(f"[DELETE-TODO] Google Calendar 이벤트 삭제 실패: {todo_item.google_calendar_event_id}")
+                        logger.warning(f"[DELETE-TODO] Google Calendar 이벤트 삭제 실패: {event_id}")
                 except Exception as e:
                     # Google Calendar 삭제 실패해도 Todo 삭제는 진행
                     logger.warning(f"[DELETE-TODO] Google Calendar 삭제 중 오류 (Todo는 삭제됨): {e}")
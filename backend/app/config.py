@@ -16,6 +16,12 @@ def get_cors_origins() -> list:
     return [origin.strip() for origin in cors_str.split(",")]
 
 
+def get_admin_emails() -> list:
+    """관리자 이메일 목록 파싱 (ADMIN_EMAILS, 쉼표로 구분, 없으면 관리자 없음)"""
+    admin_str = os.getenv("ADMIN_EMAILS", "")
+    return [email.strip().lower() for email in admin_str.split(",") if email.strip()]
+
+
 class Settings(BaseSettings):
     """애플리케이션 설정"""
     
@@ -50,6 +56,45 @@ class Settings(BaseSettings):
     server_port: int = int(os.getenv("SERVER_PORT", 8000))
     server_reload: bool = os.getenv("SERVER_RELOAD", "True").lower() == "true"
     
+    # Google Calendar 미러 (google_calendar_events)
+    # 마지막 동기화 후 이 시간이 지나면 응답은 미러에서 하고 백그라운드로 갱신
+    calendar_mirror_stale_seconds: int = int(os.getenv("CALENDAR_MIRROR_STALE_SECONDS", 300))
+    # 여러 캘린더를 선택한 경우 동시에 동기화할 최대 캘린더 수
+    google_calendar_max_parallel_calendars: int = int(os.getenv("GOOGLE_CALENDAR_MAX_PARALLEL_CALENDARS", 4))
+    # 일괄 내보내기/삭제 시 DB 커밋 단위 (일정 N개마다 한 번 커밋)
+    calendar_sync_commit_chunk_size: int = int(os.getenv("CALENDAR_SYNC_COMMIT_CHUNK_SIZE", 100))
+    
+    # Google API 호출 제한 (초당 요청 수, 할당량 오류 시 최대 재시도 횟수)
+    google_api_project_qps: float = float(os.getenv("GOOGLE_API_PROJECT_QPS", 10))
+    google_api_user_qps: float = float(os.getenv("GOOGLE_API_USER_QPS", 5))
+    google_api_max_retries: int = int(os.getenv("GOOGLE_API_MAX_RETRIES", 5))
+    
+    # 외부 연결 풀 (Google OAuth/Calendar API, SMTP) - 앱 수명 동안 연결 재사용
+    outbound_http_timeout: float = float(os.getenv("OUTBOUND_HTTP_TIMEOUT", 30))
+    outbound_http_pool_size: int = int(os.getenv("OUTBOUND_HTTP_POOL_SIZE", 100))  # 전체 최대 연결 수
+    outbound_http_pool_per_host: int = int(os.getenv("OUTBOUND_HTTP_POOL_PER_HOST", 20))  # 호스트별 최대 연결 수
+    outbound_keepalive_seconds: float = float(os.getenv("OUTBOUND_KEEPALIVE_SECONDS", 30))
+    outbound_dns_cache_seconds: int = int(os.getenv("OUTBOUND_DNS_CACHE_SECONDS", 300))
+    smtp_pool_size: int = int(os.getenv("SMTP_POOL_SIZE", 2))  # 유지할 SMTP 연결 수
+    smtp_idle_seconds: float = float(os.getenv("SMTP_IDLE_SECONDS", 60))  # 이 시간 넘게 쉰 SMTP 연결은 다시 연결
+    
+    # 인증된 사용자 캐시 (get_current_user의 users 조회 생략, 0이면 사용 안 함)
+    user_cache_ttl_seconds: float = float(os.getenv("USER_CACHE_TTL_SECONDS", 30))
+    user_cache_max_entries: int = int(os.getenv("USER_CACHE_MAX_ENTRIES", 10000))
+    
+    # 일정 알림 (reminder_jobs)
+    reminder_claim_batch_size: int = int(os.getenv("REMINDER_CLAIM_BATCH_SIZE", 200))  # 스케줄러 한 번에 가져가는 최대 알림 수
+    reminder_max_lateness_minutes: int = int(os.getenv("REMINDER_MAX_LATENESS_MINUTES", 10))  # 이보다 늦어진 알림은 발송하지 않고 만료
+    reminder_claim_timeout_seconds: int = int(os.getenv("REMINDER_CLAIM_TIMEOUT_SECONDS", 300))  # 가져간 뒤 끝나지 않은 알림을 다시 대기로 돌리는 시간
+    reminder_horizon_seconds: int = int(os.getenv("REMINDER_HORIZON_SECONDS", 300))  # 스케줄러가 메모리에 올려 두는 앞으로의 발송 시각 범위 (이 주기로 다시 조회)
+    reminder_email_concurrency: int = int(os.getenv("REMINDER_EMAIL_CONCURRENCY", 20))  # 발송기 큐에 동시에 넣는 최대 알림 이메일 수 (SMTP 연결 수는 SMTP_POOL_SIZE)
+    reminder_send_timeout_seconds: float = float(os.getenv("REMINDER_SEND_TIMEOUT_SECONDS", 30))  # 이메일 한 건 / 푸시 일괄 발송 한 번의 최대 대기 시간
+    reminder_digest_daily_hour: int = int(os.getenv("REMINDER_DIGEST_DAILY_HOUR", 7))  # 하루 일정 묶음 메일 발송 시각 (Asia/Seoul 기준 시)
+    reminder_retry_max_attempts: int = int(os.getenv("REMINDER_RETRY_MAX_ATTEMPTS", 5))  # 발송 실패 알림의 최대 시도 수 (넘으면 dead로 보관)
+    reminder_retry_base_seconds: int = int(os.getenv("REMINDER_RETRY_BASE_SECONDS", 60))  # 첫 재시도 대기 시간 (시도마다 2배)
+    reminder_retry_max_seconds: int = int(os.getenv("REMINDER_RETRY_MAX_SECONDS", 3600))  # 재시도 대기 시간 상한
+    reminder_requeue_max_lateness_minutes: int = int(os.getenv("REMINDER_REQUEUE_MAX_LATENESS_MINUTES", 24 * 60))  # 관리자가 다시 발송할 수 있는 알림의 최대 지연 (재시도를 다 쓴 알림은 보통 MAX_LATENESS를 넘김)
+    
     # 로깅
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
     
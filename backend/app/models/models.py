@@ -1,11 +1,22 @@
 """
 Other Models (FamilyMember, Todo, etc.)
 """
-from sqlalchemy import Column, String, Date, Time, Text, Boolean, DateTime, ForeignKey, Integer, Numeric, Index
+from sqlalchemy import Column, String, Date, Time, Text, Boolean, DateTime, ForeignKey, Integer, Numeric, Index, text, func, literal_column
 from sqlalchemy.orm import relationship
 from datetime import datetime, date
 from app.models.base import BaseModel
 
+# idx_todos_user_calendar_event 부분 인덱스 조건 (가져오기 upsert의 ON CONFLICT 대상과 같아야 함)
+TODO_GOOGLE_EVENT_INDEX_WHERE = "google_calendar_event_id IS NOT NULL AND deleted_at IS NULL"
+
+
+def todo_calendar_key(calendar_id_column):
+    """idx_todos_user_calendar_event의 캘린더 키 (primary는 google_calendar_id를 None으로 저장하므로 'primary'로 맞춤)"""
+    return func.coalesce(calendar_id_column, literal_column("'primary'"))
+
+# idx_calendar_sync_jobs_user_running 부분 인덱스 조건 (사용자당 실행 중 동기화 작업 하나)
+CALENDAR_SYNC_JOB_RUNNING_INDEX_WHERE = "status = 'running' AND deleted_at IS NULL"
+
 
 class FamilyMember(BaseModel):
     """가족 구성원"""
@@ -65,6 +76,7 @@ class Todo(BaseModel):
     
     # Google Calendar 연동
     google_calendar_event_id = Column(String(255), index=True)  # Google Calendar 이벤트 ID 저장
+    google_calendar_id = Column(String(255))  # 가져온 이벤트의 캘린더 ID (None이면 primary)
     bulk_synced = Column(Boolean, default=False)  # 일괄 동기화로 생성된 일정인지 여부 (토글 꺼도 유지)
     
     # 일정 그룹화 (여러 날짜에 걸친 일정을 하나로 묶기)
@@ -77,6 +89,14 @@ class Todo(BaseModel):
     __table_args__ = (
         Index('idx_todos_user_date', 'user_id', 'date'),
         Index('idx_todos_user_status', 'user_id', 'status'),
+        # 같은 캘린더의 Google Calendar 이벤트는 삭제되지 않은 일정 하나에만 연결
+        # (공유/초대 일정처럼 같은 이벤트가 선택한 캘린더 여러 개에 있으면 캘린더마다 한 행)
+        Index(
+            'idx_todos_user_calendar_event', 'user_id', todo_calendar_key(google_calendar_id), 'google_calendar_event_id',
+            unique=True,
+            postgresql_where=text(TODO_GOOGLE_EVENT_INDEX_WHERE),
+            sqlite_where=text(TODO_GOOGLE_EVENT_INDEX_WHERE)
+        ),
     )
 
 
@@ -201,6 +221,67 @@ class Notification(BaseModel):
     )
 
 
+class ReminderJob(BaseModel):
+    """일정 알림 발송 예약 (리마인더 하나당 한 행, 스케줄러는 fire_at이 지난 행만 조회)"""
+    __tablename__ = "reminder_jobs"
+    
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    todo_id = Column(String(36), ForeignKey("todos.id", ondelete="CASCADE"), nullable=False)
+    
+    reminder_value = Column(Integer, nullable=False)  # 30
+    reminder_unit = Column(String(20), nullable=False)  # minutes, hours, days, weeks
+    fire_at = Column(DateTime, nullable=False)  # 발송 시각 (Asia/Seoul 기준 naive, 일정 시간과 같은 기준)
+    
+    status = Column(String(20), nullable=False, default="pending")  # pending, claimed, retrying, sent, failed, expired, dead
+    claim_token = Column(String(36))  # 이 작업을 가져간 스케줄러 실행 (같은 작업을 두 번 발송하지 않도록)
+    claimed_at = Column(DateTime)
+    sent_at = Column(DateTime)
+    
+    # 발송 실패 시 재시도 (지수 백오프, 최대 횟수를 넘으면 dead)
+    attempts = Column(Integer, nullable=False, default=0)  # 실패한 발송 시도 수
+    next_attempt_at = Column(DateTime)  # 다음 재시도 시각 (Asia/Seoul 기준 naive, retrying일 때만)
+    last_error = Column(Text)  # 마지막 실패 사유
+    
+    __table_args__ = (
+        Index('idx_reminder_jobs_due', 'status', 'fire_at'),
+        Index('idx_reminder_jobs_retry', 'status', 'next_attempt_at'),
+        Index('idx_reminder_jobs_todo', 'todo_id', 'status'),
+        Index('idx_reminder_jobs_claim', 'claim_token'),
+    )
+
+
+class ReminderDelivery(BaseModel):
+    """알림 발송 기록 (채널별 중복 발송 방지, 발송 전에 행을 먼저 넣어 선점)"""
+    __tablename__ = "reminder_deliveries"
+    
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    todo_id = Column(String(36), ForeignKey("todos.id", ondelete="CASCADE"), nullable=False)
+    reminder_offset = Column(Integer, nullable=False)  # 일정 시작 몇 분 전 알림인지 (30분 전 = 30, 1일 전 = 1440)
+    channel = Column(String(20), nullable=False)  # email, push
+    occurrence_at = Column(DateTime, nullable=False)  # 알림 대상 일정 시작 시각 (KST, 일정을 다른 날이나 시간으로 옮기면 다시 발송)
+    
+    status = Column(String(20), nullable=False, default="sending")  # sending, sent
+    claimed_at = Column(DateTime)  # 발송을 시작한 시각 (오래된 sending 행은 다른 실행이 다시 가져갈 수 있음)
+    sent_at = Column(DateTime)
+    
+    __table_args__ = (
+        Index('idx_reminder_deliveries_key', 'todo_id', 'reminder_offset', 'channel', 'occurrence_at', unique=True),
+    )
+
+
+class DeviceToken(BaseModel):
+    """푸시 알림을 받을 기기의 FCM 토큰 (사용자당 여러 기기)"""
+    __tablename__ = "device_tokens"
+    
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token = Column(String(500), nullable=False, unique=True)  # 같은 기기로 다른 계정에 로그인하면 소유자만 바뀜
+    last_seen_at = Column(DateTime)  # 마지막으로 토큰을 등록한 시각
+    
+    __table_args__ = (
+        Index('idx_device_tokens_user', 'user_id', 'last_seen_at'),
+    )
+
+
 class Memo(BaseModel):
     """메모 (OCR 텍스트)"""
     __tablename__ = "memos"
@@ -301,3 +382,130 @@ class ImageFile(BaseModel):
         Index('idx_image_files_user', 'user_id'),
         Index('idx_image_files_todo', 'todo_id'),
     )
+
+
+class GoogleCalendarEvent(BaseModel):
+    """Google Calendar 이벤트 미러 (GET /calendar/events 조회용 로컬 사본)"""
+    __tablename__ = "google_calendar_events"
+    
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    calendar_id = Column(String(255), nullable=False, default="primary")
+    event_id = Column(String(255), nullable=False)  # Google Calendar 이벤트 ID
+    etag = Column(String(255))
+    
+    title = Column(String(255))
+    description = Column(Text)
+    location = Column(String(255))
+    
+    # 앱 형식(Asia/Seoul 기준)으로 변환된 값
+    date = Column(Date)
+    end_date = Column(Date)  # 기간 일정인 경우만 (inclusive)
+    start_time = Column(String(5))  # "HH:MM"
+    end_time = Column(String(5))
+    all_day = Column(Boolean, default=False)
+    
+    # 기간 조회용 (UTC, naive)
+    start_at = Column(DateTime, nullable=False)
+    end_at = Column(DateTime, nullable=False)
+    
+    html_link = Column(String(500))
+    source_id = Column(String(36))  # Always Plan의 Todo ID (extendedProperties)
+    notification_reminders = Column(Text)  # JSON 배열
+    repeat_type = Column(String(20), default="none")
+    repeat_pattern = Column(Text)  # JSON
+    repeat_end_date = Column(Date)
+    
+    synced_at = Column(DateTime)  # 마지막으로 Google에서 받아온 시간
+    
+    __table_args__ = (
+        Index('idx_gcal_events_user_event', 'user_id', 'calendar_id', 'event_id', unique=True),
+        Index('idx_gcal_events_user_start', 'user_id', 'start_at'),
+    )
+
+
+class GoogleCalendarSyncState(BaseModel):
+    """Google Calendar 미러 동기화 상태 (사용자/캘린더별 sync token)"""
+    __tablename__ = "google_calendar_sync_states"
+    
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    calendar_id = Column(String(255), nullable=False, default="primary")
+    
+    sync_token = Column(Text)  # 전체 동기화 완료 후 발급된 nextSyncToken (있으면 전체 기간 미러링됨)
+    window_start = Column(DateTime)  # sync token 발급 전, 기간 조회로 채워진 범위 (UTC)
+    window_end = Column(DateTime)
+    last_synced_at = Column(DateTime)
+    
+    __table_args__ = (
+        Index('idx_gcal_sync_states_user_calendar', 'user_id', 'calendar_id', unique=True),
+    )
+
+
+class CalendarSyncJob(BaseModel):
+    """Google Calendar 일괄 동기화/내보내기 작업 (요청과 분리된 백그라운드 실행 + 진행 상황 조회)"""
+    __tablename__ = "calendar_sync_jobs"
+    
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    job_type = Column(String(20), nullable=False)  # "sync_all", "export"
+    status = Column(String(20), nullable=False, default="pending")  # "pending", "running", "completed", "failed"
+    phase = Column(String(20))  # 현재 단계: "export", "import"
+    
+    # 진행 상황
+    total_count = Column(Integer, default=0)  # 현재 단계에서 처리할 항목 수 (가져오기 단계는 페이지마다 증가)
+    processed_count = Column(Integer, default=0)
+    
+    checkpoint = Column(Text)  # JSON: 단계, 통계, 가져오기 페이지 토큰 (재시작 시 이어서 실행)
+    result = Column(Text)  # JSON: 완료 시 응답 본문 (기존 /sync/all, /export 응답 형식)
+    error_message = Column(Text)
+    attempts = Column(Integer, default=0)  # 실행(재개 포함) 횟수, 실행 중인 워커의 소유 확인에도 사용
+    
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)  # 실행 중 마지막 체크포인트 시간 (오래되면 다른 워커가 이어서 실행)
+    
+    __table_args__ = (
+        Index('idx_calendar_sync_jobs_user_status', 'user_id', 'job_type', 'status'),
+        Index('idx_calendar_sync_jobs_status', 'status', 'created_at'),
+        # 여러 인스턴스에서도 사용자당 실행 중 작업은 하나만 (선점 UPDATE가 유니크 위반으로 실패)
+        Index(
+            'idx_calendar_sync_jobs_user_running', 'user_id',
+            unique=True,
+            postgresql_where=text(CALENDAR_SYNC_JOB_RUNNING_INDEX_WHERE),
+            sqlite_where=text(CALENDAR_SYNC_JOB_RUNNING_INDEX_WHERE)
+        ),
+    )
+
+
+class GoogleCalendarSyncSnapshot(BaseModel):
+    """Todo ↔ Google Calendar 이벤트 마지막 동기화 지문 (3-way 동기화 계획용)"""
+    __tablename__ = "google_calendar_sync_snapshots"
+    
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    calendar_id = Column(String(255), nullable=False, default="primary")
+    todo_id = Column(String(36), nullable=False)  # Todo가 삭제되어도 원격 이벤트 정리를 위해 FK 없이 유지
+    event_id = Column(String(255), nullable=False)
+    
+    etag = Column(String(255))  # 동기화 직후 원격 이벤트 etag
+    content_hash = Column(String(64), nullable=False)  # 동기화 시점 매핑 필드 해시 (sync_planner.fingerprint)
+    synced_at = Column(DateTime)
+    
+    __table_args__ = (
+        Index('idx_gcal_snapshots_user_todo', 'user_id', 'calendar_id', 'todo_id', unique=True),
+        Index('idx_gcal_snapshots_user_event', 'user_id', 'event_id'),
+    )
+
+
+class GoogleCalendarSelection(BaseModel):
+    """사용자별 Google Calendar 캘린더 선택 (가져오기/미러 대상 캘린더)"""
+    __tablename__ = "google_calendar_selections"
+    
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    calendar_id = Column(String(255), nullable=False)  # 기본 캘린더는 "primary"로 저장
+    summary = Column(String(255))  # 캘린더 이름
+    background_color = Column(String(20))
+    access_role = Column(String(20))  # owner, writer, reader, freeBusyReader
+    is_primary = Column(Boolean, default=False)
+    selected = Column(Boolean, default=False)
+    
+    __table_args__ = (
+        Index('idx_gcal_selections_user_calendar', 'user_id', 'calendar_id', unique=True),
+    )
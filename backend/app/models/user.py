@@ -30,10 +30,12 @@ class User(BaseModel):
     google_calendar_watch_channel_id = Column(String(255))  # Watch 채널 ID
     google_calendar_watch_resource_id = Column(String(255))  # Google에서 반환한 리소스 ID
     google_calendar_watch_expiration = Column(DateTime)  # Watch 만료 시간
+    google_calendar_watch_token = Column(String(64))  # Watch 등록 시 보낸 채널 토큰 (웹훅의 X-Goog-Channel-Token 확인용)
 
     # FCM (Firebase Cloud Messaging) 웹 푸시 알림
-    fcm_token = Column(String(500))  # FCM 토큰
+    fcm_token = Column(String(500))  # (사용 안 함) 기기별 토큰은 device_tokens 테이블에 저장
     notification_preference = Column(String(20), default="email")  # 알림 방식: email, push, both, none
+    notification_digest = Column(String(20), default="off")  # 이메일 알림 묶음: off(알림마다), hourly(다음 1시간), daily(매일 아침 하루 일정)
 
     # 로그인 관련
     last_login = Column(DateTime)
@@ -54,6 +56,9 @@ class User(BaseModel):
     __table_args__ = (
         Index('idx_users_email', 'email'),
         Index('idx_users_google_id', 'google_id'),
+        Index('idx_users_watch_expiration', 'google_calendar_watch_expiration'),  # Watch 갱신 스케줄러 조회용
+        Index('idx_users_watch_channel', 'google_calendar_watch_channel_id'),  # 웹훅 채널 확인용
+        Index('idx_users_notification_digest', 'notification_digest'),  # 알림 묶음 발송 대상 조회용
     )
     
     def to_dict(self):
@@ -188,7 +188,7 @@ class GoogleOAuthService:
         인증 코드 → 토큰 교환 (Main_PJ2의 exchange_code_for_token 패턴)
         calendar=True인 경우 캘린더 전용 토큰 반환
         """
-        import aiohttp
+        from app.services.outbound_connections import outbound
         
         try:
             logger.info(f"[TOKEN_EXCHANGE] Starting token exchange with code: {code[:20]}...")
@@ -196,59 +196,60 @@ class GoogleOAuthService:
             logger.info(f"[TOKEN_EXCHANGE] Using redirect_uri: {settings.google_redirect_uri}")
             logger.info(f"[TOKEN_EXCHANGE] Calendar mode: {calendar}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    'https://oauth2.googleapis.com/token',
-                    data={
-                        'client_id': settings.google_client_id,
-                        'client_secret': settings.google_client_secret,
-                        'code': code,
-                        'grant_type': 'authorization_code',
-                        'redirect_uri': settings.google_redirect_uri,
-                    }
-                ) as resp:
-                    response_text = await resp.text()
-                    logger.info(f"[TOKEN_EXCHANGE] Response status: {resp.status}")
-                    logger.info(f"[TOKEN_EXCHANGE] Response body: {response_text[:500]}")
+            # 앱 공용 세션 사용 (연결/DNS/TLS 재사용, 세션은 앱 종료 시 닫힘)
+            session = outbound.aiohttp_session()
+            async with session.post(
+                'https://oauth2.googleapis.com/token',
+                data={
+                    'client_id': settings.google_client_id,
+                    'client_secret': settings.google_client_secret,
+                    'code': code,
+                    'grant_type': 'authorization_code',
+                    'redirect_uri': settings.google_redirect_uri,
+                }
+            ) as resp:
+                response_text = await resp.text()
+                logger.info(f"[TOKEN_EXCHANGE] Response status: {resp.status}")
+                logger.info(f"[TOKEN_EXCHANGE] Response body: {response_text[:500]}")
+                
+                if resp.status == 200:
+                    token_data = await resp.json()
+                    logger.info(f"[TOKEN_EXCHANGE] Token exchange successful, got id_token: {bool(token_data.get('id_token'))}")
                     
-                    if resp.status == 200:
-                        token_data = await resp.json()
-                        logger.info(f"[TOKEN_EXCHANGE] Token exchange successful, got id_token: {bool(token_data.get('id_token'))}")
-                        
-                        # expiry 계산 (초 단위 → ISO 형식 datetime 문자열)
-                        expires_in = token_data.get('expires_in', 3600)
-                        expiry_dt = datetime.utcnow() + timedelta(seconds=expires_in)
-                        expiry_iso = expiry_dt.isoformat() + 'Z'
-                        
-                        if calendar:
-                            # 캘린더 전용 토큰 반환
-                            return {
-                                "access_token": token_data.get('access_token'),
-                                "refresh_token": token_data.get('refresh_token'),
-                                "token_uri": 'https://oauth2.googleapis.com/token',
-                                "client_id": settings.google_client_id,
-                                "client_secret": settings.google_client_secret,
-                                "scopes": GoogleOAuthService.CALENDAR_SCOPES,
-                                "expiry": expiry_iso,  # ISO 형식
-                                "expires_in": expires_in,
-                            }
-                        else:
-                            # 일반 로그인 토큰 반환
-                            return {
-                                "token": token_data.get('id_token'),  # ID 토큰 사용
-                                "access_token": token_data.get('access_token'),
-                                "refresh_token": token_data.get('refresh_token'),
-                                "token_uri": token_data.get('token_uri', 'https://oauth2.googleapis.com/token'),
-                                "client_id": settings.google_client_id,
-                                "client_secret": settings.google_client_secret,
-                                "scopes": GoogleOAuthService.SCOPES,
-                                "expiry": expiry_iso,  # ISO 형식
-                                "expires_in": expires_in,
-                            }
+                    # expiry 계산 (초 단위 → ISO 형식 datetime 문자열)
+                    expires_in = token_data.get('expires_in', 3600)
+                    expiry_dt = datetime.utcnow() + timedelta(seconds=expires_in)
+                    expiry_iso = expiry_dt.isoformat() + 'Z'
+                    
+                    if calendar:
+                        # 캘린더 전용 토큰 반환
+                        return {
+                            "access_token": token_data.get('access_token'),
+                            "refresh_token": token_data.get('refresh_token'),
+                            "token_uri": 'https://oauth2.googleapis.com/token',
+                            "client_id": settings.google_client_id,
+                            "client_secret": settings.google_client_secret,
+                            "scopes": GoogleOAuthService.CALENDAR_SCOPES,
+                            "expiry": expiry_iso,  # ISO 형식
+                            "expires_in": expires_in,
+                        }
                     else:
-                        logger.error(f"[TOKEN_EXCHANGE] Token exchange failed: {resp.status}")
-                        logger.error(f"[TOKEN_EXCHANGE] Error response: {response_text}")
-                        return None
+                        # 일반 로그인 토큰 반환
+                        return {
+                            "token": token_data.get('id_token'),  # ID 토큰 사용
+                            "access_token": token_data.get('access_token'),
+                            "refresh_token": token_data.get('refresh_token'),
+                            "token_uri": token_data.get('token_uri', 'https://oauth2.googleapis.com/token'),
+                            "client_id": settings.google_client_id,
+                            "client_secret": settings.google_client_secret,
+                            "scopes": GoogleOAuthService.SCOPES,
+                            "expiry": expiry_iso,  # ISO 형식
+                            "expires_in": expires_in,
+                        }
+                else:
+                    logger.error(f"[TOKEN_EXCHANGE] Token exchange failed: {resp.status}")
+                    logger.error(f"[TOKEN_EXCHANGE] Error response: {response_text}")
+                    return None
         except Exception as e:
             logger.error(f"[TOKEN_EXCHANGE] Exception: {e}", exc_info=True)
             return None
@@ -260,17 +261,11 @@ class GoogleOAuthService:
         Main_PJ2 패턴을 따릅니다
         """
         try:
-            from google.auth.transport import requests as google_requests
-            from google.oauth2 import id_token as google_id_token
+            from app.services.google_id_token_verifier import google_id_token_verifier
             
             logger.info(f"[TOKEN_VERIFY] Starting token verification")
-            # Google 공개 키로 검증 (프로덕션 권장)
-            request = google_requests.Request()
-            idinfo = google_id_token.verify_oauth2_token(
-                id_token, 
-                request, 
-                settings.google_client_id
-            )
+            # Google 공개 키로 검증 (프로덕션 권장, 캐시된 인증서로 로컬 검증)
+            idinfo = await google_id_token_verifier.verify(id_token, settings.google_client_id)
             
             logger.info(f"[TOKEN_VERIFY] Token verified for user: {idinfo.get('email')}")
             return idinfo
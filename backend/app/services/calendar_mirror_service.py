@@ -0,0 +1,673 @@
+"""
+Google Calendar 이벤트 미러 서비스
+google_calendar_events 테이블을 증분 동기화(sync token)와 웹훅으로 유지하고,
+GET /calendar/events는 Google API 대신 이 테이블에서 기간 조회로 응답
+"""
+import asyncio
+import json
+import logging
+import re
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Set, Tuple, Callable, Awaitable, AsyncIterator
+
+from sqlalchemy import exists
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.models import GoogleCalendarEvent, GoogleCalendarSyncState, GoogleCalendarSelection, Todo
+from app.models.user import User
+from app.services.calendar_service import GoogleCalendarService, SyncTokenExpiredError
+from app.services.google_rate_limiter import PRIORITY_INTERACTIVE, PRIORITY_BULK
+from app.services.sync_writer import run_in_thread
+
+logger = logging.getLogger(__name__)
+
+SEOUL_TZ = timezone(timedelta(hours=9))  # 앱에서 사용하는 시간대 (UTC+9)
+
+# 인접 월 미리 가져오기 범위
+PREFETCH_MARGIN = timedelta(days=31)
+
+# 캘린더 선택이 없을 때 사용하는 기본 캘린더
+DEFAULT_CALENDAR_ID = 'primary'
+
+# 백그라운드 갱신 중인 사용자 ID (인스턴스 내 중복 실행 방지)
+_refreshing_users: Set[str] = set()
+# 실행 중인 백그라운드 태스크 참조 (GC 방지)
+_background_tasks: Set[asyncio.Task] = set()
+# 사용자별 미러 동기화 잠금 (웹훅/백그라운드 갱신이 동시에 돌지 않도록)
+_user_locks: Dict[str, asyncio.Lock] = {}
+# 사용자별 잠금을 잡고 있거나 기다리는 수 (0이 되면 잠금을 지워 사용자 수만큼 쌓이지 않도록)
+_user_lock_users: Dict[str, int] = {}
+
+
+class CalendarMirrorService:
+    """Google Calendar 이벤트 미러 (google_calendar_events) 관리"""
+
+    @staticmethod
+    @asynccontextmanager
+    async def get_user_lock(user_id: str) -> AsyncIterator[None]:
+        """
+        사용자별 미러 동기화 잠금 (인스턴스 내 사용자당 하나의 동기화만 실행)
+
+        async with로 사용하며, 풀 때 기다리는 곳이 없으면 잠금을 지웁니다.
+        """
+        lock = _user_locks.get(user_id)
+        if lock is None:
+            lock = _user_locks[user_id] = asyncio.Lock()
+        _user_lock_users[user_id] = _user_lock_users.get(user_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            remaining = _user_lock_users[user_id] - 1
+            if remaining:
+                _user_lock_users[user_id] = remaining
+            else:
+                del _user_lock_users[user_id]
+                del _user_locks[user_id]
+
+    @staticmethod
+    def load_selected_calendar_ids(user_id: str) -> List[str]:
+        """get_selected_calendar_ids를 별도 세션으로 실행 (이벤트 루프에서는 run_in_thread로 호출)"""
+        db = SessionLocal()
+        try:
+            return CalendarMirrorService.get_selected_calendar_ids(db, user_id)
+        finally:
+            db.close()
+
+    @staticmethod
+    def get_selected_calendar_ids(db: Session, user_id: str) -> List[str]:
+        """미러/가져오기 대상 캘린더 ID 목록 (선택한 캘린더가 없으면 primary만)"""
+        rows = db.query(GoogleCalendarSelection.calendar_id).filter(
+            GoogleCalendarSelection.user_id == user_id,
+            GoogleCalendarSelection.selected == True,
+            GoogleCalendarSelection.deleted_at.is_(None)
+        ).order_by(GoogleCalendarSelection.is_primary.desc(), GoogleCalendarSelection.calendar_id).all()
+        calendar_ids = [row.calendar_id for row in rows]
+        return calendar_ids or [DEFAULT_CALENDAR_ID]
+
+    @staticmethod
+    async def run_per_calendar(
+        user_id: str,
+        calendar_ids: List[str],
+        func: Callable[[Session, User, str], Awaitable[Any]],
+        tag: str = "MIRROR"
+    ) -> Dict[str, Any]:
+        """
+        캘린더별 작업을 동시에 실행 (최대 google_calendar_max_parallel_calendars개)
+
+        캘린더마다 별도 DB 세션을 사용하고(DB 작업은 작업 스레드에서), 한 캘린더가 실패해도 나머지는 계속 진행합니다.
+        Google API 호출 속도는 google_rate_limiter가 사용자/프로젝트 단위로 제한합니다.
+
+        Returns:
+            {calendar_id: 결과} (실패한 캘린더는 None)
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.google_calendar_max_parallel_calendars))
+
+        async def _run(calendar_id: str):
+            async with semaphore:
+                db = SessionLocal()
+                try:
+                    user = await run_in_thread(CalendarMirrorService._load_linked_user, db, user_id)
+                    if not user:
+                        return None
+                    return await func(db, user, calendar_id)
+                except Exception as e:
+                    logger.error(f"[{tag}] 캘린더 처리 실패 - user_id={user_id}, calendar_id={calendar_id}: {e}", exc_info=True)
+                    await run_in_thread(db.rollback)
+                    return None
+                finally:
+                    await run_in_thread(db.close)
+
+        results = await asyncio.gather(*[_run(calendar_id) for calendar_id in calendar_ids])
+        return dict(zip(calendar_ids, results))
+
+    @staticmethod
+    def _load_linked_user(db: Session, user_id: str) -> Optional[User]:
+        """Google Calendar가 연동된 사용자 (연동되지 않았으면 None)"""
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user or not user.google_calendar_token:
+            return None
+        return user
+
+    @staticmethod
+    def _user_credentials(user: User) -> Tuple[str, Optional[str]]:
+        """(user_id, 토큰) - 커밋 후 만료된 속성을 다시 읽는 쿼리가 이벤트 루프에서 실행되지 않도록 작업 스레드에서 읽음"""
+        return user.id, user.google_calendar_token
+
+    @staticmethod
+    async def sync_calendars(user_id: str, calendar_ids: List[str]) -> int:
+        """선택한 캘린더들을 동시에 증분 동기화. 반영한 이벤트 수 합계 반환"""
+        results = await CalendarMirrorService.run_per_calendar(
+            user_id,
+            calendar_ids,
+            lambda db, user, calendar_id: CalendarMirrorService.sync_user(db, user, calendar_id)
+        )
+        return sum(applied or 0 for applied in results.values())
+
+    @staticmethod
+    async def fill_calendars(
+        user_id: str,
+        calendar_ids: List[str],
+        time_min: datetime,
+        time_max: datetime,
+        priority: str = PRIORITY_INTERACTIVE
+    ) -> int:
+        """선택한 캘린더들의 기간을 동시에 채움. 반영한 이벤트 수 합계 반환"""
+        results = await CalendarMirrorService.run_per_calendar(
+            user_id,
+            calendar_ids,
+            lambda db, user, calendar_id: CalendarMirrorService.fill_range(
+                db, user, time_min, time_max, calendar_id=calendar_id, priority=priority
+            )
+        )
+        return sum(applied or 0 for applied in results.values())
+
+    @staticmethod
+    def _parse_datetime(value: str) -> datetime:
+        """RFC3339 문자열 파싱 (타임존이 없으면 UTC로 간주)"""
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed
+
+    @staticmethod
+    def _parse_date(value: str):
+        if 'T' in value:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+        return datetime.strptime(value, '%Y-%m-%d').date()
+
+    @staticmethod
+    def _parse_reminders(reminders: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Google reminders → [{'value': 30, 'unit': 'minutes'}, ...]"""
+        result = []
+        if not reminders:
+            return result
+        if reminders.get('useDefault'):
+            # 기본 알림 사용 (30분 전)
+            return [{'value': 30, 'unit': 'minutes'}]
+
+        for override in reminders.get('overrides', []):
+            minutes = override.get('minutes', 30)
+            # 분을 단위로 변환 (나누어 떨어지는 가장 큰 단위 선택)
+            if minutes >= 7 * 24 * 60 and minutes % (7 * 24 * 60) == 0:
+                result.append({'value': minutes // (7 * 24 * 60), 'unit': 'weeks'})
+            elif minutes >= 24 * 60 and minutes % (24 * 60) == 0:
+                result.append({'value': minutes // (24 * 60), 'unit': 'days'})
+            elif minutes >= 60 and minutes % 60 == 0:
+                result.append({'value': minutes // 60, 'unit': 'hours'})
+            else:
+                result.append({'value': minutes, 'unit': 'minutes'})
+        return result
+
+    @staticmethod
+    def _parse_recurrence(recurrence: List[str]):
+        """RRULE → (repeat_type, repeat_pattern, repeat_end_date)"""
+        repeat_type = 'none'
+        repeat_pattern = None
+        repeat_end_date = None
+        if not recurrence or not recurrence[0].startswith('RRULE:'):
+            return repeat_type, repeat_pattern, repeat_end_date
+
+        rule = {}
+        for part in recurrence[0][6:].split(';'):
+            if '=' in part:
+                key, value = part.split('=', 1)
+                rule[key] = value
+
+        freq = rule.get('FREQ')
+        byday = rule.get('BYDAY')
+        until = rule.get('UNTIL')
+        interval = int(rule['INTERVAL']) if rule.get('INTERVAL') else None
+        count = int(rule['COUNT']) if rule.get('COUNT') else None
+
+        if freq == 'DAILY':
+            repeat_type = 'daily'
+        elif freq == 'WEEKLY':
+            if byday == 'MO,TU,WE,TH,FR':
+                repeat_type = 'weekdays'
+            elif byday == 'SA,SU':
+                repeat_type = 'weekends'
+            elif byday:
+                repeat_type = 'custom'
+            else:
+                repeat_type = 'weekly'
+        elif freq == 'MONTHLY':
+            repeat_type = 'monthly'
+        elif freq == 'YEARLY':
+            repeat_type = 'yearly'
+
+        # 종료일 파싱 (YYYYMMDD 형식)
+        if until and len(until) >= 8:
+            repeat_end_date = datetime.strptime(until[:8], '%Y%m%d').date()
+
+        # 커스텀 패턴 저장
+        if repeat_type == 'custom' or (interval and interval > 1):
+            repeat_pattern = {
+                'freq': freq.lower() if freq else 'daily',
+                'interval': interval or 1,
+                'byday': byday,
+                'count': count
+            }
+        return repeat_type, repeat_pattern, repeat_end_date
+
+    @staticmethod
+    def _extract_source_id(event: Dict[str, Any]) -> Optional[str]:
+        """extendedProperties(또는 description fallback)에서 Always Plan Todo ID 추출"""
+        private_props = event.get('extendedProperties', {}).get('private', {})
+        if private_props.get('alwaysPlanSourceId'):
+            return private_props.get('alwaysPlanSourceId')
+        description = event.get('description', '')
+        if description and 'AlwaysPlanID:' in description:
+            match = re.search(r'AlwaysPlanID:([^\s\n]+)', description)
+            if match:
+                return match.group(1)
+        return None
+
+    @staticmethod
+    def parse_event(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Google Calendar 이벤트를 미러 컬럼 값으로 변환
+
+        Returns:
+            컬럼 값 dict (시작 시간을 알 수 없는 이벤트는 None)
+        """
+        start = event.get('start', {})
+        end = event.get('end', {})
+
+        start_date = None
+        end_date = None
+        start_time = None
+        end_time = None
+        all_day = False
+
+        if 'date' in start:
+            # 종일 이벤트
+            all_day = True
+            start_date = CalendarMirrorService._parse_date(start['date'])
+            start_at = datetime.combine(start_date, datetime.min.time(), SEOUL_TZ)
+            end_at = start_at + timedelta(days=1)
+            if 'date' in end:
+                # Google Calendar는 종료 날짜를 exclusive로 저장하므로 하루 빼야 함
+                end_exclusive = CalendarMirrorService._parse_date(end['date'])
+                end_at = datetime.combine(end_exclusive, datetime.min.time(), SEOUL_TZ)
+                end_date = end_exclusive - timedelta(days=1)
+        elif 'dateTime' in start:
+            # 시간 지정 이벤트 (Asia/Seoul로 변환)
+            start_at = CalendarMirrorService._parse_datetime(start['dateTime'])
+            start_seoul = start_at.astimezone(SEOUL_TZ)
+            start_date = start_seoul.date()
+            start_time = start_seoul.strftime('%H:%M')
+            end_at = start_at
+            if 'dateTime' in end:
+                end_at = CalendarMirrorService._parse_datetime(end['dateTime'])
+                end_seoul = end_at.astimezone(SEOUL_TZ)
+                end_date = end_seoul.date()
+                end_time = end_seoul.strftime('%H:%M')
+        else:
+            return None
+
+        # 시작 날짜와 종료 날짜가 같거나 작으면 종료 날짜를 None으로 설정 (하루 일정)
+        if end_date and end_date <= start_date:
+            end_date = None
+
+        repeat_type, repeat_pattern, repeat_end_date = CalendarMirrorService._parse_recurrence(
+            event.get('recurrence', [])
+        )
+        notification_reminders = CalendarMirrorService._parse_reminders(event.get('reminders', {}))
+
+        return {
+            'etag': event.get('etag'),
+            'title': event.get('summary', '제목 없음'),
+            'description': event.get('description', ''),
+            'location': event.get('location', ''),
+            'date': start_date,
+            'end_date': end_date,
+            'start_time': start_time,
+            'end_time': end_time,
+            'all_day': all_day,
+            'start_at': start_at.astimezone(timezone.utc).replace(tzinfo=None),
+            'end_at': end_at.astimezone(timezone.utc).replace(tzinfo=None),
+            'html_link': event.get('htmlLink'),
+            'source_id': CalendarMirrorService._extract_source_id(event),
+            'notification_reminders': json.dumps(notification_reminders),
+            'repeat_type': repeat_type,
+            'repeat_pattern': json.dumps(repeat_pattern) if repeat_pattern else None,
+            'repeat_end_date': repeat_end_date,
+        }
+
+    @staticmethod
+    def to_response(row: GoogleCalendarEvent) -> Dict[str, Any]:
+        """미러 행을 GET /calendar/events 응답 형식으로 변환"""
+        return {
+            'id': row.event_id,
+            'calendar_id': row.calendar_id,
+            'title': row.title,
+            'description': row.description or '',
+            'location': row.location or '',
+            'date': row.date.isoformat() if row.date else None,
+            'end_date': row.end_date.isoformat() if row.end_date else None,
+            'start_time': row.start_time,
+            'end_time': row.end_time,
+            'all_day': bool(row.all_day),
+            'html_link': row.html_link,
+            'google_calendar_event_id': row.event_id,
+            'source_id': row.source_id,  # Always Plan의 Todo ID (중복 제거용)
+            'source': 'google_calendar',
+            'notification_reminders': json.loads(row.notification_reminders) if row.notification_reminders else [],
+            'repeat_type': row.repeat_type or 'none',
+            'repeat_pattern': json.loads(row.repeat_pattern) if row.repeat_pattern else None,
+            'repeat_end_date': row.repeat_end_date.isoformat() if row.repeat_end_date else None,
+        }
+
+    @staticmethod
+    def get_state(db: Session, user_id: str, calendar_id: str = 'primary') -> Optional[GoogleCalendarSyncState]:
+        return db.query(GoogleCalendarSyncState).filter(
+            GoogleCalendarSyncState.user_id == user_id,
+            GoogleCalendarSyncState.calendar_id == calendar_id
+        ).first()
+
+    @staticmethod
+    def _get_or_create_state(db: Session, user_id: str, calendar_id: str = 'primary') -> GoogleCalendarSyncState:
+        state = CalendarMirrorService.get_state(db, user_id, calendar_id)
+        if not state:
+            state = GoogleCalendarSyncState(user_id=user_id, calendar_id=calendar_id)
+            db.add(state)
+            db.flush()
+        return state
+
+    @staticmethod
+    def is_covered(state: Optional[GoogleCalendarSyncState], time_min: datetime, time_max: datetime) -> bool:
+        """요청 기간이 미러에 채워져 있는지 (sync token이 있으면 전체 기간이 미러링된 상태)"""
+        if not state:
+            return False
+        if state.sync_token:
+            return True
+        return bool(
+            state.window_start and state.window_end
+            and state.window_start <= time_min and time_max <= state.window_end
+        )
+
+    @staticmethod
+    def is_stale(state: Optional[GoogleCalendarSyncState]) -> bool:
+        if not state or not state.last_synced_at:
+            return True
+        age = datetime.utcnow() - state.last_synced_at
+        return age > timedelta(seconds=settings.calendar_mirror_stale_seconds)
+
+    @staticmethod
+    def _apply_page(db: Session, user_id: str, calendar_id: str, events: List[Dict[str, Any]]) -> int:
+        """이벤트 한 페이지를 미러에 반영 (취소된 이벤트는 삭제). 반영한 이벤트 수 반환"""
+        event_ids = [event.get('id') for event in events if event.get('id')]
+        if not event_ids:
+            return 0
+
+        existing = {
+            row.event_id: row
+            for row in db.query(GoogleCalendarEvent).filter(
+                GoogleCalendarEvent.user_id == user_id,
+                GoogleCalendarEvent.calendar_id == calendar_id,
+                GoogleCalendarEvent.event_id.in_(event_ids)
+            ).all()
+        }
+
+        now = datetime.utcnow()
+        applied = 0
+        for event in events:
+            event_id = event.get('id')
+            if not event_id:
+                continue
+            row = existing.get(event_id)
+
+            values = None if event.get('status') == 'cancelled' else CalendarMirrorService.parse_event(event)
+            if values is None:
+                if row:
+                    db.delete(row)
+                    applied += 1
+                continue
+
+            if row is None:
+                row = GoogleCalendarEvent(user_id=user_id, calendar_id=calendar_id, event_id=event_id)
+                db.add(row)
+                existing[event_id] = row
+            for key, value in values.items():
+                setattr(row, key, value)
+            row.synced_at = now
+            applied += 1
+
+        db.commit()
+        return applied
+
+    @staticmethod
+    async def fill_range(
+        db: Session,
+        user: User,
+        time_min: datetime,
+        time_max: datetime,
+        calendar_id: str = 'primary',
+        priority: str = PRIORITY_INTERACTIVE
+    ) -> int:
+        """
+        기간 조회로 미러 채우기 (sync token 발급 전 첫 화면용)
+
+        time_min, time_max: UTC naive datetime
+        페이지 저장/커밋은 작업 스레드에서 실행하므로 db는 이 작업만 쓰는 세션이어야 합니다.
+        """
+        user_id, token_json = await run_in_thread(CalendarMirrorService._user_credentials, user)
+        started_at = datetime.utcnow()
+        applied = 0
+        async for page_events in GoogleCalendarService.iter_event_pages(
+            token_json=token_json,
+            time_min=time_min,
+            time_max=time_max,
+            calendar_id=calendar_id,
+            priority=priority
+        ):
+            applied += await run_in_thread(CalendarMirrorService._apply_page, db, user_id, calendar_id, page_events)
+
+        await run_in_thread(
+            CalendarMirrorService._finish_fill, db, user_id, calendar_id, time_min, time_max, started_at
+        )
+        logger.info(f"[MIRROR] 기간 채우기 완료 - user_id={user_id}, calendar_id={calendar_id}, {time_min} ~ {time_max}, {applied}개 반영")
+        return applied
+
+    @staticmethod
+    def _finish_fill(
+        db: Session,
+        user_id: str,
+        calendar_id: str,
+        time_min: datetime,
+        time_max: datetime,
+        started_at: datetime
+    ):
+        """기간 채우기 마무리 (삭제된 이벤트 정리 + 채운 기간 기록)"""
+        # 기간 안에서 이번 조회에 나오지 않은 행은 Google에서 삭제된 이벤트
+        db.query(GoogleCalendarEvent).filter(
+            GoogleCalendarEvent.user_id == user_id,
+            GoogleCalendarEvent.calendar_id == calendar_id,
+            GoogleCalendarEvent.start_at < time_max,
+            GoogleCalendarEvent.end_at > time_min,
+            GoogleCalendarEvent.synced_at < started_at
+        ).delete(synchronize_session=False)
+
+        state = CalendarMirrorService._get_or_create_state(db, user_id, calendar_id)
+        if (state.window_start and state.window_end
+                and time_min <= state.window_end and time_max >= state.window_start):
+            state.window_start = min(state.window_start, time_min)
+            state.window_end = max(state.window_end, time_max)
+        else:
+            state.window_start = time_min
+            state.window_end = time_max
+        if not state.sync_token:
+            state.last_synced_at = started_at
+        db.commit()
+
+    @staticmethod
+    async def sync_user(db: Session, user: User, calendar_id: str = 'primary') -> int:
+        """
+        sync token 기반 증분 동기화 (token이 없거나 만료되면 전체 동기화)
+        페이지 저장/커밋은 작업 스레드에서 실행하므로 db는 이 작업만 쓰는 세션이어야 합니다.
+
+        Returns:
+            반영한 이벤트 수
+        """
+        user_id, token_json = await run_in_thread(CalendarMirrorService._user_credentials, user)
+        if not token_json:
+            return 0
+
+        sync_token = await run_in_thread(CalendarMirrorService._load_sync_token, db, user_id, calendar_id)
+        started_at = datetime.utcnow()
+        applied = 0
+        next_sync_token = None
+
+        try:
+            async for page in GoogleCalendarService.iter_sync_pages(
+                token_json=token_json,
+                sync_token=sync_token,
+                calendar_id=calendar_id
+            ):
+                applied += await run_in_thread(
+                    CalendarMirrorService._apply_page, db, user_id, calendar_id, page.get('items', [])
+                )
+                next_sync_token = page.get('nextSyncToken') or next_sync_token
+        except SyncTokenExpiredError:
+            # sync token 만료 → 전체 동기화로 다시 시작
+            await run_in_thread(CalendarMirrorService._reset_sync_token, db, user_id, calendar_id)
+            return await CalendarMirrorService.sync_user(db, user, calendar_id)
+
+        if not sync_token:
+            # 전체 동기화: 이번에 나오지 않은 행은 Google에서 삭제된 이벤트
+            await run_in_thread(CalendarMirrorService._delete_unsynced, db, user_id, calendar_id, started_at)
+        await run_in_thread(
+            CalendarMirrorService._save_sync_token, db, user_id, calendar_id, next_sync_token, started_at
+        )
+
+        logger.info(f"[MIRROR] {'증분' if sync_token else '전체'} 동기화 완료 - user_id={user_id}, calendar_id={calendar_id}, {applied}개 반영")
+        return applied
+
+    @staticmethod
+    def _load_sync_token(db: Session, user_id: str, calendar_id: str) -> Optional[str]:
+        state = CalendarMirrorService._get_or_create_state(db, user_id, calendar_id)
+        return state.sync_token
+
+    @staticmethod
+    def _delete_unsynced(db: Session, user_id: str, calendar_id: str, started_at: datetime):
+        """started_at 이후 동기화되지 않은 행 삭제 (커밋은 _save_sync_token에서 함께)"""
+        db.query(GoogleCalendarEvent).filter(
+            GoogleCalendarEvent.user_id == user_id,
+            GoogleCalendarEvent.calendar_id == calendar_id,
+            GoogleCalendarEvent.synced_at < started_at
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def _reset_sync_token(db: Session, user_id: str, calendar_id: str):
+        """만료된 sync token 삭제 (다음 동기화는 전체 동기화)"""
+        state = CalendarMirrorService._get_or_create_state(db, user_id, calendar_id)
+        state.sync_token = None
+        db.commit()
+
+    @staticmethod
+    def _save_sync_token(
+        db: Session,
+        user_id: str,
+        calendar_id: str,
+        sync_token: Optional[str],
+        synced_at: datetime
+    ):
+        """동기화 완료 기록 (새 sync token이 있을 때만 교체) 후 커밋"""
+        state = CalendarMirrorService._get_or_create_state(db, user_id, calendar_id)
+        if sync_token:
+            state.sync_token = sync_token
+        state.last_synced_at = synced_at
+        db.commit()
+
+    @staticmethod
+    def clear_user(db: Session, user_id: str) -> None:
+        """사용자의 미러, 동기화 상태, 캘린더 선택 삭제 (연동 해제/계정 재연동 시). 커밋은 호출 측에서"""
+        db.query(GoogleCalendarEvent).filter(
+            GoogleCalendarEvent.user_id == user_id
+        ).delete(synchronize_session=False)
+        db.query(GoogleCalendarSyncState).filter(
+            GoogleCalendarSyncState.user_id == user_id
+        ).delete(synchronize_session=False)
+        db.query(GoogleCalendarSelection).filter(
+            GoogleCalendarSelection.user_id == user_id
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def clear_calendar(db: Session, user_id: str, calendar_id: str) -> None:
+        """선택 해제한 캘린더의 미러와 동기화 상태 삭제. 커밋은 호출 측에서"""
+        db.query(GoogleCalendarEvent).filter(
+            GoogleCalendarEvent.user_id == user_id,
+            GoogleCalendarEvent.calendar_id == calendar_id
+        ).delete(synchronize_session=False)
+        db.query(GoogleCalendarSyncState).filter(
+            GoogleCalendarSyncState.user_id == user_id,
+            GoogleCalendarSyncState.calendar_id == calendar_id
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def query_range(
+        db: Session,
+        user_id: str,
+        time_min: datetime,
+        time_max: datetime,
+        calendar_ids: Optional[List[str]] = None
+    ) -> List[GoogleCalendarEvent]:
+        """기간과 겹치는 미러 이벤트 조회 (삭제된 Todo와 연결된 이벤트 제외, 여러 캘린더는 시작 시간순으로 합침)"""
+        deleted_todo_exists = exists().where(
+            Todo.user_id == user_id,
+            Todo.deleted_at.isnot(None),
+            Todo.google_calendar_event_id == GoogleCalendarEvent.event_id
+        )
+        query = db.query(GoogleCalendarEvent).filter(
+            GoogleCalendarEvent.user_id == user_id,
+            GoogleCalendarEvent.start_at < time_max,
+            GoogleCalendarEvent.end_at > time_min,
+            ~deleted_todo_exists
+        )
+        if calendar_ids is not None:
+            query = query.filter(GoogleCalendarEvent.calendar_id.in_(calendar_ids))
+        return query.order_by(GoogleCalendarEvent.start_at).all()
+
+    @staticmethod
+    def schedule_refresh(
+        user_id: str,
+        time_min: datetime = None,
+        time_max: datetime = None,
+        calendar_ids: Optional[List[str]] = None
+    ) -> bool:
+        """
+        백그라운드에서 미러 갱신 (stale-while-revalidate / 인접 월 미리 가져오기)
+
+        기간을 주면 해당 기간을 채우고, 없으면 sync token 증분 동기화를 실행합니다.
+        calendar_ids가 없으면 사용자가 선택한 모든 캘린더를 동시에 갱신합니다.
+        같은 사용자의 갱신이 이미 실행 중이면 건너뜁니다.
+        """
+        if user_id in _refreshing_users:
+            return False
+        _refreshing_users.add(user_id)
+
+        async def _refresh():
+            try:
+                targets = calendar_ids
+                if not targets:
+                    targets = await run_in_thread(CalendarMirrorService.load_selected_calendar_ids, user_id)
+                async with CalendarMirrorService.get_user_lock(user_id):
+                    if time_min and time_max:
+                        await CalendarMirrorService.fill_calendars(
+                            user_id, targets, time_min, time_max, priority=PRIORITY_BULK
+                        )
+                    else:
+                        await CalendarMirrorService.sync_calendars(user_id, targets)
+            except Exception as e:
+                logger.error(f"[MIRROR] 백그라운드 갱신 실패 - user_id={user_id}: {e}", exc_info=True)
+            finally:
+                _refreshing_users.discard(user_id)
+
+        task = asyncio.create_task(_refresh())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        return True
@@ -2,26 +2,41 @@
 Google Calendar API 서비스
 일정을 Google Calendar와 동기화
 """
+import asyncio
+import hashlib
 import json
 import logging
-from typing import Optional, Dict, List, Any
-from datetime import datetime, timedelta, date
+import os
+import secrets
+from typing import Optional, Dict, List, Any, AsyncIterator, Set, Tuple
+from datetime import datetime, timedelta, date, timezone
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from google.auth.transport.requests import Request
 
 from app.config import settings
+from app.services.google_rate_limiter import google_rate_limiter, PRIORITY_INTERACTIVE, PRIORITY_BULK
+from app.services.outbound_connections import outbound
 
 logger = logging.getLogger(__name__)
 
 
+class SyncTokenExpiredError(Exception):
+    """Google Calendar sync token 만료 (410 Gone) - 전체 동기화 필요"""
+
+
 class GoogleCalendarService:
     """Google Calendar API 서비스"""
     
     SCOPES = ['https://www.googleapis.com/auth/calendar']
     
+    # events.list partial response: 일정 매핑에 실제로 사용하는 속성만 요청
+    EVENT_LIST_FIELDS = (
+        'nextPageToken,nextSyncToken,'
+        'items(id,etag,status,summary,description,location,start,end,'
+        'recurrence,recurringEventId,reminders,extendedProperties,htmlLink)'
+    )
+    
     @staticmethod
     def is_token_expired(credentials: Credentials) -> bool:
         """토큰 만료 여부 안전하게 체크 (timezone 문제 방지)"""
@@ -112,11 +127,45 @@ class GoogleCalendarService:
             logger.error(f"[GET_CREDENTIALS] 토큰에서 Credentials 생성 실패: {e}", exc_info=True)
             return None
     
+    @staticmethod
+    def _user_key(token_json: str) -> Optional[str]:
+        """호출 제한용 사용자 키 (refresh_token 해시 - 토큰 원문은 보관하지 않음)"""
+        try:
+            refresh_token = json.loads(token_json).get('refresh_token')
+        except Exception:
+            return None
+        if not refresh_token:
+            return None
+        return hashlib.sha256(refresh_token.encode('utf-8')).hexdigest()[:16]
+    
+    @staticmethod
+    async def execute(
+        request,
+        token_json: str = None,
+        priority: str = PRIORITY_INTERACTIVE,
+        amount: int = 1,
+        idempotent: bool = True
+    ):
+        """
+        Google API 요청 실행 (공용 호출 제한기 경유)
+        
+        프로젝트/사용자 토큰 버킷, 할당량 오류 백오프, 우선순위 레인이 적용됩니다.
+        일괄 작업은 priority=PRIORITY_BULK로 호출할 것.
+        이벤트 생성처럼 다시 보내면 중복이 생기는 요청은 idempotent=False로 호출할 것 (5xx 재시도 안 함).
+        """
+        return await google_rate_limiter.execute(
+            request,
+            user_key=GoogleCalendarService._user_key(token_json) if token_json else None,
+            priority=priority,
+            amount=amount,
+            idempotent=idempotent
+        )
+    
     @staticmethod
     def get_calendar_service(credentials: Credentials):
-        """Google Calendar API 서비스 객체 생성"""
+        """Google Calendar API 서비스 객체 생성 (앱 공용 연결 풀 사용)"""
         try:
-            service = build('calendar', 'v3', credentials=credentials)
+            service = outbound.build_calendar_service(credentials)
             return service
         except Exception as e:
             logger.error(f"Calendar 서비스 생성 실패: {e}")
@@ -135,7 +184,9 @@ class GoogleCalendarService:
         repeat_type: str = None,
         repeat_pattern: Dict[str, Any] = None,
         repeat_end_date: date = None,
-        source_id: str = None  # Always Plan의 Todo ID (중복 제거용)
+        source_id: str = None,  # Always Plan의 Todo ID (중복 제거용)
+        priority: str = PRIORITY_INTERACTIVE,
+        recurrence: List[str] = None  # 반복 시리즈 이벤트의 RRULE/EXDATE/RDATE (recurrence.build_recurrence)
     ) -> Optional[Dict[str, Any]]:
         """Google Calendar에 이벤트 생성 (알림 및 반복 정보 포함)"""
         try:
@@ -146,7 +197,7 @@ class GoogleCalendarService:
             
             # 토큰 만료 시 갱신
             if GoogleCalendarService.is_token_expired(credentials):
-                credentials.refresh(Request())
+                credentials.refresh(outbound.google_auth_request())
             
             service = GoogleCalendarService.get_calendar_service(credentials)
             if not service:
@@ -262,71 +313,20 @@ class GoogleCalendarService:
                 elif not description:
                     event['description'] = f"AlwaysPlanID:{source_id}"
             
-            # 반복 설정 처리 - 반복 정보는 웹앱 내에서만 관리하고 Google Calendar에는 전달하지 않음
-            # 반복 정보를 전달하면 Google Calendar에서 자동으로 반복 일정을 생성하여 중복 일정이 발생함
-            if False:  # 반복 정보는 전달하지 않음
-                recurrence_rules = []
-                if repeat_type == 'daily':
-                    if repeat_end_date:
-                        # 종료일까지 반복
-                        end_date_str = repeat_end_date.strftime('%Y%m%d')
-                        recurrence_rules.append(f"RRULE:FREQ=DAILY;UNTIL={end_date_str}")
-                    else:
-                        recurrence_rules.append("RRULE:FREQ=DAILY")
-                elif repeat_type == 'weekly':
-                    if repeat_end_date:
-                        end_date_str = repeat_end_date.strftime('%Y%m%d')
-                        recurrence_rules.append(f"RRULE:FREQ=WEEKLY;UNTIL={end_date_str}")
-                    else:
-                        recurrence_rules.append("RRULE:FREQ=WEEKLY")
-                elif repeat_type == 'monthly':
-                    if repeat_end_date:
-                        end_date_str = repeat_end_date.strftime('%Y%m%d')
-                        recurrence_rules.append(f"RRULE:FREQ=MONTHLY;UNTIL={end_date_str}")
-                    else:
-                        recurrence_rules.append("RRULE:FREQ=MONTHLY")
-                elif repeat_type == 'yearly':
-                    if repeat_end_date:
-                        end_date_str = repeat_end_date.strftime('%Y%m%d')
-                        recurrence_rules.append(f"RRULE:FREQ=YEARLY;UNTIL={end_date_str}")
-                    else:
-                        recurrence_rules.append("RRULE:FREQ=YEARLY")
-                elif repeat_type == 'weekdays':
-                    # 평일만 (월~금)
-                    weekdays = "BYDAY=MO,TU,WE,TH,FR"
-                    if repeat_end_date:
-                        end_date_str = repeat_end_date.strftime('%Y%m%d')
-                        recurrence_rules.append(f"RRULE:FREQ=WEEKLY;{weekdays};UNTIL={end_date_str}")
-                    else:
-                        recurrence_rules.append(f"RRULE:FREQ=WEEKLY;{weekdays}")
-                elif repeat_type == 'weekends':
-                    # 주말만 (토~일)
-                    weekends = "BYDAY=SA,SU"
-                    if repeat_end_date:
-                        end_date_str = repeat_end_date.strftime('%Y%m%d')
-                        recurrence_rules.append(f"RRULE:FREQ=WEEKLY;{weekends};UNTIL={end_date_str}")
-                    else:
-                        recurrence_rules.append(f"RRULE:FREQ=WEEKLY;{weekends}")
-                elif repeat_type == 'custom' and repeat_pattern:
-                    # 사용자 정의 반복 패턴
-                    rrule_parts = ["RRULE:FREQ=" + repeat_pattern.get('freq', 'DAILY').upper()]
-                    if 'interval' in repeat_pattern:
-                        rrule_parts.append(f"INTERVAL={repeat_pattern['interval']}")
-                    if 'byday' in repeat_pattern:
-                        rrule_parts.append(f"BYDAY={repeat_pattern['byday']}")
-                    if repeat_end_date:
-                        end_date_str = repeat_end_date.strftime('%Y%m%d')
-                        rrule_parts.append(f"UNTIL={end_date_str}")
-                    if 'count' in repeat_pattern:
-                        rrule_parts.append(f"COUNT={repeat_pattern['count']}")
-                    recurrence_rules.append(';'.join(rrule_parts))
-                
-                if recurrence_rules:
-                    event['recurrence'] = recurrence_rules
-                    logger.info(f"[CREATE_EVENT] 반복 규칙 추가: {recurrence_rules}")
+            # 반복 설정 처리
+            # 웹앱은 반복 일정을 날짜별 행으로 저장하므로 repeat_type만으로 규칙을 만들면 행별 이벤트와 중복됨.
+            # 시리즈 전체를 하나의 반복 이벤트로 내보낼 때만 행 날짜로 만든 recurrence(RRULE/EXDATE/RDATE)를 전달
+            if recurrence:
+                event['recurrence'] = recurrence
+                logger.info(f"[CREATE_EVENT] 반복 규칙 추가: {recurrence}")
             
             # 이벤트 생성
-            created_event = service.events().insert(calendarId='primary', body=event).execute()
+            created_event = await GoogleCalendarService.execute(
+                service.events().insert(calendarId='primary', body=event),
+                token_json=token_json,
+                priority=priority,
+                idempotent=False  # 5xx 뒤에 이미 생성됐을 수 있음 → 다음 동기화에서 source_id로 매칭
+            )
             logger.info(f"Google Calendar 이벤트 생성 성공: {created_event.get('id')}")
             return created_event
             
@@ -350,23 +350,34 @@ class GoogleCalendarService:
         notification_reminders: List[Dict[str, Any]] = None,
         repeat_type: str = None,
         repeat_pattern: Dict[str, Any] = None,
-        repeat_end_date: date = None
+        repeat_end_date: date = None,
+        priority: str = PRIORITY_INTERACTIVE,
+        calendar_id: str = 'primary',
+        recurrence: List[str] = None
     ) -> Optional[Dict[str, Any]]:
-        """Google Calendar 이벤트 업데이트 (알림 및 반복 정보 포함)"""
+        """
+        Google Calendar 이벤트 업데이트 (알림 및 반복 정보 포함)
+
+        event_id가 반복 이벤트의 인스턴스 ID면 해당 날짜만 바뀐 예외 인스턴스가 됩니다.
+        """
         try:
             credentials = GoogleCalendarService.get_credentials_from_token(token_json)
             if not credentials:
                 return None
             
             if GoogleCalendarService.is_token_expired(credentials):
-                credentials.refresh(Request())
+                credentials.refresh(outbound.google_auth_request())
             
             service = GoogleCalendarService.get_calendar_service(credentials)
             if not service:
                 return None
             
             # 기존 이벤트 가져오기
-            event = service.events().get(calendarId='primary', eventId=event_id).execute()
+            event = await GoogleCalendarService.execute(
+                service.events().get(calendarId=calendar_id, eventId=event_id),
+                token_json=token_json,
+                priority=priority
+            )
             
             # 업데이트할 필드만 업데이트
             if title:
@@ -458,76 +469,21 @@ class GoogleCalendarService:
                     # 기본 알림 사용 (30분 전)
                     event['reminders'] = {'useDefault': True}
             
-            # 반복 설정 처리
-            # 반복 설정 처리 - 반복 정보는 웹앱 내에서만 관리하고 Google Calendar에는 전달하지 않음
-            # 반복 정보를 전달하면 Google Calendar에서 자동으로 반복 일정을 생성하여 중복 일정이 발생함
-            if False:  # 반복 정보는 전달하지 않음
-                if repeat_type == 'none':
-                    # 반복 제거
-                    event['recurrence'] = []
-                elif repeat_type != 'none':
-                    recurrence_rules = []
-                    if repeat_type == 'daily':
-                        if repeat_end_date:
-                            end_date_str = repeat_end_date.strftime('%Y%m%d')
-                            recurrence_rules.append(f"RRULE:FREQ=DAILY;UNTIL={end_date_str}")
-                        else:
-                            recurrence_rules.append("RRULE:FREQ=DAILY")
-                    elif repeat_type == 'weekly':
-                        if repeat_end_date:
-                            end_date_str = repeat_end_date.strftime('%Y%m%d')
-                            recurrence_rules.append(f"RRULE:FREQ=WEEKLY;UNTIL={end_date_str}")
-                        else:
-                            recurrence_rules.append("RRULE:FREQ=WEEKLY")
-                    elif repeat_type == 'monthly':
-                        if repeat_end_date:
-                            end_date_str = repeat_end_date.strftime('%Y%m%d')
-                            recurrence_rules.append(f"RRULE:FREQ=MONTHLY;UNTIL={end_date_str}")
-                        else:
-                            recurrence_rules.append("RRULE:FREQ=MONTHLY")
-                    elif repeat_type == 'yearly':
-                        if repeat_end_date:
-                            end_date_str = repeat_end_date.strftime('%Y%m%d')
-                            recurrence_rules.append(f"RRULE:FREQ=YEARLY;UNTIL={end_date_str}")
-                        else:
-                            recurrence_rules.append("RRULE:FREQ=YEARLY")
-                    elif repeat_type == 'weekdays':
-                        weekdays = "BYDAY=MO,TU,WE,TH,FR"
-                        if repeat_end_date:
-                            end_date_str = repeat_end_date.strftime('%Y%m%d')
-                            recurrence_rules.append(f"RRULE:FREQ=WEEKLY;{weekdays};UNTIL={end_date_str}")
-                        else:
-                            recurrence_rules.append(f"RRULE:FREQ=WEEKLY;{weekdays}")
-                    elif repeat_type == 'weekends':
-                        weekends = "BYDAY=SA,SU"
-                        if repeat_end_date:
-                            end_date_str = repeat_end_date.strftime('%Y%m%d')
-                            recurrence_rules.append(f"RRULE:FREQ=WEEKLY;{weekends};UNTIL={end_date_str}")
-                        else:
-                            recurrence_rules.append(f"RRULE:FREQ=WEEKLY;{weekends}")
-                    elif repeat_type == 'custom' and repeat_pattern:
-                        rrule_parts = ["RRULE:FREQ=" + repeat_pattern.get('freq', 'DAILY').upper()]
-                        if 'interval' in repeat_pattern:
-                            rrule_parts.append(f"INTERVAL={repeat_pattern['interval']}")
-                        if 'byday' in repeat_pattern:
-                            rrule_parts.append(f"BYDAY={repeat_pattern['byday']}")
-                        if repeat_end_date:
-                            end_date_str = repeat_end_date.strftime('%Y%m%d')
-                            rrule_parts.append(f"UNTIL={end_date_str}")
-                        if 'count' in repeat_pattern:
-                            rrule_parts.append(f"COUNT={repeat_pattern['count']}")
-                        recurrence_rules.append(';'.join(rrule_parts))
-                    
-                    if recurrence_rules:
-                        event['recurrence'] = recurrence_rules
-                        logger.info(f"[UPDATE_EVENT] 반복 규칙 추가: {recurrence_rules}")
+            # 반복 설정 처리 (시리즈 이벤트를 수정할 때만 전달, 인스턴스 수정은 예외 인스턴스로 저장됨)
+            if recurrence is not None:
+                event['recurrence'] = recurrence
+                logger.info(f"[UPDATE_EVENT] 반복 규칙 변경: {recurrence}")
             
             # 이벤트 업데이트
-            updated_event = service.events().update(
-                calendarId='primary',
-                eventId=event_id,
-                body=event
-            ).execute()
+            updated_event = await GoogleCalendarService.execute(
+                service.events().update(
+                    calendarId=calendar_id,
+                    eventId=event_id,
+                    body=event
+                ),
+                token_json=token_json,
+                priority=priority
+            )
             
             logger.info(f"Google Calendar 이벤트 업데이트 성공: {updated_event.get('id')}")
             return updated_event
@@ -540,7 +496,12 @@ class GoogleCalendarService:
             return None
     
     @staticmethod
-    async def delete_event(token_json: str, event_id: str) -> bool:
+    async def delete_event(
+        token_json: str,
+        event_id: str,
+        priority: str = PRIORITY_INTERACTIVE,
+        calendar_id: str = 'primary'
+    ) -> bool:
         """Google Calendar 이벤트 삭제"""
         try:
             credentials = GoogleCalendarService.get_credentials_from_token(token_json)
@@ -548,13 +509,17 @@ class GoogleCalendarService:
                 return False
             
             if GoogleCalendarService.is_token_expired(credentials):
-                credentials.refresh(Request())
+                credentials.refresh(outbound.google_auth_request())
             
             service = GoogleCalendarService.get_calendar_service(credentials)
             if not service:
                 return False
             
-            service.events().delete(calendarId='primary', eventId=event_id).execute()
+            await GoogleCalendarService.execute(
+                service.events().delete(calendarId=calendar_id, eventId=event_id),
+                token_json=token_json,
+                priority=priority
+            )
             logger.info(f"Google Calendar 이벤트 삭제 성공: {event_id}")
             return True
             
@@ -565,139 +530,221 @@ class GoogleCalendarService:
             logger.error(f"이벤트 삭제 실패: {e}", exc_info=True)
             return False
     
+    @staticmethod
+    async def iter_event_pages(
+        token_json: str,
+        time_min: datetime = None,
+        time_max: datetime = None,
+        page_size: int = 2500,
+        calendar_id: str = 'primary',
+        fields: str = None,
+        priority: str = PRIORITY_INTERACTIVE,
+        page_token: str = None,
+        cursor: Dict[str, Any] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Google Calendar 이벤트를 페이지 단위로 가져오는 async generator
+
+        전체 이벤트를 한 번에 모으지 않고 페이지가 도착할 때마다 yield 하므로,
+        호출 측은 페이지별로 가져오기/중복 체크를 처리하면 되고 메모리는 페이지 크기로 제한됩니다.
+        fields(partial response)로 실제 매핑에 쓰는 속성만 받아옵니다.
+
+        Args:
+            token_json: 사용자의 Google Calendar 토큰 (JSON 문자열)
+            time_min: 조회 시작 시간 (naive datetime은 UTC로 취급)
+            time_max: 조회 종료 시간 (naive datetime은 UTC로 취급)
+            page_size: 페이지당 이벤트 수 (최대 2500)
+            calendar_id: 캘린더 ID (기본: primary)
+            fields: partial response 필드 (기본: EVENT_LIST_FIELDS)
+            page_token: 이어서 조회할 페이지 토큰 (중단된 작업 재개용, 같은 time_min/time_max로 호출해야 함)
+            cursor: 전달하면 각 페이지를 yield 하기 전에 cursor['next_page_token']에 다음 페이지 토큰을 기록
+
+        Raises:
+            HttpError: Google Calendar API 호출 실패 시 (이미 yield 된 페이지는 유효)
+        """
+        service = GoogleCalendarService._get_authorized_service(token_json, "ITER_EVENT_PAGES")
+        if not service:
+            return
+
+        # 기본 시간 범위 설정
+        if not time_min:
+            time_min = datetime.utcnow()
+        if not time_max:
+            time_max = time_min + timedelta(days=30)
+
+        # RFC3339 형식으로 변환 (naive datetime은 UTC로 취급)
+        if time_min.tzinfo is not None:
+            time_min = time_min.astimezone(timezone.utc).replace(tzinfo=None)
+        if time_max.tzinfo is not None:
+            time_max = time_max.astimezone(timezone.utc).replace(tzinfo=None)
+        time_min_str = time_min.strftime('%Y-%m-%dT%H:%M:%SZ')
+        time_max_str = time_max.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        page_count = 0
+        while True:
+            page_count += 1
+            request_params = {
+                'calendarId': calendar_id,
+                'timeMin': time_min_str,
+                'timeMax': time_max_str,
+                'maxResults': page_size,
+                'singleEvents': True,
+                'orderBy': 'startTime',
+                'timeZone': 'UTC',  # 시간대 명시
+                'fields': fields or GoogleCalendarService.EVENT_LIST_FIELDS
+            }
+            if page_token:
+                request_params['pageToken'] = page_token
+
+            # 공용 호출 제한기를 거쳐 스레드에서 실행 (이벤트 루프 블로킹 방지)
+            events_result = await GoogleCalendarService.execute(
+                service.events().list(**request_params),
+                token_json=token_json,
+                priority=priority
+            )
+
+            page_events = events_result.get('items', [])
+            logger.info(f"[ITER_EVENT_PAGES] 페이지 {page_count}: {len(page_events)}개 이벤트 ({time_min_str} ~ {time_max_str})")
+            page_token = events_result.get('nextPageToken')
+            if cursor is not None:
+                cursor['next_page_token'] = page_token
+            yield page_events
+
+            # 다음 페이지가 없으면 종료
+            if not page_token:
+                break
+
+    @staticmethod
+    async def iter_sync_pages(
+        token_json: str,
+        sync_token: str = None,
+        page_size: int = 2500,
+        calendar_id: str = 'primary',
+        priority: str = PRIORITY_BULK
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        sync token 기반 증분 동기화 페이지를 가져오는 async generator
+
+        sync_token이 없으면 전체 목록을 가져오고(초기 동기화), 마지막 페이지의
+        'nextSyncToken'을 다음 증분 동기화에 사용합니다. 증분 결과에는 삭제된
+        이벤트가 status='cancelled'로 포함됩니다.
+
+        Yields:
+            events.list 응답 페이지 (items, nextPageToken, nextSyncToken)
+
+        Raises:
+            SyncTokenExpiredError: sync token 만료 (410) - 전체 동기화로 다시 시작해야 함
+            HttpError: 그 외 Google Calendar API 오류
+        """
+        service = GoogleCalendarService._get_authorized_service(token_json, "ITER_SYNC_PAGES")
+        if not service:
+            return
+
+        page_token = None
+        while True:
+            request_params = {
+                'calendarId': calendar_id,
+                'maxResults': page_size,
+                'singleEvents': True,
+                'timeZone': 'UTC',
+                'fields': GoogleCalendarService.EVENT_LIST_FIELDS
+            }
+            if sync_token:
+                request_params['syncToken'] = sync_token
+            if page_token:
+                request_params['pageToken'] = page_token
+
+            try:
+                page = await GoogleCalendarService.execute(
+                    service.events().list(**request_params),
+                    token_json=token_json,
+                    priority=priority
+                )
+            except HttpError as e:
+                if hasattr(e, 'resp') and e.resp.status == 410:
+                    logger.warning(f"[ITER_SYNC_PAGES] sync token 만료 (410) - calendar_id: {calendar_id}")
+                    raise SyncTokenExpiredError(str(e))
+                raise
+
+            yield page
+
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                break
+
+    @staticmethod
+    async def list_calendars(token_json: str, priority: str = PRIORITY_INTERACTIVE) -> List[Dict[str, Any]]:
+        """
+        사용자의 캘린더 목록 (calendarList)
+
+        Returns:
+            [{'id', 'summary', 'background_color', 'access_role', 'primary'}] (실패 시 빈 목록)
+        """
+        try:
+            service = GoogleCalendarService._get_authorized_service(token_json, "LIST_CALENDARS")
+            if not service:
+                return []
+
+            calendars = []
+            page_token = None
+            while True:
+                request_params = {
+                    'fields': 'nextPageToken,items(id,summary,summaryOverride,backgroundColor,accessRole,primary)'
+                }
+                if page_token:
+                    request_params['pageToken'] = page_token
+                result = await GoogleCalendarService.execute(
+                    service.calendarList().list(**request_params),
+                    token_json=token_json,
+                    priority=priority
+                )
+                for item in result.get('items', []):
+                    calendars.append({
+                        'id': item.get('id'),
+                        'summary': item.get('summaryOverride') or item.get('summary'),
+                        'background_color': item.get('backgroundColor'),
+                        'access_role': item.get('accessRole'),
+                        'primary': bool(item.get('primary', False))
+                    })
+                page_token = result.get('nextPageToken')
+                if not page_token:
+                    break
+
+            logger.info(f"[LIST_CALENDARS] 캘린더 {len(calendars)}개")
+            return calendars
+        except Exception as e:
+            logger.error(f"[LIST_CALENDARS] 캘린더 목록 가져오기 실패: {e}", exc_info=True)
+            return []
+
     @staticmethod
     async def list_events(
         token_json: str,
         time_min: datetime = None,
         time_max: datetime = None,
-        max_results: int = 100
+        max_results: int = 100,
+        priority: str = PRIORITY_INTERACTIVE
     ) -> List[Dict[str, Any]]:
-        """Google Calendar에서 이벤트 목록 가져오기"""
+        """
+        Google Calendar에서 이벤트 목록 가져오기
+
+        짧은 기간(월 단위 조회 등)용. 넓은 기간은 iter_event_pages로 페이지별 처리할 것.
+        """
         try:
             logger.info(f"[LIST_EVENTS] 시작 - time_min: {time_min}, time_max: {time_max}")
-            
-            credentials = GoogleCalendarService.get_credentials_from_token(token_json)
-            if not credentials:
-                logger.error("[LIST_EVENTS] Credentials 생성 실패")
-                return []
-            
-            is_expired = GoogleCalendarService.is_token_expired(credentials)
-            logger.info(f"[LIST_EVENTS] Credentials 생성 성공 - expired: {is_expired}")
-            
-            if is_expired:
-                logger.info("[LIST_EVENTS] 토큰 만료, 갱신 시도...")
-                try:
-                    credentials.refresh(Request())
-                    logger.info("[LIST_EVENTS] 토큰 갱신 성공")
-                except Exception as refresh_error:
-                    logger.error(f"[LIST_EVENTS] 토큰 갱신 실패: {refresh_error}", exc_info=True)
-                    return []
-            
-            service = GoogleCalendarService.get_calendar_service(credentials)
-            if not service:
-                logger.error("[LIST_EVENTS] Calendar 서비스 생성 실패")
-                return []
-            
-            logger.info("[LIST_EVENTS] Calendar 서비스 생성 성공")
-            
-            # 기본 시간 범위 설정
-            if not time_min:
-                time_min = datetime.utcnow()
-            if not time_max:
-                time_max = time_min + timedelta(days=30)
-            
-            # UTC 시간으로 변환 (naive datetime을 UTC로 취급)
-            if time_min.tzinfo is None:
-                from datetime import timezone
-                time_min = time_min.replace(tzinfo=timezone.utc)
-            if time_max.tzinfo is None:
-                from datetime import timezone
-                time_max = time_max.replace(tzinfo=timezone.utc)
-            
-            # RFC3339 형식으로 변환 (Google Calendar API 요구사항)
-            # 형식: YYYY-MM-DDTHH:MM:SSZ (UTC)
-            time_min_str = time_min.strftime('%Y-%m-%dT%H:%M:%SZ')
-            time_max_str = time_max.strftime('%Y-%m-%dT%H:%M:%SZ')
-            
-            logger.info(f"[LIST_EVENTS] Google Calendar API 호출 - timeMin: {time_min_str}, timeMax: {time_max_str}, maxResults: {max_results}")
-            logger.info(f"[LIST_EVENTS] 원본 시간 - time_min: {time_min}, time_max: {time_max}")
-            
-            # 이벤트 목록 가져오기 (페이지네이션 지원)
-            try:
-                # 캘린더 목록 먼저 확인
-                calendar_list = service.calendarList().list().execute()
-                primary_calendar_id = None
-                for cal in calendar_list.get('items', []):
-                    if cal.get('primary'):
-                        primary_calendar_id = cal.get('id')
-                        logger.info(f"[LIST_EVENTS] Primary 캘린더 ID: {primary_calendar_id}, 이름: {cal.get('summary')}")
-                        break
-                
-                if not primary_calendar_id:
-                    primary_calendar_id = 'primary'
-                    logger.warning(f"[LIST_EVENTS] Primary 캘린더를 찾을 수 없어 'primary' 사용")
-                
-                # 모든 이벤트를 가져오기 위해 페이지네이션 처리
-                all_events = []
-                page_token = None
-                page_count = 0
-                
-                while True:
-                    page_count += 1
-                    request_params = {
-                        'calendarId': primary_calendar_id,
-                        'timeMin': time_min_str,
-                        'timeMax': time_max_str,
-                        'maxResults': max_results,
-                        'singleEvents': True,
-                        'orderBy': 'startTime',
-                        'timeZone': 'UTC'  # 시간대 명시
-                    }
-                    
-                    if page_token:
-                        request_params['pageToken'] = page_token
-                    
-                    events_result = service.events().list(**request_params).execute()
-                    
-                    page_events = events_result.get('items', [])
-                    all_events.extend(page_events)
-                    
-                    logger.info(f"[LIST_EVENTS] 페이지 {page_count}: {len(page_events)}개 이벤트 가져옴 (전체: {len(all_events)}개)")
-                
-                    # 다음 페이지가 없으면 종료
-                    page_token = events_result.get('nextPageToken')
-                    if not page_token:
-                        break
-                
-                logger.info(f"[LIST_EVENTS] Google Calendar API 응답 받음 (총 {len(all_events)}개 이벤트)")
-                events = all_events
-                
-                # 응답 전체 구조 로깅 (디버깅용)
-                if len(events) == 0:
-                    logger.warning(f"[LIST_EVENTS] ⚠️ 이벤트가 0개입니다!")
-                    logger.info(f"[LIST_EVENTS] 응답 summary: {events_result.get('summary', 'N/A')}")
-                    logger.info(f"[LIST_EVENTS] 응답 timeZone: {events_result.get('timeZone', 'N/A')}")
-                    logger.info(f"[LIST_EVENTS] 응답 nextPageToken: {events_result.get('nextPageToken', '없음')}")
-                    
-            except Exception as api_error:
-                logger.error(f"[LIST_EVENTS] Google Calendar API 호출 중 예외 발생: {api_error}", exc_info=True)
-                raise
-            
-            # 이벤트가 있을 경우 첫 번째 이벤트 정보 로깅
-            if events and len(events) > 0:
-                first_event = events[0]
-                logger.info(f"[LIST_EVENTS] 첫 번째 이벤트 샘플:")
-                logger.info(f"  - 제목: {first_event.get('summary', '제목 없음')}")
-                logger.info(f"  - 시작: {first_event.get('start', {})}")
-                logger.info(f"  - 종료: {first_event.get('end', {})}")
-                logger.info(f"  - ID: {first_event.get('id', 'N/A')}")
-            else:
-                logger.warning(f"[LIST_EVENTS] 이벤트가 없습니다. Google Calendar에 해당 기간 내 이벤트가 있는지 확인하세요.")
-                logger.info(f"[LIST_EVENTS] 요청 시간 범위: {time_min_str} ~ {time_max_str} (UTC)")
-                logger.info(f"[LIST_EVENTS] 요청 시간 범위 (한국시간): {time_min + timedelta(hours=9)} ~ {time_max + timedelta(hours=9)}")
-            
+
+            events = []
+            async for page_events in GoogleCalendarService.iter_event_pages(
+                token_json=token_json,
+                time_min=time_min,
+                time_max=time_max,
+                page_size=max_results,
+                priority=priority
+            ):
+                events.extend(page_events)
+
+            logger.info(f"[LIST_EVENTS] Google Calendar API 응답 받음 (총 {len(events)}개 이벤트)")
             return events
-            
+
         except HttpError as e:
             logger.error(f"[LIST_EVENTS] Google Calendar API HttpError: {e}", exc_info=True)
             logger.error(f"[LIST_EVENTS] 에러 상세: status={e.resp.status if hasattr(e, 'resp') else 'N/A'}, content={e.content if hasattr(e, 'content') else 'N/A'}")
@@ -706,11 +753,127 @@ class GoogleCalendarService:
             logger.error(f"[LIST_EVENTS] 이벤트 목록 가져오기 실패: {e}", exc_info=True)
             return []
 
+    @staticmethod
+    def _get_authorized_service(token_json: str, tag: str):
+        """토큰으로 Credentials를 만들고 (만료 시 갱신) Calendar 서비스 객체 반환"""
+        credentials = GoogleCalendarService.get_credentials_from_token(token_json)
+        if not credentials:
+            logger.error(f"[{tag}] Credentials 생성 실패")
+            return None
+
+        if GoogleCalendarService.is_token_expired(credentials):
+            logger.info(f"[{tag}] 토큰 만료, 갱신 시도...")
+            credentials.refresh(outbound.google_auth_request())
+
+        return GoogleCalendarService.get_calendar_service(credentials)
+
+    @staticmethod
+    async def find_events_by_source_ids(
+        token_json: str,
+        source_ids: List[str],
+        calendar_id: str = 'primary',
+        priority: str = PRIORITY_BULK
+    ) -> Tuple[Dict[str, str], Set[str]]:
+        """
+        Always Plan Todo ID(extendedProperties.private.alwaysPlanSourceId)로 기존 이벤트 조회
+
+        제목/날짜 기반 전체 목록 매칭 대신, 내보낸 이벤트에 찍어둔 source_id로
+        Todo별 키 조회를 수행합니다. 요청은 batch API로 묶어서 보냅니다.
+        batch 안의 일부 요청이 할당량 오류(403 rateLimitExceeded, 429, 5xx)로 실패하면 그 요청만 백오프 후 다시 보냅니다.
+
+        Args:
+            token_json: 사용자의 Google Calendar 토큰 (JSON 문자열)
+            source_ids: 조회할 Todo ID 목록
+            calendar_id: 캘린더 ID (기본: primary)
+
+        Returns:
+            ({todo_id: event_id}, 조회에 실패한 todo_id 집합)
+            조회에 실패한 Todo는 기존 이벤트가 있는지 알 수 없으므로 호출하는 쪽에서 새로 만들지 말 것
+        """
+        found: Dict[str, str] = {}
+        pending = [str(source_id) for source_id in source_ids]
+        if not pending:
+            return found, set()
+
+        try:
+            service = GoogleCalendarService._get_authorized_service(token_json, "FIND_BY_SOURCE_ID")
+            if not service:
+                return found, set(pending)
+
+            unresolved: Set[str] = set()
+            attempt = 0
+            while True:
+                retry_ids: List[str] = []
+
+                def _callback(request_id, response, exception):
+                    if exception is not None:
+                        if isinstance(exception, HttpError) and google_rate_limiter.is_retryable(exception):
+                            retry_ids.append(request_id)
+                        else:
+                            unresolved.add(request_id)
+                        logger.warning(f"[FIND_BY_SOURCE_ID] 조회 실패: source_id={request_id}, error={exception}")
+                        return
+                    for item in (response or {}).get('items', []):
+                        if item.get('status') != 'cancelled' and item.get('id'):
+                            found[request_id] = item['id']
+                            break
+
+                # Google batch API는 요청 50개 단위 권장
+                batch_size = 50
+                for offset in range(0, len(pending), batch_size):
+                    batch = service.new_batch_http_request(callback=_callback)
+                    chunk = pending[offset:offset + batch_size]
+                    for source_id in chunk:
+                        batch.add(
+                            service.events().list(
+                                calendarId=calendar_id,
+                                privateExtendedProperty=f"alwaysPlanSourceId={source_id}",
+                                maxResults=1,
+                                fields='items(id,status)'
+                            ),
+                            request_id=source_id
+                        )
+                    await GoogleCalendarService.execute(
+                        batch,
+                        token_json=token_json,
+                        priority=priority,
+                        amount=len(chunk)
+                    )
+
+                if not retry_ids or attempt >= google_rate_limiter.max_retries:
+                    unresolved.update(retry_ids)
+                    break
+                delay = google_rate_limiter.backoff_delay(attempt)
+                attempt += 1
+                logger.warning(f"[FIND_BY_SOURCE_ID] {len(retry_ids)}개 조회 할당량 오류, {delay:.1f}초 후 재시도 ({attempt}/{google_rate_limiter.max_retries})")
+                await asyncio.sleep(delay)
+                pending = retry_ids
+
+            logger.info(f"[FIND_BY_SOURCE_ID] {len(source_ids)}개 Todo 조회, {len(found)}개 이벤트 매칭, {len(unresolved)}개 조회 실패")
+            return found, unresolved
+
+        except HttpError as e:
+            logger.error(f"[FIND_BY_SOURCE_ID] Google Calendar API HttpError: {e}", exc_info=True)
+            return found, {str(source_id) for source_id in source_ids} - found.keys()
+        except Exception as e:
+            logger.error(f"[FIND_BY_SOURCE_ID] 이벤트 조회 실패: {e}", exc_info=True)
+            return found, {str(source_id) for source_id in source_ids} - found.keys()
+
+    @staticmethod
+    def get_webhook_url() -> str:
+        """Watch 알림을 받을 웹훅 URL (Cloud Run URL 또는 환경변수)"""
+        base_url = os.getenv('WEBHOOK_BASE_URL') or os.getenv('API_BASE_URL')
+        if not base_url:
+            # Cloud Run 기본 URL 패턴
+            base_url = "https://alwaysplan-backend-509998441771.asia-northeast3.run.app"
+        return f"{base_url}/calendar/webhook"
+
     @staticmethod
     async def register_watch(
         token_json: str,
         webhook_url: str,
-        channel_id: str
+        channel_id: str,
+        priority: str = PRIORITY_INTERACTIVE
     ) -> Optional[Dict[str, Any]]:
         """
         Google Calendar Watch 등록 (Push Notifications)
@@ -721,7 +884,8 @@ class GoogleCalendarService:
             channel_id: 고유한 채널 ID (UUID 권장)
 
         Returns:
-            성공 시: {'channel_id': str, 'resource_id': str, 'expiration': datetime}
+            성공 시: {'channel_id': str, 'resource_id': str, 'expiration': datetime, 'channel_token': str}
+            (channel_token은 Google이 웹훅마다 X-Goog-Channel-Token으로 돌려주는 값 → 저장해 두고 웹훅 확인에 사용)
             실패 시: None
         """
         try:
@@ -735,9 +899,9 @@ class GoogleCalendarService:
             # 토큰 만료 시 갱신
             if GoogleCalendarService.is_token_expired(credentials):
                 logger.info("[REGISTER_WATCH] 토큰 만료됨, 갱신 시도")
-                credentials.refresh(Request())
+                credentials.refresh(outbound.google_auth_request())
 
-            service = build('calendar', 'v3', credentials=credentials)
+            service = GoogleCalendarService.get_calendar_service(credentials)
 
             # Watch 요청 body
             watch_body = {
@@ -749,14 +913,21 @@ class GoogleCalendarService:
             }
 
             logger.info(f"[REGISTER_WATCH] Watch 요청: {watch_body}")
+            channel_token = secrets.token_urlsafe(32)
+            watch_body['token'] = channel_token
 
             # primary 캘린더에 watch 등록
-            response = service.events().watch(
-                calendarId='primary',
-                body=watch_body
-            ).execute()
+            response = await GoogleCalendarService.execute(
+                service.events().watch(
+                    calendarId='primary',
+                    body=watch_body
+                ),
+                token_json=token_json,
+                priority=priority
+            )
 
-            logger.info(f"[REGISTER_WATCH] Watch 등록 성공: {response}")
+            # 응답에는 채널 토큰이 그대로 들어 있으므로 로그에 남기지 않음
+            logger.info(f"[REGISTER_WATCH] Watch 등록 성공 - channel_id: {response.get('id')}, resource_id: {response.get('resourceId')}, expiration: {response.get('expiration')}")
 
             # 만료 시간을 datetime으로 변환
             expiration_ms = int(response.get('expiration', 0))
@@ -765,7 +936,8 @@ class GoogleCalendarService:
             return {
                 'channel_id': response.get('id'),
                 'resource_id': response.get('resourceId'),
-                'expiration': expiration
+                'expiration': expiration,
+                'channel_token': channel_token
             }
 
         except HttpError as e:
@@ -781,7 +953,8 @@ class GoogleCalendarService:
     async def stop_watch(
         token_json: str,
         channel_id: str,
-        resource_id: str
+        resource_id: str,
+        priority: str = PRIORITY_INTERACTIVE
     ) -> bool:
         """
         Google Calendar Watch 중지
@@ -806,15 +979,19 @@ class GoogleCalendarService:
             # 토큰 만료 시 갱신
             if GoogleCalendarService.is_token_expired(credentials):
                 logger.info("[STOP_WATCH] 토큰 만료됨, 갱신 시도")
-                credentials.refresh(Request())
+                credentials.refresh(outbound.google_auth_request())
 
-            service = build('calendar', 'v3', credentials=credentials)
+            service = GoogleCalendarService.get_calendar_service(credentials)
 
             # Watch 중지 요청
-            service.channels().stop(body={
-                'id': channel_id,
-                'resourceId': resource_id
-            }).execute()
+            await GoogleCalendarService.execute(
+                service.channels().stop(body={
+                    'id': channel_id,
+                    'resourceId': resource_id
+                }),
+                token_json=token_json,
+                priority=priority
+            )
 
             logger.info(f"[STOP_WATCH] Watch 중지 성공 - channel_id: {channel_id}")
             return True
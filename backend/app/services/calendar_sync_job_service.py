@@ -0,0 +1,1460 @@
+"""
+Google Calendar 일괄 동기화/내보내기 작업
+/calendar/sync/all, /calendar/export 요청은 작업(CalendarSyncJob)만 등록하고 바로 응답하며,
+실제 처리는 CalendarSyncJobWorker가 요청과 분리된 DB 세션에서 실행합니다.
+- 단계/통계/가져오기 페이지 토큰을 체크포인트로 저장하여 인스턴스 재시작 후 이어서 실행
+- 사용자/작업 종류별로 진행 중인 작업은 하나만 유지 (중복 요청은 기존 작업을 반환)
+- 클라이언트 연결이 끊겨도 작업은 계속 진행되고, GET /calendar/jobs/{id}로 진행 상황 조회
+"""
+import asyncio
+import json
+import logging
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+from datetime import time as time_obj
+from typing import Optional, Dict, Any, List, Set, Tuple
+
+from sqlalchemy import exists, func, text as sql_text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.models import CalendarSyncJob, Todo, TODO_GOOGLE_EVENT_INDEX_WHERE, todo_calendar_key
+from app.models.user import User
+from app.services.calendar_service import GoogleCalendarService
+from app.services.calendar_mirror_service import CalendarMirrorService, DEFAULT_CALENDAR_ID
+from app.services.google_rate_limiter import PRIORITY_BULK
+from app.services.recurrence import series_event_id
+from app.services.reminder_job_service import ReminderJobService
+from app.services.sync_writer import ChunkedSyncWriter, run_in_thread
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE_SYNC_ALL = "sync_all"
+JOB_TYPE_EXPORT = "export"
+JOB_TYPES = (JOB_TYPE_SYNC_ALL, JOB_TYPE_EXPORT)
+
+JOB_STATUS_PENDING = "pending"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_COMPLETED = "completed"
+JOB_STATUS_FAILED = "failed"
+ACTIVE_JOB_STATUSES = (JOB_STATUS_PENDING, JOB_STATUS_RUNNING)
+
+# 가져오기 단계 조회 기간 (최근 3년 전 ~ 3년 후)
+IMPORT_WINDOW_DAYS = 3 * 365
+# 결과에 남기는 실패 이벤트 상세 정보 최대 개수
+MAX_FAILED_EVENTS_INFO = 100
+# 다시 가져온 이벤트가 이미 저장되어 있을 때 Google 내용으로 갱신하는 컬럼
+IMPORT_UPSERT_COLUMNS = (
+    'title', 'description', 'memo', 'location',
+    'date', 'end_date', 'start_time', 'end_time', 'all_day',
+    'notification_reminders', 'repeat_type', 'repeat_pattern', 'repeat_end_date',
+)
+# 가져오기 단계에서 저장을 기다리는 최대 페이지 수 (캘린더별 producer가 DB 저장보다 앞서 나가지 않도록)
+IMPORT_QUEUE_PAGES = 4
+
+
+def _new_export_stats() -> Dict[str, Any]:
+    return {
+        'total_count': None,
+        'synced_count': 0,
+        'matched_count': 0,
+        'series_count': 0,  # 반복 이벤트 하나로 내보낸 반복 일정 시리즈 수
+        'failed_count': 0,
+        'failed_todos': []
+    }
+
+
+def _new_import_stats() -> Dict[str, Any]:
+    return {
+        'imported_count': 0,
+        'imported_failed_count': 0,
+        'new_events_count': 0,
+        'skipped_events_count': 0,
+        'skipped_already_saved_count': 0,
+        'skipped_always_plan_count': 0,
+        'total_events_from_google': 0,
+        'failed_events_info': []
+    }
+
+
+class CalendarSyncJobService:
+    """일괄 동기화/내보내기 작업 서비스"""
+
+    @staticmethod
+    def create_job(db: Session, user_id: str, job_type: str) -> Tuple[CalendarSyncJob, bool]:
+        """
+        작업 등록 (같은 종류의 작업이 대기/실행 중이면 그 작업을 반환)
+
+        Returns:
+            (작업, 새로 만들었는지 여부)
+        """
+        active_job = db.query(CalendarSyncJob).filter(
+            CalendarSyncJob.user_id == user_id,
+            CalendarSyncJob.job_type == job_type,
+            CalendarSyncJob.status.in_(ACTIVE_JOB_STATUSES),
+            CalendarSyncJob.deleted_at.is_(None)
+        ).order_by(CalendarSyncJob.created_at.desc()).first()
+        if active_job:
+            return active_job, False
+
+        job = CalendarSyncJob(
+            user_id=user_id,
+            job_type=job_type,
+            status=JOB_STATUS_PENDING,
+            total_count=0,
+            processed_count=0,
+            attempts=0
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        logger.info(f"[SYNC_JOB] 작업 등록 - job_id={job.id}, user_id={user_id}, type={job_type}")
+        return job, True
+
+    @staticmethod
+    def get_job(db: Session, job_id: str, user_id: str) -> Optional[CalendarSyncJob]:
+        return db.query(CalendarSyncJob).filter(
+            CalendarSyncJob.id == job_id,
+            CalendarSyncJob.user_id == user_id,
+            CalendarSyncJob.deleted_at.is_(None)
+        ).first()
+
+    @staticmethod
+    def to_response(job: CalendarSyncJob) -> Dict[str, Any]:
+        """작업 상태 응답 (완료 시 result에 기존 /sync/all, /export 응답 본문)"""
+        progress = None
+        if job.status == JOB_STATUS_COMPLETED:
+            progress = 100
+        elif job.total_count:
+            progress = min(99, int((job.processed_count or 0) * 100 / job.total_count))
+
+        return {
+            "job_id": job.id,
+            "job_type": job.job_type,
+            "status": job.status,
+            "phase": job.phase,
+            "total_count": job.total_count or 0,
+            "processed_count": job.processed_count or 0,
+            "progress": progress,  # 전체 개수를 알 수 없는 단계(가져오기)에서는 None
+            "result": json.loads(job.result) if job.result else None,
+            "error": job.error_message,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None
+        }
+
+    @staticmethod
+    def _load_checkpoint(job: CalendarSyncJob) -> Dict[str, Any]:
+        if not job.checkpoint:
+            return {}
+        try:
+            return json.loads(job.checkpoint)
+        except (TypeError, ValueError):
+            logger.warning(f"[SYNC_JOB] 체크포인트 파싱 실패, 처음부터 실행 - job_id={job.id}")
+            return {}
+
+    @staticmethod
+    def _stage_checkpoint(job: CalendarSyncJob, checkpoint: Dict[str, Any]):
+        """체크포인트를 세션에만 반영 (다음 커밋에 함께 저장)"""
+        job.checkpoint = json.dumps(checkpoint, ensure_ascii=False)
+        job.heartbeat_at = datetime.utcnow()
+
+    @staticmethod
+    def _save_checkpoint(db: Session, job: CalendarSyncJob, checkpoint: Dict[str, Any]):
+        """체크포인트 저장 (처리한 Todo/이벤트 변경과 함께 커밋)"""
+        CalendarSyncJobService._stage_checkpoint(job, checkpoint)
+        db.commit()
+
+    @staticmethod
+    def _checkpoint_writer(db: Session, job: CalendarSyncJob, checkpoint: Dict[str, Any], tag: str) -> ChunkedSyncWriter:
+        """일정 N개마다 Todo 변경과 체크포인트를 함께 커밋하는 writer"""
+        return ChunkedSyncWriter(
+            db,
+            on_commit=lambda: CalendarSyncJobService._stage_checkpoint(job, checkpoint),
+            tag=tag
+        )
+
+    @staticmethod
+    def _set_phase(db: Session, job: CalendarSyncJob, checkpoint: Dict[str, Any], phase: str, total_count: int = 0):
+        checkpoint['phase'] = phase
+        job.phase = phase
+        job.total_count = total_count
+        job.processed_count = 0
+        CalendarSyncJobService._save_checkpoint(db, job, checkpoint)
+
+    @staticmethod
+    def build_event_range(todo: Todo) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Todo의 Google Calendar 이벤트 시작/종료 시간"""
+        if todo.all_day:
+            # 종일 이벤트
+            start_datetime = datetime.combine(todo.date, datetime.min.time())
+            # end_date는 inclusive이므로, Google Calendar의 exclusive 형식으로 변환하려면 +1일
+            if todo.end_date:
+                end_datetime = datetime.combine(todo.end_date, datetime.min.time()) + timedelta(days=1)
+            else:
+                end_datetime = start_datetime + timedelta(days=1)
+            return start_datetime, end_datetime
+
+        # 시간 지정 이벤트
+        if todo.start_time:
+            start_datetime = datetime.combine(todo.date, todo.start_time)
+        else:
+            start_datetime = datetime.combine(todo.date, datetime.min.time())
+
+        if todo.end_date:
+            # 여러 날짜에 걸친 일정 (end_time이 없으면 end_date의 23:59:59)
+            if todo.end_time:
+                end_datetime = datetime.combine(todo.end_date, todo.end_time)
+            else:
+                end_datetime = datetime.combine(todo.end_date, datetime.max.time())
+        else:
+            # 하루 일정
+            if todo.end_time:
+                end_datetime = datetime.combine(todo.date, todo.end_time)
+            else:
+                end_datetime = start_datetime + timedelta(hours=1)
+        return start_datetime, end_datetime
+
+    @staticmethod
+    def parse_reminders(todo: Todo) -> List[Dict[str, Any]]:
+        if not todo.notification_reminders:
+            return []
+        try:
+            parsed = json.loads(todo.notification_reminders) if isinstance(todo.notification_reminders, str) else todo.notification_reminders
+            return parsed if isinstance(parsed, list) else []
+        except Exception:
+            return []
+
+    @staticmethod
+    async def export_pending_todos(
+        db: Session,
+        user: User,
+        job: CalendarSyncJob,
+        checkpoint: Dict[str, Any],
+        tag: str
+    ) -> Dict[str, Any]:
+        """
+        Google Calendar에 동기화되지 않은 일정 내보내기
+
+        처리한 일정은 google_calendar_event_id가 저장되므로, 재시작 시 남은 일정만 다시 조회됩니다.
+        Todo 변경과 체크포인트는 일정 N개(calendar_sync_commit_chunk_size)마다 함께 커밋하며,
+        커밋 전에 중단된 청크의 일정은 source_id 조회로 기존 이벤트와 매칭되어 중복 생성되지 않습니다.
+        """
+        stats = checkpoint.setdefault('export', _new_export_stats())
+
+        todos_to_export = await run_in_thread(
+            lambda: db.query(Todo).filter(
+                Todo.user_id == user.id,
+                Todo.deleted_at.is_(None),
+                Todo.google_calendar_event_id.is_(None)  # 아직 동기화되지 않은 일정만
+            ).all()
+        )
+        if stats['total_count'] is None:
+            stats['total_count'] = len(todos_to_export)
+        logger.info(f"[{tag}] 내보낼 일정: {len(todos_to_export)}개 (작업 전체: {stats['total_count']}개)")
+
+        await run_in_thread(CalendarSyncJobService._set_phase, db, job, checkpoint, 'export', stats['total_count'])
+        job.processed_count = stats['total_count'] - len(todos_to_export)
+
+        if not todos_to_export:
+            logger.info(f"[{tag}] 내보낼 일정이 없습니다 (모든 일정이 이미 동기화됨)")
+            return stats
+
+        # 이전에 내보냈지만 event_id 저장 전에 중단된 일정은 source_id로 찾아서 매칭
+        # 조회에 실패한 일정은 기존 이벤트가 있을 수 있으므로 새로 만들지 않고 이번 실행에서 실패로 남김 (다음 실행에서 다시 조회)
+        source_matches, unresolved_ids = await GoogleCalendarService.find_events_by_source_ids(
+            token_json=user.google_calendar_token,
+            source_ids=[todo.id for todo in todos_to_export if todo.date],
+            priority=PRIORITY_BULK
+        )
+
+        # 매칭된 이벤트가 이미 다른 일정에 연결되어 있으면(유니크 인덱스 충돌) 그 일정만 실패로 남김 (청크 커밋 전체가 실패하지 않도록)
+        linked_event_ids = await run_in_thread(
+            CalendarSyncJobService._linked_event_ids, db, user.id, list(source_matches.values())
+        )
+
+        writer = CalendarSyncJobService._checkpoint_writer(db, job, checkpoint, tag)
+
+        # 반복 일정 시리즈는 행마다 이벤트를 만들지 않고 반복 이벤트 하나로 내보냄
+        exported_series_ids = await CalendarSyncJobService._export_series(
+            db, user, job, checkpoint, todos_to_export, source_matches, unresolved_ids, linked_event_ids, writer, tag
+        )
+
+        for todo in todos_to_export:
+            if todo.id in exported_series_ids:
+                continue
+            try:
+                # 날짜가 없는 일정은 건너뜀
+                if not todo.date:
+                    continue
+
+                # 기존 이벤트와 매칭 확인 (source_id 기준)
+                existing_event_id = source_matches.get(todo.id)
+                if existing_event_id and existing_event_id in linked_event_ids:
+                    logger.warning(f"[{tag}] 매칭된 이벤트가 이미 다른 일정에 연결되어 있어 건너뜀: todo_id={todo.id}, event_id={existing_event_id}")
+                    stats['failed_count'] += 1
+                    stats['failed_todos'].append(todo.id)
+                    continue
+                if existing_event_id:
+                    linked_event_ids.add(existing_event_id)
+                    todo.google_calendar_event_id = existing_event_id
+                    todo.bulk_synced = True  # 일괄 동기화로 매칭된 일정도 표시
+                    stats['matched_count'] += 1
+                    logger.info(f"[{tag}] 기존 이벤트와 매칭: todo_id={todo.id}, event_id={existing_event_id}, bulk_synced=True")
+                    continue
+                if todo.id in unresolved_ids:
+                    logger.warning(f"[{tag}] 기존 이벤트 조회 실패로 내보내기 건너뜀: todo_id={todo.id}")
+                    stats['failed_count'] += 1
+                    stats['failed_todos'].append(todo.id)
+                    continue
+
+                start_datetime, end_datetime = CalendarSyncJobService.build_event_range(todo)
+                if not start_datetime:
+                    continue
+
+                notification_reminders = CalendarSyncJobService.parse_reminders(todo)
+
+                # 반복 정보는 Google Calendar로 전달하지 않음 (중복 일정 생성 방지)
+                # 반복 일정 시리즈는 _export_series에서 반복 이벤트로 내보내고, 여기서는 단일 이벤트로만 내보냄
+                logger.info(f"[{tag}] Google Calendar 이벤트 생성 - start={start_datetime}, end={end_datetime}, all_day={todo.all_day}")
+                event = await GoogleCalendarService.create_event(
+                    token_json=user.google_calendar_token,
+                    title=todo.title,
+                    description=todo.memo or todo.description or "",
+                    start_datetime=start_datetime,
+                    end_datetime=end_datetime,
+                    location=todo.location or "",
+                    all_day=todo.all_day,
+                    notification_reminders=notification_reminders if notification_reminders else None,
+                    repeat_type=None,  # 반복 정보는 전달하지 않음
+                    repeat_pattern=None,
+                    repeat_end_date=None,
+                    source_id=todo.id,  # Always Plan의 Todo ID 저장 (중복 제거용)
+                    priority=PRIORITY_BULK
+                )
+
+                if event and event.get('id'):
+                    # Todo에 Google Calendar 이벤트 ID 저장 및 일괄 동기화 플래그 설정
+                    todo.google_calendar_event_id = event.get('id')
+                    todo.bulk_synced = True  # 일괄 동기화로 생성된 일정 표시
+                    stats['synced_count'] += 1
+                    logger.info(f"[{tag}] 새 이벤트 생성: todo_id={todo.id}, event_id={event.get('id')}, bulk_synced=True")
+                else:
+                    stats['failed_count'] += 1
+                    stats['failed_todos'].append(todo.id)
+            except Exception as e:
+                # 롤백하면 같은 청크에서 먼저 처리한 일정의 변경도 버려지므로, 실패한 일정만 실패로 기록
+                logger.error(f"[{tag}] 일정 내보내기 실패 (todo_id={todo.id}): {e}", exc_info=True)
+                stats['failed_count'] += 1
+                stats['failed_todos'].append(todo.id)
+            finally:
+                # Todo 변경사항과 체크포인트를 청크 단위로 함께 커밋
+                job.processed_count = (job.processed_count or 0) + 1
+                await writer.record_async()
+
+        await writer.finish_async()
+        return stats
+
+    @staticmethod
+    def _linked_event_ids(db: Session, user_id: str, event_ids: List[str]) -> Set[str]:
+        """event_ids 중 이미 삭제되지 않은 일정에 연결된 primary 캘린더 이벤트 ID (내보내기는 primary 캘린더)"""
+        linked: Set[str] = set()
+        event_ids = list(set(event_ids))
+        # 아직 커밋하지 않은 이번 청크의 변경은 flush하지 않고 DB에 저장된 연결만 확인
+        with db.no_autoflush:
+            for start in range(0, len(event_ids), 500):
+                rows = db.query(Todo.google_calendar_event_id).filter(
+                    Todo.user_id == user_id,
+                    Todo.deleted_at.is_(None),
+                    todo_calendar_key(Todo.google_calendar_id) == DEFAULT_CALENDAR_ID,
+                    Todo.google_calendar_event_id.in_(event_ids[start:start + 500])
+                ).all()
+                linked.update(row[0] for row in rows)
+        return linked
+
+    @staticmethod
+    async def _export_series(
+        db: Session,
+        user: User,
+        job: CalendarSyncJob,
+        checkpoint: Dict[str, Any],
+        todos_to_export: List[Todo],
+        source_matches: Dict[str, str],
+        unresolved_ids: Set[str],
+        linked_event_ids: Set[str],
+        writer: ChunkedSyncWriter,
+        tag: str
+    ) -> Set[str]:
+        """
+        아직 내보내지 않은 반복 일정 시리즈를 반복 이벤트 하나씩으로 내보내기
+
+        일부 행만 내보낸 시리즈(이전 버전)나 RRULE로 표현할 수 없는 시리즈는 행 단위로 처리하도록 남겨둡니다.
+
+        Returns:
+            처리한(성공/실패 포함) Todo ID 집합
+        """
+        from app.services.recurring_series_service import RecurringSeriesService
+
+        stats = checkpoint['export']
+        pending_by_group: Dict[str, List[Todo]] = {}
+        for todo in todos_to_export:
+            if todo.date and RecurringSeriesService.is_series(todo):
+                pending_by_group.setdefault(todo.todo_group_id, []).append(todo)
+
+        handled_ids: Set[str] = set()
+        for todo_group_id, pending in pending_by_group.items():
+            series = await run_in_thread(RecurringSeriesService.load_series, db, user.id, todo_group_id)
+            if len(series) != len(pending) or not RecurringSeriesService.build_recurrence(series):
+                continue
+
+            try:
+                # 이전에 내보냈지만 event_id 저장 전에 중단된 시리즈는 기준 행의 source_id로 매칭
+                existing_event_id = source_matches.get(series[0].id)
+                if existing_event_id is None and series[0].id in unresolved_ids:
+                    logger.warning(f"[{tag}] 기존 반복 이벤트 조회 실패로 내보내기 건너뜀: todo_group_id={todo_group_id}")
+                    stats['failed_count'] += len(series)
+                    stats['failed_todos'].extend(todo.id for todo in series)
+                    continue
+                if existing_event_id:
+                    RecurringSeriesService.assign_instance_ids(series, series_event_id(existing_event_id))
+                    instance_ids = [todo.google_calendar_event_id for todo in series]
+                    conflicts = linked_event_ids.intersection(instance_ids) or await run_in_thread(
+                        CalendarSyncJobService._linked_event_ids, db, user.id, instance_ids
+                    )
+                    if conflicts:
+                        logger.warning(f"[{tag}] 매칭된 반복 이벤트의 인스턴스 {len(conflicts)}개가 이미 다른 일정에 연결되어 있어 건너뜀: todo_group_id={todo_group_id}")
+                        for todo in series:
+                            todo.google_calendar_event_id = None
+                        stats['failed_count'] += len(series)
+                        stats['failed_todos'].extend(todo.id for todo in series)
+                        continue
+                    linked_event_ids.update(instance_ids)
+                    stats['matched_count'] += len(series)
+                    logger.info(f"[{tag}] 기존 반복 이벤트와 매칭: todo_group_id={todo_group_id}, event_id={existing_event_id}")
+                else:
+                    result = await RecurringSeriesService.export_series(db, user, series, priority=PRIORITY_BULK)
+                    if not result:
+                        stats['failed_count'] += len(series)
+                        stats['failed_todos'].extend(todo.id for todo in series)
+                        continue
+                    stats['synced_count'] += len(series)
+                    stats['series_count'] = stats.get('series_count', 0) + 1
+                for todo in series:
+                    todo.bulk_synced = True  # 일괄 동기화로 생성된 일정 표시
+            except Exception as e:
+                logger.error(f"[{tag}] 반복 일정 시리즈 내보내기 실패 (todo_group_id={todo_group_id}): {e}", exc_info=True)
+                # 이 시리즈의 변경만 되돌림 (이미 만든 반복 이벤트는 다음 실행에서 source_id로 매칭)
+                for todo in series:
+                    todo.google_calendar_event_id = None
+                stats['failed_count'] += len(series)
+                stats['failed_todos'].extend(todo.id for todo in series)
+            finally:
+                handled_ids.update(todo.id for todo in series)
+                # Todo 변경사항과 체크포인트를 청크 단위로 함께 커밋
+                job.processed_count = (job.processed_count or 0) + len(series)
+                await writer.record_async(len(series))
+
+        return handled_ids
+
+    @staticmethod
+    def _parse_import_event(
+        user: User,
+        event: Dict[str, Any],
+        stats: Dict[str, Any],
+        calendar_id: str = DEFAULT_CALENDAR_ID
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Google Calendar 이벤트 하나를 todos 행 값으로 변환 (구글 캘린더에서 직접 만든 이벤트만)
+
+        저장은 페이지 단위 upsert(_upsert_imported_todos)에서 하므로 DB에 접근하지 않습니다.
+
+        Returns:
+            todos 행 값 (건너뛰거나 변환 실패 시 None)
+        """
+        event_id = None
+        try:
+            event_id = event.get('id')
+            if not event_id:
+                logger.warning(f"[SYNC_ALL] 이벤트 ID가 없음: {event.get('summary', '제목 없음')}")
+                stats['skipped_events_count'] += 1
+                return None
+
+            # Always Plan에서 만든 이벤트인지 확인 (source_id 체크)
+            # Always Plan에서 만든 이벤트는 extendedProperties 또는 description에 AlwaysPlanID가 있음
+            source_id = None
+            extended_props = event.get('extendedProperties', {})
+            private_props = extended_props.get('private', {})
+            if private_props.get('alwaysPlanSourceId'):
+                source_id = private_props.get('alwaysPlanSourceId')
+            else:
+                # description에서도 추출 시도 (fallback)
+                description = event.get('description', '')
+                if description and 'AlwaysPlanID:' in description:
+                    match = re.search(r'AlwaysPlanID:([^\s\n]+)', description)
+                    if match:
+                        source_id = match.group(1)
+
+            if source_id:
+                # Always Plan에서 만든 이벤트는 건너뜀 (웹앱의 Todo를 Google Calendar에 동기화한 것)
+                stats['skipped_always_plan_count'] += 1
+                logger.debug(f"[SYNC_ALL] Always Plan에서 만든 이벤트 건너뜀: event_id={event_id}, source_id={source_id}, title={event.get('summary', '제목 없음')}")
+                return None
+
+            # 구글 캘린더에서 직접 만든 이벤트만 저장
+            stats['new_events_count'] += 1
+            logger.debug(f"[SYNC_ALL] 이벤트 변환 (구글 캘린더에서 직접 만든 이벤트): event_id={event_id}, title={event.get('summary', '제목 없음')}")
+
+            # 이벤트 정보 파싱
+            start = event.get('start', {})
+            end = event.get('end', {})
+
+            # 시작 시간 파싱
+            start_date = None
+            end_date = None
+            start_time_obj = None
+            end_time_obj = None
+            all_day = False
+
+            if 'date' in start:
+                # 종일 이벤트
+                all_day = True
+                start_date_str = start['date']
+                if 'T' in start_date_str:
+                    start_date = datetime.fromisoformat(start_date_str.replace('Z', '+00:00')).date()
+                else:
+                    start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+
+                # 종료 날짜 파싱 (종일 이벤트의 경우)
+                if 'date' in end:
+                    end_date_str = end['date']
+                    if 'T' in end_date_str:
+                        end_date_obj = datetime.fromisoformat(end_date_str.replace('Z', '+00:00'))
+                    else:
+                        end_date_obj = datetime.strptime(end_date_str, '%Y-%m-%d')
+                    # Google Calendar는 종료 날짜를 exclusive로 저장하므로 하루 빼야 함
+                    end_date = (end_date_obj - timedelta(days=1)).date()
+                    # 시작 날짜와 종료 날짜가 같으면 종료 날짜를 None으로 설정
+                    if end_date <= start_date:
+                        end_date = None
+            elif 'dateTime' in start:
+                # 시간 지정 이벤트
+                start_datetime_str = start['dateTime']
+
+                # ISO 형식 파싱
+                if start_datetime_str.endswith('Z'):
+                    start_datetime_obj = datetime.fromisoformat(start_datetime_str.replace('Z', '+00:00'))
+                else:
+                    start_datetime_obj = datetime.fromisoformat(start_datetime_str)
+
+                # 타임존이 없으면 UTC로 간주
+                if start_datetime_obj.tzinfo is None:
+                    start_datetime_obj = start_datetime_obj.replace(tzinfo=timezone.utc)
+
+                # Asia/Seoul 타임존으로 변환
+                seoul_tz = timezone(timedelta(hours=9))
+                start_datetime_seoul = start_datetime_obj.astimezone(seoul_tz)
+
+                start_date = start_datetime_seoul.date()
+                start_time_str = start_datetime_seoul.strftime('%H:%M')
+                start_time_obj = time_obj(*map(int, start_time_str.split(':')))
+
+                # 종료 시간 파싱
+                if 'dateTime' in end:
+                    end_datetime_str = end['dateTime']
+                    if end_datetime_str.endswith('Z'):
+                        end_datetime_obj = datetime.fromisoformat(end_datetime_str.replace('Z', '+00:00'))
+                    else:
+                        end_datetime_obj = datetime.fromisoformat(end_datetime_str)
+
+                    if end_datetime_obj.tzinfo is None:
+                        end_datetime_obj = end_datetime_obj.replace(tzinfo=timezone.utc)
+
+                    end_datetime_seoul = end_datetime_obj.astimezone(seoul_tz)
+                    end_date = end_datetime_seoul.date()
+                    end_time_str = end_datetime_seoul.strftime('%H:%M')
+                    end_time_obj = time_obj(*map(int, end_time_str.split(':')))
+
+                    # 시작 날짜와 종료 날짜가 같으면 종료 날짜를 None으로 설정
+                    if end_date <= start_date:
+                        end_date = None
+
+            if not start_date:
+                return None
+
+            # 알림 정보 파싱
+            notification_reminders = None
+            reminders = event.get('reminders', {})
+            if reminders:
+                reminders_list = []
+                if reminders.get('useDefault'):
+                    # 기본 알림 사용 (30분 전)
+                    reminders_list = [{'value': 30, 'unit': 'minutes'}]
+                else:
+                    # 커스텀 알림
+                    overrides = reminders.get('overrides', [])
+                    for override in overrides:
+                        minutes = override.get('minutes', 30)
+                        # 분을 단위로 변환
+                        if minutes < 60:
+                            reminders_list.append({'value': minutes, 'unit': 'minutes'})
+                        elif minutes < 24 * 60:
+                            hours = minutes // 60
+                            remaining_minutes = minutes % 60
+                            if remaining_minutes == 0:
+                                reminders_list.append({'value': hours, 'unit': 'hours'})
+                            else:
+                                reminders_list.append({'value': minutes, 'unit': 'minutes'})
+                        elif minutes < 7 * 24 * 60:
+                            days = minutes // (24 * 60)
+                            remaining_minutes = minutes % (24 * 60)
+                            if remaining_minutes == 0:
+                                reminders_list.append({'value': days, 'unit': 'days'})
+                            else:
+                                reminders_list.append({'value': minutes, 'unit': 'minutes'})
+                        else:
+                            weeks = minutes // (7 * 24 * 60)
+                            remaining_minutes = minutes % (7 * 24 * 60)
+                            if remaining_minutes == 0:
+                                reminders_list.append({'value': weeks, 'unit': 'weeks'})
+                            else:
+                                reminders_list.append({'value': minutes, 'unit': 'minutes'})
+                if reminders_list:
+                    try:
+                        notification_reminders = json.dumps(reminders_list)
+                    except Exception as json_err:
+                        logger.error(f"[SYNC_ALL] 알림 정보 JSON 변환 실패: {json_err}")
+                        notification_reminders = None
+
+            # 반복 정보 파싱
+            repeat_type = None
+            repeat_pattern = None
+            repeat_end_date = None
+            recurrence = event.get('recurrence', [])
+            if recurrence and len(recurrence) > 0:
+                rrule = recurrence[0]
+                if rrule.startswith('RRULE:'):
+                    rrule_str = rrule[6:]
+                    parts = rrule_str.split(';')
+                    freq = None
+                    until = None
+                    count = None
+                    byday = None
+                    interval = None
+
+                    for part in parts:
+                        if '=' in part:
+                            key, value = part.split('=', 1)
+                            if key == 'FREQ':
+                                freq = value
+                            elif key == 'UNTIL':
+                                until = value
+                            elif key == 'COUNT':
+                                count = int(value)
+                            elif key == 'BYDAY':
+                                byday = value
+                            elif key == 'INTERVAL':
+                                interval = int(value)
+
+                    if freq == 'DAILY':
+                        repeat_type = 'daily'
+                    elif freq == 'WEEKLY':
+                        if byday:
+                            if byday == 'MO,TU,WE,TH,FR':
+                                repeat_type = 'weekdays'
+                            elif byday == 'SA,SU':
+                                repeat_type = 'weekends'
+                            else:
+                                repeat_type = 'custom'
+                                # 요일 목록을 배열로 변환 (예: 'MO,TU' -> [0, 1])
+                                day_map = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+                                days_list = [day_map.get(day, 0) for day in byday.split(',') if day in day_map]
+                                repeat_pattern = json.dumps({
+                                    'freq': 'weeks',
+                                    'interval': interval or 1,
+                                    'days': days_list,
+                                    'endType': 'count' if count else ('date' if until else 'never'),
+                                    'count': count,
+                                    'endDate': until if until and not count else None
+                                })
+                        else:
+                            if interval and interval > 1:
+                                # INTERVAL이 1보다 크면 custom으로 처리
+                                repeat_type = 'custom'
+                                repeat_pattern = json.dumps({
+                                    'freq': 'weeks',
+                                    'interval': interval,
+                                    'days': [],
+                                    'endType': 'count' if count else ('date' if until else 'never'),
+                                    'count': count,
+                                    'endDate': until if until and not count else None
+                                })
+                            else:
+                                repeat_type = 'weekly'
+                    elif freq == 'MONTHLY':
+                        if interval and interval > 1:
+                            repeat_type = 'custom'
+                            repeat_pattern = json.dumps({
+                                'freq': 'months',
+                                'interval': interval,
+                                'days': [],
+                                'endType': 'count' if count else ('date' if until else 'never'),
+                                'count': count,
+                                'endDate': until if until and not count else None
+                            })
+                        else:
+                            repeat_type = 'monthly'
+                    elif freq == 'YEARLY':
+                        if interval and interval > 1:
+                            repeat_type = 'custom'
+                            repeat_pattern = json.dumps({
+                                'freq': 'years',
+                                'interval': interval,
+                                'days': [],
+                                'endType': 'count' if count else ('date' if until else 'never'),
+                                'count': count,
+                                'endDate': until if until and not count else None
+                            })
+                        else:
+                            repeat_type = 'yearly'
+
+                    if until:
+                        if len(until) == 8:
+                            repeat_end_date = datetime.strptime(until, '%Y%m%d').date()
+
+                    # custom 반복 패턴이 아닌 경우에도 repeat_end_date 설정
+                    if repeat_type != 'custom':
+                        if until:
+                            if len(until) == 8:
+                                repeat_end_date = datetime.strptime(until, '%Y%m%d').date()
+                        elif count:
+                            # COUNT가 있으면 종료일 계산 필요 (현재는 처리하지 않음)
+                            pass
+
+            # Todo 행 값 (Google Calendar에서 가져온 일정)
+            return {
+                'user_id': user.id,
+                'title': event.get('summary', '제목 없음'),
+                'description': event.get('description', ''),
+                'memo': event.get('description', ''),
+                'location': event.get('location', ''),
+                'date': start_date,
+                'end_date': end_date,  # 종료 날짜 추가 (기간 일정인 경우)
+                'start_time': start_time_obj,
+                'end_time': end_time_obj,
+                'all_day': all_day,
+                'category': "구글",
+                'status': "pending",
+                'priority': "medium",
+                'source': "google_calendar",  # Google Calendar에서 가져온 일정임을 명시
+                'google_calendar_event_id': event_id,
+                'google_calendar_id': None if calendar_id == DEFAULT_CALENDAR_ID else calendar_id,  # 가져온 캘린더 (primary는 None)
+                'bulk_synced': True,  # 동기화 후 저장으로 영구 저장
+                'deleted_at': None,
+                'notification_reminders': notification_reminders,
+                'repeat_type': repeat_type,
+                'repeat_pattern': repeat_pattern,
+                'repeat_end_date': repeat_end_date
+            }
+
+        except Exception as e:
+            # 상세한 에러 정보 로깅
+            error_type = type(e).__name__
+            error_message = str(e)
+            event_title = event.get('summary', '제목 없음')
+            event_start = event.get('start', {})
+
+            logger.error("[SYNC_ALL] ❌ Google Calendar 이벤트 변환 실패:")
+            logger.error(f"  - event_id: {event_id}")
+            logger.error(f"  - title: {event_title}")
+            logger.error(f"  - start: {event_start}")
+            logger.error(f"  - error_type: {error_type}")
+            logger.error(f"  - error_message: {error_message}")
+            logger.error("  - 상세 에러:", exc_info=True)
+
+            # 파싱된 데이터 정보도 로깅
+            try:
+                logger.error(f"  - 파싱된 데이터: start_date={start_date}, end_date={end_date}, all_day={all_day}, start_time_obj={start_time_obj}, end_time_obj={end_time_obj}")
+            except:
+                logger.error("  - 파싱된 데이터 정보 없음 (파싱 단계에서 실패)")
+
+            # 실패한 이벤트 정보 저장 (체크포인트 크기를 제한하기 위해 최대 MAX_FAILED_EVENTS_INFO개)
+            if len(stats['failed_events_info']) < MAX_FAILED_EVENTS_INFO:
+                stats['failed_events_info'].append({
+                    "event_id": event_id,
+                    "title": event_title,
+                    "error_type": error_type,
+                    "error_message": error_message,
+                    "start": str(event_start) if event_start else None
+                })
+
+            stats['imported_failed_count'] += 1
+            return None
+
+    @staticmethod
+    def _upsert_imported_todos(db: Session, rows: List[Dict[str, Any]], stats: Dict[str, Any]):
+        """
+        가져온 이벤트 한 페이지를 INSERT ... ON CONFLICT DO UPDATE 한 번으로 저장
+
+        (user_id, 캘린더, google_calendar_event_id) 부분 유니크 인덱스 기준으로, 이미 저장된 이벤트는 새 행을 만들지 않고
+        내용만 갱신하므로 같은 페이지를 다시 가져와도 중복이 생기지 않습니다.
+        Always Plan에서 만든 일정(source가 google_calendar가 아님)과 연결된 이벤트는 덮어쓰지 않습니다.
+        Core 문장은 ORM after_flush 훅을 거치지 않으므로, 저장한 일정의 알림 예약은 여기서 다시 계산합니다.
+        커밋은 호출 측에서 체크포인트와 함께 합니다.
+        """
+        # 같은 문장 안에서 같은 행을 두 번 갱신할 수 없으므로 이벤트 ID 기준으로 중복 제거 (마지막 값 사용)
+        rows_by_event_id = {row['google_calendar_event_id']: row for row in rows}
+        if not rows_by_event_id:
+            return
+
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name not in ('postgresql', 'sqlite'):
+            CalendarSyncJobService._insert_imported_todos(db, list(rows_by_event_id.values()), stats)
+            return
+
+        now = datetime.utcnow()
+        values = [
+            {**row, 'id': str(uuid.uuid4()), 'created_at': now, 'updated_at': now}
+            for row in rows_by_event_id.values()
+        ]
+        table = Todo.__table__
+        insert_stmt = postgresql_insert(table) if dialect_name == 'postgresql' else sqlite_insert(table)
+        insert_stmt = insert_stmt.values(values)
+        upsert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, todo_calendar_key(table.c.google_calendar_id), table.c.google_calendar_event_id],
+            index_where=sql_text(TODO_GOOGLE_EVENT_INDEX_WHERE),
+            set_={
+                **{column: insert_stmt.excluded[column] for column in IMPORT_UPSERT_COLUMNS},
+                'updated_at': now
+            },
+            where=(table.c.source == 'google_calendar')
+        ).returning(table.c.id)
+
+        # 새로 만든 행은 이번에 만든 ID, 갱신된 행은 기존 ID를 반환 (덮어쓰지 않은 행은 반환되지 않음)
+        new_ids = {value['id'] for value in values}
+        returned_ids = [row[0] for row in db.execute(upsert_stmt).all()]
+        inserted_ids = new_ids.intersection(returned_ids)
+        CalendarSyncJobService._sync_imported_reminders(db, returned_ids, inserted_ids)
+
+        inserted_count = len(inserted_ids)
+        stats['imported_count'] += inserted_count
+        stats['skipped_already_saved_count'] += len(values) - inserted_count
+        logger.info(f"[SYNC_ALL] 페이지 upsert - 새로 저장 {inserted_count}개, 이미 저장됨 {len(values) - inserted_count}개 (갱신 {len(returned_ids) - inserted_count}개)")
+
+    @staticmethod
+    def _sync_imported_reminders(db: Session, todo_ids: List[str], new_todo_ids: Set[str]):
+        """upsert로 저장한 일정의 알림 예약 다시 계산 (Google에서 옮긴 일정이 이전 시각에 알리지 않도록)"""
+        if not todo_ids:
+            return
+        todos = []
+        for start in range(0, len(todo_ids), 500):
+            # 세션에 남아 있는 이전 값 대신 방금 저장한 값으로 계산
+            todos.extend(
+                db.query(Todo).filter(Todo.id.in_(todo_ids[start:start + 500])).populate_existing().all()
+            )
+        fire_times = ReminderJobService.sync_todos(db.connection(), todos, new_todo_ids=new_todo_ids)
+        if fire_times:
+            ReminderJobService.notify_after_commit(db, min(fire_times))
+
+    @staticmethod
+    def _insert_imported_todos(db: Session, rows: List[Dict[str, Any]], stats: Dict[str, Any]):
+        """ON CONFLICT를 지원하지 않는 DB용: 이미 저장된 이벤트를 제외하고 추가 (한 페이지는 한 캘린더의 이벤트)"""
+        existing_event_ids = {
+            row[0] for row in db.query(Todo.google_calendar_event_id).filter(
+                Todo.user_id == rows[0]['user_id'],
+                Todo.deleted_at.is_(None),
+                todo_calendar_key(Todo.google_calendar_id) == (rows[0]['google_calendar_id'] or DEFAULT_CALENDAR_ID),
+                Todo.google_calendar_event_id.in_([row['google_calendar_event_id'] for row in rows])
+            ).all()
+        }
+        for row in rows:
+            if row['google_calendar_event_id'] in existing_event_ids:
+                stats['skipped_already_saved_count'] += 1
+                continue
+            db.add(Todo(**row))
+            stats['imported_count'] += 1
+
+    @staticmethod
+    async def import_google_events(
+        db: Session,
+        user: User,
+        job: CalendarSyncJob,
+        checkpoint: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Google Calendar 이벤트를 웹앱에 Todo로 저장 (양방향 동기화)
+
+        선택한 캘린더마다 페이지를 가져오는 producer를 동시에 실행하고(최대 google_calendar_max_parallel_calendars개),
+        DB 저장은 하나의 consumer가 크기 제한이 있는 큐에서 페이지를 꺼내 처리합니다.
+        캘린더별로 처리한 페이지의 다음 페이지 토큰을 체크포인트에 저장하므로, 재시작 시 캘린더마다
+        마지막으로 끝낸 페이지 다음부터 이어서 가져옵니다. (조회 기간/캘린더 목록도 체크포인트의 값을 그대로 사용)
+        """
+        stats = checkpoint.setdefault('import', _new_import_stats())
+        if stats.get('done'):
+            return stats
+
+        if not stats.get('time_min'):
+            now = datetime.utcnow()
+            stats['time_min'] = (now - timedelta(days=IMPORT_WINDOW_DAYS)).isoformat()
+            stats['time_max'] = (now + timedelta(days=IMPORT_WINDOW_DAYS)).isoformat()
+        time_min = datetime.fromisoformat(stats['time_min'])
+        time_max = datetime.fromisoformat(stats['time_max'])
+
+        if 'calendars' not in stats:
+            # 이전 버전 체크포인트의 page_token은 primary 캘린더의 진행 상황
+            legacy_page_token = stats.pop('page_token', None)
+            selected_ids = await run_in_thread(CalendarMirrorService.get_selected_calendar_ids, db, user.id)
+            stats['calendars'] = {
+                calendar_id: {
+                    'page_token': legacy_page_token if calendar_id == DEFAULT_CALENDAR_ID else None,
+                    'done': False
+                }
+                for calendar_id in selected_ids
+            }
+        calendars: Dict[str, Dict[str, Any]] = stats['calendars']
+
+        await run_in_thread(CalendarSyncJobService._set_phase, db, job, checkpoint, 'import')
+        job.processed_count = stats['total_events_from_google']
+        # producer는 세션에 접근하지 않도록 토큰을 미리 읽어 둠 (페이지 저장은 작업 스레드에서 같은 세션으로 실행)
+        token_json = user.google_calendar_token
+
+        logger.info(f"[SYNC_ALL] 가져올 캘린더: {len(calendars)}개")
+
+        pending_ids = [calendar_id for calendar_id, progress in calendars.items() if not progress.get('done')]
+        queue: asyncio.Queue = asyncio.Queue(maxsize=IMPORT_QUEUE_PAGES)
+        semaphore = asyncio.Semaphore(max(1, settings.google_calendar_max_parallel_calendars))
+
+        async def _produce(calendar_id: str):
+            """캘린더 하나의 페이지를 큐에 넣음 (끝나면 page=None을 넣어 완료를 알림)"""
+            progress = calendars[calendar_id]
+            page_token = progress.get('page_token')
+            fetched_pages = 0
+            async with semaphore:
+                while True:
+                    cursor: Dict[str, Any] = {}
+                    try:
+                        async for page_events in GoogleCalendarService.iter_event_pages(
+                            token_json=token_json,
+                            time_min=time_min,
+                            time_max=time_max,
+                            calendar_id=calendar_id,
+                            page_size=2500,  # Google Calendar API 최대값 (2500)
+                            priority=PRIORITY_BULK,
+                            page_token=page_token,
+                            cursor=cursor
+                        ):
+                            fetched_pages += 1
+                            await queue.put((calendar_id, page_events, cursor.get('next_page_token')))
+                    except asyncio.CancelledError:
+                        # 작업이 중단된 경우 완료 표시를 하지 않음 (재시작 시 이어서 가져옴)
+                        raise
+                    except Exception as e:
+                        if page_token and fetched_pages == 0:
+                            # 저장된 페이지 토큰이 만료된 경우 처음부터 다시 조회 (이미 저장된 이벤트는 건너뜀)
+                            logger.warning(f"[SYNC_ALL] 저장된 페이지 토큰으로 재개 실패, 처음부터 다시 조회 - calendar_id={calendar_id}: {e}")
+                            page_token = None
+                            continue
+                        logger.warning(f"[SYNC_ALL] Google Calendar 이벤트 목록 가져오기 실패 (가져온 페이지까지만 처리) - calendar_id={calendar_id}: {e}")
+                    break
+            await queue.put((calendar_id, None, None))
+
+        producers = [asyncio.create_task(_produce(calendar_id)) for calendar_id in pending_ids]
+        remaining = len(producers)
+        try:
+            while remaining:
+                calendar_id, page_events, next_page_token = await queue.get()
+                progress = calendars[calendar_id]
+                if page_events is None:
+                    progress['done'] = True
+                    remaining -= 1
+                    await run_in_thread(CalendarSyncJobService._save_checkpoint, db, job, checkpoint)
+                    continue
+
+                # 변환/upsert/커밋은 작업 스레드에서 (페이지당 최대 2,500개)
+                await run_in_thread(
+                    CalendarSyncJobService._store_import_page,
+                    db, user, job, checkpoint, calendar_id, page_events, next_page_token
+                )
+        finally:
+            for producer in producers:
+                producer.cancel()
+            await asyncio.gather(*producers, return_exceptions=True)
+
+        stats['done'] = True
+        await run_in_thread(CalendarSyncJobService._save_checkpoint, db, job, checkpoint)
+        logger.info(f"[SYNC_ALL] 처리한 전체 이벤트 수: {stats['total_events_from_google']}개 (캘린더 {len(calendars)}개)")
+        return stats
+
+    @staticmethod
+    def _store_import_page(
+        db: Session,
+        user: User,
+        job: CalendarSyncJob,
+        checkpoint: Dict[str, Any],
+        calendar_id: str,
+        page_events: List[Dict[str, Any]],
+        next_page_token: Optional[str]
+    ):
+        """가져온 페이지 하나를 저장하고 다음 페이지 토큰을 체크포인트에 기록 (같은 트랜잭션으로 커밋)"""
+        stats = checkpoint['import']
+        stats['total_events_from_google'] += len(page_events)
+        rows = []
+        for event in page_events:
+            row = CalendarSyncJobService._parse_import_event(user, event, stats, calendar_id)
+            if row:
+                rows.append(row)
+        try:
+            # 페이지 전체를 한 문장으로 저장 (이미 저장된 이벤트는 갱신되므로 다시 가져와도 중복 없음)
+            CalendarSyncJobService._upsert_imported_todos(db, rows, stats)
+        except Exception as e:
+            logger.error(f"[SYNC_ALL] 페이지 저장 실패 - calendar_id={calendar_id}, 이벤트 {len(rows)}개: {e}", exc_info=True)
+            db.rollback()
+            stats['imported_failed_count'] += len(rows)
+
+        # 다음 페이지부터 이어서 가져오도록 체크포인트 저장 (페이지 저장과 같은 트랜잭션)
+        stats['calendars'][calendar_id]['page_token'] = next_page_token
+        job.processed_count = stats['total_events_from_google']
+        CalendarSyncJobService._save_checkpoint(db, job, checkpoint)
+
+    @staticmethod
+    def _mark_bulk_synced(db: Session, user: User, job: CalendarSyncJob, checkpoint: Dict[str, Any]):
+        """이미 동기화되었지만 bulk_synced=False인 일정을 bulk_synced=True로 설정 (체크포인트와 함께 커밋)"""
+        bulk_synced_count = db.query(Todo).filter(
+            Todo.user_id == user.id,
+            Todo.deleted_at.is_(None),
+            Todo.google_calendar_event_id.isnot(None),  # 이미 동기화된 일정
+            Todo.bulk_synced == False  # 아직 bulk_synced가 False인 일정
+        ).update({Todo.bulk_synced: True}, synchronize_session=False)
+        checkpoint['bulk_synced_count'] = bulk_synced_count
+        CalendarSyncJobService._save_checkpoint(db, job, checkpoint)
+        logger.info(f"[SYNC_ALL] {bulk_synced_count}개 이미 동기화된 일정을 bulk_synced=True로 설정 완료")
+
+    @staticmethod
+    async def run_sync_all(db: Session, user: User, job: CalendarSyncJob) -> Dict[str, Any]:
+        """모든 기존 일정을 Google Calendar에 일괄 동기화 (중복 방지) + Google Calendar 이벤트 가져오기"""
+        logger.info(f"[SYNC_ALL] ========== 동기화 시작 ========== 사용자: {user.email} (ID: {user.id}), job_id={job.id}")
+        checkpoint = CalendarSyncJobService._load_checkpoint(job)
+
+        # 일괄 동기화는 토글 상태와 관계없이 동작
+        # 토글을 꺼도 일괄 동기화한 일정은 Google Calendar에 남아있어야 함
+        import_enabled_raw = getattr(user, 'google_calendar_import_enabled', 'false')
+        import_enabled = str(import_enabled_raw).lower() == 'true'
+        export_enabled_raw = getattr(user, 'google_calendar_export_enabled', 'false')
+        export_enabled = str(export_enabled_raw).lower() == 'true'
+        logger.info(f"[SYNC_ALL] 토글 상태 - 가져오기: {import_enabled}, 내보내기: {export_enabled}")
+
+        # 이미 동기화되었지만 bulk_synced=False인 일정도 bulk_synced=True로 설정
+        # (토글을 꺼도 Google Calendar에 남아있도록 하기 위함)
+        if 'bulk_synced_count' not in checkpoint:
+            await run_in_thread(CalendarSyncJobService._mark_bulk_synced, db, user, job, checkpoint)
+        bulk_synced_count = checkpoint['bulk_synced_count']
+
+        # 웹앱 → Google Calendar (export_enabled가 활성화되어 있을 때만)
+        if export_enabled:
+            export_stats = await CalendarSyncJobService.export_pending_todos(db, user, job, checkpoint, "SYNC_ALL")
+        else:
+            logger.info("[SYNC_ALL] Google Calendar 내보내기가 비활성화되어 있어 일정을 내보내지 않습니다.")
+            export_stats = checkpoint.setdefault('export', _new_export_stats())
+
+        # Google Calendar → 웹앱 (import_enabled가 활성화되어 있을 때만)
+        if import_enabled:
+            import_stats = await CalendarSyncJobService.import_google_events(db, user, job, checkpoint)
+        else:
+            logger.info("[SYNC_ALL] Google Calendar 가져오기가 비활성화되어 있어 이벤트를 가져오지 않습니다.")
+            import_stats = checkpoint.setdefault('import', _new_import_stats())
+
+        synced_count = export_stats['synced_count']
+        matched_count = export_stats['matched_count']
+        imported_count = import_stats['imported_count']
+        total_events_from_google = import_stats['total_events_from_google']
+        new_events_count = import_stats['new_events_count']
+        skipped_already_saved_count = import_stats['skipped_already_saved_count']
+        skipped_always_plan_count = import_stats['skipped_always_plan_count']
+
+        logger.info(f"[SYNC_ALL] ========== 동기화 완료 ========== job_id={job.id}")
+        logger.info(f"[SYNC_ALL] 웹앱 → Google Calendar: 매칭 {matched_count}개, 새로 생성 {synced_count}개, 실패 {export_stats['failed_count']}개, bulk_synced 설정 {bulk_synced_count}개")
+        logger.info(f"[SYNC_ALL] Google Calendar → 웹앱: 새로 저장 {imported_count}개, 실패 {import_stats['imported_failed_count']}개, 건너뜀: 이미 저장됨 {skipped_already_saved_count}개, Always Plan 이벤트 {skipped_always_plan_count}개, 기타 {import_stats['skipped_events_count']}개")
+
+        message_parts = []
+        if synced_count > 0:
+            message_parts.append(f"웹앱 일정 {synced_count}개가 Google Calendar에 저장됨")
+        if matched_count > 0:
+            message_parts.append(f"웹앱 일정 {matched_count}개가 기존 Google Calendar 이벤트와 매칭됨")
+        if bulk_synced_count > 0:
+            message_parts.append(f"웹앱 일정 {bulk_synced_count}개가 영구 저장됨")
+        if imported_count > 0:
+            message_parts.append(f"Google Calendar 일정 {imported_count}개가 웹앱에 저장됨")
+
+        if message_parts:
+            message = ", ".join(message_parts) + ". 동기화 해제해도 양쪽에 일정이 남아있습니다."
+        elif not import_enabled:
+            message = "Google Calendar 가져오기가 비활성화되어 있습니다. 설정에서 활성화해주세요."
+        elif total_events_from_google == 0:
+            message = "Google Calendar에서 가져온 이벤트가 없습니다. Google Calendar에 일정이 있는지 확인해주세요."
+        elif new_events_count == 0:
+            message = f"모든 Google Calendar 이벤트가 이미 저장되어 있거나 Always Plan에서 만든 이벤트입니다. (전체 {total_events_from_google}개 이벤트 중 건너뜀: 이미 저장됨 {skipped_already_saved_count}개, Always Plan 이벤트 {skipped_always_plan_count}개)"
+        else:
+            message = "저장할 일정이 없습니다."
+
+        return {
+            "success": True,
+            "synced_count": synced_count,
+            "matched_count": matched_count,
+            "series_count": export_stats.get('series_count', 0),  # 반복 이벤트 하나로 내보낸 반복 일정 시리즈 수
+            "bulk_synced_count": bulk_synced_count,  # 이미 동기화된 일정 중 bulk_synced=True로 설정된 수
+            "imported_count": imported_count,  # Google Calendar 이벤트를 웹앱에 저장한 수
+            "failed_count": export_stats['failed_count'],
+            "imported_failed_count": import_stats['imported_failed_count'],  # Google Calendar 이벤트 저장 실패 수
+            "total_count": export_stats['total_count'] or 0,
+            "total_saved": synced_count + matched_count + bulk_synced_count,  # 총 저장된 일정 수 (웹앱 → Google Calendar)
+            "failed_todo_ids": export_stats['failed_todos'],
+            "message": message,
+            "import_enabled": import_enabled,  # import_enabled 토글 상태
+            "total_events_from_google": total_events_from_google,  # Google Calendar에서 가져온 전체 이벤트 수
+            "new_events_count": new_events_count,  # 새로 처리해야 할 이벤트 수 (건너뛴 것 제외)
+            "skipped_counts": {  # 건너뛴 이벤트 통계
+                "already_saved": skipped_already_saved_count,
+                "always_plan_events": skipped_always_plan_count,
+                "other": import_stats['skipped_events_count']
+            },
+            "failed_events_info": import_stats['failed_events_info']  # 실패한 이벤트 상세 정보 (디버깅용)
+        }
+
+    @staticmethod
+    async def run_export(db: Session, user: User, job: CalendarSyncJob) -> Dict[str, Any]:
+        """웹앱의 모든 기존 일정을 Google Calendar로 내보내기 (토글 상태와 무관)"""
+        logger.info(f"[EXPORT] ========== 웹앱 일정 내보내기 시작 ========== 사용자: {user.email} (ID: {user.id}), job_id={job.id}")
+        checkpoint = CalendarSyncJobService._load_checkpoint(job)
+        stats = await CalendarSyncJobService.export_pending_todos(db, user, job, checkpoint, "EXPORT")
+
+        synced_count = stats['synced_count']
+        matched_count = stats['matched_count']
+        failed_count = stats['failed_count']
+        logger.info(f"[EXPORT] ========== 내보내기 완료 ========== 매칭: {matched_count}개, 새로 생성: {synced_count}개, 실패: {failed_count}개")
+
+        total_exported = synced_count + matched_count
+        message = ""
+        if synced_count > 0:
+            message += f"웹앱 일정 {synced_count}개가 Google Calendar에 저장되었습니다. "
+        if matched_count > 0:
+            message += f"웹앱 일정 {matched_count}개가 기존 Google Calendar 이벤트와 매칭되었습니다. "
+        if failed_count > 0:
+            message += f"일정 {failed_count}개 내보내기 실패. "
+        if total_exported == 0:
+            message = "내보낼 일정이 없습니다 (모든 일정이 이미 동기화되었거나 날짜가 없음)."
+        else:
+            message += "내보낸 일정은 Google Calendar에 저장되어 있습니다."
+
+        return {
+            "success": True,
+            "synced_count": synced_count,
+            "matched_count": matched_count,
+            "series_count": stats.get('series_count', 0),  # 반복 이벤트 하나로 내보낸 반복 일정 시리즈 수
+            "failed_count": failed_count,
+            "total_count": stats['total_count'] or 0,
+            "total_exported": total_exported,
+            "failed_todo_ids": stats['failed_todos'],
+            "message": message
+        }
+
+
+class CalendarSyncJobWorker:
+    """
+    일괄 동기화/내보내기 작업 워커 (DB에 등록된 작업을 가져와 실행)
+
+    - 작업 선점/heartbeat/상태 저장 등 DB 접근은 작업 스레드에서 실행 (API 이벤트 루프를 막지 않음)
+    - 사용자당 실행 중 작업 하나는 idx_calendar_sync_jobs_user_running 부분 유니크 인덱스로 보장 (인스턴스가 여러 개여도)
+    - attempts는 선점할 때마다 1씩 늘고, 실행 중인 인스턴스는 자기가 선점한 attempts 값으로 heartbeat를 갱신
+      → 다른 인스턴스가 중단된 작업으로 보고 다시 선점하면 heartbeat 갱신이 실패하므로 실행을 멈춤
+    - max_attempts번 선점된 뒤에도 중단된 작업(인스턴스를 죽이는 작업 등)은 실패로 처리
+    """
+
+    def __init__(
+        self,
+        poll_seconds: float = 5.0,
+        max_concurrency: int = 2,
+        heartbeat_seconds: float = 30.0,
+        stale_seconds: float = 180.0,
+        max_attempts: int = 3
+    ):
+        """
+        Args:
+            poll_seconds: 대기 작업 확인 간격 (초, notify()로 즉시 깨울 수 있음)
+            max_concurrency: 이 인스턴스에서 동시에 실행하는 작업 수
+            heartbeat_seconds: 실행 중인 작업의 heartbeat 갱신 간격 (초)
+            stale_seconds: heartbeat가 이 시간보다 오래된 실행 중 작업은 중단된 것으로 보고 다시 대기 상태로
+            max_attempts: 작업을 실행(재개 포함)하는 최대 횟수 (워커 종료로 되돌린 실행은 세지 않음)
+        """
+        self.poll_seconds = poll_seconds
+        self.max_concurrency = max_concurrency
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.is_running = False
+        self.task = None
+        self._wakeup = asyncio.Event()
+        self._tasks: Set[asyncio.Task] = set()
+        self._running_users: Set[str] = set()
+        self._lost_jobs: Set[str] = set()  # 다른 인스턴스가 다시 선점하여 이 인스턴스에서 중단한 작업
+
+    async def start(self):
+        """워커 시작"""
+        if self.is_running:
+            logger.warning("[SYNC_JOB] 워커가 이미 실행 중입니다.")
+            return
+
+        self.is_running = True
+        logger.info(f"[SYNC_JOB] 동기화 작업 워커 시작 (동시 실행: {self.max_concurrency}개)")
+        self.task = asyncio.create_task(self._run_loop())
+
+    async def stop(self):
+        """워커 중지 (실행 중인 작업은 대기 상태로 되돌려 다음 실행 때 이어서 처리)"""
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        tasks = ([self.task] if self.task else []) + list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._tasks.clear()
+        logger.info("[SYNC_JOB] 동기화 작업 워커 중지")
+
+    def notify(self):
+        """새 작업 등록 시 대기 중인 워커를 즉시 깨움"""
+        self._wakeup.set()
+
+    async def _run_loop(self):
+        """워커 루프"""
+        while self.is_running:
+            try:
+                await asyncio.to_thread(self._recover_stale_jobs)
+                await self._dispatch_jobs()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+            except asyncio.CancelledError:
+                logger.info("[SYNC_JOB] 워커 취소됨")
+                break
+            except Exception as e:
+                logger.error(f"[SYNC_JOB] 워커 오류: {e}", exc_info=True)
+                await asyncio.sleep(self.poll_seconds)
+
+    def _recover_stale_jobs(self):
+        """heartbeat가 끊긴 실행 중 작업(인스턴스 종료 등)을 다시 대기 상태로 (최대 실행 횟수에 도달한 작업은 실패 처리)"""
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            threshold = now - timedelta(seconds=self.stale_seconds)
+
+            def _stale_jobs():
+                return db.query(CalendarSyncJob).filter(
+                    CalendarSyncJob.status == JOB_STATUS_RUNNING,
+                    CalendarSyncJob.heartbeat_at < threshold,
+                    CalendarSyncJob.deleted_at.is_(None)
+                )
+
+            failed = _stale_jobs().filter(
+                CalendarSyncJob.attempts >= self.max_attempts
+            ).update({
+                CalendarSyncJob.status: JOB_STATUS_FAILED,
+                CalendarSyncJob.error_message: f"작업이 {self.max_attempts}번 중단되어 더 이상 다시 실행하지 않습니다.",
+                CalendarSyncJob.finished_at: now
+            }, synchronize_session=False)
+            recovered = _stale_jobs().update(
+                {CalendarSyncJob.status: JOB_STATUS_PENDING}, synchronize_session=False
+            )
+            db.commit()
+            if failed:
+                logger.error(f"[SYNC_JOB] {self.max_attempts}번 중단된 작업 {failed}개를 실패 처리")
+            if recovered:
+                logger.warning(f"[SYNC_JOB] 중단된 작업 {recovered}개를 대기 상태로 되돌림 (체크포인트부터 이어서 실행)")
+        finally:
+            db.close()
+
+    async def _dispatch_jobs(self):
+        """빈 실행 슬롯만큼 대기 작업을 가져와 실행 (사용자당 하나씩)"""
+        free_slots = self.max_concurrency - len(self._tasks)
+        if free_slots <= 0:
+            return
+
+        claimed = await asyncio.to_thread(self._claim_jobs, free_slots, set(self._running_users))
+        for job_id, user_id, attempt in claimed:
+            self._running_users.add(user_id)
+            task = asyncio.create_task(self._run_job(job_id, user_id, attempt))
+            self._tasks.add(task)
+            task.add_done_callback(self._on_job_done)
+
+    def _claim_jobs(self, free_slots: int, running_users: Set[str]) -> List[Tuple[str, str, int]]:
+        """
+        대기 작업을 최대 free_slots개 선점
+
+        Returns:
+            [(job_id, user_id, 선점한 attempts 값)]
+        """
+        db = SessionLocal()
+        try:
+            running = aliased(CalendarSyncJob)
+            query = db.query(CalendarSyncJob.id, CalendarSyncJob.user_id).filter(
+                CalendarSyncJob.status == JOB_STATUS_PENDING,
+                CalendarSyncJob.deleted_at.is_(None),
+                # 다른 인스턴스에서 같은 사용자의 작업이 실행 중이면 건너뜀
+                ~exists().where(
+                    running.user_id == CalendarSyncJob.user_id,
+                    running.status == JOB_STATUS_RUNNING,
+                    running.deleted_at.is_(None)
+                )
+            )
+            if running_users:
+                query = query.filter(CalendarSyncJob.user_id.notin_(running_users))
+            candidates = query.order_by(CalendarSyncJob.created_at).limit(free_slots * 4).all()
+
+            claimed = []
+            for job_id, user_id in candidates:
+                if len(claimed) >= free_slots:
+                    break
+                if user_id in running_users:
+                    continue
+                # 다른 인스턴스와 동시에 가져가지 않도록 조건부 UPDATE로 선점
+                try:
+                    count = db.query(CalendarSyncJob).filter(
+                        CalendarSyncJob.id == job_id,
+                        CalendarSyncJob.status == JOB_STATUS_PENDING
+                    ).update({
+                        CalendarSyncJob.status: JOB_STATUS_RUNNING,
+                        CalendarSyncJob.heartbeat_at: datetime.utcnow(),
+                        CalendarSyncJob.attempts: func.coalesce(CalendarSyncJob.attempts, 0) + 1
+                    }, synchronize_session=False)
+                    db.commit()
+                except IntegrityError:
+                    # 같은 사용자의 다른 작업이 그 사이 실행을 시작함 (idx_calendar_sync_jobs_user_running)
+                    db.rollback()
+                    continue
+                if not count:
+                    continue
+
+                attempt = db.query(CalendarSyncJob.attempts).filter(CalendarSyncJob.id == job_id).scalar()
+                running_users.add(user_id)
+                claimed.append((job_id, user_id, attempt))
+            return claimed
+        finally:
+            db.close()
+
+    def _on_job_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        # 빈 슬롯이 생겼으므로 다음 작업 확인
+        self._wakeup.set()
+
+    @staticmethod
+    def _touch_heartbeat(job_id: str, attempt: int) -> bool:
+        """heartbeat 갱신. 이 실행이 더 이상 작업을 갖고 있지 않으면(다른 곳에서 다시 선점) False"""
+        db = SessionLocal()
+        try:
+            updated = db.query(CalendarSyncJob).filter(
+                CalendarSyncJob.id == job_id,
+                CalendarSyncJob.status == JOB_STATUS_RUNNING,
+                CalendarSyncJob.attempts == attempt
+            ).update({CalendarSyncJob.heartbeat_at: datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+            return updated > 0
+        finally:
+            db.close()
+
+    async def _heartbeat_loop(self, job_id: str, attempt: int, job_task: asyncio.Task):
+        """긴 API 호출 중에도 작업이 살아있음을 기록 (작업을 잃으면 job_task 취소)"""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                owned = await asyncio.to_thread(self._touch_heartbeat, job_id, attempt)
+            except Exception as e:
+                logger.warning(f"[SYNC_JOB] heartbeat 갱신 실패 - job_id={job_id}: {e}")
+                continue
+            if not owned:
+                logger.warning(f"[SYNC_JOB] 다른 인스턴스가 작업을 다시 가져감, 이 인스턴스의 실행 중단 - job_id={job_id}")
+                self._lost_jobs.add(job_id)
+                job_task.cancel()
+                return
+
+    @staticmethod
+    def _load_job(db: Session, job_id: str, user_id: str) -> Tuple[Optional[CalendarSyncJob], Optional[User]]:
+        job = db.query(CalendarSyncJob).filter(CalendarSyncJob.id == job_id).first()
+        if not job:
+            return None, None
+        if not job.started_at:
+            job.started_at = datetime.utcnow()
+            db.commit()
+        user = db.query(User).filter(User.id == user_id, User.deleted_at.is_(None)).first()
+        return job, user
+
+    @staticmethod
+    def _complete_job(db: Session, job: CalendarSyncJob, result: Dict[str, Any]):
+        job.status = JOB_STATUS_COMPLETED
+        job.result = json.dumps(result, ensure_ascii=False, default=str)
+        job.finished_at = datetime.utcnow()
+        db.commit()
+
+    @staticmethod
+    def _fail_job(db: Session, job: Optional[CalendarSyncJob], error: str):
+        db.rollback()
+        if job:
+            job.status = JOB_STATUS_FAILED
+            job.error_message = error
+            job.finished_at = datetime.utcnow()
+            db.commit()
+
+    async def _run_job(self, job_id: str, user_id: str, attempt: int):
+        """작업 실행 (요청과 분리된 DB 세션 사용, 조회/커밋은 작업 스레드에서)"""
+        # 작업 스레드에서 커밋한 뒤 이벤트 루프에서 객체 속성을 읽을 때 다시 조회하지 않도록 만료하지 않음
+        db = SessionLocal(expire_on_commit=False)
+        heartbeat = asyncio.create_task(self._heartbeat_loop(job_id, attempt, asyncio.current_task()))
+        job = None
+        try:
+            job, user = await run_in_thread(self._load_job, db, job_id, user_id)
+            if not job:
+                return
+            if not user or not user.google_calendar_token:
+                raise ValueError("Google Calendar 연동이 필요합니다. 설정에서 연동해주세요.")
+
+            if job.job_type == JOB_TYPE_SYNC_ALL:
+                result = await CalendarSyncJobService.run_sync_all(db, user, job)
+            elif job.job_type == JOB_TYPE_EXPORT:
+                result = await CalendarSyncJobService.run_export(db, user, job)
+            else:
+                raise ValueError(f"알 수 없는 작업 종류: {job.job_type}")
+
+            await run_in_thread(self._complete_job, db, job, result)
+            logger.info(f"[SYNC_JOB] 작업 완료 - job_id={job_id}, type={job.job_type}")
+        except asyncio.CancelledError:
+            db.rollback()
+            if job_id in self._lost_jobs:
+                # 다른 인스턴스가 실행 중이므로 상태를 건드리지 않음
+                self._lost_jobs.discard(job_id)
+                raise
+            # 워커 종료: 체크포인트는 이미 저장되어 있으므로 대기 상태로 되돌려 다음 실행 때 이어서 처리 (실행 횟수에서 제외)
+            if job:
+                job.status = JOB_STATUS_PENDING
+                job.attempts = max(0, attempt - 1)
+                db.commit()
+            logger.info(f"[SYNC_JOB] 워커 종료로 작업 중단, 대기 상태로 되돌림 - job_id={job_id}")
+            raise
+        except Exception as e:
+            logger.error(f"[SYNC_JOB] 작업 실패 - job_id={job_id}: {e}", exc_info=True)
+            await run_in_thread(self._fail_job, db, job, str(e))
+        finally:
+            heartbeat.cancel()
+            db.close()
+            self._running_users.discard(user_id)
+
+
+# 전역 동기화 작업 워커 인스턴스
+calendar_sync_worker = CalendarSyncJobWorker(poll_seconds=5.0, max_concurrency=2)
@@ -0,0 +1,101 @@
+"""
+기기별 FCM 토큰 관리 (device_tokens)
+사용자 한 명이 여러 기기(브라우저/앱)에서 푸시 알림을 받을 수 있도록 토큰을 기기마다 한 행으로 저장합니다.
+
+- 같은 토큰을 다시 등록하면 last_seen_at만 갱신 (다른 계정으로 로그인한 기기는 소유자를 옮김)
+- 사용자당 최근 MAX_DEVICES_PER_USER개까지만 유지
+- FCM이 등록 해제(UNREGISTERED)로 응답한 토큰은 발송 결과를 기록할 때 한꺼번에 삭제
+"""
+import logging
+from datetime import datetime
+from typing import List, Dict, Iterable
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.models import DeviceToken
+
+logger = logging.getLogger(__name__)
+
+# 사용자당 유지하는 최대 기기 수 (오래 안 쓴 기기부터 삭제)
+MAX_DEVICES_PER_USER = 10
+# IN 목록 최대 크기 (SQLite 바인드 변수 제한)
+_CHUNK_SIZE = 500
+
+
+class DeviceTokenService:
+    """기기별 FCM 토큰 서비스"""
+
+    @staticmethod
+    def register(db: Session, user_id: str, token: str):
+        """토큰 등록 또는 갱신 (커밋까지 수행)"""
+        now = datetime.utcnow()
+        device = db.query(DeviceToken).filter(DeviceToken.token == token).first()
+        if device is None:
+            db.add(DeviceToken(user_id=user_id, token=token, last_seen_at=now))
+            try:
+                db.commit()
+            except IntegrityError:
+                # 같은 토큰이 동시에 등록된 경우: 먼저 들어간 행을 갱신
+                db.rollback()
+                device = db.query(DeviceToken).filter(DeviceToken.token == token).first()
+        if device is not None:
+            device.user_id = user_id
+            device.last_seen_at = now
+            db.commit()
+
+        # 오래된 기기 정리
+        stale_ids = [
+            row.id for row in db.query(DeviceToken.id).filter(
+                DeviceToken.user_id == user_id
+            ).order_by(DeviceToken.last_seen_at.desc()).offset(MAX_DEVICES_PER_USER).all()
+        ]
+        if stale_ids:
+            db.query(DeviceToken).filter(DeviceToken.id.in_(stale_ids)).delete(synchronize_session=False)
+            db.commit()
+            logger.info(f"[FCM_TOKEN] 오래된 기기 토큰 {len(stale_ids)}개 삭제 - user_id: {user_id}")
+
+    @staticmethod
+    def unregister(db: Session, user_id: str, token: str = None) -> int:
+        """토큰 삭제 (token이 없으면 사용자의 모든 기기). 삭제한 수 반환, 커밋은 호출하는 쪽에서"""
+        query = db.query(DeviceToken).filter(DeviceToken.user_id == user_id)
+        if token:
+            query = query.filter(DeviceToken.token == token)
+        return query.delete(synchronize_session=False)
+
+    @staticmethod
+    def tokens_for_user(db: Session, user_id: str) -> List[str]:
+        """사용자의 기기 토큰 목록 (최근 등록 순)"""
+        rows = db.query(DeviceToken.token).filter(
+            DeviceToken.user_id == user_id
+        ).order_by(DeviceToken.last_seen_at.desc()).all()
+        return [row.token for row in rows]
+
+    @staticmethod
+    def tokens_for_users(db: Session, user_ids: List[str]) -> Dict[str, List[str]]:
+        """여러 사용자의 기기 토큰을 IN 조회로 한 번에 가져옴 {user_id: [토큰, ...]} (최근 등록 순)"""
+        tokens: Dict[str, List[str]] = {}
+        for index in range(0, len(user_ids), _CHUNK_SIZE):
+            rows = db.query(DeviceToken.user_id, DeviceToken.token).filter(
+                DeviceToken.user_id.in_(user_ids[index:index + _CHUNK_SIZE])
+            ).order_by(DeviceToken.user_id, DeviceToken.last_seen_at.desc()).all()
+            for row in rows:
+                tokens.setdefault(row.user_id, []).append(row.token)
+        return tokens
+
+    @staticmethod
+    def has_tokens(db: Session, user_id: str) -> bool:
+        return db.query(DeviceToken.id).filter(DeviceToken.user_id == user_id).first() is not None
+
+    @staticmethod
+    def prune(db: Session, tokens: Iterable[str]) -> int:
+        """FCM이 유효하지 않다고 응답한 토큰 일괄 삭제. 삭제한 수 반환, 커밋은 호출하는 쪽에서"""
+        tokens = list(set(tokens))
+        deleted = 0
+        for index in range(0, len(tokens), _CHUNK_SIZE):
+            deleted += db.query(DeviceToken).filter(
+                DeviceToken.token.in_(tokens[index:index + _CHUNK_SIZE])
+            ).delete(synchronize_session=False)
+        if deleted:
+            logger.info(f"[FCM_TOKEN] 등록 해제된 기기 토큰 {deleted}개 삭제")
+        return deleted
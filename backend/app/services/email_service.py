@@ -1,20 +1,59 @@
 """
 이메일 발송 서비스
 """
-import smtplib
 import logging
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 import os
 
+from app.services.outbound_connections import outbound
+from app.services.smtp_sender import smtp_sender
+
 logger = logging.getLogger(__name__)
 
 
 class EmailService:
     """이메일 발송 서비스"""
     
+    @staticmethod
+    def _smtp_config() -> Dict[str, Any]:
+        """SMTP 설정 (환경 변수에서 가져오기)"""
+        smtp_user = os.getenv("SMTP_USER", "")
+        return {
+            'host': os.getenv("SMTP_HOST", "smtp.gmail.com"),
+            'port': int(os.getenv("SMTP_PORT", "587")),
+            'user': smtp_user,
+            'password': os.getenv("SMTP_PASSWORD", ""),
+            'from_email': os.getenv("SMTP_FROM_EMAIL", smtp_user),
+            'starttls': os.getenv("SMTP_STARTTLS", "true").lower() == "true"  # 로컬 SMTP sink는 false
+        }
+    
+    @staticmethod
+    def _build_message(
+        from_email: str,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None
+    ) -> MIMEMultipart:
+        # 이메일 메시지 생성
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = from_email
+        msg['To'] = to_email
+        
+        # 텍스트 본문 추가
+        if text_content:
+            text_part = MIMEText(text_content, 'plain', 'utf-8')
+            msg.attach(text_part)
+        
+        # HTML 본문 추가
+        html_part = MIMEText(html_content, 'html', 'utf-8')
+        msg.attach(html_part)
+        return msg
+    
     @staticmethod
     def send_email(
         to_email: str,
@@ -35,37 +74,17 @@ class EmailService:
             발송 성공 여부
         """
         try:
-            # SMTP 설정 (환경 변수에서 가져오기)
-            smtp_host = os.getenv("SMTP_HOST", "smtp.gmail.com")
-            smtp_port = int(os.getenv("SMTP_PORT", "587"))
-            smtp_user = os.getenv("SMTP_USER", "")
-            smtp_password = os.getenv("SMTP_PASSWORD", "")
-            smtp_from_email = os.getenv("SMTP_FROM_EMAIL", smtp_user)
+            config = EmailService._smtp_config()
             
             # SMTP 설정이 없으면 발송하지 않음
-            if not smtp_user or not smtp_password:
+            if not config['user'] or not config['password']:
                 logger.warning("[EMAIL] SMTP 설정이 없어 이메일을 발송할 수 없습니다.")
                 return False
             
-            # 이메일 메시지 생성
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = smtp_from_email
-            msg['To'] = to_email
-            
-            # 텍스트 본문 추가
-            if text_content:
-                text_part = MIMEText(text_content, 'plain', 'utf-8')
-                msg.attach(text_part)
-            
-            # HTML 본문 추가
-            html_part = MIMEText(html_content, 'html', 'utf-8')
-            msg.attach(html_part)
+            msg = EmailService._build_message(config['from_email'], to_email, subject, html_content, text_content)
             
-            # SMTP 서버 연결 및 발송
-            with smtplib.SMTP(smtp_host, smtp_port) as server:
-                server.starttls()  # TLS 암호화
-                server.login(smtp_user, smtp_password)
+            # SMTP 발송 (로그인된 연결을 풀에서 재사용, 없으면 새로 연결)
+            with outbound.smtp_connection(config['host'], config['port'], config['user'], config['password']) as server:
                 server.send_message(msg)
             
             logger.info(f"[EMAIL] 이메일 발송 성공: {to_email}, 제목: {subject}")
@@ -76,8 +95,46 @@ class EmailService:
             return False
     
     @staticmethod
-    def send_notification_email(
+    async def send_email_async(
         to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None
+    ) -> bool:
+        """
+        이메일 발송 (비동기, 로그인된 연결을 재사용하는 SMTP 발송기 사용)
+        알림처럼 여러 통을 연달아 보낼 때 사용합니다.
+        
+        Returns:
+            발송 성공 여부
+        """
+        try:
+            config = EmailService._smtp_config()
+            
+            # SMTP 설정이 없으면 발송하지 않음
+            if not config['user'] or not config['password']:
+                logger.warning("[EMAIL] SMTP 설정이 없어 이메일을 발송할 수 없습니다.")
+                return False
+            
+            msg = EmailService._build_message(config['from_email'], to_email, subject, html_content, text_content)
+            await smtp_sender.send(
+                msg,
+                host=config['host'],
+                port=config['port'],
+                user=config['user'],
+                password=config['password'],
+                starttls=config['starttls']
+            )
+            
+            logger.info(f"[EMAIL] 이메일 발송 성공: {to_email}, 제목: {subject}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"[EMAIL] 이메일 발송 실패: {to_email}, 오류: {e}", exc_info=True)
+            return False
+    
+    @staticmethod
+    def render_notification_email(
         todo_title: str,
         todo_date: str,
         todo_time: Optional[str] = None,
@@ -89,12 +146,11 @@ class EmailService:
         todo_checklist: Optional[list] = None,
         todo_memo: Optional[str] = None,
         assigned_members: Optional[list] = None
-    ) -> bool:
+    ) -> Tuple[str, str, str]:
         """
-        일정 알림 이메일 발송
+        일정 알림 이메일 제목/본문 생성
         
         Args:
-            to_email: 수신자 이메일
             todo_title: 일정 제목
             todo_date: 일정 날짜
             todo_time: 일정 시간 (선택사항)
@@ -105,7 +161,7 @@ class EmailService:
             todo_memo: 메모 (선택사항)
         
         Returns:
-            발송 성공 여부
+            (제목, HTML 본문, 텍스트 본문)
         """
         # 이메일 제목
         if reminder_time:
@@ -286,5 +342,195 @@ class EmailService:
         
         text_content = "\n".join(text_parts)
         
+        return subject, html_content, text_content
+    
+    @staticmethod
+    def send_notification_email(
+        to_email: str,
+        todo_title: str,
+        todo_date: str,
+        todo_time: Optional[str] = None,
+        todo_end_time: Optional[str] = None,
+        is_all_day: bool = False,
+        reminder_time: Optional[str] = None,
+        todo_location: Optional[str] = None,
+        todo_category: Optional[str] = None,
+        todo_checklist: Optional[list] = None,
+        todo_memo: Optional[str] = None,
+        assigned_members: Optional[list] = None
+    ) -> bool:
+        """
+        일정 알림 이메일 발송 (인자는 render_notification_email 참고)
+        
+        Returns:
+            발송 성공 여부
+        """
+        subject, html_content, text_content = EmailService.render_notification_email(
+            todo_title=todo_title,
+            todo_date=todo_date,
+            todo_time=todo_time,
+            todo_end_time=todo_end_time,
+            is_all_day=is_all_day,
+            reminder_time=reminder_time,
+            todo_location=todo_location,
+            todo_category=todo_category,
+            todo_checklist=todo_checklist,
+            todo_memo=todo_memo,
+            assigned_members=assigned_members
+        )
         return EmailService.send_email(to_email, subject, html_content, text_content)
+    
+    @staticmethod
+    async def send_notification_email_async(
+        to_email: str,
+        todo_title: str,
+        todo_date: str,
+        todo_time: Optional[str] = None,
+        todo_end_time: Optional[str] = None,
+        is_all_day: bool = False,
+        reminder_time: Optional[str] = None,
+        todo_location: Optional[str] = None,
+        todo_category: Optional[str] = None,
+        todo_checklist: Optional[list] = None,
+        todo_memo: Optional[str] = None,
+        assigned_members: Optional[list] = None
+    ) -> bool:
+        """
+        일정 알림 이메일 발송 (비동기, 알림 발송 파이프라인용)
+        
+        Returns:
+            발송 성공 여부
+        """
+        subject, html_content, text_content = EmailService.render_notification_email(
+            todo_title=todo_title,
+            todo_date=todo_date,
+            todo_time=todo_time,
+            todo_end_time=todo_end_time,
+            is_all_day=is_all_day,
+            reminder_time=reminder_time,
+            todo_location=todo_location,
+            todo_category=todo_category,
+            todo_checklist=todo_checklist,
+            todo_memo=todo_memo,
+            assigned_members=assigned_members
+        )
+        return await EmailService.send_email_async(to_email, subject, html_content, text_content)
 
+    
+    @staticmethod
+    def render_digest_email(window_label: str, items: List[Dict[str, Any]]) -> Tuple[str, str, str]:
+        """
+        여러 일정 알림을 묶은 이메일 제목/본문 생성 (알림 시각 순으로 한 통에 정리)
+        
+        Args:
+            window_label: 묶음 범위 설명 (예: "오늘의 일정", "14:00 - 15:00 일정")
+            items: [{'todo_title', 'todo_date', 'todo_time', 'todo_end_time', 'is_all_day',
+                     'reminder_time', 'todo_location', 'fire_time'}] (fire_time: 알림 시각 "HH:MM")
+        
+        Returns:
+            (제목, HTML 본문, 텍스트 본문)
+        """
+        subject = f"{window_label}: 일정 알림 {len(items)}개"
+        
+        def time_label(item: Dict[str, Any]) -> str:
+            if item.get('is_all_day'):
+                return "하루종일"
+            if item.get('todo_time'):
+                if item.get('todo_end_time'):
+                    return f"{item['todo_time']} - {item['todo_end_time']}"
+                return item['todo_time']
+            return ""
+        
+        rows = []
+        text_rows = []
+        for item in items:
+            details = [item['todo_date']]
+            if time_label(item):
+                details.append(time_label(item))
+            if item.get('todo_location'):
+                details.append(item['todo_location'])
+            detail_text = " · ".join(details)
+            rows.append(
+                f"<div class='info-box'>"
+                f"<p style='margin: 4px 0; color: #6b7280; font-size: 13px;'>{item['fire_time']} 알림 ({item['reminder_time']})</p>"
+                f"<p style='margin: 4px 0;'><strong>{item['todo_title']}</strong></p>"
+                f"<p style='margin: 4px 0; font-size: 14px;'>{detail_text}</p>"
+                f"</div>"
+            )
+            text_rows.append(f"- [{item['fire_time']} 알림, {item['reminder_time']}] {item['todo_title']} ({detail_text})")
+        
+        html_content = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <style>
+                body {{
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
+                    line-height: 1.6;
+                    color: #333;
+                    max-width: 600px;
+                    margin: 0 auto;
+                    padding: 20px;
+                }}
+                .container {{
+                    background-color: #ffffff;
+                    border: 1px solid #e5e7eb;
+                    border-radius: 8px;
+                    padding: 24px;
+                }}
+                .header {{
+                    background: linear-gradient(to right, #FF9B82, #FFB499);
+                    color: white;
+                    padding: 16px;
+                    border-radius: 8px 8px 0 0;
+                    margin: -24px -24px 24px -24px;
+                }}
+                .info-box {{
+                    background-color: #f9fafb;
+                    border-left: 4px solid #FF9B82;
+                    padding: 8px 16px;
+                    margin: 12px 0;
+                    border-radius: 4px;
+                }}
+                .footer {{
+                    margin-top: 24px;
+                    padding-top: 16px;
+                    border-top: 1px solid #e5e7eb;
+                    font-size: 12px;
+                    color: #6b7280;
+                    text-align: center;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h2 style="margin: 0; color: white;">{window_label}</h2>
+                </div>
+                <p style="color: #6b7280; font-size: 14px; margin-bottom: 16px;">
+                    Always Plan에서 일정 알림 {len(items)}개를 한 번에 알려드립니다.
+                </p>
+                {"".join(rows)}
+                <div class="footer">
+                    <p>이 이메일은 Always Plan에서 자동으로 발송되었습니다. 알림 묶음 설정은 앱의 알림 설정에서 바꿀 수 있습니다.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+        
+        text_content = "\n".join([
+            window_label,
+            f"Always Plan에서 일정 알림 {len(items)}개를 한 번에 알려드립니다.",
+            "",
+            *text_rows
+        ])
+        
+        return subject, html_content, text_content
+    
+    @staticmethod
+    async def send_digest_email_async(to_email: str, window_label: str, items: List[Dict[str, Any]]) -> bool:
+        """일정 알림 묶음 이메일 발송 (인자는 render_digest_email 참고)"""
+        subject, html_content, text_content = EmailService.render_digest_email(window_label, items)
+        return await EmailService.send_email_async(to_email, subject, html_content, text_content)
@@ -1,10 +1,16 @@
 """
 FCM (Firebase Cloud Messaging) 웹 푸시 알림 서비스
+여러 기기/여러 알림을 messaging.send_each로 한 번에 보내고, 등록 해제된 토큰은 결과로 알려 일괄 삭제합니다.
 """
+import asyncio
 import json
 import logging
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, List, Dict, Any
+
+from sqlalchemy.orm import Session
+
+from app.services.device_token_service import DeviceTokenService
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +78,51 @@ def initialize_firebase():
 class FCMService:
     """Firebase Cloud Messaging 서비스"""
 
+    # messaging.send_each 한 번에 보낼 수 있는 최대 메시지 수
+    MAX_BATCH_SIZE = 500
+
+    @staticmethod
+    def _build_message(
+        token: str,
+        title: str,
+        body: str,
+        data: Optional[Dict[str, str]] = None,
+        icon: Optional[str] = None,
+        click_action: Optional[str] = None
+    ):
+        """FCM 메시지 생성 (웹 푸시 설정 포함)"""
+        from firebase_admin import messaging
+
+        # 웹 푸시 설정
+        webpush_config = messaging.WebpushConfig(
+            notification=messaging.WebpushNotification(
+                title=title,
+                body=body,
+                icon=icon or '/icons/icon-192x192.png',
+            ),
+            fcm_options=messaging.WebpushFCMOptions(
+                link=click_action or '/'
+            )
+        )
+
+        return messaging.Message(
+            notification=messaging.Notification(
+                title=title,
+                body=body
+            ),
+            data=data or {},
+            token=token,
+            webpush=webpush_config
+        )
+
+    @staticmethod
+    def _is_stale_token_error(error: Optional[Exception]) -> bool:
+        """기기 토큰이 더 이상 유효하지 않다는 응답인지 (앱 삭제/토큰 만료, 다른 프로젝트의 토큰)"""
+        if error is None:
+            return False
+        from firebase_admin import messaging
+        return isinstance(error, (messaging.UnregisteredError, messaging.SenderIdMismatchError))
+
     @staticmethod
     async def send_push_notification(
         token: str,
@@ -82,7 +133,7 @@ class FCMService:
         click_action: Optional[str] = None
     ) -> bool:
         """
-        웹 푸시 알림 발송
+        웹 푸시 알림 발송 (토큰 하나)
 
         Args:
             token: FCM 토큰 (프론트엔드에서 받은 토큰)
@@ -95,68 +146,94 @@ class FCMService:
         Returns:
             성공 시 True, 실패 시 False
         """
-        if not initialize_firebase():
-            logger.warning("[FCM] Firebase가 초기화되지 않아 푸시 알림을 보낼 수 없습니다.")
-            return False
+        results = await FCMService.send_each([{
+            'token': token,
+            'title': title,
+            'body': body,
+            'data': data,
+            'icon': icon,
+            'click_action': click_action
+        }])
+        return results[0]['success']
 
-        try:
-            from firebase_admin import messaging
-
-            # 웹 푸시 설정
-            webpush_config = messaging.WebpushConfig(
-                notification=messaging.WebpushNotification(
-                    title=title,
-                    body=body,
-                    icon=icon or '/icons/icon-192x192.png',
-                ),
-                fcm_options=messaging.WebpushFCMOptions(
-                    link=click_action or '/'
-                )
-            )
+    @staticmethod
+    async def send_each(messages: List[Dict[str, Any]]) -> List[Dict[str, bool]]:
+        """
+        여러 토큰으로 웹 푸시 알림 일괄 발송 (MAX_BATCH_SIZE개씩 messaging.send_each 한 번으로 발송)
 
-            # 메시지 생성
-            message = messaging.Message(
-                notification=messaging.Notification(
-                    title=title,
-                    body=body
-                ),
-                data=data or {},
-                token=token,
-                webpush=webpush_config
-            )
+        Args:
+            messages: [{'token', 'title', 'body', 'data'(선택), 'icon'(선택), 'click_action'(선택)}]
 
-            # 메시지 발송
-            response = messaging.send(message)
-            logger.info(f"[FCM] 푸시 알림 발송 성공: {response}")
-            return True
+        Returns:
+            메시지마다 {'success': 발송 성공 여부, 'stale': 토큰이 등록 해제되어 삭제해야 하는지} (순서 동일)
+        """
+        results = [{'success': False, 'stale': False} for _ in messages]
+        if not messages:
+            return results
+        if not initialize_firebase():
+            logger.warning("[FCM] Firebase가 초기화되지 않아 푸시 알림을 보낼 수 없습니다.")
+            return results
+
+        from firebase_admin import messaging
+
+        for start in range(0, len(messages), FCMService.MAX_BATCH_SIZE):
+            chunk = messages[start:start + FCMService.MAX_BATCH_SIZE]
+            try:
+                fcm_messages = [
+                    FCMService._build_message(
+                        token=message['token'],
+                        title=message['title'],
+                        body=message['body'],
+                        data=message.get('data'),
+                        icon=message.get('icon'),
+                        click_action=message.get('click_action')
+                    )
+                    for message in chunk
+                ]
+                # 블로킹 HTTP 호출이므로 작업 스레드에서 실행
+                batch_response = await asyncio.to_thread(messaging.send_each, fcm_messages)
+            except Exception as e:
+                logger.error(f"[FCM] 푸시 알림 일괄 발송 실패 ({len(chunk)}개): {e}", exc_info=True)
+                continue
+
+            stale_count = 0
+            for offset, response in enumerate(batch_response.responses):
+                result = results[start + offset]
+                if response.success:
+                    result['success'] = True
+                elif FCMService._is_stale_token_error(response.exception):
+                    result['stale'] = True
+                    stale_count += 1
+                else:
+                    logger.warning(f"[FCM] 푸시 알림 발송 실패: {chunk[offset]['token'][:20]}..., 오류: {response.exception}")
+
+            logger.info(
+                f"[FCM] 푸시 알림 일괄 발송: 성공 {batch_response.success_count}개, "
+                f"실패 {batch_response.failure_count}개 (등록 해제된 토큰 {stale_count}개)"
+            )
 
-        except Exception as e:
-            error_str = str(e)
-            # 유효하지 않은 토큰 에러 처리
-            if 'Requested entity was not found' in error_str or 'registration-token-not-registered' in error_str:
-                logger.warning(f"[FCM] 유효하지 않은 토큰: {token[:20]}...")
-            else:
-                logger.error(f"[FCM] 푸시 알림 발송 실패: {e}", exc_info=True)
-            return False
+        return results
 
     @staticmethod
     async def send_push_to_user(
+        db: Session,
         user,
         title: str,
         body: str,
         data: Optional[Dict[str, str]] = None
     ) -> bool:
         """
-        사용자에게 푸시 알림 발송
+        사용자의 모든 기기에 푸시 알림 발송 (등록 해제된 토큰은 삭제)
 
         Args:
+            db: 데이터베이스 세션 (기기 토큰 조회/정리, 커밋까지 수행)
             user: User 모델 객체
             title: 알림 제목
             body: 알림 내용
             data: 추가 데이터 (선택)
 
         Returns:
-            성공 시 True, 실패 시 False
+            기기 하나 이상에 발송되면 True, 아니면 False
         """
         # 알림 설정 확인
         preference = getattr(user, 'notification_preference', 'email')
@@ -168,22 +245,26 @@ class FCMService:
             logger.info(f"[FCM] 사용자가 이메일 알림만 설정: {user.email}")
             return False
 
-        # FCM 토큰 확인
-        fcm_token = getattr(user, 'fcm_token', None)
-        if not fcm_token:
+        # 기기 토큰 확인
+        tokens = DeviceTokenService.tokens_for_user(db, user.id)
+        if not tokens:
             logger.info(f"[FCM] FCM 토큰 없음: {user.email}")
             return False
 
         # 푸시 알림 발송
-        return await FCMService.send_push_notification(
-            token=fcm_token,
-            title=title,
-            body=body,
-            data=data
-        )
+        results = await FCMService.send_each([
+            {'token': token, 'title': title, 'body': body, 'data': data}
+            for token in tokens
+        ])
+        stale_tokens = [token for token, result in zip(tokens, results) if result['stale']]
+        if stale_tokens:
+            DeviceTokenService.prune(db, stale_tokens)
+            db.commit()
+        return any(result['success'] for result in results)
 
     @staticmethod
     async def send_todo_reminder(
+        db: Session,
         user,
         todo_title: str,
         reminder_time: str,
@@ -193,6 +274,7 @@ class FCMService:
         일정 알림 푸시 발송
 
         Args:
+            db: 데이터베이스 세션
             user: User 모델 객체
             todo_title: 일정 제목
             reminder_time: 알림 시간 설명 (예: "10분 전", "1시간 전")
@@ -201,6 +283,18 @@ class FCMService:
         Returns:
             성공 시 True, 실패 시 False
         """
+        title, body, data = FCMService.todo_reminder_message(todo_title, reminder_time, todo_id)
+        return await FCMService.send_push_to_user(
+            db=db,
+            user=user,
+            title=title,
+            body=body,
+            data=data
+        )
+
+    @staticmethod
+    def todo_reminder_message(todo_title: str, reminder_time: str, todo_id: Optional[str]):
+        """일정 알림 푸시의 (제목, 내용, 데이터)"""
         title = "일정 알림"
         body = f"{todo_title} - {reminder_time}"
 
@@ -208,10 +302,4 @@ class FCMService:
         if todo_id:
             data['todo_id'] = str(todo_id)
             data['type'] = 'todo_reminder'
-
-        return await FCMService.send_push_to_user(
-            user=user,
-            title=title,
-            body=body,
-            data=data
-        )
+        return title, body, data
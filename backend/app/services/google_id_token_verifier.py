@@ -0,0 +1,158 @@
+"""
+Google ID 토큰 검증기 (서명 인증서 캐시)
+google_id_token.verify_oauth2_token은 호출할 때마다 Google 서명 인증서를 HTTP로 다시 받으므로,
+인증서를 메모리에 캐시하고 서명은 로컬에서 검증합니다.
+- Cache-Control: max-age 동안 캐시, 만료 전에 백그라운드에서 미리 갱신
+- 캐시에 없는 kid(키 교체 직후)는 한 번 강제 갱신 후 재시도 (강제 갱신은 최소 간격 제한)
+- 동시에 여러 로그인이 와도 인증서 요청은 하나만 보냄
+"""
+import asyncio
+import logging
+import re
+import time
+from typing import Optional, Dict, Any
+
+import jwt as pyjwt
+from google.auth import jwt as google_jwt
+
+from app.services.outbound_connections import outbound
+
+logger = logging.getLogger(__name__)
+
+# google.oauth2.id_token과 같은 인증서 주소 / 발급자
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE_PATTERN = re.compile(r'max-age=(\d+)')
+
+
+def parse_max_age(cache_control: Optional[str], default: int) -> int:
+    """Cache-Control 헤더의 max-age (초), 없으면 default"""
+    if cache_control:
+        match = _MAX_AGE_PATTERN.search(cache_control)
+        if match:
+            return int(match.group(1))
+    return default
+
+
+class GoogleIdTokenVerifier:
+    """Google 서명 인증서를 캐시하고 ID 토큰을 로컬에서 검증"""
+
+    def __init__(
+        self,
+        default_max_age: int = 3600,
+        refresh_margin_seconds: int = 300,
+        min_force_refresh_seconds: int = 60,
+        clock_skew_seconds: int = 10
+    ):
+        """
+        Args:
+            default_max_age: 응답에 max-age가 없을 때 캐시 시간 (초)
+            refresh_margin_seconds: 만료 이 시간 전에 백그라운드 갱신
+            min_force_refresh_seconds: 모르는 kid로 인한 강제 갱신 최소 간격 (잘못된 토큰으로 인증서 요청이 반복되지 않도록)
+            clock_skew_seconds: iat/exp 검증 허용 오차
+        """
+        self.default_max_age = default_max_age
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.min_force_refresh_seconds = min_force_refresh_seconds
+        self.clock_skew_seconds = clock_skew_seconds
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self.is_running = False
+        self.task = None
+
+    async def start(self):
+        """인증서를 미리 받아두고 백그라운드 갱신 시작"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self.task = asyncio.create_task(self._run_loop())
+        logger.info("[ID_TOKEN] 인증서 캐시 갱신 시작")
+
+    async def stop(self):
+        if not self.is_running:
+            return
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        logger.info("[ID_TOKEN] 인증서 캐시 갱신 중지")
+
+    async def _run_loop(self):
+        """만료 refresh_margin_seconds 전에 갱신 (실패하면 1분 뒤 재시도)"""
+        while self.is_running:
+            try:
+                await self.refresh()
+                delay = max(60.0, self._expires_at - time.time() - self.refresh_margin_seconds)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"[ID_TOKEN] 인증서 갱신 실패 (기존 캐시 유지): {e}")
+                delay = 60.0
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                break
+
+    def _lock(self) -> asyncio.Lock:
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        return self._refresh_lock
+
+    async def refresh(self, force: bool = False) -> Dict[str, str]:
+        """인증서 다시 받기 (다른 요청이 이미 갱신했으면 그 결과 사용)"""
+        requested_at = time.time()
+        async with self._lock():
+            if self._fetched_at >= requested_at or (not force and self._certs and time.time() < self._expires_at - self.refresh_margin_seconds):
+                return self._certs
+            session = outbound.aiohttp_session()
+            async with session.get(GOOGLE_CERTS_URL) as resp:
+                resp.raise_for_status()
+                certs = await resp.json()
+                max_age = parse_max_age(resp.headers.get('Cache-Control'), self.default_max_age)
+            self._certs = certs
+            self._fetched_at = time.time()
+            self._expires_at = self._fetched_at + max_age
+            logger.info(f"[ID_TOKEN] 인증서 갱신 - 키 {len(certs)}개, max-age={max_age}초")
+            return self._certs
+
+    async def get_certs(self, kid: Optional[str] = None) -> Dict[str, str]:
+        """캐시된 인증서 (만료됐거나 kid가 없으면 갱신)"""
+        if not self._certs or time.time() >= self._expires_at:
+            return await self.refresh()
+        if kid and kid not in self._certs and time.time() - self._fetched_at >= self.min_force_refresh_seconds:
+            logger.info(f"[ID_TOKEN] 캐시에 없는 kid={kid}, 인증서 강제 갱신")
+            return await self.refresh(force=True)
+        return self._certs
+
+    async def verify(self, id_token: str, audience: str) -> Dict[str, Any]:
+        """
+        ID 토큰 서명/만료/audience/발급자 검증 (google_id_token.verify_oauth2_token과 같은 검사)
+
+        Raises:
+            ValueError: 검증 실패
+        """
+        try:
+            kid = pyjwt.get_unverified_header(id_token).get('kid')
+        except pyjwt.InvalidTokenError as e:
+            raise ValueError(f"ID 토큰 헤더 파싱 실패: {e}")
+
+        certs = await self.get_certs(kid)
+        idinfo = google_jwt.decode(
+            id_token,
+            certs=certs,
+            audience=audience,
+            clock_skew_in_seconds=self.clock_skew_seconds
+        )
+        if idinfo.get('iss') not in GOOGLE_ISSUERS:
+            raise ValueError(f"잘못된 발급자: {idinfo.get('iss')}")
+        return idinfo
+
+
+# 전역 검증기 인스턴스
+google_id_token_verifier = GoogleIdTokenVerifier()
@@ -0,0 +1,208 @@
+"""
+Google API 호출 제한기 (outbound rate limiter)
+모든 GoogleCalendarService 호출이 거치는 공용 제한기
+- 프로젝트 전체 / 사용자별 토큰 버킷
+- 할당량 오류(403 rateLimitExceeded, 429, 5xx) 시 지수 백오프 + jitter 재시도
+  (5xx는 처리됐는지 알 수 없으므로 insert처럼 멱등하지 않은 요청은 재시도하지 않음)
+- 우선순위 레인: 일괄 작업(bulk)은 프로젝트 버킷 여유분만 사용하여
+  단건 동기화(interactive)가 밀리지 않도록 함
+"""
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Dict, Optional
+
+from googleapiclient.errors import HttpError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = "interactive"  # 사용자 요청에 바로 응답해야 하는 단건 호출
+PRIORITY_BULK = "bulk"  # 일괄 동기화/내보내기, 백그라운드 갱신
+
+# 재시도 대상 403 사유
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded"}
+# 사용자 버킷 정리 주기 (초)
+BUCKET_EVICT_INTERVAL = 60.0
+
+
+class TokenBucket:
+    """토큰 버킷 (rate: 초당 보충 토큰 수, capacity: 최대 토큰 수)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+    def wait_time(self, amount: float = 1, reserve: float = 0) -> float:
+        """
+        amount개를 꺼내려면 기다려야 하는 시간 (reserve: 남겨둬야 하는 토큰 수)
+
+        버킷 크기보다 큰 요청(batch)은 버킷이 가득 차면 통과시키고, 초과분은
+        consume에서 음수(빚)로 남겨 이후 요청이 그만큼 기다리게 함
+        """
+        self._refill()
+        amount = max(min(amount, self.capacity - reserve), 0)
+        missing = amount + reserve - self.tokens
+        return 0.0 if missing <= 0 else missing / self.rate
+
+    def consume(self, amount: float = 1):
+        self._refill()
+        self.tokens -= amount
+
+
+class GoogleApiRateLimiter:
+    """Google API 공용 호출 제한기"""
+
+    def __init__(
+        self,
+        project_rate: float,
+        project_burst: float,
+        user_rate: float,
+        user_burst: float,
+        bulk_reserve_ratio: float = 0.25,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 32.0
+    ):
+        """
+        Args:
+            project_rate / project_burst: 프로젝트 전체 초당 요청 수 / 최대 버스트
+            user_rate / user_burst: 사용자별 초당 요청 수 / 최대 버스트
+            bulk_reserve_ratio: bulk 레인이 손대지 않는 프로젝트 버킷 비율 (interactive 전용 여유분)
+            max_retries: 할당량 오류 시 최대 재시도 횟수
+            base_delay / max_delay: 지수 백오프 기본/최대 대기 시간 (초)
+        """
+        self.project_bucket = TokenBucket(project_rate, project_burst)
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.bulk_reserve = project_burst * bulk_reserve_ratio
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._user_buckets: Dict[str, TokenBucket] = {}
+        self._last_eviction = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._interactive_waiting = 0
+
+    def _user_bucket(self, user_key: str) -> TokenBucket:
+        bucket = self._user_buckets.get(user_key)
+        if bucket is None:
+            bucket = self._user_buckets[user_key] = TokenBucket(self.user_rate, self.user_burst)
+        return bucket
+
+    def _evict_idle_buckets(self):
+        """다시 가득 찬 사용자 버킷 삭제 (새로 만든 버킷과 같으므로 삭제해도 제한은 그대로, 사용자 수만큼 쌓이지 않도록)"""
+        now = time.monotonic()
+        if now - self._last_eviction < BUCKET_EVICT_INTERVAL:
+            return
+        self._last_eviction = now
+        idle_keys = [key for key, bucket in self._user_buckets.items() if bucket.available() >= bucket.capacity]
+        for key in idle_keys:
+            del self._user_buckets[key]
+
+    async def acquire(self, user_key: Optional[str] = None, priority: str = PRIORITY_INTERACTIVE, amount: int = 1):
+        """프로젝트/사용자 버킷에서 토큰을 꺼낼 때까지 대기"""
+        is_bulk = priority == PRIORITY_BULK
+        if not is_bulk:
+            self._interactive_waiting += 1
+        try:
+            while True:
+                async with self._lock:
+                    self._evict_idle_buckets()
+                    # bulk는 interactive 대기 요청이 있거나 여유분 이하로 내려가면 양보
+                    if is_bulk and self._interactive_waiting > 0:
+                        wait = 0.05
+                    else:
+                        reserve = self.bulk_reserve if is_bulk else 0
+                        wait = self.project_bucket.wait_time(amount, reserve)
+                        if user_key:
+                            wait = max(wait, self._user_bucket(user_key).wait_time(amount))
+                        if wait <= 0:
+                            self.project_bucket.consume(amount)
+                            if user_key:
+                                self._user_bucket(user_key).consume(amount)
+                            return
+                await asyncio.sleep(wait)
+        finally:
+            if not is_bulk:
+                self._interactive_waiting -= 1
+
+    @staticmethod
+    def is_retryable(error: HttpError, idempotent: bool = True) -> bool:
+        """
+        할당량/일시적 오류 여부 (429, 5xx, 403 rateLimitExceeded 계열)
+
+        5xx는 요청이 처리된 뒤에도 올 수 있으므로 멱등한 요청(idempotent=True)만 재시도 대상
+        """
+        status = getattr(getattr(error, 'resp', None), 'status', None)
+        if status == 429:
+            return True
+        if status is not None and status >= 500:
+            return idempotent
+        if status != 403:
+            return False
+        try:
+            content = error.content.decode('utf-8') if isinstance(error.content, bytes) else error.content
+            details = json.loads(content).get('error', {}).get('errors', [])
+            return any(detail.get('reason') in RATE_LIMIT_REASONS for detail in details)
+        except Exception:
+            return 'rateLimitExceeded' in str(error)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """지수 백오프 + full jitter"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    async def execute(
+        self,
+        request,
+        user_key: Optional[str] = None,
+        priority: str = PRIORITY_INTERACTIVE,
+        amount: int = 1,
+        idempotent: bool = True
+    ):
+        """
+        googleapiclient 요청 실행 (토큰 획득 → 스레드에서 execute → 할당량 오류 시 백오프 재시도)
+
+        Args:
+            request: HttpRequest 또는 BatchHttpRequest
+            user_key: 사용자 버킷 키
+            priority: PRIORITY_INTERACTIVE / PRIORITY_BULK
+            amount: 소비할 토큰 수 (batch 요청은 포함된 요청 수)
+            idempotent: 다시 보내도 결과가 같은 요청인지 (False면 5xx는 재시도하지 않음, 예: events.insert)
+        """
+        attempt = 0
+        while True:
+            await self.acquire(user_key, priority, amount)
+            try:
+                return await asyncio.to_thread(request.execute)
+            except HttpError as e:
+                if attempt >= self.max_retries or not self.is_retryable(e, idempotent):
+                    raise
+                delay = self.backoff_delay(attempt)
+                attempt += 1
+                logger.warning(f"[RATE_LIMITER] 할당량/일시적 오류 (status={getattr(e.resp, 'status', None)}), {delay:.1f}초 후 재시도 ({attempt}/{self.max_retries}) - priority={priority}")
+                await asyncio.sleep(delay)
+
+
+# 전역 Google API 호출 제한기
+google_rate_limiter = GoogleApiRateLimiter(
+    project_rate=settings.google_api_project_qps,
+    project_burst=settings.google_api_project_qps * 2,
+    user_rate=settings.google_api_user_qps,
+    user_burst=settings.google_api_user_qps * 2,
+    max_retries=settings.google_api_max_retries
+)
@@ -0,0 +1,252 @@
+"""
+외부 연결 관리자 (outbound connection manager)
+Google OAuth 토큰 교환, ID 토큰 검증, Calendar API, SMTP 발송이 앱 수명 동안 같은 연결 풀을 사용합니다.
+- aiohttp: 호스트별 keep-alive 풀 + DNS 캐시 + 공용 SSL 컨텍스트 (startup에서 생성, shutdown에서 종료)
+- google-auth(requests): 연결 풀이 있는 requests.Session 하나를 토큰 갱신/검증에 재사용
+- googleapiclient(httplib2): httplib2.Http는 스레드 안전하지 않으므로 작업 스레드마다 하나씩 두고 재사용
+  (요청은 asyncio.to_thread로 실행되며 기본 스레드 풀의 스레드는 계속 재사용됨)
+- SMTP: 로그인까지 마친 연결을 풀에 보관하고 NOOP으로 확인 후 재사용
+"""
+import logging
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Tuple, Iterator
+
+import aiohttp
+import httplib2
+import requests
+from google.auth.transport.requests import Request as GoogleAuthRequest
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+from requests.adapters import HTTPAdapter
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _ThreadLocalHttp:
+    """
+    스레드마다 httplib2.Http를 하나씩 사용하는 httplib2 호환 객체
+
+    Http 객체가 (scheme, host)별 연결을 유지하므로 같은 스레드의 다음 요청은 기존 연결을 재사용합니다.
+    """
+
+    def __init__(self, timeout: float):
+        self._timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._instances: List[httplib2.Http] = []
+
+    def _http(self) -> httplib2.Http:
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = httplib2.Http(timeout=self._timeout)
+            # googleapiclient.http.build_http와 동일 (308은 재개 가능 업로드 응답이므로 리다이렉트로 처리하지 않음)
+            http.redirect_codes = http.redirect_codes - {308}
+            self._local.http = http
+            with self._lock:
+                self._instances.append(http)
+        return http
+
+    def request(self, *args, **kwargs):
+        return self._http().request(*args, **kwargs)
+
+    def __getattr__(self, name):
+        # timeout, redirect_codes 등 AuthorizedHttp/googleapiclient가 읽는 속성
+        return getattr(self._http(), name)
+
+    def close(self):
+        """개별 서비스 객체의 close()에서는 닫지 않음 (앱 종료 시 close_all)"""
+
+    def close_all(self):
+        with self._lock:
+            instances, self._instances = self._instances, []
+        for http in instances:
+            try:
+                http.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+
+
+class _SMTPPool:
+    """로그인까지 마친 SMTP 연결 풀 (서버/계정별)"""
+
+    def __init__(self, size: int, idle_seconds: float, timeout: float):
+        self.size = max(1, size)
+        self.idle_seconds = idle_seconds
+        self.timeout = timeout
+        self._ssl_context = ssl.create_default_context()
+        self._pools: Dict[Tuple[str, int, str], queue.LifoQueue] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, key: Tuple[str, int, str]) -> queue.LifoQueue:
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = queue.LifoQueue(maxsize=self.size)
+                self._pools[key] = pool
+            return pool
+
+    def _connect(self, host: str, port: int, user: str, password: str) -> smtplib.SMTP:
+        server = smtplib.SMTP(host, port, timeout=self.timeout)
+        server.starttls(context=self._ssl_context)  # TLS 암호화
+        server.login(user, password)
+        return server
+
+    @staticmethod
+    def _quit(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _checkout(self, pool: queue.LifoQueue) -> Optional[smtplib.SMTP]:
+        """재사용 가능한 연결 꺼내기 (오래 쉬었거나 끊긴 연결은 닫고 다음 것 확인)"""
+        while True:
+            try:
+                server, last_used = pool.get_nowait()
+            except queue.Empty:
+                return None
+            if time.monotonic() - last_used > self.idle_seconds:
+                self._quit(server)
+                continue
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except Exception:
+                pass
+            self._quit(server)
+
+    @contextmanager
+    def connection(self, host: str, port: int, user: str, password: str) -> Iterator[smtplib.SMTP]:
+        pool = self._pool((host, port, user))
+        server = self._checkout(pool) or self._connect(host, port, user, password)
+        try:
+            yield server
+        except Exception:
+            # 발송 중 오류가 난 연결은 상태를 알 수 없으므로 재사용하지 않음
+            self._quit(server)
+            raise
+        try:
+            pool.put_nowait((server, time.monotonic()))
+        except queue.Full:
+            self._quit(server)
+
+    def close_all(self):
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            while True:
+                try:
+                    server, _ = pool.get_nowait()
+                except queue.Empty:
+                    break
+                self._quit(server)
+
+
+class OutboundConnectionManager:
+    """앱 수명 동안 유지하는 외부 연결 풀"""
+
+    def __init__(
+        self,
+        timeout: float,
+        pool_size: int,
+        pool_per_host: int,
+        keepalive_seconds: float,
+        dns_cache_seconds: int,
+        smtp_pool_size: int,
+        smtp_idle_seconds: float
+    ):
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.pool_per_host = pool_per_host
+        self.keepalive_seconds = keepalive_seconds
+        self.dns_cache_seconds = dns_cache_seconds
+        self._ssl_context = ssl.create_default_context()
+        self._aiohttp_session: Optional[aiohttp.ClientSession] = None
+        self._requests_session: Optional[requests.Session] = None
+        self._requests_lock = threading.Lock()
+        self._httplib2 = _ThreadLocalHttp(timeout)
+        self._smtp = _SMTPPool(smtp_pool_size, smtp_idle_seconds, timeout)
+
+    async def start(self):
+        """aiohttp 세션 생성 (이벤트 루프 안에서 만들어야 함)"""
+        self.aiohttp_session()
+        logger.info(f"[OUTBOUND] 외부 연결 풀 시작 (전체 {self.pool_size}, 호스트별 {self.pool_per_host}, DNS 캐시 {self.dns_cache_seconds}초)")
+
+    async def stop(self):
+        """모든 풀의 연결 종료"""
+        if self._aiohttp_session is not None and not self._aiohttp_session.closed:
+            await self._aiohttp_session.close()
+        self._aiohttp_session = None
+        with self._requests_lock:
+            if self._requests_session is not None:
+                self._requests_session.close()
+            self._requests_session = None
+        self._httplib2.close_all()
+        self._smtp.close_all()
+        logger.info("[OUTBOUND] 외부 연결 풀 종료")
+
+    def aiohttp_session(self) -> aiohttp.ClientSession:
+        """공용 aiohttp 세션 (start 전에 호출되면 현재 이벤트 루프에서 생성)"""
+        if self._aiohttp_session is None or self._aiohttp_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_per_host,
+                ttl_dns_cache=self.dns_cache_seconds,
+                keepalive_timeout=self.keepalive_seconds,
+                ssl=self._ssl_context
+            )
+            self._aiohttp_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._aiohttp_session
+
+    def requests_session(self) -> requests.Session:
+        """google-auth 토큰 갱신/검증용 공용 requests 세션"""
+        with self._requests_lock:
+            if self._requests_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_per_host, pool_maxsize=self.pool_per_host)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._requests_session = session
+            return self._requests_session
+
+    def google_auth_request(self) -> GoogleAuthRequest:
+        """credentials.refresh / id_token 검증에 넘길 transport (공용 세션 사용)"""
+        return GoogleAuthRequest(session=self.requests_session())
+
+    def authorized_http(self, credentials) -> AuthorizedHttp:
+        """credentials를 붙인 httplib2 transport (스레드별 공용 Http 사용)"""
+        return AuthorizedHttp(credentials, http=self._httplib2)
+
+    def build_calendar_service(self, credentials):
+        """Google Calendar API 서비스 객체 (공용 transport 사용)"""
+        return build('calendar', 'v3', http=self.authorized_http(credentials), cache_discovery=False)
+
+    def smtp_connection(self, host: str, port: int, user: str, password: str):
+        """로그인된 SMTP 연결 (with 문으로 사용, 끝나면 풀에 반환)"""
+        return self._smtp.connection(host, port, user, password)
+
+
+# 전역 연결 관리자 인스턴스
+outbound = OutboundConnectionManager(
+    timeout=settings.outbound_http_timeout,
+    pool_size=settings.outbound_http_pool_size,
+    pool_per_host=settings.outbound_http_pool_per_host,
+    keepalive_seconds=settings.outbound_keepalive_seconds,
+    dns_cache_seconds=settings.outbound_dns_cache_seconds,
+    smtp_pool_size=settings.smtp_pool_size,
+    smtp_idle_seconds=settings.smtp_idle_seconds
+)
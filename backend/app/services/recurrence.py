@@ -0,0 +1,198 @@
+"""
+반복 일정 → Google Calendar 반복 이벤트 변환 (RRULE/EXDATE/RDATE, 인스턴스 ID)
+
+웹앱은 반복 일정을 날짜별 Todo 행(같은 todo_group_id)으로 저장하므로, 반복 설정으로 RRULE을 만들고
+실제 행 날짜와 비교해 빠진 날짜는 EXDATE, 규칙에 없는 날짜는 RDATE로 보정합니다.
+(예: 31일 매월 반복은 웹앱에서 말일로 당겨지지만 RRULE은 해당 월을 건너뜀)
+
+DB/Google API에 의존하지 않는 순수 함수만 둡니다.
+"""
+import json
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Dict, Any, List
+
+# 앱에서 사용하는 시간대 (UTC+9, 서머타임 없음)
+TIMEZONE_NAME = 'Asia/Seoul'
+UTC_OFFSET = timedelta(hours=9)
+
+WEEKDAY_CODES = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+# custom 반복 패턴 freq → RRULE FREQ
+_PATTERN_FREQS = {
+    'days': 'DAILY',
+    'weeks': 'WEEKLY',
+    'months': 'MONTHLY',
+    'years': 'YEARLY',
+}
+
+# 반복 이벤트 인스턴스 ID ({recurringEventId}_{YYYYMMDD} 또는 {recurringEventId}_{YYYYMMDDTHHMMSSZ})
+INSTANCE_ID_PATTERN = re.compile(r'^(.+)_\d{8}(T\d{6}Z)?$')
+
+
+def _load_pattern(repeat_pattern) -> Dict[str, Any]:
+    if not repeat_pattern:
+        return {}
+    if isinstance(repeat_pattern, dict):
+        return repeat_pattern
+    try:
+        return json.loads(repeat_pattern) or {}
+    except (TypeError, ValueError):
+        return {}
+
+
+def build_rule(repeat_type: Optional[str], repeat_pattern, start_date: date) -> Optional[Dict[str, Any]]:
+    """
+    반복 설정 → {'freq', 'interval', 'byday'} (RRULE로 표현할 수 없으면 None)
+
+    byday는 요일 번호 목록 (0=월 ~ 6=일), WEEKLY일 때만 사용
+    """
+    if repeat_type == 'daily':
+        return {'freq': 'DAILY', 'interval': 1, 'byday': None}
+    if repeat_type == 'weekly':
+        return {'freq': 'WEEKLY', 'interval': 1, 'byday': [start_date.weekday()]}
+    if repeat_type == 'weekdays':
+        return {'freq': 'WEEKLY', 'interval': 1, 'byday': [0, 1, 2, 3, 4]}
+    if repeat_type == 'weekends':
+        return {'freq': 'WEEKLY', 'interval': 1, 'byday': [5, 6]}
+    if repeat_type == 'monthly':
+        return {'freq': 'MONTHLY', 'interval': 1, 'byday': None}
+    if repeat_type == 'yearly':
+        return {'freq': 'YEARLY', 'interval': 1, 'byday': None}
+    if repeat_type == 'custom':
+        pattern = _load_pattern(repeat_pattern)
+        freq = _PATTERN_FREQS.get(pattern.get('freq', 'days'))
+        if not freq:
+            return None
+        try:
+            interval = max(1, int(pattern.get('interval') or 1))
+        except (TypeError, ValueError):
+            return None
+        byday = None
+        if freq == 'WEEKLY':
+            days = sorted({int(day) for day in pattern.get('days') or [] if str(day).isdigit() and int(day) < 7})
+            byday = days or [start_date.weekday()]
+        return {'freq': freq, 'interval': interval, 'byday': byday}
+    return None
+
+
+def _add_months(value: date, months: int) -> Optional[date]:
+    """months개월 뒤 같은 날짜 (해당 월에 그 날짜가 없으면 None → RRULE도 건너뜀)"""
+    month_index = value.month - 1 + months
+    try:
+        return date(value.year + month_index // 12, month_index % 12 + 1, value.day)
+    except ValueError:
+        return None
+
+
+def expand_rule(rule: Dict[str, Any], start_date: date, until_date: date) -> List[date]:
+    """RRULE이 만드는 날짜 목록 (DTSTART는 규칙과 관계없이 첫 인스턴스, WKST=MO)"""
+    interval = rule['interval']
+    freq = rule['freq']
+    result = {start_date}
+
+    if freq == 'DAILY':
+        current = start_date
+        while current <= until_date:
+            result.add(current)
+            current += timedelta(days=interval)
+    elif freq == 'WEEKLY':
+        week_start = start_date - timedelta(days=start_date.weekday())
+        while week_start <= until_date:
+            for weekday in rule['byday']:
+                current = week_start + timedelta(days=weekday)
+                if start_date <= current <= until_date:
+                    result.add(current)
+            week_start += timedelta(weeks=interval)
+    elif freq in ('MONTHLY', 'YEARLY'):
+        step = interval if freq == 'MONTHLY' else interval * 12
+        months = 0
+        while True:
+            month_index = start_date.month - 1 + months
+            if date(start_date.year + month_index // 12, month_index % 12 + 1, 1) > until_date:
+                break
+            current = _add_months(start_date, months)
+            if current and current <= until_date:
+                result.add(current)
+            months += step
+
+    return sorted(result)
+
+
+def _format_local(value: date, start_time: Optional[time], all_day: bool) -> str:
+    if all_day:
+        return value.strftime('%Y%m%d')
+    return datetime.combine(value, start_time or time()).strftime('%Y%m%dT%H%M%S')
+
+
+def _format_utc(value: date, start_time: Optional[time]) -> str:
+    return (datetime.combine(value, start_time or time()) - UTC_OFFSET).strftime('%Y%m%dT%H%M%SZ')
+
+
+def build_recurrence(
+    repeat_type: Optional[str],
+    repeat_pattern,
+    dates: List[date],
+    all_day: bool,
+    start_time: Optional[time] = None,
+    max_exceptions: Optional[int] = None
+) -> Optional[List[str]]:
+    """
+    반복 일정 행 날짜 목록 → Google Calendar recurrence 목록 (RRULE + EXDATE/RDATE)
+
+    Args:
+        dates: 시리즈에 속한 (삭제되지 않은) 행의 날짜, 첫 날짜가 DTSTART
+        start_time: 시간 지정 일정의 시작 시간 (Asia/Seoul)
+        max_exceptions: EXDATE+RDATE가 이보다 많으면 규칙이 시리즈를 설명하지 못하는 것으로 보고 None
+                        (기본값: 날짜 수의 절반)
+
+    Returns:
+        recurrence 문자열 목록 (반복 규칙을 만들 수 없으면 None)
+    """
+    occurrence_dates = sorted(set(dates))
+    if len(occurrence_dates) < 2:
+        return None
+    start_date = occurrence_dates[0]
+    until_date = occurrence_dates[-1]
+    rule = build_rule(repeat_type, repeat_pattern, start_date)
+    if not rule:
+        return None
+
+    expected = set(expand_rule(rule, start_date, until_date))
+    actual = set(occurrence_dates)
+    excluded = sorted(expected - actual)  # 규칙에는 있지만 행이 없는 날짜 (개별 삭제 등)
+    added = sorted(actual - expected)  # 규칙에 없는 날짜 (말일 보정 등)
+
+    if max_exceptions is None:
+        max_exceptions = len(occurrence_dates) // 2
+    if len(excluded) + len(added) > max_exceptions:
+        return None
+
+    parts = [f"FREQ={rule['freq']}"]
+    if rule['interval'] > 1:
+        parts.append(f"INTERVAL={rule['interval']}")
+    if rule['byday']:
+        parts.append("BYDAY=" + ",".join(WEEKDAY_CODES[weekday] for weekday in rule['byday']))
+    # 시간 지정 이벤트의 UNTIL은 UTC로 지정해야 함
+    parts.append(f"UNTIL={until_date.strftime('%Y%m%d') if all_day else _format_utc(until_date, start_time)}")
+    recurrence = ["RRULE:" + ";".join(parts)]
+
+    value_prefix = ";VALUE=DATE:" if all_day else f";TZID={TIMEZONE_NAME}:"
+    if excluded:
+        recurrence.append("EXDATE" + value_prefix + ",".join(_format_local(value, start_time, all_day) for value in excluded))
+    if added:
+        recurrence.append("RDATE" + value_prefix + ",".join(_format_local(value, start_time, all_day) for value in added))
+    return recurrence
+
+
+def instance_event_id(series_event_id: str, occurrence_date: date, start_time: Optional[time], all_day: bool) -> str:
+    """반복 이벤트의 날짜별 인스턴스 ID (Google이 originalStartTime으로 만드는 ID와 같은 형식)"""
+    if all_day:
+        return f"{series_event_id}_{occurrence_date.strftime('%Y%m%d')}"
+    return f"{series_event_id}_{_format_utc(occurrence_date, start_time)}"
+
+
+def series_event_id(event_id: str) -> str:
+    """인스턴스 ID면 반복 이벤트(시리즈) ID, 아니면 그대로"""
+    match = INSTANCE_ID_PATTERN.match(event_id)
+    return match.group(1) if match else event_id
@@ -0,0 +1,203 @@
+"""
+반복 일정 시리즈 ↔ Google Calendar 반복 이벤트
+같은 todo_group_id로 묶인 반복 일정 행들을 RRULE이 있는 이벤트 하나로 내보내고,
+각 행에는 날짜별 인스턴스 ID({시리즈 ID}_{날짜})를 저장합니다.
+- 시리즈 생성/삭제: 행 수와 관계없이 API 호출 1회
+- 특정 날짜만 바뀐 행: 인스턴스 ID로 수정 → Google에서 예외 인스턴스로 저장
+"""
+import logging
+from datetime import time
+from typing import Optional, Dict, Any, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.models import Todo
+from app.models.user import User
+from app.services.calendar_service import GoogleCalendarService
+from app.services.calendar_sync_job_service import CalendarSyncJobService
+from app.services.google_rate_limiter import PRIORITY_INTERACTIVE
+from app.services.recurrence import build_recurrence, instance_event_id, INSTANCE_ID_PATTERN
+
+logger = logging.getLogger(__name__)
+
+
+class RecurringSeriesService:
+    """반복 일정 시리즈 내보내기/삭제"""
+
+    @staticmethod
+    def is_series(todo: Todo) -> bool:
+        """반복 설정으로 만들어진 행인지 (todo_group_id는 여러 날짜 일정 묶기에도 사용됨)"""
+        return bool(todo.todo_group_id) and bool(todo.repeat_type) and todo.repeat_type != 'none'
+
+    @staticmethod
+    def load_series(db: Session, user_id: str, todo_group_id: str) -> List[Todo]:
+        """시리즈의 (삭제되지 않은) 행을 날짜순으로 조회 (첫 행이 시리즈 기준 행)"""
+        return db.query(Todo).filter(
+            Todo.user_id == user_id,
+            Todo.todo_group_id == todo_group_id,
+            Todo.deleted_at.is_(None),
+            Todo.date.isnot(None)
+        ).order_by(Todo.date, Todo.created_at).all()
+
+    @staticmethod
+    def _start_time(head: Todo) -> Optional[time]:
+        if head.all_day:
+            return None
+        start_datetime, _ = CalendarSyncJobService.build_event_range(head)
+        return start_datetime.time()
+
+    @staticmethod
+    def build_recurrence(todos: List[Todo]) -> Optional[List[str]]:
+        """시리즈 행 날짜로 recurrence 목록 생성 (반복 이벤트로 표현할 수 없으면 None)"""
+        if len(todos) < 2:
+            return None
+        head = todos[0]
+        return build_recurrence(
+            head.repeat_type,
+            head.repeat_pattern,
+            [todo.date for todo in todos],
+            bool(head.all_day),
+            RecurringSeriesService._start_time(head)
+        )
+
+    @staticmethod
+    def event_kwargs(todo: Todo) -> Dict[str, Any]:
+        """create_event/update_event 공통 인자 (반복 정보 제외)"""
+        start_datetime, end_datetime = CalendarSyncJobService.build_event_range(todo)
+        notification_reminders = CalendarSyncJobService.parse_reminders(todo)
+        return {
+            'title': todo.title,
+            'description': todo.memo or todo.description or "",
+            'start_datetime': start_datetime,
+            'end_datetime': end_datetime,
+            'location': todo.location or "",
+            'all_day': todo.all_day,
+            'notification_reminders': notification_reminders if notification_reminders else None,
+        }
+
+    @staticmethod
+    def _occurrence_signature(todo: Todo) -> Tuple:
+        """날짜를 뺀 행 내용 (기준 행과 다르면 해당 날짜만 수정된 행)"""
+        duration_days = (todo.end_date - todo.date).days if todo.end_date and todo.date else 0
+        return (
+            todo.title,
+            todo.memo or todo.description or "",
+            todo.location or "",
+            bool(todo.all_day),
+            todo.start_time,
+            todo.end_time,
+            duration_days,
+            todo.notification_reminders,
+        )
+
+    @staticmethod
+    def assign_instance_ids(todos: List[Todo], series_event_id: str):
+        """각 행에 시리즈 이벤트의 날짜별 인스턴스 ID 저장 (커밋은 호출 측에서)"""
+        head = todos[0]
+        start_time = RecurringSeriesService._start_time(head)
+        for todo in todos:
+            todo.google_calendar_event_id = instance_event_id(series_event_id, todo.date, start_time, bool(head.all_day))
+
+    @staticmethod
+    async def export_series(
+        db: Session,
+        user: User,
+        todos: List[Todo],
+        priority: str = PRIORITY_INTERACTIVE
+    ) -> Optional[Dict[str, Any]]:
+        """
+        시리즈를 반복 이벤트 하나로 내보내기
+
+        기준 행(첫 행)으로 이벤트를 만들고, 내용이 다른 행만 인스턴스를 따로 수정합니다.
+        행의 google_calendar_event_id 설정까지 하고 커밋은 호출 측에서 합니다.
+
+        Returns:
+            {'event_id', 'etag', 'exception_count'} (반복 이벤트로 표현할 수 없거나 생성 실패 시 None)
+        """
+        recurrence = RecurringSeriesService.build_recurrence(todos)
+        if not recurrence:
+            return None
+
+        head = todos[0]
+        event = await GoogleCalendarService.create_event(
+            token_json=user.google_calendar_token,
+            source_id=head.id,  # Always Plan의 Todo ID 저장 (중복 제거용, 시리즈는 기준 행 ID)
+            priority=priority,
+            recurrence=recurrence,
+            **RecurringSeriesService.event_kwargs(head)
+        )
+        if not event or not event.get('id'):
+            logger.warning(f"[SERIES] 반복 이벤트 생성 실패 - todo_group_id={head.todo_group_id}")
+            return None
+
+        RecurringSeriesService.assign_instance_ids(todos, event['id'])
+        exception_count = await RecurringSeriesService.apply_exceptions(user, todos, priority)
+
+        logger.info(f"[SERIES] 반복 이벤트 생성 - todo_group_id={head.todo_group_id}, event_id={event['id']}, 행 {len(todos)}개, 예외 {exception_count}개, recurrence={recurrence}")
+        return {'event_id': event['id'], 'etag': event.get('etag'), 'exception_count': exception_count}
+
+    @staticmethod
+    async def apply_exceptions(user: User, todos: List[Todo], priority: str = PRIORITY_INTERACTIVE) -> int:
+        """기준 행과 내용이 다른 행을 예외 인스턴스로 반영. 반영한 수 반환"""
+        head_signature = RecurringSeriesService._occurrence_signature(todos[0])
+        applied = 0
+        for todo in todos[1:]:
+            if RecurringSeriesService._occurrence_signature(todo) == head_signature:
+                continue
+            updated = await GoogleCalendarService.update_event(
+                token_json=user.google_calendar_token,
+                event_id=todo.google_calendar_event_id,
+                priority=priority,
+                **RecurringSeriesService.event_kwargs(todo)
+            )
+            if updated:
+                applied += 1
+            else:
+                logger.warning(f"[SERIES] 예외 인스턴스 반영 실패 - todo_id={todo.id}, event_id={todo.google_calendar_event_id}")
+        return applied
+
+    @staticmethod
+    async def update_series(
+        user: User,
+        todos: List[Todo],
+        series_event_id: str,
+        priority: str = PRIORITY_INTERACTIVE
+    ) -> Optional[Dict[str, Any]]:
+        """시리즈 이벤트를 기준 행 내용과 현재 행 날짜로 수정 (행 인스턴스 ID도 다시 계산)"""
+        recurrence = RecurringSeriesService.build_recurrence(todos)
+        if not recurrence:
+            return None
+        event = await GoogleCalendarService.update_event(
+            token_json=user.google_calendar_token,
+            event_id=series_event_id,
+            priority=priority,
+            recurrence=recurrence,
+            **RecurringSeriesService.event_kwargs(todos[0])
+        )
+        if not event:
+            return None
+        RecurringSeriesService.assign_instance_ids(todos, series_event_id)
+        return event
+
+    @staticmethod
+    def delete_targets(todos: List[Todo]) -> List[Tuple[str, str]]:
+        """
+        행 목록을 지울 때 삭제할 (event_id, calendar_id) 목록
+
+        반복 이벤트 인스턴스로 내보낸 행들은 시리즈 이벤트 하나로 묶어서 한 번만 삭제합니다.
+        """
+        targets: List[Tuple[str, str]] = []
+        seen = set()
+        for todo in todos:
+            event_id = todo.google_calendar_event_id
+            if not event_id:
+                continue
+            if RecurringSeriesService.is_series(todo):
+                match = INSTANCE_ID_PATTERN.match(event_id)
+                if match:
+                    event_id = match.group(1)
+            target = (event_id, todo.google_calendar_id or 'primary')
+            if target not in seen:
+                seen.add(target)
+                targets.append(target)
+        return targets
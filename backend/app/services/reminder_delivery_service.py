@@ -0,0 +1,151 @@
+"""
+알림 발송 기록 (reminder_deliveries)
+(일정, 몇 분 전 알림, 채널, 일정 시작 시각) 유니크 인덱스로 같은 알림이 같은 채널로 두 번 나가지 않도록 합니다.
+
+- 발송 전에 INSERT ... ON CONFLICT로 행을 먼저 넣어 선점 → 들어간 행만 발송 (중복 확인이 인덱스 조회 한 번)
+- 여러 인스턴스가 같은 알림을 동시에 잡아도 한 곳만 행을 넣으므로 한 번만 발송
+- 발송에 실패하면 행을 지워 다시 발송할 수 있게 함
+- 일정 시작 시각이 키에 들어가므로 같은 날 다른 시간으로 옮긴 일정의 알림은 다시 발송
+- 발송 중(sending) 상태로 claim_timeout이 지난 행은 프로세스가 중간에 종료된 것으로 보고 다시 선점 가능
+"""
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Set, Tuple, Iterable
+
+from sqlalchemy import select, update, delete, tuple_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.models import ReminderDelivery
+
+logger = logging.getLogger(__name__)
+
+# 단위별 분 (reminder_offset 계산용)
+UNIT_MINUTES = {'minutes': 1, 'hours': 60, 'days': 60 * 24, 'weeks': 60 * 24 * 7}
+# 한 문장으로 넣는/조회하는 최대 행 수 (배치 하나의 알림 × 채널이 한 문장에 들어가도록, 바인드 변수 제한 이내)
+_ROW_CHUNK_SIZE = 500
+
+# (todo_id, reminder_offset, channel, occurrence_at)
+DeliveryKey = Tuple[str, int, str, datetime]
+
+
+def _key_columns():
+    table = ReminderDelivery.__table__
+    return (table.c.todo_id, table.c.reminder_offset, table.c.channel, table.c.occurrence_at)
+
+
+def _chunks(items: List[Any]):
+    for start in range(0, len(items), _ROW_CHUNK_SIZE):
+        yield items[start:start + _ROW_CHUNK_SIZE]
+
+
+class ReminderDeliveryService:
+    """알림 발송 기록 서비스"""
+
+    @staticmethod
+    def reminder_offset(value: int, unit: str) -> int:
+        """알림이 일정 시작 몇 분 전인지"""
+        return value * UNIT_MINUTES.get(unit, 1)
+
+    @staticmethod
+    def occurrence_at(fire_at: datetime, reminder_offset: int) -> datetime:
+        """알림 발송 시각과 오프셋으로 알림 대상 일정의 시작 시각 계산 (KST)"""
+        return fire_at + timedelta(minutes=reminder_offset)
+
+    @staticmethod
+    def key(delivery: Dict[str, Any], channel: str) -> DeliveryKey:
+        """발송 내용(dict)의 채널별 중복 확인 키"""
+        return (delivery['todo_id'], delivery['reminder_offset'], channel, delivery['occurrence_at'])
+
+    @staticmethod
+    def claim(db: Session, entries: List[Dict[str, Any]]) -> Set[DeliveryKey]:
+        """
+        발송할 (알림, 채널)을 기록에 넣어 선점하고, 선점한 키 반환 (이미 보냈거나 다른 곳에서 보내는 중이면 제외)
+        커밋은 호출하는 쪽에서
+
+        Args:
+            entries: [{'user_id', 'todo_id', 'reminder_offset', 'channel', 'occurrence_at'}]
+        """
+        # 같은 문장 안에서 같은 키를 두 번 넣을 수 없으므로 중복 제거
+        entries_by_key = {
+            (entry['todo_id'], entry['reminder_offset'], entry['channel'], entry['occurrence_at']): entry
+            for entry in entries
+        }
+        if not entries_by_key:
+            return set()
+
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name not in ('postgresql', 'sqlite'):
+            return ReminderDeliveryService._claim_without_upsert(db, entries_by_key)
+
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=settings.reminder_claim_timeout_seconds)
+        table = ReminderDelivery.__table__
+        claimed = set()
+        for chunk in _chunks(list(entries_by_key.values())):
+            values = [
+                {**entry, 'id': str(uuid.uuid4()), 'status': 'sending', 'claimed_at': now, 'created_at': now, 'updated_at': now}
+                for entry in chunk
+            ]
+            insert_stmt = postgresql_insert(table) if dialect_name == 'postgresql' else sqlite_insert(table)
+            # 새 행은 넣고, 이미 있는 행은 오래된 sending일 때만 다시 선점 (반환되는 행 = 선점한 행)
+            claim_stmt = insert_stmt.values(values).on_conflict_do_update(
+                index_elements=list(_key_columns()),
+                set_={'claimed_at': now, 'updated_at': now},
+                where=(table.c.status == 'sending') & (table.c.claimed_at < stale_before)
+            ).returning(*_key_columns())
+            claimed.update(tuple(row) for row in db.execute(claim_stmt).all())
+
+        skipped = len(entries_by_key) - len(claimed)
+        if skipped:
+            logger.info(f"[REMINDER_DELIVERY] 이미 발송했거나 발송 중인 알림 {skipped}건 건너뜀")
+        return claimed
+
+    @staticmethod
+    def _claim_without_upsert(db: Session, entries_by_key: Dict[DeliveryKey, Dict[str, Any]]) -> Set[DeliveryKey]:
+        """ON CONFLICT를 지원하지 않는 DB용: 기록이 없는 키만 추가 (동시 실행 시 유니크 인덱스 오류로 실패할 수 있음)"""
+        keys = list(entries_by_key.keys())
+        existing = set()
+        for chunk in _chunks(keys):
+            rows = db.execute(
+                select(*_key_columns()).where(
+                    tuple_(*_key_columns()).in_(chunk)
+                )
+            ).all()
+            existing.update(tuple(row) for row in rows)
+
+        now = datetime.utcnow()
+        claimed = set()
+        for key in keys:
+            if key in existing:
+                continue
+            db.add(ReminderDelivery(**entries_by_key[key], status='sending', claimed_at=now))
+            claimed.add(key)
+        db.flush()
+        return claimed
+
+    @staticmethod
+    def mark_sent(db: Session, keys: Iterable[DeliveryKey], sent_at: datetime):
+        """발송에 성공한 기록을 sent로 변경 (커밋은 호출하는 쪽에서)"""
+        table = ReminderDelivery.__table__
+        for chunk in _chunks(list(keys)):
+            db.execute(
+                update(table).where(
+                    tuple_(*_key_columns()).in_(chunk)
+                ).values(status='sent', sent_at=sent_at, updated_at=datetime.utcnow())
+            )
+
+    @staticmethod
+    def release(db: Session, keys: Iterable[DeliveryKey]):
+        """발송에 실패한 기록 삭제 (다시 선점할 수 있도록, 커밋은 호출하는 쪽에서)"""
+        table = ReminderDelivery.__table__
+        for chunk in _chunks(list(keys)):
+            db.execute(
+                delete(table).where(
+                    table.c.status == 'sending',
+                    tuple_(*_key_columns()).in_(chunk)
+                )
+            )
@@ -0,0 +1,237 @@
+"""
+일정 알림 묶음(digest) 이메일
+알림 묶음을 켠 사용자는 범위 안의 알림을 알림마다 한 통씩 받지 않고, 범위가 시작될 때 한 통으로 받습니다.
+
+- hourly: 매시 정각에 그 시간(정각 ~ 다음 정각)에 울릴 알림을 한 통으로
+- daily: 매일 reminder_digest_daily_hour 시에 앞으로 24시간 동안 울릴 알림을 한 통으로
+- 대상은 reminder_jobs의 대기 알림 (알림 예약을 그대로 사용), 이메일을 받는 사용자(email, both)만
+- 묶음에 넣은 알림은 reminder_deliveries에 email 채널 발송 완료로 기록 → 발송 시각이 되면 이메일은 중복으로 건너뛰고
+  푸시(both)만 발송. 묶음 발송에 실패하면 기록을 지워 알림마다 이메일로 발송됨
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.models import Todo, ReminderJob
+from app.models.user import User
+from app.services.email_service import EmailService
+from app.services.reminder_delivery_service import ReminderDeliveryService
+from app.services.reminder_job_service import ReminderJobService
+
+logger = logging.getLogger(__name__)
+
+DIGEST_MODES = ('off', 'hourly', 'daily')
+# 묶음 범위
+DIGEST_WINDOWS = {'hourly': timedelta(hours=1), 'daily': timedelta(days=1)}
+# 한 번에 조회하는 사용자/일정 수 (SQLite 바인드 변수 제한)
+_USER_CHUNK_SIZE = 500
+
+
+class ReminderDigestDispatcher:
+    """일정 알림 묶음 이메일 발송"""
+
+    def __init__(self, daily_hour: int, email_concurrency: int, send_timeout_seconds: float):
+        """
+        Args:
+            daily_hour: daily 묶음을 보내는 시각 (Asia/Seoul 기준 시)
+            email_concurrency: 동시에 보내는 최대 이메일 수
+            send_timeout_seconds: 이메일 한 통의 최대 대기 시간
+        """
+        self.daily_hour = daily_hour
+        self.email_concurrency = max(1, email_concurrency)
+        self.send_timeout_seconds = send_timeout_seconds
+        self._email_semaphore: Optional[asyncio.Semaphore] = None
+
+    @staticmethod
+    def next_boundary(now: datetime) -> datetime:
+        """now 다음 정각 (묶음 발송 시각)"""
+        return now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+    async def dispatch(self, boundary: datetime) -> int:
+        """
+        boundary(정각)에 시작하는 범위의 묶음 이메일 발송
+
+        Returns:
+            발송한 묶음 이메일 수
+        """
+        modes = ['hourly']
+        if boundary.hour == self.daily_hour:
+            modes.append('daily')
+
+        digests = await asyncio.to_thread(self._prepare, boundary, modes)
+        if not digests:
+            return 0
+
+        if self._email_semaphore is None:
+            self._email_semaphore = asyncio.Semaphore(self.email_concurrency)
+        results = await asyncio.gather(*(self._send(digest) for digest in digests))
+        await asyncio.to_thread(self._record, digests, results)
+
+        sent_count = sum(1 for sent in results if sent)
+        logger.info(
+            f"[REMINDER_DIGEST] 묶음 이메일 {len(digests)}통 중 {sent_count}통 발송 "
+            f"(알림 {sum(len(digest['items']) for digest in digests)}개)"
+        )
+        return sent_count
+
+    # ---- 준비 (작업 스레드) ----
+
+    def _prepare(self, boundary: datetime, modes: List[str]) -> List[Dict[str, Any]]:
+        """범위 안의 대기 알림을 사용자별로 묶고 email 채널을 발송 기록에 선점"""
+        db = SessionLocal()
+        try:
+            digests = []
+            for mode in modes:
+                window_end = boundary + DIGEST_WINDOWS[mode]
+                last_id = None
+                while True:
+                    query = db.query(User.id, User.email).filter(
+                        User.notification_digest == mode,
+                        User.notification_preference.in_(['email', 'both']),
+                        User.deleted_at.is_(None),
+                        User.email.isnot(None)
+                    )
+                    if last_id is not None:
+                        query = query.filter(User.id > last_id)
+                    users = query.order_by(User.id).limit(_USER_CHUNK_SIZE).all()
+                    if not users:
+                        break
+                    last_id = users[-1].id
+                    digests.extend(self._prepare_users(db, users, mode, boundary, window_end))
+            db.commit()
+            return digests
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def _window_label(mode: str, boundary: datetime, window_end: datetime) -> str:
+        if mode == 'daily':
+            return f"{boundary.strftime('%m월 %d일')} 일정 알림 모음"
+        return f"{boundary.strftime('%H:%M')} - {window_end.strftime('%H:%M')} 일정 알림 모음"
+
+    def _prepare_users(self, db: Session, users, mode: str, boundary: datetime, window_end: datetime) -> List[Dict[str, Any]]:
+        emails = {user.id: user.email for user in users}
+        jobs = db.query(ReminderJob).filter(
+            ReminderJob.user_id.in_(list(emails.keys())),
+            ReminderJob.status == 'pending',
+            ReminderJob.fire_at >= boundary,
+            ReminderJob.fire_at < window_end
+        ).order_by(ReminderJob.fire_at).all()
+        if not jobs:
+            return []
+
+        todos = {}
+        todo_ids = list({job.todo_id for job in jobs})
+        for start in range(0, len(todo_ids), _USER_CHUNK_SIZE):
+            for todo in db.query(Todo).filter(
+                Todo.id.in_(todo_ids[start:start + _USER_CHUNK_SIZE]),
+                Todo.deleted_at.is_(None),
+                Todo.status != "completed",
+                Todo.has_notification == True
+            ).all():
+                todos[todo.id] = todo
+
+        candidates = []
+        for job in jobs:
+            todo = todos.get(job.todo_id)
+            if todo is None:
+                continue
+            reminder_offset = ReminderDeliveryService.reminder_offset(job.reminder_value, job.reminder_unit)
+            reminder_str = f"{job.reminder_value} {job.reminder_unit} 전" if job.reminder_unit != 'minutes' else f"{job.reminder_value}분 전"
+            candidates.append({
+                'user_id': job.user_id,
+                'todo_id': todo.id,
+                'reminder_offset': reminder_offset,
+                'occurrence_at': ReminderDeliveryService.occurrence_at(job.fire_at, reminder_offset),
+                'item': {
+                    'todo_title': todo.title,
+                    'todo_date': todo.date.strftime("%Y년 %m월 %d일"),
+                    'todo_time': todo.start_time.strftime("%H:%M") if todo.start_time else None,
+                    'todo_end_time': todo.end_time.strftime("%H:%M") if todo.end_time else None,
+                    'is_all_day': bool(todo.all_day),
+                    'reminder_time': reminder_str,
+                    'todo_location': todo.location,
+                    'fire_time': job.fire_at.strftime("%H:%M") if mode == 'hourly' else job.fire_at.strftime("%m/%d %H:%M")
+                }
+            })
+
+        # 이미 알림마다 발송했거나 다른 인스턴스가 묶음에 넣은 알림은 제외
+        claimed = ReminderDeliveryService.claim(db, [
+            {
+                'user_id': candidate['user_id'],
+                'todo_id': candidate['todo_id'],
+                'reminder_offset': candidate['reminder_offset'],
+                'channel': 'email',
+                'occurrence_at': candidate['occurrence_at']
+            }
+            for candidate in candidates
+        ])
+
+        digests_by_user: Dict[str, Dict[str, Any]] = {}
+        for candidate in candidates:
+            key = ReminderDeliveryService.key(candidate, 'email')
+            if key not in claimed:
+                continue
+            claimed.discard(key)  # 같은 키(중복 예약)는 한 번만
+            digest = digests_by_user.setdefault(candidate['user_id'], {
+                'user_id': candidate['user_id'],
+                'to_email': emails[candidate['user_id']],
+                'window_label': self._window_label(mode, boundary, window_end),
+                'items': [],
+                'keys': []
+            })
+            digest['items'].append(candidate['item'])
+            digest['keys'].append(key)
+        return list(digests_by_user.values())
+
+    # ---- 발송 (이벤트 루프) ----
+
+    async def _send(self, digest: Dict[str, Any]) -> bool:
+        async with self._email_semaphore:
+            try:
+                return await asyncio.wait_for(
+                    EmailService.send_digest_email_async(digest['to_email'], digest['window_label'], digest['items']),
+                    timeout=self.send_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"[REMINDER_DIGEST] 묶음 이메일 발송 시간 초과 ({self.send_timeout_seconds}초): {digest['to_email']}")
+                return False
+            except Exception as e:
+                logger.error(f"[REMINDER_DIGEST] 묶음 이메일 발송 실패: {digest['to_email']}, 오류: {e}", exc_info=True)
+                return False
+
+    # ---- 기록 (작업 스레드) ----
+
+    def _record(self, digests: List[Dict[str, Any]], results: List[bool]):
+        """묶음에 넣은 알림의 email 발송 기록 갱신 (실패한 묶음은 기록을 지워 알림마다 발송되도록)"""
+        db = SessionLocal()
+        try:
+            sent_keys = []
+            failed_keys = []
+            for digest, sent in zip(digests, results):
+                (sent_keys if sent else failed_keys).extend(digest['keys'])
+            ReminderDeliveryService.mark_sent(db, sent_keys, ReminderJobService.now())
+            ReminderDeliveryService.release(db, failed_keys)
+            db.commit()
+        except Exception as e:
+            # 기록하지 못한 묶음은 claim_timeout 후 알림마다 다시 발송될 수 있음
+            logger.error(f"[REMINDER_DIGEST] 묶음 발송 결과 저장 실패: {e}", exc_info=True)
+            db.rollback()
+        finally:
+            db.close()
+
+
+# 전역 알림 묶음 발송 인스턴스
+reminder_digest_dispatcher = ReminderDigestDispatcher(
+    daily_hour=settings.reminder_digest_daily_hour,
+    email_concurrency=settings.reminder_email_concurrency,
+    send_timeout_seconds=settings.reminder_send_timeout_seconds
+)
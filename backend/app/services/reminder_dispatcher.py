@@ -0,0 +1,468 @@
+"""
+일정 알림 발송 파이프라인
+발송 시각이 된 reminder_jobs를 선점해 이메일/FCM 푸시를 비동기로 동시에 보냅니다.
+
+1. 준비 (작업 스레드): 알림 선점, 배치 전체의 일정/체크리스트/사용자/담당 프로필/기기 토큰을 IN 조회로 한 번에 읽기
+   → 발송 내용(dict)으로 변환 (알림 수와 관계없이 배치당 쿼리 수 일정)
+   → 채널별로 reminder_deliveries에 먼저 기록해 선점 (이미 보냈거나 다른 곳에서 보내는 중인 채널은 제외)
+2. 발송 (이벤트 루프): 건별 타임아웃
+   - 이메일: smtp_sender (로그인된 연결 재사용 + 파이프라이닝, 동시 SMTP 연결 수는 발송기 설정으로 제한), 세마포어로 동시 발송 수 제한
+   - 푸시: 배치의 모든 알림 × 기기 토큰을 FCMService.send_each로 한꺼번에 발송 (호출당 최대 500개)
+     시간 초과 시에는 발송 여부를 알 수 없으므로(스레드에서 계속 발송될 수 있음) 실패로 보고 재시도하지 않음
+3. 기록 (작업 스레드): Notification 저장, 알림 상태(sent/retrying/dead)/발송 기록 갱신, 등록 해제된 기기 토큰 일괄 삭제
+   - 실패한 채널이 있으면 백오프 후 재시도 예약 (보낸 채널은 발송 기록으로 다시 보내지 않음)
+
+DB 조회/커밋과 SMTP/FCM 호출이 모두 작업 스레드에서 실행되므로 API 이벤트 루프를 막지 않습니다.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session, selectinload
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.models import Todo, Notification, FamilyMember, ReminderJob
+from app.models.user import User
+from app.services.email_service import EmailService
+from app.services.device_token_service import DeviceTokenService
+from app.services.fcm_service import FCMService
+from app.services.reminder_job_service import ReminderJobService
+from app.services.reminder_delivery_service import ReminderDeliveryService
+
+logger = logging.getLogger(__name__)
+
+# IN 목록 최대 크기 (SQLite 바인드 변수 제한)
+_ID_CHUNK_SIZE = 500
+
+
+def _chunks(items: List[str]):
+    for start in range(0, len(items), _ID_CHUNK_SIZE):
+        yield items[start:start + _ID_CHUNK_SIZE]
+
+
+class ReminderDispatcher:
+    """알림 발송 파이프라인 (이메일 동시 발송 수 제한, 푸시는 배치 단위 일괄 발송)"""
+
+    def __init__(self, email_concurrency: int, send_timeout_seconds: float):
+        """
+        Args:
+            email_concurrency: 동시에 보내는 최대 이메일 수
+            send_timeout_seconds: 이메일 한 건 / 푸시 일괄 발송 한 번의 최대 대기 시간 (초과 시 발송 여부를 알 수 없음으로 기록)
+        """
+        self.email_concurrency = max(1, email_concurrency)
+        self.send_timeout_seconds = send_timeout_seconds
+        self._email_semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_email_semaphore(self) -> asyncio.Semaphore:
+        if self._email_semaphore is None:
+            self._email_semaphore = asyncio.Semaphore(self.email_concurrency)
+        return self._email_semaphore
+
+    async def dispatch_due(self) -> int:
+        """
+        발송 시각이 된 알림을 남김없이 발송 (배치 단위로 선점 → 발송 → 기록)
+
+        Returns:
+            하나 이상의 채널로 발송된 알림 수
+        """
+        sent_count = 0
+        claimed_count = 0
+        while True:
+            deliveries, claimed = await asyncio.to_thread(self._prepare_batch)
+            if not claimed:
+                break
+
+            results, stale_tokens = await self._deliver_batch(deliveries)
+            await asyncio.to_thread(self._record_results, results, stale_tokens)
+
+            sent_count += sum(1 for result in results if result['channels'])
+            claimed_count += claimed
+            if claimed < settings.reminder_claim_batch_size:
+                break
+
+        if claimed_count:
+            logger.info(f"[REMINDER_DISPATCH] 알림 {claimed_count}개 중 {sent_count}개 발송 완료")
+        return sent_count
+
+    # ---- 1. 준비 (작업 스레드) ----
+
+    def _prepare_batch(self) -> Tuple[List[Dict[str, Any]], int]:
+        """알림 한 배치를 선점하고 발송 내용으로 변환. (발송 내용 목록, 선점한 알림 수) 반환"""
+        db = SessionLocal()
+        try:
+            jobs = ReminderJobService.claim_due(db)
+            context = self._preload(db, jobs)
+            deliveries = []
+            for job in jobs:
+                try:
+                    delivery = self._build_delivery(job, context)
+                except Exception as e:
+                    logger.error(f"[REMINDER_DISPATCH] 알림 준비 실패: job_id={job.id}, todo_id={job.todo_id}, 오류: {e}", exc_info=True)
+                    ReminderJobService.mark_failed(job)
+                    continue
+                if delivery:
+                    deliveries.append(delivery)
+            deliveries = self._claim_channels(db, jobs, deliveries)
+            db.commit()
+            return deliveries, len(jobs)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def _channels(delivery: Dict[str, Any]) -> List[str]:
+        """발송할 채널 목록"""
+        channels = []
+        if delivery['email']:
+            channels.append("email")
+        if delivery['push_tokens']:
+            channels.append("push")
+        return channels
+
+    @staticmethod
+    def _claim_channels(db: Session, jobs: List[ReminderJob], deliveries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        발송 기록에 채널별로 먼저 넣어 선점하고, 선점하지 못한 채널은 발송 내용에서 제외
+        모든 채널이 이미 발송된 알림은 발송 완료로 처리
+        """
+        entries = [
+            {
+                'user_id': delivery['user_id'],
+                'todo_id': delivery['todo_id'],
+                'reminder_offset': delivery['reminder_offset'],
+                'channel': channel,
+                'occurrence_at': delivery['occurrence_at']
+            }
+            for delivery in deliveries
+            for channel in ReminderDispatcher._channels(delivery)
+        ]
+        claimed = ReminderDeliveryService.claim(db, entries)
+
+        jobs_by_id = {job.id: job for job in jobs}
+        now = ReminderJobService.now()
+        claimed_deliveries = []
+        for delivery in deliveries:
+            if delivery['email'] and ReminderDeliveryService.key(delivery, "email") not in claimed:
+                delivery['email'] = None
+            if delivery['push_tokens'] and ReminderDeliveryService.key(delivery, "push") not in claimed:
+                delivery['push_tokens'] = []
+            if not ReminderDispatcher._channels(delivery):
+                ReminderJobService.mark_sent(jobs_by_id[delivery['job_id']], now)
+                continue
+            claimed_deliveries.append(delivery)
+        return claimed_deliveries
+
+    @staticmethod
+    def _member_ids(todo: Todo) -> List[str]:
+        """일정의 담당 프로필 ID 목록 ("me" 포함)"""
+        if not todo.family_member_ids:
+            return []
+        try:
+            member_ids = json.loads(todo.family_member_ids) if isinstance(todo.family_member_ids, str) else todo.family_member_ids
+        except Exception:
+            return []
+        return member_ids if isinstance(member_ids, list) else []
+
+    @staticmethod
+    def _preload(db: Session, jobs: List[ReminderJob]) -> Dict[str, Dict[str, Any]]:
+        """
+        배치의 알림에 필요한 일정/체크리스트/사용자/담당 프로필/기기 토큰을 IN 조회 몇 번으로 미리 읽어 둠
+        (알림 수와 관계없이 배치당 쿼리 수가 일정하도록 _build_delivery에서는 DB를 조회하지 않음)
+        """
+        todos = {}
+        for chunk in _chunks(list({job.todo_id for job in jobs})):
+            for todo in db.query(Todo).options(selectinload(Todo.checklist_items)).filter(Todo.id.in_(chunk)).all():
+                todos[todo.id] = todo
+
+        users = {}
+        for chunk in _chunks(list({todo.user_id for todo in todos.values()})):
+            for user in db.query(User).filter(User.id.in_(chunk)).all():
+                users[user.id] = user
+
+        member_ids = {
+            member_id for todo in todos.values()
+            for member_id in ReminderDispatcher._member_ids(todo) if member_id != "me"
+        }
+        members = {}
+        for chunk in _chunks(list(member_ids)):
+            for member in db.query(FamilyMember).filter(FamilyMember.id.in_(chunk)).all():
+                members[member.id] = member
+
+        push_user_ids = [
+            user.id for user in users.values()
+            if (getattr(user, 'notification_preference', 'email') or 'email') in ['push', 'both']
+        ]
+        device_tokens = DeviceTokenService.tokens_for_users(db, push_user_ids)
+
+        return {
+            'todos': todos,
+            'users': users,
+            'members': members,
+            'device_tokens': device_tokens
+        }
+
+    @staticmethod
+    def _assigned_members(todo: Todo, user: User, members: Dict[str, FamilyMember]) -> List[Dict[str, str]]:
+        """담당 프로필 정보 ("me"는 사용자 본인)"""
+        assigned_members = []
+        member_ids = ReminderDispatcher._member_ids(todo)
+        if "me" in member_ids:
+            assigned_members.append({"emoji": user.avatar_emoji or "👤", "name": user.name})
+        for member_id in member_ids:
+            member = members.get(member_id) if member_id != "me" else None
+            if member is not None:
+                assigned_members.append({"emoji": member.emoji or "👤", "name": member.name})
+        return assigned_members
+
+    def _build_delivery(self, job: ReminderJob, context: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        알림 하나의 발송 내용 (ORM 객체 없이 값만 담음, 미리 읽어 둔 context만 사용)
+        보낼 수 없는 알림은 상태를 바꾸고 None 반환
+        """
+        todo = context['todos'].get(job.todo_id)
+        # 선점 이후 삭제/완료/알림 해제된 일정은 보내지 않음
+        if not todo or todo.deleted_at is not None or todo.status == "completed" or not todo.has_notification:
+            job.status = "expired"
+            return None
+
+        user = context['users'].get(todo.user_id)
+        if not user or not user.email:
+            ReminderJobService.mark_failed(job)
+            return None
+
+        notification_pref = getattr(user, 'notification_preference', 'email') or 'email'
+        if notification_pref == 'none':
+            job.status = "expired"
+            return None
+
+        value = job.reminder_value
+        unit = job.reminder_unit
+        reminder_str = f"{value} {unit} 전" if unit != 'minutes' else f"{value}분 전"
+        reminder_offset = ReminderDeliveryService.reminder_offset(value, unit)
+
+        email = None
+        if notification_pref in ['email', 'both']:
+            checklist_items = [item.text for item in todo.checklist_items if item.text]
+            assigned_members = self._assigned_members(todo, user, context['members'])
+            email = {
+                'to_email': user.email,
+                'todo_title': todo.title,
+                'todo_date': todo.date.strftime("%Y년 %m월 %d일"),
+                'todo_time': todo.start_time.strftime("%H:%M") if todo.start_time else None,
+                'todo_end_time': todo.end_time.strftime("%H:%M") if todo.end_time else None,
+                'is_all_day': bool(todo.all_day),
+                'reminder_time': reminder_str,
+                'todo_location': todo.location,
+                'todo_category': todo.category,
+                'todo_checklist': checklist_items if checklist_items else None,
+                'todo_memo': todo.memo if todo.memo else None,
+                'assigned_members': assigned_members if assigned_members else None
+            }
+
+        push_tokens = []
+        if notification_pref in ['push', 'both']:
+            push_tokens = context['device_tokens'].get(user.id, [])
+
+        if not email and not push_tokens:
+            # 푸시만 설정했는데 FCM 토큰이 없는 경우
+            ReminderJobService.mark_failed(job)
+            return None
+
+        return {
+            'job_id': job.id,
+            'user_id': todo.user_id,
+            'user_email': user.email,
+            'todo_id': todo.id,
+            'todo_title': todo.title,
+            'reminder_str': reminder_str,
+            'reminder_offset': reminder_offset,
+            'occurrence_at': ReminderDeliveryService.occurrence_at(job.fire_at, reminder_offset),
+            'fire_at': job.fire_at,
+            'email': email,
+            'push_tokens': push_tokens
+        }
+
+    # ---- 2. 발송 (이벤트 루프) ----
+
+    async def _send_email(self, delivery: Dict[str, Any]) -> Optional[bool]:
+        """
+        알림 이메일 한 건 발송
+
+        Returns:
+            발송 성공 여부 (시간 초과로 발송 여부를 알 수 없으면 None)
+        """
+        async with self._get_email_semaphore():
+            try:
+                return await asyncio.wait_for(
+                    EmailService.send_notification_email_async(**delivery['email']),
+                    timeout=self.send_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                # 기다리기만 멈출 뿐 SMTP 발송은 작업 스레드에서 계속되어 전달될 수 있으므로 실패로 보지 않음 (중복 메일 방지)
+                logger.error(f"[EMAIL_NOTIFICATION] 이메일 발송 시간 초과 ({self.send_timeout_seconds}초), 발송 여부 알 수 없음: {delivery['user_email']}")
+                return None
+
+    async def _send_push_batch(self, deliveries: List[Dict[str, Any]]) -> Tuple[Set[str], List[str], Set[str]]:
+        """
+        배치의 모든 푸시를 한꺼번에 발송 (알림 하나 × 기기 토큰마다 메시지 하나)
+
+        Returns:
+            (기기 하나 이상에 발송된 job_id 집합, 등록 해제된 토큰 목록, 발송 여부를 알 수 없는 job_id 집합)
+        """
+        messages = []
+        job_ids = []
+        for delivery in deliveries:
+            if not delivery['push_tokens']:
+                continue
+            title, body, data = FCMService.todo_reminder_message(
+                delivery['todo_title'], delivery['reminder_str'], str(delivery['todo_id'])
+            )
+            for token in delivery['push_tokens']:
+                messages.append({'token': token, 'title': title, 'body': body, 'data': data})
+                job_ids.append(delivery['job_id'])
+        if not messages:
+            return set(), [], set()
+
+        try:
+            results = await asyncio.wait_for(FCMService.send_each(messages), timeout=self.send_timeout_seconds)
+        except asyncio.TimeoutError:
+            # send_each는 작업 스레드에서 계속 실행되어 발송될 수 있으므로 실패로 보지 않고 다시 보내지 않음 (중복 푸시 방지)
+            logger.error(f"[FCM_NOTIFICATION] 푸시 알림 일괄 발송 시간 초과 ({self.send_timeout_seconds}초), 발송 여부 알 수 없음: {len(messages)}개")
+            return set(), [], set(job_ids)
+
+        sent_job_ids = set()
+        stale_tokens = []
+        for job_id, message, result in zip(job_ids, messages, results):
+            if result['success']:
+                sent_job_ids.add(job_id)
+            elif result['stale']:
+                stale_tokens.append(message['token'])
+        return sent_job_ids, stale_tokens, set()
+
+    async def _deliver_batch(self, deliveries: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        배치의 알림을 설정된 채널로 동시에 발송
+
+        Returns:
+            (알림마다 성공한 채널을 더한 발송 내용 목록, 등록 해제된 기기 토큰 목록)
+        """
+        push_task = asyncio.create_task(self._send_push_batch(deliveries))
+        email_deliveries = [delivery for delivery in deliveries if delivery['email']]
+        email_results = await asyncio.gather(
+            *(self._send_email(delivery) for delivery in email_deliveries), return_exceptions=True
+        )
+        try:
+            sent_push_job_ids, stale_tokens, unknown_push_job_ids = await push_task
+        except Exception as e:
+            logger.error(f"[REMINDER_DISPATCH] push 발송 실패: {e}", exc_info=True)
+            sent_push_job_ids, stale_tokens, unknown_push_job_ids = set(), [], set()
+
+        sent_email_job_ids = set()
+        unknown_email_job_ids = set()
+        for delivery, result in zip(email_deliveries, email_results):
+            if isinstance(result, Exception):
+                logger.error(f"[REMINDER_DISPATCH] email 발송 실패: {delivery['user_email']}, 오류: {result}")
+            elif result is None:
+                unknown_email_job_ids.add(delivery['job_id'])
+            elif result:
+                sent_email_job_ids.add(delivery['job_id'])
+
+        results = []
+        for delivery in deliveries:
+            channels_sent = []
+            if delivery['job_id'] in sent_email_job_ids:
+                channels_sent.append("email")
+            if delivery['job_id'] in sent_push_job_ids:
+                channels_sent.append("push")
+            # 결과를 알 수 없는 채널 (시간 초과 후에도 발송됐을 수 있음)
+            channels_unknown = []
+            if delivery['job_id'] in unknown_email_job_ids:
+                channels_unknown.append("email")
+            if delivery['job_id'] in unknown_push_job_ids:
+                channels_unknown.append("push")
+            if channels_sent:
+                logger.info(f"[REMINDER_DISPATCH] 알림 발송 성공: {delivery['user_email']}, 일정: {delivery['todo_title']}, 채널: {channels_sent}")
+            results.append({**delivery, 'channels': channels_sent, 'unknown_channels': channels_unknown})
+        return results, stale_tokens
+
+    # ---- 3. 기록 (작업 스레드) ----
+
+    def _record_results(self, results: List[Dict[str, Any]], stale_tokens: List[str]):
+        """발송 결과 저장 (Notification 기록 + 알림 상태/발송 기록 갱신 + 등록 해제된 기기 토큰 삭제)"""
+        if not results and not stale_tokens:
+            return
+        db = SessionLocal()
+        try:
+            now = ReminderJobService.now()
+            jobs = {
+                job.id: job for job in db.query(ReminderJob).filter(
+                    ReminderJob.id.in_([result['job_id'] for result in results])
+                ).all()
+            }
+            sent_keys = []
+            failed_keys = []
+            retry_times = []
+            for result in results:
+                failed_channels = []
+                for channel in self._channels(result):
+                    key = ReminderDeliveryService.key(result, channel)
+                    # 결과를 알 수 없는 채널은 발송한 것으로 기록하여 재시도하지 않음 (중복 발송 방지)
+                    if channel in result['channels'] or channel in result.get('unknown_channels', ()):
+                        sent_keys.append(key)
+                    else:
+                        failed_keys.append(key)
+                        failed_channels.append(channel)
+
+                job = jobs.get(result['job_id'])
+                if job is None:
+                    continue
+                if result['channels'] and job.sent_at is None:
+                    # 처음 발송에 성공한 시도만 Notification으로 남김 (재시도로 나머지 채널을 보내도 하나만)
+                    self._add_notification(db, result, now)
+                    job.sent_at = now
+                if failed_channels:
+                    retry_at = ReminderJobService.schedule_retry(job, f"{', '.join(failed_channels)} 발송 실패", now)
+                    if retry_at is not None:
+                        retry_times.append(retry_at)
+                    continue
+                ReminderJobService.mark_sent(job, now)
+            ReminderDeliveryService.mark_sent(db, sent_keys, now)
+            # 실패한 채널은 기록을 지워 다시 발송할 수 있게 함
+            ReminderDeliveryService.release(db, failed_keys)
+            if stale_tokens:
+                DeviceTokenService.prune(db, stale_tokens)
+            if retry_times:
+                ReminderJobService.notify_after_commit(db, min(retry_times))
+                logger.warning(f"[REMINDER_DISPATCH] 발송 실패 알림 {len(retry_times)}개 재시도 예약")
+            db.commit()
+        except Exception as e:
+            # 기록하지 못한 알림은 claim_timeout 후 재시도됨
+            logger.error(f"[REMINDER_DISPATCH] 발송 결과 저장 실패: {e}", exc_info=True)
+            db.rollback()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _add_notification(db: Session, result: Dict[str, Any], now: datetime):
+        """앱 알림 목록에 보이는 Notification 기록"""
+        db.add(Notification(
+            user_id=result['user_id'],
+            todo_id=result['todo_id'],
+            type="reminder",
+            title=f"일정 알림: {result['todo_title']}",
+            message=f"{result['reminder_str']} 알림",
+            scheduled_time=result['fire_at'],
+            sent_at=now,
+            channels=json.dumps(result['channels'])
+        ))
+
+# 전역 알림 발송 파이프라인 인스턴스
+reminder_dispatcher = ReminderDispatcher(
+    email_concurrency=settings.reminder_email_concurrency,
+    send_timeout_seconds=settings.reminder_send_timeout_seconds
+)
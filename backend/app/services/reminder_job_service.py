@@ -0,0 +1,400 @@
+"""
+일정 알림 예약 (reminder_jobs)
+할 일의 알림 리마인더마다 발송 시각(fire_at)을 미리 계산해 저장해 두고,
+스케줄러는 모든 일정을 훑지 않고 fire_at이 지난 대기 행만 인덱스로 조회해 가져갑니다.
+
+유지 방식:
+- Todo가 생성/수정/삭제(소프트 삭제 포함)되어 flush되면 세션 이벤트에서 해당 일정의 대기 행을 다시 계산
+  (반복 일정 전개로 한꺼번에 만든 일정, 완료 처리도 같은 경로로 반영)
+- flush와 같은 연결/트랜잭션에서 실행하므로 일정 변경과 알림 예약이 함께 커밋/롤백됨
+- 이미 발송했거나 발송 중인 시각은 다시 예약하지 않음
+- 커밋 후 새로 예약한 발송 시각을 등록된 리스너(알림 스케줄러)에 알려, 더 이른 알림이면 바로 깨어나도록 함
+
+발송 실패:
+- 실패한 알림은 retrying 상태로 지수 백오프(+지터) 후 다시 선점 (실패 채널만 다시 발송, 보낸 채널은 reminder_deliveries로 건너뜀)
+- reminder_retry_max_attempts번 실패하면 dead로 남기고, 관리자 API에서 확인/재시도
+"""
+import json
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Set, Tuple, Callable
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import event, inspect, select, insert, update, delete, and_, or_, case, func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.models import Todo, ReminderJob
+
+logger = logging.getLogger(__name__)
+
+KST = ZoneInfo("Asia/Seoul")
+REMINDER_UNITS = ('minutes', 'hours', 'days', 'weeks')
+# 바뀌면 알림 시각을 다시 계산해야 하는 Todo 컬럼
+REMINDER_FIELDS = (
+    'user_id', 'date', 'start_time', 'all_day', 'status',
+    'has_notification', 'notification_reminders', 'deleted_at',
+)
+# IN 목록 최대 크기 (SQLite 바인드 변수 제한)
+_ID_CHUNK_SIZE = 500
+
+# 커밋된 새 알림의 발송 시각을 받는 콜백 (알림 스케줄러가 시작할 때 등록)
+_scheduled_listeners: List[Callable[[datetime], None]] = []
+
+
+def _chunks(items: List[str]):
+    for start in range(0, len(items), _ID_CHUNK_SIZE):
+        yield items[start:start + _ID_CHUNK_SIZE]
+
+
+class ReminderJobService:
+    """알림 예약 계산/저장과 스케줄러의 발송 대상 선점"""
+
+    @staticmethod
+    def now() -> datetime:
+        """현재 시각 (Asia/Seoul 기준 naive, fire_at과 같은 기준)"""
+        return datetime.now(KST).replace(tzinfo=None)
+
+    @staticmethod
+    def parse_reminders(todo: Todo) -> List[Tuple[int, str]]:
+        """notification_reminders JSON → [(value, unit), ...] (형식이 잘못된 항목은 제외)"""
+        if not todo.notification_reminders:
+            return []
+        try:
+            parsed = json.loads(todo.notification_reminders) if isinstance(todo.notification_reminders, str) else todo.notification_reminders
+        except Exception:
+            return []
+        if not isinstance(parsed, list):
+            return []
+
+        reminders = []
+        for reminder in parsed:
+            if not isinstance(reminder, dict):
+                continue
+            unit = reminder.get('unit', 'minutes')
+            try:
+                value = int(reminder.get('value', 30))
+            except (TypeError, ValueError):
+                continue
+            if unit in REMINDER_UNITS and (value, unit) not in reminders:
+                reminders.append((value, unit))
+        return reminders
+
+    @staticmethod
+    def compute_fire_times(todo: Todo) -> List[Tuple[int, str, datetime]]:
+        """
+        일정의 알림 발송 시각 목록 [(value, unit, fire_at), ...]
+
+        하루종일 일정은 그날 00:00, 시간 일정은 시작 시간 기준 (시작 시간이 없는 일정은 알림 없음)
+        """
+        if not todo.has_notification or todo.deleted_at is not None or todo.status == "completed" or not todo.date:
+            return []
+
+        if todo.all_day:
+            todo_datetime = datetime.combine(todo.date, datetime.min.time())
+        elif todo.start_time:
+            todo_datetime = datetime.combine(todo.date, todo.start_time)
+        else:
+            return []
+
+        return [
+            (value, unit, todo_datetime - timedelta(**{unit: value}))
+            for value, unit in ReminderJobService.parse_reminders(todo)
+        ]
+
+    @staticmethod
+    def sync_todos(connection, todos: List[Todo], new_todo_ids: Optional[Set[str]] = None) -> List[datetime]:
+        """
+        일정들의 대기 중인 알림 예약을 다시 계산 (커밋하지 않음)
+
+        Args:
+            connection: 일정 변경과 같은 트랜잭션의 연결
+            new_todo_ids: 이번에 새로 만든 일정 ID (기존 예약 조회/삭제 생략)
+
+        Returns:
+            새로 예약한 알림의 발송 시각 목록
+        """
+        table = ReminderJob.__table__
+        new_todo_ids = new_todo_ids or set()
+        existing_ids = [todo.id for todo in todos if todo.id not in new_todo_ids]
+
+        # 이미 발송했거나 발송 중인 시각 (일정을 수정해도 같은 시각의 알림을 다시 보내지 않음)
+        handled: Dict[str, Set[datetime]] = {}
+        for chunk in _chunks(existing_ids):
+            connection.execute(
+                delete(table).where(table.c.todo_id.in_(chunk), table.c.status == 'pending')
+            )
+            rows = connection.execute(
+                select(table.c.todo_id, table.c.fire_at).where(
+                    table.c.todo_id.in_(chunk),
+                    table.c.status.in_(('claimed', 'retrying', 'sent'))
+                )
+            )
+            for todo_id, fire_at in rows:
+                handled.setdefault(todo_id, set()).add(fire_at)
+
+        now = ReminderJobService.now()
+        created_at = datetime.utcnow()
+        values: List[Dict[str, Any]] = []
+        for todo in todos:
+            for value, unit, fire_at in ReminderJobService.compute_fire_times(todo):
+                if fire_at < now or fire_at in handled.get(todo.id, ()):
+                    continue
+                values.append({
+                    'id': str(uuid.uuid4()),
+                    'user_id': todo.user_id,
+                    'todo_id': todo.id,
+                    'reminder_value': value,
+                    'reminder_unit': unit,
+                    'fire_at': fire_at,
+                    'status': 'pending',
+                    'created_at': created_at,
+                    'updated_at': created_at,
+                })
+
+        if values:
+            connection.execute(insert(table), values)
+        return [value['fire_at'] for value in values]
+
+    @staticmethod
+    def sync_todo(db: Session, todo: Todo) -> List[datetime]:
+        """일정 하나의 알림 예약 다시 계산 (세션 밖에서 바뀐 일정, 기존 데이터 채우기용)"""
+        return ReminderJobService.sync_todos(db.connection(), [todo])
+
+    @staticmethod
+    def remove_todos(connection, todo_ids: List[str]):
+        """삭제된 일정의 알림 예약 삭제"""
+        table = ReminderJob.__table__
+        for chunk in _chunks(todo_ids):
+            connection.execute(delete(table).where(table.c.todo_id.in_(chunk)))
+
+    @staticmethod
+    def claim_due(db: Session, limit: Optional[int] = None) -> List[ReminderJob]:
+        """
+        발송 시각이 지난 대기 알림을 이 실행의 것으로 선점하고 반환 (선점은 바로 커밋)
+
+        여러 인스턴스/워커가 동시에 실행되어도 같은 알림은 한 곳에서만 가져갑니다.
+        - PostgreSQL: 대상 행을 SELECT ... FOR UPDATE SKIP LOCKED로 잠그므로, 다른 인스턴스가 선점 중인 행은
+          기다리지 않고 건너뛰어 인스턴스끼리 배치가 나뉨
+        - SQLite 등 (로컬 실행): UPDATE ... WHERE status = 'pending' 한 문장으로 선점 (쓰기는 DB 전체에서 직렬화됨)
+        - 선점 후 claim_timeout이 지나도 끝나지 않은 알림(발송 중 프로세스 종료)은 실패 한 번으로 세고 바로 재시도
+        - 발송 시각보다 max_lateness 넘게 늦어진 알림(서버 중단 등)은 보내지 않고 만료 (재시도 중인 알림은 제외)
+        - 재시도 시각(next_attempt_at)이 된 retrying 알림도 함께 선점
+        """
+        table = ReminderJob.__table__
+        limit = limit or settings.reminder_claim_batch_size
+        now = ReminderJobService.now()
+        utc_now = datetime.utcnow()
+
+        db.execute(
+            update(table).where(
+                table.c.status == 'claimed',
+                table.c.claimed_at < utc_now - timedelta(seconds=settings.reminder_claim_timeout_seconds)
+            ).values(
+                status=case((table.c.attempts + 1 >= settings.reminder_retry_max_attempts, 'dead'), else_='retrying'),
+                attempts=table.c.attempts + 1,
+                next_attempt_at=now,
+                last_error='발송 결과가 기록되지 않음 (claim timeout)',
+                claim_token=None,
+                claimed_at=None,
+                updated_at=utc_now
+            )
+        )
+        expired = db.execute(
+            update(table).where(
+                table.c.status == 'pending',
+                table.c.fire_at < now - timedelta(minutes=settings.reminder_max_lateness_minutes)
+            ).values(status='expired', updated_at=utc_now)
+        ).rowcount
+        if expired:
+            logger.warning(f"[REMINDER_JOBS] 발송 시각이 {settings.reminder_max_lateness_minutes}분 넘게 지난 알림 {expired}개 만료")
+
+        claim_token = str(uuid.uuid4())
+        due_ids = select(table.c.id).where(
+            or_(
+                and_(table.c.status == 'pending', table.c.fire_at <= now),
+                and_(table.c.status == 'retrying', table.c.next_attempt_at <= now)
+            )
+        ).order_by(table.c.fire_at).limit(limit)
+        if db.get_bind().dialect.name == 'postgresql':
+            due_ids = due_ids.with_for_update(skip_locked=True)
+        db.execute(
+            update(table).where(
+                table.c.id.in_(due_ids),
+                table.c.status.in_(('pending', 'retrying'))
+            ).values(status='claimed', claim_token=claim_token, claimed_at=utc_now, updated_at=utc_now)
+        )
+        db.commit()
+
+        return db.query(ReminderJob).filter(
+            ReminderJob.claim_token == claim_token
+        ).order_by(ReminderJob.fire_at).all()
+
+    @staticmethod
+    def upcoming_fire_times(db: Session, until: datetime, limit: int = 1000) -> List[datetime]:
+        """until까지 발송할 대기 알림의 발송 시각과 재시도 시각 (이미 지난 것 포함, 빠른 순)"""
+        table = ReminderJob.__table__
+        fire_times = set()
+        for status, column in (('pending', table.c.fire_at), ('retrying', table.c.next_attempt_at)):
+            rows = db.execute(
+                select(column).where(
+                    table.c.status == status,
+                    column <= until
+                ).distinct().order_by(column).limit(limit)
+            )
+            fire_times.update(row[0] for row in rows)
+        return sorted(fire_times)[:limit]
+
+    @staticmethod
+    def mark_sent(job: ReminderJob, sent_at: datetime):
+        job.status = 'sent'
+        job.sent_at = sent_at
+
+    @staticmethod
+    def mark_failed(job: ReminderJob):
+        """다시 보내도 소용없는 알림 (받을 이메일/기기가 없음, 발송 내용을 만들 수 없음)"""
+        job.status = 'failed'
+
+    @staticmethod
+    def retry_delay_seconds(attempts: int) -> float:
+        """attempts번 실패한 뒤의 재시도 대기 시간 (지수 백오프, 같은 시각에 몰리지 않도록 절반 범위 지터)"""
+        delay = min(settings.reminder_retry_max_seconds, settings.reminder_retry_base_seconds * (2 ** (attempts - 1)))
+        return random.uniform(delay / 2, delay)
+
+    @staticmethod
+    def schedule_retry(job: ReminderJob, error: str, now: datetime) -> Optional[datetime]:
+        """
+        발송 실패를 기록하고 재시도 예약 (최대 횟수를 넘으면 dead)
+
+        Returns:
+            다음 재시도 시각 (dead가 되면 None)
+        """
+        job.attempts = (job.attempts or 0) + 1
+        job.last_error = error[:1000]
+        if job.attempts >= settings.reminder_retry_max_attempts:
+            job.status = 'dead'
+            job.next_attempt_at = None
+            logger.warning(f"[REMINDER_JOBS] 알림 발송 {job.attempts}회 실패로 중단 (dead): job_id={job.id}, 오류: {error}")
+            return None
+        job.status = 'retrying'
+        job.next_attempt_at = now + timedelta(seconds=ReminderJobService.retry_delay_seconds(job.attempts))
+        return job.next_attempt_at
+
+    @staticmethod
+    def requeue(
+        db: Session,
+        job_ids: Optional[List[str]] = None,
+        statuses: Tuple[str, ...] = ('dead',),
+        max_lateness_minutes: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """
+        실패한 알림을 바로 다시 발송하도록 되돌림 (시도 수 초기화, 커밋은 호출하는 쪽에서)
+        발송 시각보다 max_lateness_minutes 넘게 지난 알림은 되돌리지 않고 만료
+        (재시도를 모두 쓴 알림은 이미 claim_due의 max_lateness를 넘긴 경우가 대부분이므로 별도의 더 긴 기준 사용)
+
+        Args:
+            job_ids: 되돌릴 알림 ID (없으면 statuses 상태인 알림 전체)
+            statuses: 되돌릴 수 있는 상태
+            max_lateness_minutes: 되돌릴 수 있는 최대 지연 (기본: REMINDER_REQUEUE_MAX_LATENESS_MINUTES)
+
+        Returns:
+            (되돌린 알림 수, 만료한 알림 수)
+        """
+        table = ReminderJob.__table__
+        now = ReminderJobService.now()
+        utc_now = datetime.utcnow()
+        if max_lateness_minutes is None:
+            max_lateness_minutes = settings.reminder_requeue_max_lateness_minutes
+        late = table.c.fire_at < now - timedelta(minutes=max_lateness_minutes)
+        updates = [
+            ([late], dict(status='expired', next_attempt_at=None, claim_token=None, claimed_at=None, updated_at=utc_now)),
+            ([~late], dict(status='retrying', attempts=0, next_attempt_at=now, claim_token=None, claimed_at=None, updated_at=utc_now)),
+        ]
+        counts = []
+        for conditions, values in updates:
+            conditions = [table.c.status.in_(statuses), *conditions]
+            if job_ids is None:
+                count = db.execute(update(table).where(*conditions).values(**values)).rowcount
+            else:
+                count = 0
+                for chunk in _chunks(job_ids):
+                    count += db.execute(update(table).where(table.c.id.in_(chunk), *conditions).values(**values)).rowcount
+            counts.append(count)
+
+        expired, requeued = counts
+        if expired:
+            logger.warning(f"[REMINDER_JOBS] 발송 시각이 {max_lateness_minutes}분 넘게 지난 알림 {expired}개는 다시 발송하지 않고 만료")
+        if requeued:
+            ReminderJobService.notify_after_commit(db, now)
+        return requeued, expired
+
+    @staticmethod
+    def status_counts(db: Session) -> Dict[str, int]:
+        """상태별 알림 수"""
+        rows = db.query(ReminderJob.status, func.count(ReminderJob.id)).group_by(ReminderJob.status).all()
+        return {status: count for status, count in rows}
+
+    @staticmethod
+    def notify_after_commit(session: Session, fire_at: datetime):
+        """이 세션이 커밋되면 스케줄러에 fire_at을 알림 (재시도 예약처럼 일정 변경 없이 발송 시각이 생길 때)"""
+        pending = session.info.get('reminder_earliest_fire_at')
+        session.info['reminder_earliest_fire_at'] = fire_at if pending is None else min(pending, fire_at)
+
+    @staticmethod
+    def add_scheduled_listener(callback: Callable[[datetime], None]):
+        """새 알림이 커밋되면 가장 이른 발송 시각으로 callback 호출 (커밋한 스레드에서 호출됨)"""
+        if callback not in _scheduled_listeners:
+            _scheduled_listeners.append(callback)
+
+    @staticmethod
+    def remove_scheduled_listener(callback: Callable[[datetime], None]):
+        if callback in _scheduled_listeners:
+            _scheduled_listeners.remove(callback)
+
+
+def _reminder_fields_changed(todo: Todo) -> bool:
+    state = inspect(todo)
+    return any(state.attrs[field].history.has_changes() for field in REMINDER_FIELDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_flushed_todo_reminders(session: Session, flush_context):
+    """Todo 생성/수정/삭제가 flush되면 같은 트랜잭션에서 알림 예약 갱신"""
+    new_todos = [obj for obj in session.new if isinstance(obj, Todo)]
+    changed_todos = [obj for obj in session.dirty if isinstance(obj, Todo) and _reminder_fields_changed(obj)]
+    deleted_ids = [obj.id for obj in session.deleted if isinstance(obj, Todo) and obj.id]
+    if not (new_todos or changed_todos or deleted_ids):
+        return
+
+    connection = session.connection()
+    if deleted_ids:
+        ReminderJobService.remove_todos(connection, deleted_ids)
+    if new_todos or changed_todos:
+        fire_times = ReminderJobService.sync_todos(
+            connection,
+            new_todos + changed_todos,
+            new_todo_ids={todo.id for todo in new_todos}
+        )
+        if fire_times:
+            logger.debug(f"[REMINDER_JOBS] 일정 {len(new_todos) + len(changed_todos)}개 알림 예약 갱신 - {len(fire_times)}개 예약")
+            ReminderJobService.notify_after_commit(session, min(fire_times))
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_committed_reminders(session: Session):
+    """커밋된 새 알림 중 가장 이른 발송 시각을 스케줄러에 알림"""
+    earliest = session.info.pop('reminder_earliest_fire_at', None)
+    if earliest is None:
+        return
+    for callback in list(_scheduled_listeners):
+        try:
+            callback(earliest)
+        except Exception as e:
+            logger.warning(f"[REMINDER_JOBS] 알림 예약 리스너 호출 실패: {e}")
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_uncommitted_reminders(session: Session, previous_transaction):
+    session.info.pop('reminder_earliest_fire_at', None)
@@ -1,80 +1,168 @@
 """
 알림 스케줄러 서비스
-주기적으로 알림 이메일을 발송합니다.
+reminder_jobs의 발송 시각에 맞춰 알림 이메일/푸시를 발송합니다.
+
+- 앞으로 horizon_seconds 동안의 발송 시각을 메모리 힙에 올려 두고, 가장 이른 시각까지 정확히 대기
+- 일정 저장으로 더 이른 알림이 예약되면(커밋 후 리스너 호출) 바로 깨어나 대기 시간을 다시 계산
+- horizon이 끝나면 힙을 다시 채우면서 남은 알림도 한 번 확인 (다른 인스턴스에서 예약된 알림, 놓친 알림 처리)
+- 매시 정각에는 알림 묶음(digest) 이메일을 먼저 보내, 같은 시각에 울릴 알림의 이메일이 따로 나가지 않도록 함
 """
 import asyncio
+import heapq
 import logging
-from datetime import datetime
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.api.routes.notifications import send_scheduled_emails
+from datetime import datetime, timedelta
+from typing import List, Optional
+from app.config import settings
+from app.database import SessionLocal
+from app.services.reminder_dispatcher import reminder_dispatcher
+from app.services.reminder_digest import reminder_digest_dispatcher
+from app.services.reminder_job_service import ReminderJobService
 
 logger = logging.getLogger(__name__)
 
+# 힙에 올리는 최대 발송 시각 수 (넘으면 마지막 시각까지만 horizon으로 사용)
+HORIZON_MAX_FIRE_TIMES = 1000
+
 
 class NotificationScheduler:
     """알림 스케줄러"""
-    
-    def __init__(self, interval_minutes: int = 5):
+
+    def __init__(self, horizon_seconds: int = 300, retry_seconds: int = 60):
         """
         Args:
-            interval_minutes: 알림 확인 간격 (분)
+            horizon_seconds: 메모리에 올려 두는 발송 시각 범위 (초), 이 주기로 DB를 다시 조회
+            retry_seconds: 오류 발생 시 재시도 간격 (초)
         """
-        self.interval_minutes = interval_minutes
+        self.horizon_seconds = horizon_seconds
+        self.retry_seconds = retry_seconds
         self.is_running = False
         self.task = None
-    
+        self._fire_times: List[datetime] = []  # 발송 시각 힙 (Asia/Seoul 기준 naive)
+        self._horizon_end: Optional[datetime] = None
+        self._next_digest_at: Optional[datetime] = None
+        self._wake_event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
     async def start(self):
         """스케줄러 시작"""
         if self.is_running:
             logger.warning("[SCHEDULER] 스케줄러가 이미 실행 중입니다.")
             return
-        
+
         self.is_running = True
-        logger.info(f"[SCHEDULER] 알림 스케줄러 시작 (간격: {self.interval_minutes}분)")
-        
+        self._loop = asyncio.get_running_loop()
+        self._wake_event = asyncio.Event()
+        self._horizon_end = None
+        self._next_digest_at = reminder_digest_dispatcher.next_boundary(ReminderJobService.now())
+        ReminderJobService.add_scheduled_listener(self.notify)
+        logger.info(f"[SCHEDULER] 알림 스케줄러 시작 (조회 범위: {self.horizon_seconds}초)")
+
         # 백그라운드 태스크로 실행
         self.task = asyncio.create_task(self._run_loop())
-    
+
     async def stop(self):
         """스케줄러 중지"""
         if not self.is_running:
             return
-        
+
         self.is_running = False
+        ReminderJobService.remove_scheduled_listener(self.notify)
         if self.task:
             self.task.cancel()
             try:
                 await self.task
             except asyncio.CancelledError:
                 pass
-        
+
         logger.info("[SCHEDULER] 알림 스케줄러 중지")
-    
+
+    def notify(self, fire_at: datetime):
+        """
+        새 알림이 예약됨 (일정 저장 커밋 후 호출, 어느 스레드에서든 호출 가능)
+        현재 horizon 안이면 힙에 넣고 스케줄러를 깨움 (horizon 밖이면 다음 조회 때 올라옴)
+        """
+        if not self.is_running or self._loop is None:
+            return
+        if self._horizon_end is not None and fire_at > self._horizon_end:
+            return
+        self._loop.call_soon_threadsafe(self._push, fire_at)
+
+    def _push(self, fire_at: datetime):
+        heapq.heappush(self._fire_times, fire_at)
+        self._wake_event.set()
+
+    @staticmethod
+    def _upcoming_fire_times(horizon_end: datetime) -> List[datetime]:
+        db = SessionLocal()
+        try:
+            return ReminderJobService.upcoming_fire_times(db, horizon_end, limit=HORIZON_MAX_FIRE_TIMES)
+        finally:
+            db.close()
+
+    async def _load_horizon(self, now: datetime):
+        """앞으로 horizon_seconds 동안의 발송 시각을 힙에 올림 (조회는 작업 스레드에서 실행)"""
+        horizon_end = now + timedelta(seconds=self.horizon_seconds)
+        # 조회하는 동안 notify로 들어온 시각은 조회 결과에 없을 수 있으므로 함께 보관
+        self._fire_times = []
+        self._horizon_end = None
+        fire_times = await asyncio.to_thread(self._upcoming_fire_times, horizon_end)
+        if len(fire_times) >= HORIZON_MAX_FIRE_TIMES:
+            # 다 올리지 못한 시각은 다음 조회에서 가져옴
+            horizon_end = fire_times[-1]
+        fire_times.extend(self._fire_times)
+        heapq.heapify(fire_times)
+        self._fire_times = fire_times
+        self._horizon_end = horizon_end
+        logger.debug(f"[SCHEDULER] 발송 예정 시각 {len(fire_times)}개 로드 (~{horizon_end})")
+
+    def _next_delay(self, now: datetime) -> float:
+        """다음 발송 시각, 묶음 발송 시각, horizon 끝 중 가장 이른 시각까지 남은 시간 (초)"""
+        wake_at = min(self._horizon_end, self._next_digest_at)
+        if self._fire_times and self._fire_times[0] < wake_at:
+            wake_at = self._fire_times[0]
+        return max(0.0, (wake_at - now).total_seconds())
+
     async def _run_loop(self):
         """스케줄러 루프"""
         while self.is_running:
             try:
-                # 데이터베이스 세션 생성
-                db = next(get_db())
+                # 이 시점 이후의 notify는 아래 대기를 바로 깨움
+                self._wake_event.clear()
+                now = ReminderJobService.now()
+
+                if now >= self._next_digest_at:
+                    # 정각: 묶음 이메일 먼저 발송 (놓친 정각은 건너뛰고, 그 범위의 알림은 알림마다 발송됨)
+                    boundary = self._next_digest_at
+                    self._next_digest_at = reminder_digest_dispatcher.next_boundary(now)
+                    await reminder_digest_dispatcher.dispatch(boundary)
+                    now = ReminderJobService.now()
+
+                if self._horizon_end is None or now >= self._horizon_end:
+                    # horizon 갱신: 남은 알림 발송 후 다음 범위 조회
+                    await reminder_dispatcher.dispatch_due()
+                    await self._load_horizon(ReminderJobService.now())
+                elif self._fire_times and self._fire_times[0] <= now:
+                    # 발송 시각 도달
+                    while self._fire_times and self._fire_times[0] <= now:
+                        heapq.heappop(self._fire_times)
+                    await reminder_dispatcher.dispatch_due()
+
+                # 다음 발송 시각까지 대기 (더 이른 알림이 예약되면 바로 깨어남)
+                delay = self._next_delay(ReminderJobService.now())
                 try:
-                    # 예정된 알림 이메일 발송
-                    send_scheduled_emails(db)
-                finally:
-                    db.close()
-                
-                # 다음 실행까지 대기
-                await asyncio.sleep(self.interval_minutes * 60)
-                
+                    await asyncio.wait_for(self._wake_event.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+
             except asyncio.CancelledError:
                 logger.info("[SCHEDULER] 스케줄러 취소됨")
                 break
             except Exception as e:
                 logger.error(f"[SCHEDULER] 스케줄러 오류: {e}", exc_info=True)
-                # 오류 발생 시에도 계속 실행 (다음 주기에서 재시도)
-                await asyncio.sleep(self.interval_minutes * 60)
+                # 오류 발생 시에도 계속 실행 (다음 조회에서 재시도)
+                self._horizon_end = None
+                await asyncio.sleep(self.retry_seconds)
 
 
 # 전역 스케줄러 인스턴스
-scheduler = NotificationScheduler(interval_minutes=1)
-
+scheduler = NotificationScheduler(horizon_seconds=settings.reminder_horizon_seconds)
@@ -0,0 +1,309 @@
+"""
+비동기 SMTP 발송기 (연결 풀 + 파이프라이닝)
+알림처럼 한꺼번에 많은 메일을 보낼 때 메시지마다 연결/STARTTLS/로그인을 반복하지 않도록,
+로그인된 연결을 하나씩 가진 작업자들이 큐에 쌓인 메시지를 연달아 보냅니다.
+
+- 작업자는 큐에서 최대 BATCH_SIZE개를 꺼내 작업 스레드에서 같은 연결로 연속 발송 (이벤트 루프를 막지 않음)
+- 서버가 PIPELINING(RFC 2920)을 지원하면 MAIL FROM/RCPT TO/DATA를 한 번에 보내 메시지당 왕복을 4회 → 2회로 줄임
+- 오래 쉰 연결은 다시 연결하고, 발송 중 연결이 끊기면 새 연결로 다시 시도 (max_retries회)
+- 수신 거부 같은 SMTP 응답 오류는 재시도하지 않고 해당 메시지만 실패 처리 (연결은 RSET 후 계속 사용)
+"""
+import asyncio
+import copy
+import io
+import logging
+import re
+import smtplib
+import ssl
+import time
+from email.generator import BytesGenerator
+from email.message import Message
+from email.utils import getaddresses
+from typing import Optional, List, Dict, Any, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 작업자가 한 번에 꺼내 같은 연결로 보내는 최대 메시지 수
+BATCH_SIZE = 20
+
+_LEADING_PERIOD = re.compile(br'(?m)^\.')
+CRLF = b"\r\n"
+
+
+def _envelope(msg: Message) -> Tuple[str, List[str]]:
+    """smtplib.send_message와 같은 방식으로 보내는 사람/받는 사람 주소 추출"""
+    sender = msg['Sender'] or msg['From']
+    from_addr = getaddresses([sender])[0][1] if sender else ""
+    recipients = msg.get_all('To', []) + msg.get_all('Cc', []) + msg.get_all('Bcc', [])
+    to_addrs = [addr for _, addr in getaddresses(recipients) if addr]
+    return from_addr, to_addrs
+
+
+def _flatten(msg: Message) -> bytes:
+    """메시지를 SMTP로 보낼 바이트로 변환 (Bcc 헤더 제외, CRLF 줄바꿈)"""
+    if msg['Bcc'] is not None:
+        msg = copy.copy(msg)
+        del msg['Bcc']
+    buffer = io.BytesIO()
+    BytesGenerator(buffer).flatten(msg, linesep='\r\n')
+    return buffer.getvalue()
+
+
+def pipelined_sendmail(server: smtplib.SMTP, from_addr: str, to_addrs: List[str], data: bytes) -> Dict[str, Tuple[int, bytes]]:
+    """
+    MAIL FROM/RCPT TO/DATA를 한 번에 보내고 응답을 순서대로 읽는 sendmail (서버가 PIPELINING을 지원할 때만 사용)
+
+    Returns:
+        거부된 수신자 {주소: (코드, 응답)} (smtplib.SMTP.sendmail과 동일)
+
+    Raises:
+        smtplib.SMTPSenderRefused / SMTPRecipientsRefused / SMTPDataError
+    """
+    commands = [f"MAIL FROM:{smtplib.quoteaddr(from_addr)}"]
+    commands += [f"RCPT TO:{smtplib.quoteaddr(addr)}" for addr in to_addrs]
+    commands.append("DATA")
+    server.send(("\r\n".join(commands) + "\r\n").encode('ascii'))
+
+    # 응답은 보낸 명령 순서대로 도착
+    mail_code, mail_resp = server.getreply()
+    refused = {}
+    for addr in to_addrs:
+        code, resp = server.getreply()
+        if code not in (250, 251):
+            refused[addr] = (code, resp)
+    data_code, data_resp = server.getreply()
+
+    transaction_ok = mail_code == 250 and len(refused) < len(to_addrs)
+    if data_code == 354 and not transaction_ok:
+        # 트랜잭션이 없는데 DATA를 받아들인 경우: 빈 본문으로 끝내고 초기화
+        server.send(b"." + CRLF)
+        server.getreply()
+        data_code = 503
+    if data_code != 354:
+        server.rset()
+        if mail_code != 250:
+            raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+        if len(refused) == len(to_addrs):
+            raise smtplib.SMTPRecipientsRefused(refused)
+        raise smtplib.SMTPDataError(data_code, data_resp)
+
+    body = _LEADING_PERIOD.sub(b"..", data)
+    if body[-2:] != CRLF:
+        body += CRLF
+    server.send(body + b"." + CRLF)
+    code, resp = server.getreply()
+    if code != 250:
+        server.rset()
+        raise smtplib.SMTPDataError(code, resp)
+    return refused
+
+
+class _Connection:
+    """작업자 하나가 쓰는 SMTP 연결"""
+
+    def __init__(self):
+        self.server: Optional[smtplib.SMTP] = None
+        self.key: Optional[Tuple[str, int, str, bool]] = None
+        self.pipelining = False
+        self.last_used = 0.0
+
+
+class PooledSMTPSender:
+    """로그인된 연결을 재사용하는 비동기 SMTP 발송기"""
+
+    def __init__(
+        self,
+        connections: int,
+        idle_seconds: float,
+        timeout: float,
+        pipelining: bool = True,
+        max_retries: int = 1
+    ):
+        """
+        Args:
+            connections: 동시에 유지하는 SMTP 연결(작업자) 수
+            idle_seconds: 이 시간 넘게 쉰 연결은 다시 연결
+            timeout: 소켓 타임아웃 (초)
+            pipelining: 서버가 지원하면 PIPELINING 사용
+            max_retries: 연결 오류 시 새 연결로 다시 시도하는 횟수
+        """
+        self.connections = max(1, connections)
+        self.idle_seconds = idle_seconds
+        self.timeout = timeout
+        self.pipelining = pipelining
+        self.max_retries = max_retries
+        self._ssl_context = ssl.create_default_context()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._connections: List[_Connection] = []
+        self.is_running = False
+
+    async def start(self):
+        """작업자 시작 (연결은 첫 메시지를 보낼 때 맺음)"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._queue = asyncio.Queue()
+        self._connections = [_Connection() for _ in range(self.connections)]
+        self._workers = [asyncio.create_task(self._worker(conn)) for conn in self._connections]
+        logger.info(f"[SMTP_SENDER] SMTP 발송기 시작 (연결 {self.connections}개, 파이프라이닝 {'사용' if self.pipelining else '사용 안 함'})")
+
+    async def stop(self):
+        """작업자 종료, 대기 중인 메시지는 실패 처리, 연결 종료"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(smtplib.SMTPServerDisconnected("SMTP 발송기가 종료되었습니다"))
+
+        connections, self._connections = self._connections, []
+        await asyncio.to_thread(self._close_all, connections)
+        logger.info("[SMTP_SENDER] SMTP 발송기 종료")
+
+    async def send(
+        self,
+        msg: Message,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        starttls: bool = True
+    ):
+        """
+        메시지 발송 (큐에 넣고 작업자가 보낼 때까지 대기)
+
+        Raises:
+            smtplib.SMTPException, OSError: 발송 실패
+        """
+        if not self.is_running:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        job = {
+            'msg': msg,
+            'key': (host, port, user, starttls),
+            'password': password
+        }
+        self._queue.put_nowait((job, future))
+        await future
+
+    async def _worker(self, conn: _Connection):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            # 기다리다 취소된(타임아웃) 메시지는 보내지 않음
+            batch = [(job, future) for job, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            try:
+                results = await asyncio.to_thread(self._send_batch, conn, [job for job, _ in batch])
+            except Exception as e:
+                results = [e] * len(batch)
+            for (_, future), error in zip(batch, results):
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+
+    # ---- 작업 스레드 ----
+
+    def _send_batch(self, conn: _Connection, jobs: List[Dict[str, Any]]) -> List[Optional[Exception]]:
+        return [self._send_one(conn, job) for job in jobs]
+
+    def _send_one(self, conn: _Connection, job: Dict[str, Any]) -> Optional[Exception]:
+        """메시지 하나 발송. 성공하면 None, 실패하면 예외 반환"""
+        from_addr, to_addrs = _envelope(job['msg'])
+        data = _flatten(job['msg'])
+        attempt = 0
+        while True:
+            try:
+                server = self._ensure_connected(conn, job['key'], job['password'])
+                if conn.pipelining:
+                    pipelined_sendmail(server, from_addr, to_addrs, data)
+                else:
+                    server.sendmail(from_addr, to_addrs, data)
+                conn.last_used = time.monotonic()
+                return None
+            except (smtplib.SMTPServerDisconnected, OSError) as e:
+                # 연결 문제: 연결을 버리고 새 연결로 다시 시도
+                self._close(conn)
+                if attempt >= self.max_retries:
+                    return e
+                attempt += 1
+                logger.warning(f"[SMTP_SENDER] SMTP 연결 오류, 다시 연결 후 재시도 ({attempt}/{self.max_retries}): {e}")
+            except smtplib.SMTPException as e:
+                # 메시지 단위 오류(수신 거부 등) 또는 로그인 실패: 재시도하지 않음
+                if conn.server is not None:
+                    try:
+                        conn.server.rset()
+                    except Exception:
+                        self._close(conn)
+                return e
+
+    def _ensure_connected(self, conn: _Connection, key: Tuple[str, int, str, bool], password: str) -> smtplib.SMTP:
+        """로그인된 연결 반환 (서버 설정이 바뀌었거나 오래 쉰 연결은 다시 연결)"""
+        if conn.server is not None and (conn.key != key or time.monotonic() - conn.last_used > self.idle_seconds):
+            self._close(conn)
+        if conn.server is not None:
+            return conn.server
+
+        host, port, user, starttls = key
+        server = smtplib.SMTP(host, port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if starttls:
+                server.starttls(context=self._ssl_context)  # TLS 암호화
+                server.ehlo()
+            if user:
+                server.login(user, password)
+        except Exception:
+            self._quit(server)
+            raise
+        conn.server = server
+        conn.key = key
+        conn.pipelining = self.pipelining and server.has_extn('pipelining')
+        conn.last_used = time.monotonic()
+        return server
+
+    @staticmethod
+    def _quit(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _close(self, conn: _Connection):
+        if conn.server is not None:
+            self._quit(conn.server)
+        conn.server = None
+        conn.key = None
+
+    def _close_all(self, connections: List[_Connection]):
+        for conn in connections:
+            self._close(conn)
+
+
+# 전역 SMTP 발송기 인스턴스 (연결 수/유휴 시간은 동기 SMTP 풀과 같은 설정 사용)
+smtp_sender = PooledSMTPSender(
+    connections=settings.smtp_pool_size,
+    idle_seconds=settings.smtp_idle_seconds,
+    timeout=settings.outbound_http_timeout
+)
@@ -0,0 +1,419 @@
+"""
+3-way 동기화 계획 실행 서비스
+로컬 Todo, 이벤트 미러(원격 상태), 마지막 동기화 스냅샷으로 sync_planner 입력을 만들고
+계획된 작업만 Google Calendar/DB에 반영합니다.
+"""
+import json
+import logging
+from datetime import datetime, timedelta
+from datetime import time as time_obj
+from typing import Optional, Dict, Any, List, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from app.models.models import GoogleCalendarEvent, GoogleCalendarSyncSnapshot, Todo
+from app.models.user import User
+from app.services.calendar_mirror_service import CalendarMirrorService
+from app.services.calendar_service import GoogleCalendarService
+from app.services.calendar_sync_job_service import CalendarSyncJobService
+from app.services.google_rate_limiter import PRIORITY_BULK
+from app.services.recurrence import INSTANCE_ID_PATTERN, series_event_id
+from app.services.recurring_series_service import RecurringSeriesService
+from app.services.sync_writer import ChunkedSyncWriter
+from app.services.sync_planner import (
+    SyncPlan,
+    plan_sync,
+    fingerprint,
+    OP_CREATE,
+    OP_UPDATE,
+    OP_DELETE,
+    OP_IMPORT,
+    OP_LINK,
+    OP_UNLINK
+)
+
+logger = logging.getLogger(__name__)
+
+# Todo는 Asia/Seoul 기준 naive datetime, 미러는 UTC naive datetime
+KST_OFFSET = timedelta(hours=9)
+
+class SyncPlanContext:
+    """계획 계산에 사용한 로컬/원격 객체 (적용 단계에서 다시 조회하지 않기 위함)"""
+
+    def __init__(self, calendar_id: str):
+        self.calendar_id = calendar_id
+        self.todos: Dict[str, Todo] = {}
+        self.series: Dict[str, List[Todo]] = {}  # 기준 행 ID → 반복 이벤트 하나로 동기화하는 시리즈 행 (날짜순)
+        self.remote_rows: Dict[str, GoogleCalendarEvent] = {}
+        self.snapshots: Dict[str, GoogleCalendarSyncSnapshot] = {}
+
+
+class SyncPlanService:
+    """3-way 동기화 계획 서비스"""
+
+    @staticmethod
+    def todo_fingerprint(todo: Todo) -> Optional[str]:
+        """Todo가 내보내질 때의 이벤트 내용 해시 (날짜가 없으면 None)"""
+        if not todo.date:
+            return None
+        start_datetime, end_datetime = CalendarSyncJobService.build_event_range(todo)
+        return fingerprint(
+            todo.title,
+            todo.memo or todo.description or "",
+            todo.location or "",
+            todo.all_day,
+            start_datetime - KST_OFFSET,
+            end_datetime - KST_OFFSET
+        )
+
+    @staticmethod
+    def event_fingerprint(row: GoogleCalendarEvent) -> str:
+        return fingerprint(row.title, row.description, row.location, row.all_day, row.start_at, row.end_at)
+
+    @staticmethod
+    def _series_event_id(rows: List[Todo]):
+        """
+        시리즈가 연결된 반복 이벤트 ID
+
+        Returns:
+            반복 이벤트 ID, 아직 내보내지 않았으면 None,
+            행 단위로 처리해야 하면 False (행마다 다른 이벤트 / 반복 이벤트로 표현할 수 없음)
+        """
+        event_ids = {todo.google_calendar_event_id for todo in rows if todo.google_calendar_event_id}
+        if not event_ids:
+            return None if RecurringSeriesService.build_recurrence(rows) else False
+        if not all(INSTANCE_ID_PATTERN.match(event_id) for event_id in event_ids):
+            return False
+        series_ids = {series_event_id(event_id) for event_id in event_ids}
+        return series_ids.pop() if len(series_ids) == 1 else False
+
+    @staticmethod
+    def load_inputs(
+        db: Session,
+        user: User,
+        calendar_id: str = 'primary'
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], SyncPlanContext]:
+        """로컬/원격/스냅샷을 sync_planner 입력 형식으로 조회"""
+        context = SyncPlanContext(calendar_id)
+
+        local = {}
+        # 다른 캘린더에서 가져온 일정은 그 캘린더의 이벤트이므로 제외 (google_calendar_id가 None이면 primary)
+        if calendar_id == 'primary':
+            calendar_filter = Todo.google_calendar_id.is_(None)
+        else:
+            calendar_filter = Todo.google_calendar_id == calendar_id
+        todos = db.query(Todo).filter(
+            Todo.user_id == user.id,
+            Todo.deleted_at.is_(None),
+            Todo.date.isnot(None),
+            calendar_filter
+        ).all()
+        series_rows: Dict[str, List[Todo]] = {}
+        for todo in todos:
+            context.todos[todo.id] = todo
+            if RecurringSeriesService.is_series(todo):
+                series_rows.setdefault(todo.todo_group_id, []).append(todo)
+                continue
+            local[todo.id] = {
+                'event_id': todo.google_calendar_event_id,
+                'hash': SyncPlanService.todo_fingerprint(todo)
+            }
+
+        # 반복 일정 시리즈는 기준 행(첫 날짜) 하나로 계획 (원격은 반복 이벤트 하나)
+        for rows in series_rows.values():
+            rows.sort(key=lambda todo: (todo.date, todo.created_at))
+            event_id = SyncPlanService._series_event_id(rows)
+            if event_id is False:
+                # 행마다 따로 내보낸 시리즈(이전 버전)이거나 반복 이벤트로 표현할 수 없는 시리즈는 행 단위로 계획
+                for todo in rows:
+                    local[todo.id] = {
+                        'event_id': todo.google_calendar_event_id,
+                        'hash': SyncPlanService.todo_fingerprint(todo)
+                    }
+                continue
+            head = rows[0]
+            context.series[head.id] = rows
+            local[head.id] = {
+                'event_id': event_id,
+                'hash': SyncPlanService.todo_fingerprint(head)
+            }
+
+        # 미러는 singleEvents로 반복 이벤트를 인스턴스별로 저장하므로, 인스턴스는 시리즈 ID로 묶고
+        # 가장 이른 인스턴스(시리즈 시작과 같은 내용)만 비교에 사용
+        remote = {}
+        rows = db.query(GoogleCalendarEvent).filter(
+            GoogleCalendarEvent.user_id == user.id,
+            GoogleCalendarEvent.calendar_id == calendar_id
+        ).order_by(GoogleCalendarEvent.start_at).all()
+        for row in rows:
+            match = INSTANCE_ID_PATTERN.match(row.event_id)
+            event_id = match.group(1) if match else row.event_id
+            if event_id in remote:
+                continue
+            context.remote_rows[event_id] = row
+            remote[event_id] = {
+                'etag': row.etag,
+                'hash': SyncPlanService.event_fingerprint(row),
+                'source_id': row.source_id
+            }
+
+        snapshots = {}
+        for snapshot in db.query(GoogleCalendarSyncSnapshot).filter(
+            GoogleCalendarSyncSnapshot.user_id == user.id,
+            GoogleCalendarSyncSnapshot.calendar_id == calendar_id
+        ).all():
+            context.snapshots[snapshot.todo_id] = snapshot
+            snapshots[snapshot.todo_id] = {
+                'event_id': snapshot.event_id,
+                'etag': snapshot.etag,
+                'hash': snapshot.content_hash
+            }
+
+        return local, remote, snapshots, context
+
+    @staticmethod
+    async def build_plan(
+        db: Session,
+        user: User,
+        include_imports: bool = False,
+        calendar_id: str = 'primary'
+    ) -> Tuple[SyncPlan, SyncPlanContext]:
+        """
+        이벤트 미러를 증분 동기화한 뒤 동기화 계획 계산
+
+        원격 상태는 미러(sync token 증분 동기화)에서 읽으므로, 매번 전체 이벤트 목록을 받아오지 않습니다.
+        """
+        async with CalendarMirrorService.get_user_lock(user.id):
+            await CalendarMirrorService.sync_user(db, user, calendar_id)
+
+        local, remote, snapshots, context = SyncPlanService.load_inputs(db, user, calendar_id)
+        plan = plan_sync(local, remote, snapshots, include_imports=include_imports)
+        logger.info(f"[SYNC_PLAN] 계획 계산 - user_id={user.id}, 로컬 {len(local)}개, 원격 {len(remote)}개, 스냅샷 {len(snapshots)}개 → {plan.summary()}")
+        return plan, context
+
+    @staticmethod
+    def _save_snapshot(
+        db: Session,
+        user: User,
+        context: SyncPlanContext,
+        todo_id: str,
+        event_id: str,
+        etag: Optional[str],
+        content_hash: str
+    ):
+        snapshot = context.snapshots.get(todo_id)
+        if snapshot is None:
+            snapshot = GoogleCalendarSyncSnapshot(
+                user_id=user.id,
+                calendar_id=context.calendar_id,
+                todo_id=todo_id
+            )
+            db.add(snapshot)
+            context.snapshots[todo_id] = snapshot
+        snapshot.event_id = event_id
+        snapshot.etag = etag
+        snapshot.content_hash = content_hash
+        snapshot.synced_at = datetime.utcnow()
+
+    @staticmethod
+    def _drop_snapshot(db: Session, context: SyncPlanContext, todo_id: str):
+        snapshot = context.snapshots.pop(todo_id, None)
+        if snapshot is not None:
+            db.delete(snapshot)
+
+    @staticmethod
+    def _apply_remote_content(todo: Todo, row: GoogleCalendarEvent):
+        """미러 이벤트의 제목/설명/장소를 Todo에 반영"""
+        todo.title = row.title or '제목 없음'
+        todo.description = row.description or ''
+        todo.memo = row.description or ''
+        todo.location = row.location or ''
+
+    @staticmethod
+    def _apply_remote_to_todo(todo: Todo, row: GoogleCalendarEvent):
+        """미러 이벤트 내용을 Todo에 반영 (가져오기)"""
+        SyncPlanService._apply_remote_content(todo, row)
+        todo.date = row.date
+        todo.end_date = row.end_date
+        todo.start_time = time_obj(*map(int, row.start_time.split(':'))) if row.start_time else None
+        todo.end_time = time_obj(*map(int, row.end_time.split(':'))) if row.end_time else None
+        todo.all_day = row.all_day
+        todo.notification_reminders = row.notification_reminders
+        todo.repeat_type = row.repeat_type
+        todo.repeat_pattern = row.repeat_pattern
+        todo.repeat_end_date = row.repeat_end_date
+
+    @staticmethod
+    def _todo_event_kwargs(todo: Todo, with_repeat: bool) -> Dict[str, Any]:
+        """create_event/update_event 공통 인자"""
+        start_datetime, end_datetime = CalendarSyncJobService.build_event_range(todo)
+        notification_reminders = CalendarSyncJobService.parse_reminders(todo)
+        kwargs = {
+            'title': todo.title,
+            'description': todo.memo or todo.description or "",
+            'start_datetime': start_datetime,
+            'end_datetime': end_datetime,
+            'location': todo.location or "",
+            'all_day': todo.all_day,
+            'notification_reminders': notification_reminders if notification_reminders else None,
+        }
+        if with_repeat and todo.repeat_type and todo.repeat_type != 'none':
+            repeat_pattern = None
+            if todo.repeat_pattern:
+                try:
+                    repeat_pattern = json.loads(todo.repeat_pattern) if isinstance(todo.repeat_pattern, str) else todo.repeat_pattern
+                except (TypeError, ValueError):
+                    pass
+            kwargs.update(
+                repeat_type=todo.repeat_type,
+                repeat_pattern=repeat_pattern,
+                repeat_end_date=todo.repeat_end_date
+            )
+        return kwargs
+
+    @staticmethod
+    async def apply_plan(
+        db: Session,
+        user: User,
+        plan: SyncPlan,
+        context: SyncPlanContext,
+        with_repeat: bool = True,
+        priority: str = PRIORITY_BULK,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        계획된 작업만 반영 (변경 없는 항목은 건드리지 않음)
+
+        DB 변경은 chunk_size개 작업마다 모아서 커밋합니다 (기본값: settings.calendar_sync_commit_chunk_size).
+
+        Returns:
+            작업 종류별 성공 수와 failed_count
+        """
+        token_json = user.google_calendar_token
+        stats = {f"{op}_count": 0 for op in plan.operations}
+        stats['failed_count'] = 0
+        writer = ChunkedSyncWriter(db, chunk_size=chunk_size, tag="SYNC_PLAN")
+
+        for op, items in plan.operations.items():
+            for item in items:
+                todo_id = item['todo_id']
+                event_id = item['event_id']
+                todo = context.todos.get(todo_id) if todo_id else None
+                series = context.series.get(todo_id) if todo_id else None
+                try:
+                    if op == OP_CREATE and series:
+                        result = await RecurringSeriesService.export_series(db, user, series, priority=priority)
+                        if not result:
+                            stats['failed_count'] += 1
+                            continue
+                        for series_todo in series:
+                            if series_todo.bulk_synced is None:
+                                series_todo.bulk_synced = False
+                        SyncPlanService._save_snapshot(db, user, context, todo.id, result['event_id'], result['etag'], item['hash'])
+
+                    elif op == OP_CREATE:
+                        event = await GoogleCalendarService.create_event(
+                            token_json=token_json,
+                            source_id=todo.id,  # Always Plan의 Todo ID 저장 (중복 제거용)
+                            priority=priority,
+                            **SyncPlanService._todo_event_kwargs(todo, with_repeat)
+                        )
+                        if not event or not event.get('id'):
+                            stats['failed_count'] += 1
+                            continue
+                        todo.google_calendar_event_id = event['id']
+                        if todo.bulk_synced is None:
+                            todo.bulk_synced = False
+                        SyncPlanService._save_snapshot(db, user, context, todo.id, event['id'], event.get('etag'), item['hash'])
+
+                    elif op == OP_UPDATE and series:
+                        event = await RecurringSeriesService.update_series(user, series, event_id, priority=priority)
+                        if not event:
+                            stats['failed_count'] += 1
+                            continue
+                        SyncPlanService._save_snapshot(db, user, context, todo.id, event_id, event.get('etag'), item['hash'])
+
+                    elif op == OP_UPDATE:
+                        event = await GoogleCalendarService.update_event(
+                            token_json=token_json,
+                            event_id=event_id,
+                            priority=priority,
+                            **SyncPlanService._todo_event_kwargs(todo, with_repeat)
+                        )
+                        if not event:
+                            stats['failed_count'] += 1
+                            continue
+                        todo.google_calendar_event_id = event_id
+                        SyncPlanService._save_snapshot(db, user, context, todo.id, event_id, event.get('etag'), item['hash'])
+                        if item.get('conflict'):
+                            logger.info(f"[SYNC_PLAN] 양쪽 변경 충돌 - 로컬 우선 반영: todo_id={todo.id}, event_id={event_id}")
+
+                    elif op == OP_DELETE:
+                        deleted = await GoogleCalendarService.delete_event(
+                            token_json=token_json,
+                            event_id=event_id,
+                            priority=priority
+                        )
+                        if not deleted:
+                            stats['failed_count'] += 1
+                            continue
+                        snapshot = context.snapshots.get(todo_id)
+                        if snapshot is not None and snapshot.event_id == event_id:
+                            SyncPlanService._drop_snapshot(db, context, todo_id)
+
+                    elif op == OP_LINK:
+                        for linked_todo in series or [todo]:
+                            if linked_todo.bulk_synced is None:
+                                linked_todo.bulk_synced = False
+                        if series:
+                            RecurringSeriesService.assign_instance_ids(series, event_id)
+                        else:
+                            todo.google_calendar_event_id = event_id
+                        SyncPlanService._save_snapshot(db, user, context, todo.id, event_id, item['etag'], item['hash'])
+
+                    elif op == OP_UNLINK:
+                        for linked_todo in series or [todo]:
+                            linked_todo.google_calendar_event_id = None
+                        SyncPlanService._drop_snapshot(db, context, todo.id)
+
+                    elif op == OP_IMPORT:
+                        row = context.remote_rows[event_id]
+                        if todo is None:
+                            todo = Todo(
+                                user_id=user.id,
+                                category="구글",
+                                status="pending",
+                                priority="medium",
+                                source="google_calendar",  # Google Calendar에서 가져온 일정임을 명시
+                                google_calendar_event_id=event_id,
+                                bulk_synced=True
+                            )
+                            db.add(todo)
+                        if series:
+                            # 시리즈는 날짜/반복 설정은 그대로 두고 내용만 모든 행에 반영 (미러 행은 인스턴스라 반복 정보가 없음)
+                            for series_todo in series:
+                                SyncPlanService._apply_remote_content(series_todo, row)
+                        else:
+                            SyncPlanService._apply_remote_to_todo(todo, row)
+                        db.flush()  # 새 Todo ID 확보
+                        SyncPlanService._save_snapshot(db, user, context, todo.id, event_id, item['etag'], item['hash'])
+
+                    stats[f"{op}_count"] += 1
+                    writer.record()
+                except Exception as e:
+                    logger.error(f"[SYNC_PLAN] 작업 실패 - op={op}, todo_id={todo_id}, event_id={event_id}: {e}", exc_info=True)
+                    stats['failed_count'] += 1
+                    # 커밋 전 변경은 버려짐 (이미 만든 원격 이벤트는 다음 계획에서 source_id로 link 됨)
+                    writer.discard()
+                    context.snapshots = {
+                        key: snapshot for key, snapshot in context.snapshots.items()
+                        if not inspect(snapshot).transient
+                    }
+
+        for todo_id in plan.stale_snapshot_todo_ids:
+            SyncPlanService._drop_snapshot(db, context, todo_id)
+
+        writer.finish()
+        logger.info(f"[SYNC_PLAN] 계획 반영 완료 - user_id={user.id}, {stats}")
+        return stats
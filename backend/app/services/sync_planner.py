@@ -0,0 +1,183 @@
+"""
+Google Calendar 3-way 동기화 계획 (로컬 Todo / 원격 이벤트 / 마지막 동기화 스냅샷)
+
+마지막으로 동기화한 시점의 지문(etag + 매핑 필드 해시)과 비교하여, 양쪽에서 실제로 바뀐 항목에
+대해서만 생성/수정/삭제/가져오기 작업을 만듭니다. 바뀐 것이 없는 항목은 API 호출도 DB 커밋도 하지 않습니다.
+
+DB/Google API에 의존하지 않는 순수 함수만 두어 dry-run과 벤치마크(benchmark_sync_planner.py)에서
+그대로 사용할 수 있습니다.
+
+입력 형식:
+    local:     {todo_id: {"event_id": str | None, "hash": str}}
+    remote:    {event_id: {"etag": str, "hash": str, "source_id": str | None}}
+    snapshots: {todo_id: {"event_id": str, "etag": str, "hash": str}}
+"""
+import hashlib
+import json
+import re
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+OP_CREATE = "create"  # 원격에 이벤트 생성
+OP_UPDATE = "update"  # 원격 이벤트를 로컬 내용으로 수정
+OP_DELETE = "delete"  # 원격 이벤트 삭제 (로컬에서 삭제된 일정 / 중복 이벤트)
+OP_IMPORT = "import"  # 원격 이벤트를 로컬로 가져오기 (새 이벤트 또는 원격에서만 바뀐 이벤트)
+OP_LINK = "link"  # API 호출 없이 매핑/스냅샷만 기록 (내용이 이미 같음)
+OP_UNLINK = "unlink"  # 원격에서 삭제된 이벤트의 매핑 해제 (로컬 변경이 없으면 다시 만들지 않음)
+OPS = (OP_CREATE, OP_UPDATE, OP_DELETE, OP_IMPORT, OP_LINK, OP_UNLINK)
+
+# API 호출이 필요한 작업
+REMOTE_OPS = (OP_CREATE, OP_UPDATE, OP_DELETE)
+
+_SOURCE_TAG_PATTERN = re.compile(r'\s*AlwaysPlanID:\S+')
+
+
+def _format_minute(value: Optional[datetime]) -> Optional[str]:
+    return value.strftime('%Y-%m-%dT%H:%M') if value else None
+
+
+def fingerprint(
+    title: Optional[str],
+    description: Optional[str],
+    location: Optional[str],
+    all_day: bool,
+    start_at: Optional[datetime],
+    end_at: Optional[datetime]
+) -> str:
+    """
+    매핑 필드의 내용 해시
+
+    로컬 Todo와 원격 이벤트를 같은 기준(UTC 분 단위 시작/종료, source 태그를 뺀 설명)으로 정규화하므로
+    내용이 같으면 양쪽 해시가 같습니다.
+    """
+    normalized = {
+        'title': (title or '').strip(),
+        'description': _SOURCE_TAG_PATTERN.sub('', description or '').strip(),
+        'location': (location or '').strip(),
+        'all_day': bool(all_day),
+        'start': _format_minute(start_at),
+        'end': _format_minute(end_at),
+    }
+    payload = json.dumps(normalized, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SyncPlan:
+    """동기화 계획 (작업 목록 + 변경 없는 항목 수)"""
+
+    def __init__(self):
+        self.operations: Dict[str, List[Dict[str, Any]]] = {op: [] for op in OPS}
+        self.unchanged_count = 0
+        self.conflict_count = 0
+        self.stale_snapshot_todo_ids: List[str] = []  # 로컬/원격 모두 없어진 스냅샷 (정리 대상)
+
+    def add(self, op: str, todo_id: Optional[str] = None, event_id: Optional[str] = None, **extra):
+        self.operations[op].append({'todo_id': todo_id, 'event_id': event_id, **extra})
+
+    @property
+    def api_call_count(self) -> int:
+        return sum(len(self.operations[op]) for op in REMOTE_OPS)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            **{f"{op}_count": len(items) for op, items in self.operations.items()},
+            'unchanged_count': self.unchanged_count,
+            'conflict_count': self.conflict_count,
+            'stale_snapshot_count': len(self.stale_snapshot_todo_ids),
+            'api_call_count': self.api_call_count,
+        }
+
+    def to_dict(self, max_items: Optional[int] = None) -> Dict[str, Any]:
+        """dry-run 응답용 (max_items: 작업 종류별 최대 표시 개수)"""
+        return {
+            'summary': self.summary(),
+            'operations': {
+                op: items[:max_items] if max_items is not None else items
+                for op, items in self.operations.items()
+            },
+        }
+
+
+def plan_sync(
+    local: Dict[str, Dict[str, Any]],
+    remote: Dict[str, Dict[str, Any]],
+    snapshots: Dict[str, Dict[str, Any]],
+    include_imports: bool = False
+) -> SyncPlan:
+    """
+    3-way 비교로 최소 작업 목록 계산
+
+    - 로컬만 바뀜 → update / 원격만 바뀜 → import (include_imports일 때) / 양쪽 다 바뀜 → 로컬 우선 update (충돌로 집계)
+    - 스냅샷 없이 원격에서 같은 내용의 이벤트를 찾으면 API 호출 없이 link
+    - 원격에서 삭제된 이벤트: 로컬이 그대로면 unlink, 로컬이 바뀌었으면 다시 create
+    - 로컬에서 삭제된 일정이 만든 이벤트(source_id) / 같은 일정의 중복 이벤트 → delete
+    - 원격에서 직접 만든 새 이벤트 → import (include_imports일 때, 로컬에서 지운 가져온 일정은 제외)
+    """
+    plan = SyncPlan()
+    remote_by_source = {
+        item['source_id']: event_id
+        for event_id, item in remote.items()
+        if item.get('source_id')
+    }
+    claimed_event_ids = set()
+
+    for todo_id, item in local.items():
+        snapshot = snapshots.get(todo_id)
+        event_id = item.get('event_id') or (snapshot or {}).get('event_id') or remote_by_source.get(todo_id)
+        remote_item = remote.get(event_id) if event_id else None
+
+        if remote_item is None:
+            if snapshot and item['hash'] == snapshot['hash']:
+                # 동기화 후 원격에서만 삭제됨 → 사용자가 Google에서 지운 것이므로 다시 만들지 않음
+                plan.add(OP_UNLINK, todo_id, snapshot['event_id'])
+            else:
+                plan.add(OP_CREATE, todo_id, hash=item['hash'])
+            continue
+
+        claimed_event_ids.add(event_id)
+
+        if not snapshot or snapshot.get('event_id') != event_id:
+            # 스냅샷이 없는 매핑 (이전 버전에서 동기화했거나 source_id로 찾음)
+            if remote_item['hash'] == item['hash']:
+                plan.add(OP_LINK, todo_id, event_id, etag=remote_item['etag'], hash=item['hash'])
+            else:
+                plan.add(OP_UPDATE, todo_id, event_id, hash=item['hash'])
+            continue
+
+        local_changed = item['hash'] != snapshot['hash']
+        remote_touched = remote_item['etag'] != snapshot['etag']
+        remote_changed = remote_touched and remote_item['hash'] != snapshot['hash']
+
+        if local_changed:
+            if remote_changed:
+                plan.conflict_count += 1
+            plan.add(OP_UPDATE, todo_id, event_id, hash=item['hash'], conflict=remote_changed)
+        elif remote_changed:
+            if include_imports:
+                plan.add(OP_IMPORT, todo_id, event_id, etag=remote_item['etag'], hash=remote_item['hash'])
+            else:
+                # 내보내기만 하는 경우 원격 변경은 그대로 둠 (스냅샷을 갱신하지 않아 로컬로 덮어쓰지 않음)
+                plan.unchanged_count += 1
+        elif remote_touched:
+            # 내용은 같고 etag만 바뀜 (알림 등 매핑하지 않는 필드 변경) → 스냅샷 etag만 갱신
+            plan.add(OP_LINK, todo_id, event_id, etag=remote_item['etag'], hash=item['hash'])
+        else:
+            plan.unchanged_count += 1
+
+    snapshot_event_ids = {snapshot['event_id'] for snapshot in snapshots.values() if snapshot.get('event_id')}
+    for event_id, remote_item in remote.items():
+        if event_id in claimed_event_ids:
+            continue
+        source_id = remote_item.get('source_id')
+        if source_id:
+            # Always Plan이 만든 이벤트인데 대응하는 로컬 일정이 없거나 다른 이벤트와 이미 매핑됨
+            plan.add(OP_DELETE, source_id, event_id)
+        elif include_imports and event_id not in snapshot_event_ids:
+            # 스냅샷에 있는 이벤트는 가져온 뒤 로컬에서 지운 것이므로 다시 가져오지 않음
+            plan.add(OP_IMPORT, None, event_id, etag=remote_item['etag'], hash=remote_item['hash'])
+
+    for todo_id, snapshot in snapshots.items():
+        if todo_id not in local and snapshot.get('event_id') not in remote:
+            plan.stale_snapshot_todo_ids.append(todo_id)
+
+    return plan
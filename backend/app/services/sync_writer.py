@@ -0,0 +1,104 @@
+"""
+일괄 동기화 DB 쓰기 (청크 단위 커밋)
+일정마다 db.commit()을 호출하지 않고, 변경된 ORM 객체를 세션에 모아 두었다가 N개마다 한 번 커밋합니다.
+(예: 2,000개 내보내기 → 청크 100개 기준 약 20회 커밋)
+
+- 커밋 직전에 체크포인트 콜백을 호출하여 체크포인트와 해당 청크의 변경이 같은 트랜잭션으로 저장됨
+- 중간에 중단되면 마지막으로 커밋한 청크까지만 남고, 커밋하지 못한 청크의 일정은 다음 실행에서 다시 처리
+  (이미 만든 원격 이벤트는 source_id 조회로 매칭되므로 중복 생성되지 않음)
+- 이벤트 루프에서 쓸 때는 record_async/finish_async (청크 커밋을 작업 스레드에서 실행)
+"""
+import asyncio
+import logging
+from typing import Optional, Callable, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+T = TypeVar('T')
+
+logger = logging.getLogger(__name__)
+
+
+async def run_in_thread(func: Callable[..., T], *args) -> T:
+    """
+    세션을 쓰는 동기 함수를 작업 스레드에서 실행
+
+    asyncio.to_thread와 같지만, 기다리는 중에 취소되면 스레드의 작업이 끝날 때까지 기다린 뒤 취소를 전달합니다.
+    (취소 처리에서 같은 세션을 롤백/종료할 때 스레드와 동시에 세션을 쓰지 않도록)
+    """
+    future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        try:
+            await future
+        except Exception:
+            pass
+        raise
+
+
+class ChunkedSyncWriter:
+    """청크 단위로 커밋하는 동기화 쓰기 도우미"""
+
+    def __init__(
+        self,
+        db: Session,
+        chunk_size: Optional[int] = None,
+        on_commit: Optional[Callable[[], None]] = None,
+        tag: str = "SYNC_WRITER"
+    ):
+        """
+        Args:
+            chunk_size: 커밋 단위 (기본값: settings.calendar_sync_commit_chunk_size)
+            on_commit: 커밋 직전에 호출 (체크포인트 등 같은 트랜잭션에 저장할 값 갱신)
+        """
+        self.db = db
+        self.chunk_size = max(1, chunk_size or settings.calendar_sync_commit_chunk_size)
+        self.on_commit = on_commit
+        self.tag = tag
+        self.pending_count = 0  # 마지막 커밋 이후 반영한 항목 수
+        self.commit_count = 0
+
+    def record(self, count: int = 1):
+        """항목 처리 완료 기록 (청크가 차면 커밋)"""
+        self.pending_count += count
+        if self.pending_count >= self.chunk_size:
+            self.flush()
+
+    async def record_async(self, count: int = 1):
+        """record의 비동기 버전 (청크 커밋은 작업 스레드에서 실행하여 이벤트 루프를 막지 않음)"""
+        self.pending_count += count
+        if self.pending_count >= self.chunk_size:
+            await run_in_thread(self.flush)
+
+    def flush(self):
+        """모아 둔 변경 커밋 (실패 시 롤백 후 예외 전달)"""
+        if self.on_commit:
+            self.on_commit()
+        try:
+            self.db.commit()
+        except Exception:
+            logger.error(f"[{self.tag}] 청크 커밋 실패 - 커밋하지 않은 {self.pending_count}개 항목은 다음 실행에서 다시 처리", exc_info=True)
+            self.db.rollback()
+            self.pending_count = 0
+            raise
+        self.commit_count += 1
+        self.pending_count = 0
+
+    def discard(self) -> int:
+        """커밋하지 않은 변경 버리기. 버린 항목 수 반환"""
+        discarded = self.pending_count
+        self.db.rollback()
+        self.pending_count = 0
+        return discarded
+
+    def finish(self):
+        """남은 변경 커밋"""
+        self.flush()
+        logger.info(f"[{self.tag}] 커밋 {self.commit_count}회 (청크 크기 {self.chunk_size})")
+
+    async def finish_async(self):
+        """finish의 비동기 버전"""
+        await run_in_thread(self.finish)
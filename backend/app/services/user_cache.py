@@ -0,0 +1,123 @@
+"""
+인증된 사용자 캐시 (인스턴스별, 짧은 TTL)
+get_current_user가 요청마다 users 테이블을 조회하지 않도록 사용자 컬럼 값을 잠시 보관하고,
+캐시 적중 시 SELECT 없이 요청의 DB 세션에 연결된 User 객체를 만들어 돌려줍니다.
+(라우트에서 current_user를 수정/커밋/refresh 하는 기존 코드가 그대로 동작)
+
+무효화:
+- 어떤 세션에서든 User 행을 수정/삭제하면 flush/commit 시점에 해당 사용자 캐시를 지움
+  (/auth/me 수정, 캘린더 토글, 알림 설정, Watch 갱신 등)
+- 다른 인스턴스의 변경은 TTL(USER_CACHE_TTL_SECONDS)이 지나면 반영
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import settings
+from app.models.user import User
+from app.repositories.user_repo import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class AuthenticatedUserCache:
+    """사용자 ID → users 컬럼 값 (LRU + TTL)"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # user_id → (만료 시각, 컬럼 값)
+        self._versions: Dict[str, int] = {}  # 무효화 횟수 (조회 중 무효화된 값을 다시 넣지 않기 위함)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _snapshot(user: User) -> Dict[str, Any]:
+        return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+    @staticmethod
+    def _attach(db: Session, values: Dict[str, Any]) -> User:
+        """캐시된 값으로 세션에 연결된 User 생성 (SELECT 없음, 변경 이력 없음)"""
+        user = User(**values)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def get(self, db: Session, user_id: str) -> Optional[User]:
+        """사용자 조회 (캐시에 없거나 만료되었으면 DB 조회 후 저장)"""
+        if self.ttl_seconds <= 0:
+            return UserRepository.get_by_id(db, user_id)
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                values = entry[1]
+            else:
+                values = None
+                if entry:
+                    del self._entries[user_id]
+            version = self._versions.get(user_id, 0)
+
+        if values is not None:
+            return self._attach(db, values)
+
+        user = UserRepository.get_by_id(db, user_id)
+        if user is None:
+            return None
+
+        values = self._snapshot(user)
+        with self._lock:
+            if self._versions.get(user_id, 0) == version:
+                self._entries[user_id] = (time.monotonic() + self.ttl_seconds, values)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+# 전역 사용자 캐시 인스턴스
+user_cache = AuthenticatedUserCache(
+    ttl_seconds=settings.user_cache_ttl_seconds,
+    max_entries=settings.user_cache_max_entries
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed_users(session: Session, flush_context):
+    """User 행 변경이 flush되면 캐시 무효화 (commit 시 한 번 더 무효화하기 위해 ID 기록)"""
+    user_ids = {
+        obj.id for obj in list(session.dirty) + list(session.deleted)
+        if isinstance(obj, User) and obj.id
+    }
+    if not user_ids:
+        return
+    session.info.setdefault('flushed_user_ids', set()).update(user_ids)
+    for user_id in user_ids:
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session):
+    """flush와 commit 사이에 다른 요청이 이전 값을 다시 캐시했을 수 있으므로 commit 후 한 번 더 무효화"""
+    for user_id in session.info.pop('flushed_user_ids', ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_flushed_users(session: Session, previous_transaction):
+    session.info.pop('flushed_user_ids', None)
@@ -0,0 +1,183 @@
+"""
+Google Calendar Watch 채널 갱신 스케줄러
+만료가 임박한 Watch 채널을 주기적으로 새 채널로 교체하고 이전 채널을 중지합니다.
+(Watch 채널은 최대 7일 후 만료되므로, 갱신하지 않으면 푸시 기반 동기화가 끊김)
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from app.database import SessionLocal
+from app.models.user import User
+from app.services.calendar_service import GoogleCalendarService
+from app.services.google_rate_limiter import PRIORITY_BULK
+from app.services.webhook_sync_worker import webhook_worker
+
+logger = logging.getLogger(__name__)
+
+
+class WatchRenewalScheduler:
+    """Watch 채널 갱신 스케줄러"""
+
+    def __init__(
+        self,
+        interval_minutes: int = 30,
+        horizon_hours: int = 24,
+        batch_size: int = 100,
+        max_concurrency: int = 5
+    ):
+        """
+        Args:
+            interval_minutes: 만료 임박 채널 확인 간격 (분)
+            horizon_hours: 이 시간 안에 만료되는 채널을 갱신 대상으로 조회
+            batch_size: 한 번에 조회하는 사용자 수
+            max_concurrency: 동시에 갱신하는 채널 수
+        """
+        self.interval_minutes = interval_minutes
+        self.horizon_hours = horizon_hours
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.is_running = False
+        self.task = None
+
+    async def start(self):
+        """스케줄러 시작"""
+        if self.is_running:
+            logger.warning("[WATCH_RENEWAL] 스케줄러가 이미 실행 중입니다.")
+            return
+
+        self.is_running = True
+        logger.info(f"[WATCH_RENEWAL] Watch 갱신 스케줄러 시작 (간격: {self.interval_minutes}분, 갱신 기준: 만료 {self.horizon_hours}시간 전)")
+        self.task = asyncio.create_task(self._run_loop())
+
+    async def stop(self):
+        """스케줄러 중지"""
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("[WATCH_RENEWAL] Watch 갱신 스케줄러 중지")
+
+    async def _run_loop(self):
+        """스케줄러 루프"""
+        while self.is_running:
+            try:
+                await self.renew_expiring_channels()
+                await asyncio.sleep(self.interval_minutes * 60)
+            except asyncio.CancelledError:
+                logger.info("[WATCH_RENEWAL] 스케줄러 취소됨")
+                break
+            except Exception as e:
+                logger.error(f"[WATCH_RENEWAL] 스케줄러 오류: {e}", exc_info=True)
+                await asyncio.sleep(self.interval_minutes * 60)
+
+    def _find_expiring_user_ids(self, after_id: str = None) -> List[str]:
+        """만료 임박 채널을 가진 사용자 ID 조회 (idx_users_watch_expiration 사용)"""
+        db = SessionLocal()
+        try:
+            horizon = datetime.utcnow() + timedelta(hours=self.horizon_hours)
+            query = db.query(User.id).filter(
+                User.google_calendar_watch_expiration.isnot(None),
+                User.google_calendar_watch_expiration < horizon,
+                User.google_calendar_token.isnot(None),
+                User.deleted_at.is_(None)
+            )
+            if after_id:
+                query = query.filter(User.id > after_id)
+            rows = query.order_by(User.id).limit(self.batch_size).all()
+            return [row[0] for row in rows]
+        finally:
+            db.close()
+
+    async def renew_expiring_channels(self) -> int:
+        """
+        만료 임박 채널을 배치 단위로, 제한된 동시성으로 갱신
+
+        Returns:
+            갱신에 성공한 채널 수
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        renewed = 0
+        after_id = None
+
+        async def _renew_with_limit(user_id: str) -> bool:
+            async with semaphore:
+                return await self.renew_user_channel(user_id)
+
+        while True:
+            user_ids = self._find_expiring_user_ids(after_id)
+            if not user_ids:
+                break
+
+            results = await asyncio.gather(
+                *[_renew_with_limit(user_id) for user_id in user_ids],
+                return_exceptions=True
+            )
+            renewed += sum(1 for result in results if result is True)
+            after_id = user_ids[-1]
+
+            if len(user_ids) < self.batch_size:
+                break
+
+        if renewed:
+            logger.info(f"[WATCH_RENEWAL] Watch 채널 {renewed}개 갱신 완료")
+        return renewed
+
+    @staticmethod
+    async def renew_user_channel(user_id: str) -> bool:
+        """새 Watch 채널을 등록한 뒤 이전 채널을 중지 (새 채널 등록 실패 시 이전 채널 유지)"""
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.id == user_id).first()
+            if not user or not user.google_calendar_token:
+                return False
+
+            old_channel_id = user.google_calendar_watch_channel_id
+            old_resource_id = user.google_calendar_watch_resource_id
+
+            watch_result = await GoogleCalendarService.register_watch(
+                token_json=user.google_calendar_token,
+                webhook_url=GoogleCalendarService.get_webhook_url(),
+                channel_id=str(uuid.uuid4()),
+                priority=PRIORITY_BULK
+            )
+            if not watch_result:
+                logger.warning(f"[WATCH_RENEWAL] 새 Watch 등록 실패 - user_id={user_id}, 기존 channel_id={old_channel_id}")
+                return False
+
+            user.google_calendar_watch_channel_id = watch_result['channel_id']
+            user.google_calendar_watch_resource_id = watch_result['resource_id']
+            user.google_calendar_watch_expiration = watch_result['expiration']
+            user.google_calendar_watch_token = watch_result['channel_token']
+            db.commit()
+
+            if old_channel_id and old_resource_id:
+                await GoogleCalendarService.stop_watch(
+                    token_json=user.google_calendar_token,
+                    channel_id=old_channel_id,
+                    resource_id=old_resource_id,
+                    priority=PRIORITY_BULK
+                )
+                webhook_worker.forget_channel(old_channel_id)
+
+            logger.info(f"[WATCH_RENEWAL] Watch 갱신 - user_id={user_id}, {old_channel_id} → {watch_result['channel_id']}, 만료: {watch_result['expiration']}")
+            return True
+        except Exception as e:
+            logger.error(f"[WATCH_RENEWAL] Watch 갱신 실패 - user_id={user_id}: {e}", exc_info=True)
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+
+# 전역 Watch 갱신 스케줄러 인스턴스
+watch_renewal_scheduler = WatchRenewalScheduler(interval_minutes=30, horizon_hours=24)
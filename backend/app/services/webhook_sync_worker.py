@@ -0,0 +1,194 @@
+"""
+Google Calendar 웹훅 동기화 워커
+Push Notification을 즉시 응답(ack)하고, 채널별로 알림을 모아(debounce)
+사용자당 하나의 증분 동기화만 실행합니다.
+
+웹훅 엔드포인트는 인증 없이 열려 있으므로, 저장된 Watch 채널(채널 ID + 채널 토큰)과 맞는 알림만
+기록/예약합니다. (임의의 채널 ID로 메모리를 늘리거나 태스크를 만들 수 없도록)
+"""
+import asyncio
+import hmac
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+
+from app.database import SessionLocal
+from app.models.user import User
+from app.services.calendar_mirror_service import CalendarMirrorService
+from app.services.sync_writer import run_in_thread
+
+logger = logging.getLogger(__name__)
+
+# 마지막 메시지 번호를 기억하는 최대 채널 수 (넘으면 가장 오래된 채널부터 지움)
+MAX_TRACKED_CHANNELS = 10000
+
+
+class CalendarWebhookWorker:
+    """웹훅 알림 debounce/병합 워커"""
+
+    def __init__(self, debounce_seconds: float = 5.0):
+        """
+        Args:
+            debounce_seconds: 첫 알림 이후 같은 채널의 알림을 모으는 시간 (초)
+        """
+        self.debounce_seconds = debounce_seconds
+        self.is_running = False
+        # 채널별 마지막으로 받은 X-Goog-Message-Number (중복/재전송 알림 무시, 확인된 채널만, 최근 순)
+        self._last_message_numbers: "OrderedDict[str, int]" = OrderedDict()
+        # 채널별 대기 중인 debounce 태스크
+        self._pending: Dict[str, asyncio.Task] = {}
+        # 동기화 실행 중인 사용자 / 실행 중에 새 알림이 들어온 사용자
+        self._in_flight: Set[str] = set()
+        self._dirty: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def start(self):
+        """워커 시작"""
+        self.is_running = True
+        logger.info(f"[WEBHOOK_WORKER] 웹훅 워커 시작 (debounce: {self.debounce_seconds}초)")
+
+    async def stop(self):
+        """워커 중지 (대기 중인 동기화 취소)"""
+        self.is_running = False
+        tasks = list(self._pending.values()) + list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._pending.clear()
+        self._tasks.clear()
+        logger.info("[WEBHOOK_WORKER] 웹훅 워커 중지")
+
+    async def enqueue(
+        self,
+        channel_id: str,
+        channel_token: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        message_number: Optional[str] = None
+    ) -> bool:
+        """
+        채널 변경 알림 등록 (채널 확인 후 바로 반환)
+
+        Returns:
+            새 동기화가 예약되었거나 대기 중인 동기화에 병합되면 True,
+            중복 알림이거나 저장된 Watch 채널과 맞지 않으면 False
+        """
+        if not self.is_running:
+            logger.warning(f"[WEBHOOK_WORKER] 워커가 실행 중이 아님 - channel_id: {channel_id}")
+            return False
+
+        user_id = await run_in_thread(self._verify_channel, channel_id, channel_token, resource_id)
+        if not user_id:
+            logger.warning(f"[WEBHOOK_WORKER] 등록되지 않았거나 토큰이 맞지 않는 채널 - channel_id: {channel_id}")
+            return False
+
+        # X-Goog-Message-Number로 중복/순서 뒤바뀐 재전송 알림 제거
+        if message_number:
+            try:
+                number = int(message_number)
+                last_number = self._last_message_numbers.get(channel_id)
+                if last_number is not None and number <= last_number:
+                    logger.info(f"[WEBHOOK_WORKER] 중복 알림 무시 - channel_id: {channel_id}, message_number: {number} (마지막: {last_number})")
+                    return False
+                self._last_message_numbers[channel_id] = number
+                self._last_message_numbers.move_to_end(channel_id)
+                while len(self._last_message_numbers) > MAX_TRACKED_CHANNELS:
+                    self._last_message_numbers.popitem(last=False)
+            except ValueError:
+                pass
+
+        if channel_id in self._pending:
+            # debounce 구간 안의 알림은 대기 중인 동기화에 병합
+            return True
+
+        self._pending[channel_id] = asyncio.create_task(self._debounce(channel_id, user_id))
+        return True
+
+    @staticmethod
+    def _verify_channel(channel_id: str, channel_token: Optional[str], resource_id: Optional[str]) -> Optional[str]:
+        """
+        저장된 Watch 채널과 맞으면 사용자 ID 반환 (작업 스레드에서 실행)
+
+        채널 토큰을 저장하기 전에 등록한 채널은 토큰이 없으므로 리소스 ID로 확인합니다. (갱신 시 토큰이 생김)
+        """
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(
+                User.google_calendar_watch_channel_id == channel_id,
+                User.deleted_at.is_(None)
+            ).first()
+            if not user:
+                return None
+            if user.google_calendar_watch_token:
+                expected, provided = user.google_calendar_watch_token, channel_token
+            else:
+                expected, provided = user.google_calendar_watch_resource_id, resource_id
+            if not expected or not provided or not hmac.compare_digest(expected, provided):
+                return None
+            return user.id
+        finally:
+            db.close()
+
+    def forget_channel(self, channel_id: str):
+        """채널 중지/교체 시 채널 상태 정리"""
+        self._last_message_numbers.pop(channel_id, None)
+        task = self._pending.pop(channel_id, None)
+        if task:
+            task.cancel()
+
+    async def _debounce(self, channel_id: str, user_id: str):
+        """debounce 시간 동안 알림을 모은 뒤 사용자 동기화 실행"""
+        try:
+            await asyncio.sleep(self.debounce_seconds)
+        except asyncio.CancelledError:
+            return
+        finally:
+            self._pending.pop(channel_id, None)
+
+        if user_id in self._in_flight:
+            # 이미 동기화 중이면 끝난 뒤 한 번 더 실행
+            self._dirty.add(user_id)
+            return
+
+        task = asyncio.create_task(self._run_user_sync(user_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    def _load_calendar_ids(user_id: str) -> Optional[List[str]]:
+        """동기화할 캘린더 ID 목록 (Google Calendar 연동이 해제되었으면 None, 작업 스레드에서 실행)"""
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.id == user_id).first()
+            if not user or not user.google_calendar_token:
+                return None
+            return CalendarMirrorService.get_selected_calendar_ids(db, user_id)
+        finally:
+            db.close()
+
+    async def _run_user_sync(self, user_id: str):
+        """사용자당 하나의 증분 동기화만 실행 (실행 중 들어온 알림은 한 번으로 병합)"""
+        self._in_flight.add(user_id)
+        try:
+            while True:
+                self._dirty.discard(user_id)
+                try:
+                    calendar_ids = await run_in_thread(self._load_calendar_ids, user_id)
+                    if calendar_ids:
+                        async with CalendarMirrorService.get_user_lock(user_id):
+                            applied = await CalendarMirrorService.sync_calendars(user_id, calendar_ids)
+                        logger.info(f"[WEBHOOK_WORKER] 증분 동기화 완료 - user_id={user_id}, 반영된 이벤트: {applied}개")
+                except Exception as e:
+                    logger.error(f"[WEBHOOK_WORKER] 동기화 중 오류 - user_id={user_id}: {e}", exc_info=True)
+
+                if user_id not in self._dirty:
+                    break
+        finally:
+            self._in_flight.discard(user_id)
+
+
+# 전역 웹훅 워커 인스턴스
+webhook_worker = CalendarWebhookWorker(debounce_seconds=5.0)
@@ -0,0 +1,95 @@
+"""
+SMTP 발송 벤치마크
+로컬 SMTP 수신기(smtp_sink.py)에 응답 지연을 주고 알림 메일 발송 처리량(msgs/sec)을 비교합니다.
+실제 메일 서버 없이 실행됩니다.
+
+- 메시지마다 연결/로그인/발송/종료 (기존 방식)
+- smtp_sender 연결 재사용 (파이프라이닝 없이)
+- smtp_sender 연결 재사용 + 파이프라이닝
+
+사용법:
+    python benchmark_smtp_sender.py [메시지 수] [응답 지연(ms)] [연결 수]
+"""
+import asyncio
+import smtplib
+import sys
+import os
+import time
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.email_service import EmailService
+from app.services.smtp_sender import PooledSMTPSender
+from smtp_sink import SMTPSink
+
+USER = "bench@example.com"
+PASSWORD = "bench"
+
+
+def build_messages(count: int):
+    messages = []
+    for index in range(count):
+        subject, html_content, text_content = EmailService.render_notification_email(
+            todo_title=f"일정 {index}",
+            todo_date="2026년 01월 01일",
+            todo_time="09:00",
+            reminder_time="30분 전"
+        )
+        messages.append(EmailService._build_message(USER, f"user{index}@example.com", subject, html_content, text_content))
+    return messages
+
+
+def send_per_message(messages, port: int):
+    """기존 방식: 메시지마다 새 연결"""
+    for msg in messages:
+        with smtplib.SMTP("127.0.0.1", port, timeout=30) as server:
+            server.login(USER, PASSWORD)
+            server.send_message(msg)
+
+
+async def send_pooled(messages, port: int, connections: int, pipelining: bool):
+    sender = PooledSMTPSender(connections=connections, idle_seconds=60, timeout=30, pipelining=pipelining)
+    await sender.start()
+    try:
+        await asyncio.gather(*(
+            sender.send(msg, "127.0.0.1", port, USER, PASSWORD, starttls=False) for msg in messages
+        ))
+    finally:
+        await sender.stop()
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    connections = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+
+    sink = SMTPSink(port=0, latency=latency_ms / 1000)
+    await sink.start()
+    messages = build_messages(count)
+    results = []
+    try:
+        cases = [
+            ("메시지마다 연결", lambda: asyncio.to_thread(send_per_message, messages, sink.port)),
+            (f"연결 재사용 ({connections}개)", lambda: send_pooled(messages, sink.port, connections, pipelining=False)),
+            (f"연결 재사용 ({connections}개) + 파이프라이닝", lambda: send_pooled(messages, sink.port, connections, pipelining=True)),
+        ]
+        for name, run in cases:
+            sink.reset()
+            started = time.perf_counter()
+            await run()
+            seconds = time.perf_counter() - started
+            assert len(sink.messages) == count, f"{name}: 예상 {count}개, 실제 {len(sink.messages)}개 수신"
+            results.append((name, seconds, sink.connection_count))
+    finally:
+        await sink.stop()
+
+    print(f"📊 SMTP 발송 벤치마크 (메시지 {count:,}개, 응답 지연 {latency_ms:.1f}ms)")
+    baseline = results[0][1]
+    for name, seconds, connection_count in results:
+        print(f"   - {name}: {seconds:.2f}초, {count / seconds:,.1f} msgs/sec, 연결 {connection_count:,}회 (x{baseline / seconds:.1f})")
+    print("✅ 모든 메시지 수신 확인")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
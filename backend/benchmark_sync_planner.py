@@ -0,0 +1,119 @@
+"""
+3-way 동기화 계획 벤치마크
+10,000개 일정(로컬/원격/스냅샷)으로 sync_planner의 계획 계산 시간과 작업 수를 측정합니다.
+DB나 Google API 없이 실행됩니다.
+
+사용법:
+    python benchmark_sync_planner.py [일정 수] [반복 횟수]
+"""
+import random
+import statistics
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.sync_planner import plan_sync, fingerprint
+
+
+def build_dataset(count: int, seed: int = 42):
+    """
+    마지막 동기화 이후 일부만 바뀐 상태를 만듦
+    - 90% 변경 없음, 3% 로컬 수정, 2% 원격 수정, 1% 양쪽 수정
+    - 2% 새 로컬 일정, 1% 로컬에서 삭제, 1% 원격에서 삭제, 원격에서 직접 만든 새 이벤트 count의 1%
+    """
+    rng = random.Random(seed)
+    base = datetime(2026, 1, 1, 0, 0)
+    local, remote, snapshots = {}, {}, {}
+    expected = {'create': 0, 'update': 0, 'delete': 0, 'import': 0, 'unlink': 0}
+
+    def event_hash(index: int, title: str) -> str:
+        start = base + timedelta(hours=index)
+        return fingerprint(title, f"메모 {index}", "", False, start, start + timedelta(hours=1))
+
+    for index in range(count):
+        todo_id = f"todo-{index:06d}"
+        event_id = f"event{index:06d}"
+        synced_hash = event_hash(index, f"일정 {index}")
+        roll = rng.random()
+
+        if roll < 0.02:
+            # 아직 내보내지 않은 새 로컬 일정
+            local[todo_id] = {'event_id': None, 'hash': synced_hash}
+            expected['create'] += 1
+            continue
+
+        snapshots[todo_id] = {'event_id': event_id, 'etag': f'"{index}-1"', 'hash': synced_hash}
+        local_item = {'event_id': event_id, 'hash': synced_hash}
+        remote_item = {'etag': f'"{index}-1"', 'hash': synced_hash, 'source_id': todo_id}
+
+        if roll < 0.05:
+            local_item['hash'] = event_hash(index, f"일정 {index} (수정)")
+            expected['update'] += 1
+        elif roll < 0.07:
+            remote_item = {'etag': f'"{index}-2"', 'hash': event_hash(index, f"원격 {index}"), 'source_id': todo_id}
+            expected['import'] += 1
+        elif roll < 0.08:
+            local_item['hash'] = event_hash(index, f"일정 {index} (수정)")
+            remote_item = {'etag': f'"{index}-2"', 'hash': event_hash(index, f"원격 {index}"), 'source_id': todo_id}
+            expected['update'] += 1
+        elif roll < 0.09:
+            local_item = None  # 로컬에서 삭제 → 원격 이벤트 삭제
+            expected['delete'] += 1
+        elif roll < 0.10:
+            remote_item = None  # 원격에서 삭제 → 매핑 해제
+            expected['unlink'] += 1
+
+        if local_item is not None:
+            local[todo_id] = local_item
+        if remote_item is not None:
+            remote[event_id] = remote_item
+
+    for index in range(count // 100):
+        # 구글 캘린더에서 직접 만든 새 이벤트
+        remote[f"google{index:06d}"] = {'etag': '"1"', 'hash': event_hash(index, f"구글 {index}"), 'source_id': None}
+        expected['import'] += 1
+
+    return local, remote, snapshots, expected
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    started = time.perf_counter()
+    local, remote, snapshots, expected = build_dataset(count)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for index in range(count):
+        start = datetime(2026, 1, 1) + timedelta(hours=index)
+        fingerprint(f"일정 {index}", f"메모 {index}", "", False, start, start + timedelta(hours=1))
+    hash_seconds = time.perf_counter() - started
+
+    durations = []
+    plan = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        plan = plan_sync(local, remote, snapshots, include_imports=True)
+        durations.append(time.perf_counter() - started)
+
+    summary = plan.summary()
+    for op, value in expected.items():
+        actual = summary[f"{op}_count"]
+        assert actual == value, f"{op}: 예상 {value}개, 실제 {actual}개"
+
+    print(f"📊 3-way 동기화 계획 벤치마크 (일정 {count:,}개, 원격 이벤트 {len(remote):,}개, 스냅샷 {len(snapshots):,}개)")
+    print(f"   - 데이터 생성: {build_seconds * 1000:.1f}ms")
+    print(f"   - 지문 계산 {count:,}개: {hash_seconds * 1000:.1f}ms")
+    print(f"   - 계획 계산 ({repeat}회): 중앙값 {statistics.median(durations) * 1000:.1f}ms, 최대 {max(durations) * 1000:.1f}ms")
+    print(f"   - 작업: {summary}")
+    print(f"   - Google API 호출: {summary['api_call_count']:,}회 (전체 일정을 다시 확인/반영하면 {len(local):,}회)")
+    print("✅ 예상 작업 수와 일치")
+
+
+if __name__ == "__main__":
+    main()
@@ -138,17 +138,36 @@ except Exception as e:
 from app.services.scheduler_service import scheduler
 import asyncio
 
+from app.services.webhook_sync_worker import webhook_worker
+from app.services.watch_renewal_service import watch_renewal_scheduler
+from app.services.calendar_sync_job_service import calendar_sync_worker
+from app.services.outbound_connections import outbound
+from app.services.smtp_sender import smtp_sender
+from app.services.google_id_token_verifier import google_id_token_verifier
+
 @app.on_event("startup")
 async def startup_event():
-    """앱 시작 시 알림 스케줄러 시작"""
+    """앱 시작 시 외부 연결 풀, ID 토큰 인증서 캐시, 알림 스케줄러, 웹훅 워커, Watch 갱신 스케줄러, 동기화 작업 워커 시작"""
+    await outbound.start()
+    await smtp_sender.start()
+    await google_id_token_verifier.start()
     await scheduler.start()
     logger.info("알림 스케줄러가 시작되었습니다.")
+    await webhook_worker.start()
+    await watch_renewal_scheduler.start()
+    await calendar_sync_worker.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """앱 종료 시 알림 스케줄러 중지"""
+    """앱 종료 시 알림 스케줄러, 웹훅 워커, Watch 갱신 스케줄러, 동기화 작업 워커, ID 토큰 인증서 캐시 중지 후 외부 연결 풀 종료"""
+    await calendar_sync_worker.stop()
+    await watch_renewal_scheduler.stop()
+    await webhook_worker.stop()
     await scheduler.stop()
     logger.info("알림 스케줄러가 중지되었습니다.")
+    await google_id_token_verifier.stop()
+    await smtp_sender.stop()
+    await outbound.stop()
 
 logger.info("Always Plan API initialized successfully")
 
@@ -0,0 +1,73 @@
+"""
+데이터베이스 마이그레이션: calendar_sync_jobs (user_id) 부분 유니크 인덱스 추가
+여러 인스턴스에서도 사용자당 실행 중(running) 동기화 작업이 하나만 있도록 하기 위함
+
+인덱스를 만들기 전에 같은 사용자의 실행 중 작업이 여러 개면 heartbeat가 가장 최근인 하나만 남기고
+나머지는 대기(pending) 상태로 되돌립니다 (체크포인트부터 이어서 실행됨)
+"""
+from sqlalchemy import create_engine, text
+from datetime import datetime
+import logging
+import os
+
+# 환경 변수에서 데이터베이스 URL 가져오기
+database_url = os.getenv('DATABASE_URL', 'sqlite:///./always-plan.db')
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INDEX_WHERE = "status = 'running' AND deleted_at IS NULL"
+
+
+def release_duplicate_running_jobs(conn) -> int:
+    """사용자별로 실행 중 작업을 하나만 남김. 대기 상태로 되돌린 작업 수 반환"""
+    users = conn.execute(text(
+        "SELECT user_id FROM calendar_sync_jobs "
+        f"WHERE {INDEX_WHERE} "
+        "GROUP BY user_id HAVING COUNT(*) > 1"
+    )).fetchall()
+
+    now = datetime.utcnow()
+    released = 0
+    for (user_id,) in users:
+        rows = conn.execute(text(
+            "SELECT id FROM calendar_sync_jobs "
+            f"WHERE user_id = :user_id AND {INDEX_WHERE} "
+            "ORDER BY heartbeat_at DESC, created_at DESC"
+        ), {"user_id": user_id}).fetchall()
+
+        for (job_id,) in rows[1:]:
+            conn.execute(text(
+                "UPDATE calendar_sync_jobs SET status = 'pending', updated_at = :now WHERE id = :id"
+            ), {"now": now, "id": job_id})
+            released += 1
+        logger.info(f"User {user_id}: kept running job {rows[0][0]}, released {len(rows) - 1}")
+    return released
+
+
+def migrate_add_calendar_sync_job_running_index():
+    """calendar_sync_jobs 테이블에 idx_calendar_sync_jobs_user_running 부분 유니크 인덱스 추가"""
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+
+    with engine.connect() as conn:
+        try:
+            released = release_duplicate_running_jobs(conn)
+            logger.info(f"Released {released} duplicate running jobs")
+
+            logger.info("Creating idx_calendar_sync_jobs_user_running unique index on calendar_sync_jobs table...")
+            conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_calendar_sync_jobs_user_running "
+                f"ON calendar_sync_jobs (user_id) WHERE {INDEX_WHERE}"
+            ))
+            conn.commit()
+            logger.info("Successfully created idx_calendar_sync_jobs_user_running")
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error creating idx_calendar_sync_jobs_user_running: {e}")
+            raise
+
+    logger.info("Migration completed")
+
+if __name__ == "__main__":
+    migrate_add_calendar_sync_job_running_index()
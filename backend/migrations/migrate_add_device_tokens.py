@@ -0,0 +1,58 @@
+"""
+데이터베이스 마이그레이션: device_tokens 테이블 생성 및 users.fcm_token 옮기기
+사용자당 토큰 하나(users.fcm_token)에서 기기별 토큰(device_tokens)으로 바꾸면서 기존 토큰을 첫 기기로 등록합니다.
+"""
+import sys
+import os
+import uuid
+import logging
+from datetime import datetime
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+
+from app.database import SessionLocal, engine
+from app.models.models import DeviceToken
+from app.models.user import User
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate_add_device_tokens():
+    """users.fcm_token이 있는 사용자마다 device_tokens 행 생성 (이미 있는 토큰은 건너뜀)"""
+    DeviceToken.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        existing = {row.token for row in db.query(DeviceToken.token).all()}
+        now = datetime.utcnow()
+        rows = []
+        for user_id, token in db.query(User.id, User.fcm_token).filter(User.fcm_token.isnot(None)).all():
+            if not token or token in existing:
+                continue
+            existing.add(token)
+            rows.append({
+                'id': str(uuid.uuid4()),
+                'user_id': user_id,
+                'token': token,
+                'last_seen_at': now,
+                'created_at': now,
+                'updated_at': now
+            })
+
+        if rows:
+            db.execute(insert(DeviceToken), rows)
+        db.commit()
+        logger.info(f"Migration completed: {len(rows)} device tokens copied from users.fcm_token")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error migrating device tokens: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    migrate_add_device_tokens()
@@ -0,0 +1,45 @@
+"""
+데이터베이스 마이그레이션: users 테이블에 notification_digest 컬럼과 인덱스 추가
+알림 묶음(digest) 이메일 설정 (off, hourly, daily)
+"""
+from sqlalchemy import create_engine, text, inspect
+import logging
+import os
+
+# 환경 변수에서 데이터베이스 URL 가져오기
+database_url = os.getenv('DATABASE_URL', 'sqlite:///./always-plan.db')
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def migrate_add_notification_digest():
+    """users 테이블에 notification_digest 컬럼과 idx_users_notification_digest 인덱스 추가"""
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    
+    with engine.connect() as conn:
+        try:
+            columns = [column['name'] for column in inspect(conn).get_columns('users')]
+            
+            if 'notification_digest' not in columns:
+                logger.info("Adding notification_digest column to users table...")
+                conn.execute(text("ALTER TABLE users ADD COLUMN notification_digest VARCHAR(20) DEFAULT 'off'"))
+                conn.commit()
+                logger.info("Successfully added notification_digest to users table")
+            else:
+                logger.info("users table already has notification_digest column")
+            
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_users_notification_digest "
+                "ON users (notification_digest)"
+            ))
+            conn.commit()
+            logger.info("Successfully created idx_users_notification_digest")
+        except Exception as e:
+            logger.error(f"Error adding notification_digest to users: {e}")
+            raise
+    
+    logger.info("Migration completed")
+
+if __name__ == "__main__":
+    migrate_add_notification_digest()
@@ -0,0 +1,30 @@
+"""
+데이터베이스 마이그레이션: reminder_deliveries 테이블 생성
+알림을 채널별로 한 번만 발송하도록 (일정, 알림 오프셋, 채널, 일정 시작 시각) 유니크 인덱스를 가진 발송 기록 테이블을 만듭니다.
+"""
+import sys
+import os
+import logging
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import engine
+from app.models.models import ReminderDelivery
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate_add_reminder_deliveries():
+    """reminder_deliveries 테이블과 idx_reminder_deliveries_key 유니크 인덱스 생성"""
+    try:
+        logger.info("Creating reminder_deliveries table...")
+        ReminderDelivery.__table__.create(bind=engine, checkfirst=True)
+        logger.info("Migration completed")
+    except Exception as e:
+        logger.error(f"Error creating reminder_deliveries: {e}")
+        raise
+
+if __name__ == "__main__":
+    migrate_add_reminder_deliveries()
@@ -0,0 +1,53 @@
+"""
+데이터베이스 마이그레이션: reminder_jobs 테이블에 재시도 컬럼과 인덱스 추가
+발송 실패 시 지수 백오프로 다시 발송하고, 최대 시도 수를 넘으면 dead 상태로 둡니다.
+"""
+from sqlalchemy import create_engine, text, inspect
+import logging
+import os
+
+# 환경 변수에서 데이터베이스 URL 가져오기
+database_url = os.getenv('DATABASE_URL', 'sqlite:///./always-plan.db')
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 추가할 컬럼 (이름, 정의)
+RETRY_COLUMNS = [
+    ('attempts', 'INTEGER NOT NULL DEFAULT 0'),
+    ('next_attempt_at', 'TIMESTAMP'),
+    ('last_error', 'TEXT'),
+]
+
+def migrate_add_reminder_job_retry():
+    """reminder_jobs 테이블에 attempts, next_attempt_at, last_error 컬럼과 idx_reminder_jobs_retry 인덱스 추가"""
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    
+    with engine.connect() as conn:
+        try:
+            columns = [column['name'] for column in inspect(conn).get_columns('reminder_jobs')]
+            
+            for name, definition in RETRY_COLUMNS:
+                if name not in columns:
+                    logger.info(f"Adding {name} column to reminder_jobs table...")
+                    conn.execute(text(f"ALTER TABLE reminder_jobs ADD COLUMN {name} {definition}"))
+                    conn.commit()
+                    logger.info(f"Successfully added {name} to reminder_jobs table")
+                else:
+                    logger.info(f"reminder_jobs table already has {name} column")
+            
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_reminder_jobs_retry "
+                "ON reminder_jobs (status, next_attempt_at)"
+            ))
+            conn.commit()
+            logger.info("Successfully created idx_reminder_jobs_retry")
+        except Exception as e:
+            logger.error(f"Error adding retry columns to reminder_jobs: {e}")
+            raise
+    
+    logger.info("Migration completed")
+
+if __name__ == "__main__":
+    migrate_add_reminder_job_retry()
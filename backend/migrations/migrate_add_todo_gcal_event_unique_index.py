@@ -0,0 +1,79 @@
+"""
+데이터베이스 마이그레이션: todos (user_id, google_calendar_event_id) 부분 유니크 인덱스 추가
+가져오기가 이벤트 ID를 기준으로 INSERT ... ON CONFLICT DO UPDATE 하기 위함
+
+인덱스를 만들기 전에 이미 쌓인 중복을 정리합니다 (가장 먼저 만든 일정만 이벤트와 연결 유지)
+- Google Calendar에서 가져온 중복 일정(source='google_calendar'): 소프트 삭제
+- Always Plan에서 만든 일정: 이벤트 연결만 해제 (일정은 유지)
+"""
+from sqlalchemy import create_engine, text
+from datetime import datetime
+import logging
+import os
+
+# 환경 변수에서 데이터베이스 URL 가져오기
+database_url = os.getenv('DATABASE_URL', 'sqlite:///./always-plan.db')
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INDEX_WHERE = "google_calendar_event_id IS NOT NULL AND deleted_at IS NULL"
+
+
+def remove_duplicate_event_links(conn) -> int:
+    """같은 사용자/이벤트 ID에 연결된 삭제되지 않은 일정 중 가장 오래된 하나만 남김. 정리한 행 수 반환"""
+    duplicates = conn.execute(text(
+        "SELECT user_id, google_calendar_event_id FROM todos "
+        f"WHERE {INDEX_WHERE} "
+        "GROUP BY user_id, google_calendar_event_id HAVING COUNT(*) > 1"
+    )).fetchall()
+
+    now = datetime.utcnow()
+    cleaned = 0
+    for user_id, event_id in duplicates:
+        rows = conn.execute(text(
+            "SELECT id, source FROM todos "
+            f"WHERE user_id = :user_id AND google_calendar_event_id = :event_id AND {INDEX_WHERE} "
+            "ORDER BY created_at, id"
+        ), {"user_id": user_id, "event_id": event_id}).fetchall()
+
+        for todo_id, source in rows[1:]:
+            if source == 'google_calendar':
+                conn.execute(text(
+                    "UPDATE todos SET deleted_at = :now, updated_at = :now WHERE id = :id"
+                ), {"now": now, "id": todo_id})
+            else:
+                conn.execute(text(
+                    "UPDATE todos SET google_calendar_event_id = NULL, updated_at = :now WHERE id = :id"
+                ), {"now": now, "id": todo_id})
+            cleaned += 1
+        logger.info(f"Deduplicated event {event_id} (user {user_id}): kept {rows[0][0]}, cleaned {len(rows) - 1}")
+    return cleaned
+
+
+def migrate_add_todo_gcal_event_unique_index():
+    """todos 테이블에 idx_todos_user_gcal_event 부분 유니크 인덱스 추가"""
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+
+    with engine.connect() as conn:
+        try:
+            cleaned = remove_duplicate_event_links(conn)
+            logger.info(f"Cleaned {cleaned} duplicate todo rows")
+
+            logger.info("Creating idx_todos_user_gcal_event unique index on todos table...")
+            conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_todos_user_gcal_event "
+                f"ON todos (user_id, google_calendar_event_id) WHERE {INDEX_WHERE}"
+            ))
+            conn.commit()
+            logger.info("Successfully created idx_todos_user_gcal_event")
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error creating idx_todos_user_gcal_event: {e}")
+            raise
+
+    logger.info("Migration completed")
+
+if __name__ == "__main__":
+    migrate_add_todo_gcal_event_unique_index()
@@ -0,0 +1,39 @@
+"""
+데이터베이스 마이그레이션: todos 테이블에 google_calendar_id 컬럼 추가
+여러 캘린더에서 가져온 일정이 어느 캘린더의 이벤트인지 저장하기 위함 (None이면 primary)
+"""
+from sqlalchemy import create_engine, inspect, text
+import logging
+import os
+
+# 환경 변수에서 데이터베이스 URL 가져오기
+database_url = os.getenv('DATABASE_URL', 'sqlite:///./always-plan.db')
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def migrate_add_todo_google_calendar_id():
+    """todos 테이블에 google_calendar_id 컬럼 추가"""
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    
+    with engine.connect() as conn:
+        try:
+            # 컬럼이 이미 있는지 확인
+            columns = [column['name'] for column in inspect(conn).get_columns('todos')]
+            
+            if 'google_calendar_id' not in columns:
+                logger.info("Adding google_calendar_id column to todos table...")
+                conn.execute(text("ALTER TABLE todos ADD COLUMN google_calendar_id VARCHAR(255)"))
+                conn.commit()
+                logger.info("Successfully added google_calendar_id to todos table")
+            else:
+                logger.info("todos table already has google_calendar_id column")
+        except Exception as e:
+            logger.error(f"Error adding google_calendar_id to todos: {e}")
+            raise
+    
+    logger.info("Migration completed")
+
+if __name__ == "__main__":
+    migrate_add_todo_google_calendar_id()
@@ -0,0 +1,46 @@
+"""
+데이터베이스 마이그레이션: users 테이블에 Watch 채널 토큰 컬럼과 채널 ID 인덱스 추가
+웹훅(X-Goog-Channel-Token)이 저장된 Watch 채널에서 온 것인지 확인하기 위함
+(기존 채널은 토큰이 없으므로 다음 Watch 갱신 때까지 리소스 ID로 확인)
+"""
+from sqlalchemy import create_engine, text, inspect
+import logging
+import os
+
+# 환경 변수에서 데이터베이스 URL 가져오기
+database_url = os.getenv('DATABASE_URL', 'sqlite:///./always-plan.db')
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def migrate_add_watch_channel_token():
+    """users 테이블에 google_calendar_watch_token 컬럼과 idx_users_watch_channel 인덱스 추가"""
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    
+    with engine.connect() as conn:
+        try:
+            columns = [column['name'] for column in inspect(conn).get_columns('users')]
+            if 'google_calendar_watch_token' not in columns:
+                logger.info("Adding google_calendar_watch_token column to users table...")
+                conn.execute(text("ALTER TABLE users ADD COLUMN google_calendar_watch_token VARCHAR(64)"))
+                conn.commit()
+                logger.info("Successfully added google_calendar_watch_token to users table")
+            else:
+                logger.info("users table already has google_calendar_watch_token column")
+
+            logger.info("Creating idx_users_watch_channel index on users table...")
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_users_watch_channel "
+                "ON users (google_calendar_watch_channel_id)"
+            ))
+            conn.commit()
+            logger.info("Successfully created idx_users_watch_channel")
+        except Exception as e:
+            logger.error(f"Error adding watch channel token to users: {e}")
+            raise
+    
+    logger.info("Migration completed")
+
+if __name__ == "__main__":
+    migrate_add_watch_channel_token()
@@ -0,0 +1,36 @@
+"""
+데이터베이스 마이그레이션: users.google_calendar_watch_expiration 인덱스 추가
+만료 임박 Watch 채널을 갱신 스케줄러가 인덱스로 조회하기 위함
+"""
+from sqlalchemy import create_engine, text
+import logging
+import os
+
+# 환경 변수에서 데이터베이스 URL 가져오기
+database_url = os.getenv('DATABASE_URL', 'sqlite:///./always-plan.db')
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def migrate_add_watch_expiration_index():
+    """users 테이블에 idx_users_watch_expiration 인덱스 추가"""
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    
+    with engine.connect() as conn:
+        try:
+            logger.info("Creating idx_users_watch_expiration index on users table...")
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_users_watch_expiration "
+                "ON users (google_calendar_watch_expiration)"
+            ))
+            conn.commit()
+            logger.info("Successfully created idx_users_watch_expiration")
+        except Exception as e:
+            logger.error(f"Error creating idx_users_watch_expiration: {e}")
+            raise
+    
+    logger.info("Migration completed")
+
+if __name__ == "__main__":
+    migrate_add_watch_expiration_index()
@@ -0,0 +1,59 @@
+"""
+데이터베이스 마이그레이션: reminder_jobs 테이블 생성 및 기존 일정의 알림 예약 채우기
+이후 생성/수정/삭제되는 일정은 세션 이벤트에서 자동으로 예약되므로, 배포 전에 만들어진 일정만 채우면 됩니다.
+"""
+import sys
+import os
+import logging
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal, engine
+from app.models.models import Todo, ReminderJob
+from app.services.reminder_job_service import ReminderJobService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+def migrate_backfill_reminder_jobs():
+    """알림이 설정된 앞으로의 일정마다 reminder_jobs 행 생성"""
+    ReminderJob.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        today = ReminderJobService.now().date()
+        query = db.query(Todo).filter(
+            Todo.has_notification == True,
+            Todo.deleted_at.is_(None),
+            Todo.status != "completed",
+            Todo.date >= today
+        ).order_by(Todo.id)
+
+        total_todos = 0
+        total_jobs = 0
+        last_id = None
+        while True:
+            batch_query = query if last_id is None else query.filter(Todo.id > last_id)
+            todos = batch_query.limit(BATCH_SIZE).all()
+            if not todos:
+                break
+            total_jobs += len(ReminderJobService.sync_todos(db.connection(), todos))
+            db.commit()
+            total_todos += len(todos)
+            last_id = todos[-1].id
+            logger.info(f"Backfilled {total_todos} todos ({total_jobs} reminder jobs)")
+
+        logger.info(f"Migration completed: {total_jobs} reminder jobs for {total_todos} todos")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error backfilling reminder_jobs: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    migrate_backfill_reminder_jobs()
@@ -0,0 +1,85 @@
+"""
+데이터베이스 마이그레이션: reminder_deliveries 중복 확인 키를 일정 날짜에서 일정 시작 시각으로 변경
+idx_reminder_deliveries_key (todo_id, reminder_offset, channel, occurrence_date)
+→ (todo_id, reminder_offset, channel, occurrence_at)
+
+같은 날 다른 시간으로 옮긴 일정의 알림이 이미 보낸 것으로 처리되어 누락되지 않도록 하기 위함
+기존 행은 일정의 현재 시작 시간으로 occurrence_at을 채웁니다 (하루종일/시작 시간이 없는 일정은 00:00)
+"""
+from datetime import datetime, date, time
+from sqlalchemy import create_engine, text, inspect, bindparam, DateTime
+import logging
+import os
+
+# 환경 변수에서 데이터베이스 URL 가져오기
+database_url = os.getenv('DATABASE_URL', 'sqlite:///./always-plan.db')
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _as_date(value) -> date:
+    # SQLite는 문자열로 돌려주므로 변환
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _as_time(value):
+    if isinstance(value, str):
+        return time.fromisoformat(value)
+    return value
+
+
+def migrate_reminder_delivery_key_by_start():
+    """occurrence_at 컬럼 추가 및 채우기, 유니크 인덱스 교체, occurrence_date 컬럼 삭제"""
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+
+    with engine.connect() as conn:
+        try:
+            columns = [column['name'] for column in inspect(conn).get_columns('reminder_deliveries')]
+            if 'occurrence_date' not in columns:
+                logger.info("reminder_deliveries table already uses occurrence_at")
+                return
+
+            if 'occurrence_at' not in columns:
+                logger.info("Adding occurrence_at column to reminder_deliveries table...")
+                conn.execute(text("ALTER TABLE reminder_deliveries ADD COLUMN occurrence_at TIMESTAMP"))
+
+            rows = conn.execute(text(
+                "SELECT d.id, d.occurrence_date, t.all_day, t.start_time "
+                "FROM reminder_deliveries d LEFT JOIN todos t ON t.id = d.todo_id "
+                "WHERE d.occurrence_at IS NULL"
+            )).all()
+            logger.info(f"Filling occurrence_at for {len(rows)} rows...")
+            # 앱과 같은 형식으로 저장되도록 DateTime 타입으로 바인딩 (SQLite는 문자열 비교)
+            update_stmt = text(
+                "UPDATE reminder_deliveries SET occurrence_at = :occurrence_at WHERE id = :id"
+            ).bindparams(bindparam('occurrence_at', type_=DateTime))
+            for delivery_id, occurrence_date, all_day, start_time in rows:
+                start = _as_time(start_time) if start_time and not all_day else time.min
+                conn.execute(
+                    update_stmt,
+                    {'occurrence_at': datetime.combine(_as_date(occurrence_date), start), 'id': delivery_id}
+                )
+
+            if conn.dialect.name == 'postgresql':
+                conn.execute(text("ALTER TABLE reminder_deliveries ALTER COLUMN occurrence_at SET NOT NULL"))
+
+            conn.execute(text("DROP INDEX IF EXISTS idx_reminder_deliveries_key"))
+            conn.execute(text(
+                "CREATE UNIQUE INDEX idx_reminder_deliveries_key "
+                "ON reminder_deliveries (todo_id, reminder_offset, channel, occurrence_at)"
+            ))
+            # NOT NULL인 occurrence_date가 남아 있으면 새 코드의 INSERT가 실패하므로 삭제 (SQLite 3.35+)
+            conn.execute(text("ALTER TABLE reminder_deliveries DROP COLUMN occurrence_date"))
+            conn.commit()
+            logger.info("Successfully replaced occurrence_date with occurrence_at in reminder_deliveries")
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error migrating reminder_deliveries key: {e}")
+            raise
+
+    logger.info("Migration completed")
+
+if __name__ == "__main__":
+    migrate_reminder_delivery_key_by_start()
@@ -0,0 +1,46 @@
+"""
+데이터베이스 마이그레이션: todos 이벤트 연결 유니크 인덱스에 캘린더 ID 추가
+idx_todos_user_gcal_event (user_id, google_calendar_event_id)
+→ idx_todos_user_calendar_event (user_id, COALESCE(google_calendar_id, 'primary'), google_calendar_event_id)
+
+공유/초대 일정처럼 같은 이벤트가 선택한 캘린더 여러 개에 있을 때 캘린더마다 한 행으로 저장하기 위함
+(기존 인덱스보다 느슨한 조건이므로 기존 데이터 정리는 필요 없음)
+"""
+from sqlalchemy import create_engine, text
+import logging
+import os
+
+# 환경 변수에서 데이터베이스 URL 가져오기
+database_url = os.getenv('DATABASE_URL', 'sqlite:///./always-plan.db')
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INDEX_WHERE = "google_calendar_event_id IS NOT NULL AND deleted_at IS NULL"
+
+
+def migrate_todo_gcal_event_index_by_calendar():
+    """idx_todos_user_gcal_event를 캘린더 ID를 포함한 idx_todos_user_calendar_event로 교체"""
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+
+    with engine.connect() as conn:
+        try:
+            logger.info("Creating idx_todos_user_calendar_event unique index on todos table...")
+            conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_todos_user_calendar_event "
+                "ON todos (user_id, COALESCE(google_calendar_id, 'primary'), google_calendar_event_id) "
+                f"WHERE {INDEX_WHERE}"
+            ))
+            conn.execute(text("DROP INDEX IF EXISTS idx_todos_user_gcal_event"))
+            conn.commit()
+            logger.info("Successfully replaced idx_todos_user_gcal_event with idx_todos_user_calendar_event")
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error replacing idx_todos_user_gcal_event: {e}")
+            raise
+
+    logger.info("Migration completed")
+
+if __name__ == "__main__":
+    migrate_todo_gcal_event_index_by_calendar()
@@ -0,0 +1,175 @@
+"""
+로컬 SMTP 수신기 (개발/벤치마크용)
+실제 메일을 보내지 않고 받은 메시지를 메모리에 쌓아 두는 SMTP 서버입니다.
+PIPELINING/AUTH를 광고하고 어떤 계정이든 로그인을 받아들이며, STARTTLS는 지원하지 않습니다 (SMTP_STARTTLS=false로 사용).
+
+- latency를 주면 모든 응답을 그만큼 늦게 보내 네트워크 왕복 시간을 흉내 냄 (응답 순서는 유지)
+- 받은 메시지 수와 맺어진 연결 수를 기록 (연결 재사용 여부 확인용)
+
+사용법:
+    python smtp_sink.py [--port 1025] [--latency-ms 0]
+    # 백엔드: SMTP_HOST=127.0.0.1 SMTP_PORT=1025 SMTP_STARTTLS=false SMTP_USER=test SMTP_PASSWORD=test
+"""
+import argparse
+import asyncio
+import time
+from typing import Optional, List, Dict, Any
+
+
+class SMTPSink:
+    """받은 메시지를 메모리에 보관하는 asyncio SMTP 서버"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 1025, latency: float = 0.0):
+        """
+        Args:
+            host: 바인딩 주소
+            port: 포트 (0이면 빈 포트 자동 선택, start 후 self.port에 반영)
+            latency: 응답마다 더하는 지연 (초)
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.messages: List[Dict[str, Any]] = []
+        self.connection_count = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def reset(self):
+        self.messages = []
+        self.connection_count = 0
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connection_count += 1
+        replies: asyncio.Queue = asyncio.Queue()
+        reply_task = asyncio.create_task(self._write_replies(writer, replies))
+
+        def reply(line: str):
+            # 응답은 (보낼 시각, 내용) 순서대로 큐에 쌓여 같은 순서로 나감
+            replies.put_nowait((time.monotonic() + self.latency, (line + "\r\n").encode()))
+
+        state: Dict[str, Any] = {'mail_from': None, 'rcpt_to': []}
+        try:
+            reply("220 smtp-sink ESMTP")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode('utf-8', 'replace').rstrip("\r\n")
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb == "EHLO":
+                    reply("250-smtp-sink")
+                    reply("250-PIPELINING")
+                    reply("250-8BITMIME")
+                    reply("250 AUTH PLAIN LOGIN")
+                elif verb == "HELO":
+                    reply("250 smtp-sink")
+                elif verb == "AUTH":
+                    args = command.split()
+                    if len(args) >= 2 and args[1].upper() == "LOGIN":
+                        # 사용자명/비밀번호를 차례로 받음 (smtplib는 사용자명을 첫 줄에 함께 보냄)
+                        if len(args) < 3:
+                            reply("334 VXNlcm5hbWU6")
+                            await reader.readline()
+                        reply("334 UGFzc3dvcmQ6")
+                        await reader.readline()
+                    elif len(args) == 2:
+                        reply("334 ")
+                        await reader.readline()
+                    reply("235 2.7.0 Authentication successful")
+                elif verb == "MAIL":
+                    state = {'mail_from': command[10:].strip(), 'rcpt_to': []}
+                    reply("250 2.1.0 OK")
+                elif verb == "RCPT":
+                    if state['mail_from'] is None:
+                        reply("503 5.5.1 MAIL first")
+                    else:
+                        state['rcpt_to'].append(command[8:].strip())
+                        reply("250 2.1.5 OK")
+                elif verb == "DATA":
+                    if not state['rcpt_to']:
+                        reply("503 5.5.1 RCPT first")
+                        continue
+                    reply("354 End data with <CR><LF>.<CR><LF>")
+                    body = []
+                    while True:
+                        data_line = await reader.readline()
+                        if not data_line or data_line in (b".\r\n", b".\n"):
+                            break
+                        body.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+                    self.messages.append({
+                        'mail_from': state['mail_from'],
+                        'rcpt_to': state['rcpt_to'],
+                        'data': b"".join(body)
+                    })
+                    state = {'mail_from': None, 'rcpt_to': []}
+                    reply("250 2.0.0 OK: queued")
+                elif verb == "RSET":
+                    state = {'mail_from': None, 'rcpt_to': []}
+                    reply("250 2.0.0 OK")
+                elif verb == "NOOP":
+                    reply("250 2.0.0 OK")
+                elif verb == "QUIT":
+                    reply("221 2.0.0 Bye")
+                    break
+                else:
+                    reply("502 5.5.2 Command not recognized")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            replies.put_nowait(None)
+            try:
+                await reply_task
+            except ConnectionError:
+                pass
+            writer.close()
+
+    @staticmethod
+    async def _write_replies(writer: asyncio.StreamWriter, replies: asyncio.Queue):
+        while True:
+            item = await replies.get()
+            if item is None:
+                return
+            send_at, data = item
+            delay = send_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            writer.write(data)
+            await writer.drain()
+
+
+async def _serve(host: str, port: int, latency: float):
+    sink = SMTPSink(host, port, latency)
+    await sink.start()
+    print(f"📮 SMTP 수신기 실행 중: {host}:{sink.port} (응답 지연 {latency * 1000:.0f}ms)")
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"   - 받은 메시지 {len(sink.messages):,}개, 연결 {sink.connection_count:,}회")
+    finally:
+        await sink.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 SMTP 수신기")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args.host, args.port, args.latency_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
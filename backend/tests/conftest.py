@@ -0,0 +1,37 @@
+"""
+테스트 공통 설정
+메모리 SQLite DB를 쓰고 (app 모듈을 불러오기 전에 설정), 테스트마다 테이블을 새로 만듭니다.
+"""
+import os
+import sys
+
+os.environ["DATABASE_URL"] = "sqlite://"
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from app.database import SessionLocal, engine
+from app.models.base import Base
+from app.models.user import User
+
+
+@pytest.fixture
+def db():
+    """테이블을 만든 메모리 DB 세션 (테스트가 끝나면 테이블 삭제)"""
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="user@example.com", name="사용자")
+    db.add(user)
+    db.commit()
+    return user
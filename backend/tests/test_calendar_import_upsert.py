@@ -0,0 +1,117 @@
+"""
+Google Calendar 가져오기 페이지 upsert (캘린더별 이벤트 키, 다시 가져와도 중복 없음)
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.models.models import Todo, CalendarSyncJob, ReminderJob
+from app.services.calendar_sync_job_service import CalendarSyncJobService, _new_import_stats
+from app.services.reminder_job_service import ReminderJobService
+
+
+def event(event_id: str, title: str, day: str = "2026-10-20"):
+    return {'id': event_id, 'summary': title, 'start': {'date': day}, 'end': {'date': day}}
+
+
+def timed_event(event_id: str, title: str, start: datetime):
+    """30분 전 알림이 있는 시간 지정 이벤트 (start: KST)"""
+    return {
+        'id': event_id,
+        'summary': title,
+        'start': {'dateTime': start.strftime('%Y-%m-%dT%H:%M:%S+09:00')},
+        'end': {'dateTime': (start + timedelta(hours=1)).strftime('%Y-%m-%dT%H:%M:%S+09:00')},
+        'reminders': {'useDefault': False, 'overrides': [{'method': 'popup', 'minutes': 30}]},
+    }
+
+
+@pytest.fixture
+def job(db, user):
+    job = CalendarSyncJob(user_id=user.id, job_type="sync_all", status="running")
+    db.add(job)
+    db.commit()
+    return job
+
+
+def store_page(db, user, job, checkpoint, calendar_id, events):
+    stats = checkpoint.setdefault('import', _new_import_stats())
+    stats.setdefault('calendars', {}).setdefault(calendar_id, {'page_token': None, 'done': False})
+    CalendarSyncJobService._store_import_page(db, user, job, checkpoint, calendar_id, events, None)
+    return stats
+
+
+def imported_todos(db, user):
+    return db.query(Todo).filter(Todo.user_id == user.id).all()
+
+
+def test_reimporting_a_page_updates_instead_of_duplicating(db, user, job):
+    checkpoint = {}
+    stats = store_page(db, user, job, checkpoint, "primary", [event("e1", "회의"), event("e2", "점심")])
+    assert stats['imported_count'] == 2
+
+    stats = store_page(db, user, job, checkpoint, "primary", [event("e1", "회의 (변경)"), event("e2", "점심")])
+
+    assert stats['imported_count'] == 2
+    assert stats['skipped_already_saved_count'] == 2
+    todos = imported_todos(db, user)
+    assert sorted(todo.title for todo in todos) == ["점심", "회의 (변경)"]
+
+
+def test_same_event_in_two_calendars_keeps_a_row_per_calendar(db, user, job):
+    checkpoint = {}
+    store_page(db, user, job, checkpoint, "primary", [event("shared", "공유 일정")])
+    store_page(db, user, job, checkpoint, "family@group.calendar.google.com", [event("shared", "공유 일정")])
+    store_page(db, user, job, checkpoint, "family@group.calendar.google.com", [event("shared", "공유 일정")])
+
+    todos = imported_todos(db, user)
+    # primary 캘린더는 google_calendar_id를 비워 둠
+    assert sorted(todo.google_calendar_id or "primary" for todo in todos) == ["family@group.calendar.google.com", "primary"]
+    assert checkpoint['import']['imported_count'] == 2
+
+
+def test_reimport_of_moved_event_reschedules_reminders(db, user, job):
+    start = (ReminderJobService.now() + timedelta(days=2)).replace(hour=9, minute=0, second=0, microsecond=0)
+    store_page(db, user, job, {}, "primary", [timed_event("e1", "회의", start)])
+    todo = db.query(Todo).filter(Todo.google_calendar_event_id == "e1").one()
+    # 가져온 일정에 알림을 켬 (ORM 변경이므로 after_flush 훅이 예약)
+    todo.has_notification = True
+    db.commit()
+    assert [job.fire_at for job in db.query(ReminderJob).all()] == [start - timedelta(minutes=30)]
+
+    moved = start + timedelta(hours=5)
+    store_page(db, user, job, {}, "primary", [timed_event("e1", "회의", moved)])
+
+    db.expire_all()
+    assert db.get(Todo, todo.id).start_time == moved.time()
+    assert [job.fire_at for job in db.query(ReminderJob).filter(ReminderJob.status == 'pending').all()] == [
+        moved - timedelta(minutes=30)
+    ]
+
+
+def test_upsert_does_not_overwrite_exported_todo(db, user, job):
+    # Always Plan에서 만들어 내보낸 일정과 연결된 이벤트
+    db.add(Todo(
+        user_id=user.id, title="내 일정", date=date(2026, 10, 20), source="text",
+        google_calendar_id="primary", google_calendar_event_id="e1"
+    ))
+    db.commit()
+
+    stats = store_page(db, user, job, {}, "primary", [event("e1", "구글에서 바꾼 제목")])
+
+    assert stats['imported_count'] == 0
+    assert [todo.title for todo in imported_todos(db, user)] == ["내 일정"]
+
+
+def test_linked_event_ids_only_counts_live_primary_links(db, user):
+    db.add_all([
+        Todo(user_id=user.id, title="primary", date=date(2026, 10, 20), google_calendar_event_id="e1"),
+        Todo(user_id=user.id, title="다른 캘린더", date=date(2026, 10, 20),
+             google_calendar_id="work@example.com", google_calendar_event_id="e2"),
+        Todo(user_id=user.id, title="삭제됨", date=date(2026, 10, 20), google_calendar_event_id="e3",
+             deleted_at=date(2026, 10, 1)),
+    ])
+    db.commit()
+
+    linked = CalendarSyncJobService._linked_event_ids(db, user.id, ["e1", "e2", "e3", "e4", "e1"])
+
+    assert linked == {"e1"}
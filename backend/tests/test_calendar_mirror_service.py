@@ -0,0 +1,141 @@
+"""
+Google Calendar 이벤트 미러 (사용자별 잠금, DB 작업은 작업 스레드에서)
+"""
+import asyncio
+import threading
+from datetime import datetime
+
+import pytest
+
+from app.models.models import GoogleCalendarEvent
+from app.services import calendar_mirror_service
+from app.services.calendar_mirror_service import CalendarMirrorService
+from app.services.calendar_service import GoogleCalendarService, SyncTokenExpiredError
+
+
+def event(event_id: str, title: str):
+    return {
+        'id': event_id, 'etag': '"1"', 'summary': title,
+        'start': {'dateTime': '2026-10-20T09:00:00+09:00'}, 'end': {'dateTime': '2026-10-20T10:00:00+09:00'}
+    }
+
+
+@pytest.fixture
+def linked_user(db, user):
+    user.google_calendar_token = '{"token": "test"}'
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def page_threads(monkeypatch):
+    """_apply_page를 실행한 스레드 목록"""
+    threads = []
+    apply_page = CalendarMirrorService._apply_page
+
+    def recording_apply_page(*args):
+        threads.append(threading.current_thread())
+        return apply_page(*args)
+
+    monkeypatch.setattr(CalendarMirrorService, "_apply_page", staticmethod(recording_apply_page))
+    return threads
+
+
+def test_user_lock_is_evicted_after_last_holder():
+    async def scenario():
+        order = []
+
+        async def hold(name):
+            async with CalendarMirrorService.get_user_lock("user-1"):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(hold("a"), hold("b"))
+        return order
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+    assert calendar_mirror_service._user_locks == {}
+    assert calendar_mirror_service._user_lock_users == {}
+
+
+def test_lock_is_kept_while_another_task_waits():
+    async def scenario():
+        first_holding = asyncio.Event()
+        release_first = asyncio.Event()
+
+        async def first():
+            async with CalendarMirrorService.get_user_lock("user-1"):
+                first_holding.set()
+                await release_first.wait()
+
+        async def second():
+            async with CalendarMirrorService.get_user_lock("user-1"):
+                return "user-1" in calendar_mirror_service._user_locks
+
+        first_task = asyncio.create_task(first())
+        await first_holding.wait()
+        second_task = asyncio.create_task(second())
+        await asyncio.sleep(0)
+        release_first.set()
+        await first_task
+        return await second_task
+
+    assert asyncio.run(scenario()) is True
+    assert calendar_mirror_service._user_locks == {}
+
+
+def test_sync_user_stores_pages_off_the_event_loop(db, linked_user, monkeypatch, page_threads):
+    async def iter_sync_pages(token_json, sync_token, calendar_id):
+        assert token_json == linked_user.google_calendar_token
+        yield {'items': [event("e1", "회의")]}
+        yield {'items': [event("e2", "점심")], 'nextSyncToken': "token-2"}
+
+    monkeypatch.setattr(GoogleCalendarService, "iter_sync_pages", iter_sync_pages)
+
+    applied = asyncio.run(CalendarMirrorService.sync_user(db, linked_user))
+
+    assert applied == 2
+    assert page_threads and all(thread is not threading.main_thread() for thread in page_threads)
+    assert sorted(row.title for row in db.query(GoogleCalendarEvent).all()) == ["점심", "회의"]
+    assert CalendarMirrorService.get_state(db, linked_user.id).sync_token == "token-2"
+
+
+def test_expired_sync_token_falls_back_to_full_sync(db, linked_user, monkeypatch):
+    db.add(GoogleCalendarEvent(
+        user_id=linked_user.id, calendar_id='primary', event_id="deleted", title="지운 일정",
+        start_at=datetime(2026, 10, 1), end_at=datetime(2026, 10, 1, 1), synced_at=datetime(2026, 10, 1)
+    ))
+    db.commit()
+    CalendarMirrorService._save_sync_token(db, linked_user.id, 'primary', "old-token", datetime(2026, 10, 1))
+    requested_tokens = []
+
+    async def iter_sync_pages(token_json, sync_token, calendar_id):
+        requested_tokens.append(sync_token)
+        if sync_token:
+            raise SyncTokenExpiredError()
+        yield {'items': [event("e1", "회의")], 'nextSyncToken': "new-token"}
+
+    monkeypatch.setattr(GoogleCalendarService, "iter_sync_pages", iter_sync_pages)
+
+    assert asyncio.run(CalendarMirrorService.sync_user(db, linked_user)) == 1
+
+    assert requested_tokens == ["old-token", None]
+    # 전체 동기화에서 나오지 않은 이벤트는 삭제
+    assert [row.event_id for row in db.query(GoogleCalendarEvent).all()] == ["e1"]
+    assert CalendarMirrorService.get_state(db, linked_user.id).sync_token == "new-token"
+
+
+def test_fill_calendars_uses_worker_threads(db, linked_user, monkeypatch, page_threads):
+    async def iter_event_pages(token_json, time_min, time_max, calendar_id, priority):
+        yield [event(f"{calendar_id}-1", "회의")]
+
+    monkeypatch.setattr(GoogleCalendarService, "iter_event_pages", iter_event_pages)
+
+    applied = asyncio.run(CalendarMirrorService.fill_calendars(
+        linked_user.id, ['primary', 'work@example.com'], datetime(2026, 10, 1), datetime(2026, 11, 1)
+    ))
+
+    assert applied == 2
+    assert len(page_threads) == 2 and threading.main_thread() not in page_threads
+    state = CalendarMirrorService.get_state(db, linked_user.id, 'work@example.com')
+    assert (state.window_start, state.window_end) == (datetime(2026, 10, 1), datetime(2026, 11, 1))
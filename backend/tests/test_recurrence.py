@@ -0,0 +1,131 @@
+"""
+반복 일정 → Google Calendar recurrence (RRULE/EXDATE/RDATE, 인스턴스 ID)
+"""
+from datetime import date, time, timedelta
+
+import pytest
+
+from app.services.recurrence import build_recurrence, build_rule, expand_rule, instance_event_id, series_event_id
+
+
+def days(start: date, count: int, step: int = 1):
+    return [start + timedelta(days=step * index) for index in range(count)]
+
+
+def weekdays_between(start: date, end: date):
+    return [value for value in days(start, (end - start).days + 1) if value.weekday() < 5]
+
+
+# 2026-10-19는 월요일
+MONDAY = date(2026, 10, 19)
+
+
+@pytest.mark.parametrize("repeat_type, repeat_pattern, dates, all_day, start_time, expected", [
+    # 매일 (하루종일 UNTIL은 날짜)
+    ('daily', None, days(MONDAY, 5), True, None,
+     ['RRULE:FREQ=DAILY;UNTIL=20261023']),
+    # 매일 (시간 지정 UNTIL은 마지막 인스턴스 시작 시각을 UTC로)
+    ('daily', None, days(MONDAY, 3), False, time(9, 0),
+     ['RRULE:FREQ=DAILY;UNTIL=20261021T000000Z']),
+    # 매주 (첫 날짜의 요일, 한국 시간 새벽 일정은 UTC로 전날)
+    ('weekly', None, days(MONDAY + timedelta(days=1), 3, step=7), False, time(9, 30),
+     ['RRULE:FREQ=WEEKLY;BYDAY=TU;UNTIL=20261103T003000Z']),
+    ('weekly', None, days(MONDAY, 2, step=7), False, time(5, 0),
+     ['RRULE:FREQ=WEEKLY;BYDAY=MO;UNTIL=20261025T200000Z']),
+    # 평일/주말
+    ('weekdays', None, weekdays_between(MONDAY, date(2026, 10, 30)), True, None,
+     ['RRULE:FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR;UNTIL=20261030']),
+    ('weekends', None, [date(2026, 10, 24), date(2026, 10, 25), date(2026, 10, 31), date(2026, 11, 1)], True, None,
+     ['RRULE:FREQ=WEEKLY;BYDAY=SA,SU;UNTIL=20261101']),
+    # custom 격주 월/수
+    ('custom', {'freq': 'weeks', 'interval': 2, 'days': [0, 2]},
+     [MONDAY, date(2026, 10, 21), date(2026, 11, 2), date(2026, 11, 4)], True, None,
+     ['RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;UNTIL=20261104']),
+    # custom 3일마다 (JSON 문자열 패턴)
+    ('custom', '{"freq": "days", "interval": 3}', days(MONDAY, 3, step=3), True, None,
+     ['RRULE:FREQ=DAILY;INTERVAL=3;UNTIL=20261025']),
+    # 매월/매년
+    ('monthly', None, [date(2026, 1, 15), date(2026, 2, 15), date(2026, 3, 15)], False, time(14, 0),
+     ['RRULE:FREQ=MONTHLY;UNTIL=20260315T050000Z']),
+    ('yearly', None, [date(2026, 3, 1), date(2027, 3, 1)], True, None,
+     ['RRULE:FREQ=YEARLY;UNTIL=20270301']),
+    # 31일 매월 반복: 웹앱은 말일로 당기지만 RRULE은 해당 월을 건너뛰므로 RDATE로 보정
+    ('monthly', None,
+     [date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30), date(2026, 5, 31)], True, None,
+     ['RRULE:FREQ=MONTHLY;UNTIL=20260531', 'RDATE;VALUE=DATE:20260228,20260430']),
+    # 개별 삭제된 날짜는 EXDATE (하루종일은 VALUE=DATE, 시간 지정은 TZID 현지 시각)
+    ('daily', None, [MONDAY, date(2026, 10, 20), date(2026, 10, 22), date(2026, 10, 23)], True, None,
+     ['RRULE:FREQ=DAILY;UNTIL=20261023', 'EXDATE;VALUE=DATE:20261021']),
+    ('weekly', None, [MONDAY, date(2026, 11, 2), date(2026, 11, 9), date(2026, 11, 16)], False, time(9, 0),
+     ['RRULE:FREQ=WEEKLY;BYDAY=MO;UNTIL=20261116T000000Z', 'EXDATE;TZID=Asia/Seoul:20261026T090000']),
+    # 중복 날짜와 정렬되지 않은 입력
+    ('daily', None, [date(2026, 10, 21), MONDAY, date(2026, 10, 20), MONDAY], True, None,
+     ['RRULE:FREQ=DAILY;UNTIL=20261021']),
+])
+def test_build_recurrence(repeat_type, repeat_pattern, dates, all_day, start_time, expected):
+    assert build_recurrence(repeat_type, repeat_pattern, dates, all_day, start_time) == expected
+
+
+@pytest.mark.parametrize("repeat_type, repeat_pattern, dates, max_exceptions", [
+    # 날짜가 하나뿐이면 반복 이벤트가 아님
+    ('daily', None, [MONDAY], None),
+    # RRULE로 표현할 수 없는 반복 설정
+    (None, None, days(MONDAY, 3), None),
+    ('hourly', None, days(MONDAY, 3), None),
+    ('custom', {'freq': 'hours'}, days(MONDAY, 3), None),
+    ('custom', {'freq': 'days', 'interval': 'x'}, days(MONDAY, 3), None),
+    # 예외가 날짜 수의 절반보다 많으면 규칙이 시리즈를 설명하지 못함
+    ('daily', None, [MONDAY, date(2026, 10, 22), date(2026, 10, 25)], None),
+    ('daily', None, [MONDAY, date(2026, 10, 20), date(2026, 10, 22), date(2026, 10, 23)], 0),
+])
+def test_build_recurrence_returns_none_when_rule_does_not_fit(repeat_type, repeat_pattern, dates, max_exceptions):
+    assert build_recurrence(repeat_type, repeat_pattern, dates, True, max_exceptions=max_exceptions) is None
+
+
+@pytest.mark.parametrize("repeat_type, repeat_pattern, start_date, expected", [
+    ('weekly', None, date(2026, 10, 22), {'freq': 'WEEKLY', 'interval': 1, 'byday': [3]}),
+    # 요일을 지정하지 않은 custom 주 반복은 시작 요일, 잘못된 요일 값은 무시
+    ('custom', {'freq': 'weeks', 'days': []}, MONDAY, {'freq': 'WEEKLY', 'interval': 1, 'byday': [0]}),
+    ('custom', {'freq': 'weeks', 'days': [4, '1', 9, 'x', 4]}, MONDAY, {'freq': 'WEEKLY', 'interval': 1, 'byday': [1, 4]}),
+    ('custom', {'freq': 'months', 'interval': 0}, MONDAY, {'freq': 'MONTHLY', 'interval': 1, 'byday': None}),
+    ('custom', 'not json', MONDAY, {'freq': 'DAILY', 'interval': 1, 'byday': None}),
+])
+def test_build_rule(repeat_type, repeat_pattern, start_date, expected):
+    assert build_rule(repeat_type, repeat_pattern, start_date) == expected
+
+
+@pytest.mark.parametrize("rule, start_date, until_date, expected", [
+    ({'freq': 'DAILY', 'interval': 2, 'byday': None}, MONDAY, date(2026, 10, 24),
+     [MONDAY, date(2026, 10, 21), date(2026, 10, 23)]),
+    # DTSTART는 BYDAY와 맞지 않아도 첫 인스턴스
+    ({'freq': 'WEEKLY', 'interval': 1, 'byday': [0]}, date(2026, 10, 21), date(2026, 11, 2),
+     [date(2026, 10, 21), date(2026, 10, 26), date(2026, 11, 2)]),
+    # 격주는 DTSTART가 속한 주(월요일 시작)부터 셈
+    ({'freq': 'WEEKLY', 'interval': 2, 'byday': [0, 6]}, date(2026, 10, 25), date(2026, 11, 9),
+     [date(2026, 10, 25), date(2026, 11, 2), date(2026, 11, 8)]),
+    # 해당 월에 없는 날짜는 건너뜀
+    ({'freq': 'MONTHLY', 'interval': 1, 'byday': None}, date(2026, 1, 31), date(2026, 4, 30),
+     [date(2026, 1, 31), date(2026, 3, 31)]),
+    # 윤년 2월 29일 매년 반복
+    ({'freq': 'YEARLY', 'interval': 1, 'byday': None}, date(2024, 2, 29), date(2029, 1, 1),
+     [date(2024, 2, 29), date(2028, 2, 29)]),
+])
+def test_expand_rule(rule, start_date, until_date, expected):
+    assert expand_rule(rule, start_date, until_date) == expected
+
+
+@pytest.mark.parametrize("occurrence_date, start_time, all_day, expected", [
+    (MONDAY, None, True, 'series_20261019'),
+    (MONDAY, time(9, 0), False, 'series_20261019T000000Z'),
+    # 한국 시간 자정~09시 일정은 UTC 기준 전날
+    (MONDAY, time(8, 30), False, 'series_20261018T233000Z'),
+])
+def test_instance_event_id_round_trips_to_series_id(occurrence_date, start_time, all_day, expected):
+    event_id = instance_event_id('series', occurrence_date, start_time, all_day)
+    assert event_id == expected
+    assert series_event_id(event_id) == 'series'
+
+
+@pytest.mark.parametrize("event_id", ['series', 'series_2026', 'series_20261019T0900'])
+def test_series_event_id_keeps_non_instance_ids(event_id):
+    assert series_event_id(event_id) == event_id
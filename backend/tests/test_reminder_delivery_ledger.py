@@ -0,0 +1,84 @@
+"""
+알림 발송 기록 (reminder_deliveries) 선점/중복 방지
+"""
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from app.config import settings
+from app.models.models import Todo, ReminderDelivery
+from app.services.reminder_delivery_service import ReminderDeliveryService
+
+FIRE_AT = datetime(2026, 10, 20, 8, 30)
+
+
+@pytest.fixture
+def todo(db, user):
+    todo = Todo(user_id=user.id, title="회의", date=date(2026, 10, 20), start_time=time(9, 0))
+    db.add(todo)
+    db.commit()
+    return todo
+
+
+def entry(todo, channel="push", fire_at=FIRE_AT, offset=30):
+    return {
+        'user_id': todo.user_id,
+        'todo_id': todo.id,
+        'reminder_offset': offset,
+        'channel': channel,
+        'occurrence_at': ReminderDeliveryService.occurrence_at(fire_at, offset),
+    }
+
+
+def key(todo, channel="push", fire_at=FIRE_AT, offset=30):
+    return ReminderDeliveryService.key(entry(todo, channel, fire_at, offset), channel)
+
+
+def test_occurrence_at_is_todo_start():
+    assert ReminderDeliveryService.occurrence_at(FIRE_AT, 30) == datetime(2026, 10, 20, 9, 0)
+    assert ReminderDeliveryService.occurrence_at(datetime(2026, 10, 19, 9, 0), 1440) == datetime(2026, 10, 20, 9, 0)
+
+
+def test_claim_is_once_per_channel(db, todo):
+    claimed = ReminderDeliveryService.claim(db, [entry(todo, "push"), entry(todo, "email"), entry(todo, "push")])
+    assert claimed == {key(todo, "push"), key(todo, "email")}
+
+    assert ReminderDeliveryService.claim(db, [entry(todo, "push"), entry(todo, "email")]) == set()
+    assert db.query(ReminderDelivery).count() == 2
+
+
+def test_todo_moved_to_another_time_same_day_is_sent_again(db, todo):
+    ReminderDeliveryService.claim(db, [entry(todo)])
+    ReminderDeliveryService.mark_sent(db, [key(todo)], datetime.utcnow())
+
+    moved_fire_at = datetime(2026, 10, 20, 14, 30)
+    assert ReminderDeliveryService.claim(db, [entry(todo, fire_at=moved_fire_at)]) == {key(todo, fire_at=moved_fire_at)}
+    # 같은 일정의 다른 알림 (1시간 전)도 별도 키
+    assert ReminderDeliveryService.claim(db, [entry(todo, fire_at=datetime(2026, 10, 20, 8, 0), offset=60)])
+
+
+def test_release_allows_reclaim_but_not_after_sent(db, todo):
+    ReminderDeliveryService.claim(db, [entry(todo, "push"), entry(todo, "email")])
+    ReminderDeliveryService.mark_sent(db, [key(todo, "email")], datetime.utcnow())
+
+    ReminderDeliveryService.release(db, [key(todo, "push"), key(todo, "email")])
+
+    assert ReminderDeliveryService.claim(db, [entry(todo, "push"), entry(todo, "email")]) == {key(todo, "push")}
+
+
+def test_stale_sending_row_is_reclaimed(db, todo):
+    ReminderDeliveryService.claim(db, [entry(todo, "push"), entry(todo, "email")])
+    ReminderDeliveryService.mark_sent(db, [key(todo, "email")], datetime.utcnow())
+    # 발송 중 프로세스가 종료되어 claim_timeout이 지남
+    stale_at = datetime.utcnow() - timedelta(seconds=settings.reminder_claim_timeout_seconds + 60)
+    db.query(ReminderDelivery).update({'claimed_at': stale_at})
+
+    assert ReminderDeliveryService.claim(db, [entry(todo, "push"), entry(todo, "email")]) == {key(todo, "push")}
+    assert ReminderDeliveryService.claim(db, [entry(todo, "push")]) == set()
+
+
+def test_claim_without_upsert_skips_existing_keys(db, todo):
+    ReminderDeliveryService.claim(db, [entry(todo, "push")])
+
+    entries = {key(todo, channel): entry(todo, channel) for channel in ("push", "email")}
+    assert ReminderDeliveryService._claim_without_upsert(db, entries) == {key(todo, "email")}
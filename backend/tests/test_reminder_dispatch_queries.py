@@ -0,0 +1,111 @@
+"""
+알림 발송 준비/기록 단계의 SQL 문 수 (N+1 조회 회귀 확인)
+발송 시각이 지난 알림을 N개 만들고, 알림 수가 늘어도 배치당 실행되는 문 수가 같은지 확인합니다.
+SMTP/FCM 호출 없이 실행됩니다.
+"""
+import json
+from contextlib import contextmanager
+from datetime import timedelta
+
+from sqlalchemy import event
+
+from app.config import settings
+from app.database import engine
+from app.models.models import Todo, ChecklistItem, FamilyMember, ReminderJob, DeviceToken
+from app.models.user import User
+from app.services.reminder_dispatcher import reminder_dispatcher
+from app.services.reminder_job_service import ReminderJobService
+
+COUNTS = (10, 50, 200)
+
+
+@contextmanager
+def count_statements():
+    """블록 안에서 실행된 SQL 문 목록"""
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "after_cursor_execute", on_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "after_cursor_execute", on_execute)
+
+
+def seed(db, count: int, run: int):
+    """알림 count개 생성 (사용자 count개, 일정마다 체크리스트 3개/담당 프로필 2명, 절반은 푸시도 받음)"""
+    now = ReminderJobService.now()
+    start = now + timedelta(minutes=5)
+    for index in range(count):
+        user = User(
+            email=f"user{run}-{index}@example.com",
+            name=f"사용자 {index}",
+            notification_preference="both" if index % 2 else "email"
+        )
+        db.add(user)
+        db.flush()
+        members = [FamilyMember(user_id=user.id, name=f"가족 {n}", emoji="🙂") for n in range(2)]
+        db.add_all(members)
+        db.flush()
+        if index % 2:
+            db.add(DeviceToken(user_id=user.id, token=f"token-{run}-{index}"))
+
+        todo = Todo(
+            user_id=user.id,
+            title=f"일정 {index}",
+            date=start.date(),
+            start_time=start.time(),
+            has_notification=True,
+            notification_reminders=json.dumps([{"value": 10, "unit": "minutes"}]),
+            family_member_ids=json.dumps(["me"] + [member.id for member in members])
+        )
+        db.add(todo)
+        db.flush()
+        db.add_all([ChecklistItem(todo_id=todo.id, text=f"항목 {n}", order_index=n) for n in range(3)])
+        # 발송 시각이 막 지난 알림
+        db.add(ReminderJob(
+            user_id=user.id,
+            todo_id=todo.id,
+            reminder_value=10,
+            reminder_unit="minutes",
+            fire_at=now - timedelta(minutes=1),
+            status="pending"
+        ))
+    db.commit()
+
+
+def measure(db, count: int, run: int):
+    """(준비 단계 문 수, 기록 단계 문 수)"""
+    seed(db, count, run)
+
+    with count_statements() as statements:
+        deliveries, claimed = reminder_dispatcher._prepare_batch()
+    prepare_queries = len(statements)
+
+    assert claimed == count
+    assert len(deliveries) == count
+    assert all(len(delivery['email']['todo_checklist']) == 3 for delivery in deliveries)
+    assert all(len(delivery['email']['assigned_members']) == 3 for delivery in deliveries)
+
+    # 모든 채널 발송에 성공했다고 가정하고 기록
+    results = [
+        {**delivery, 'channels': (["email"] if delivery['email'] else []) + (["push"] if delivery['push_tokens'] else [])}
+        for delivery in deliveries
+    ]
+    with count_statements() as statements:
+        reminder_dispatcher._record_results(results, [])
+    record_queries = len(statements)
+
+    db.expire_all()
+    assert db.query(ReminderJob).filter(ReminderJob.status == 'sent').count() == sum(COUNTS[:run + 1])
+    return prepare_queries, record_queries
+
+
+def test_query_count_does_not_grow_with_batch(db):
+    assert max(COUNTS) <= settings.reminder_claim_batch_size
+
+    query_counts = {count: measure(db, count, run) for run, count in enumerate(COUNTS)}
+
+    assert len(set(query_counts.values())) == 1, f"알림 수에 따라 쿼리 수가 달라짐: {query_counts}"
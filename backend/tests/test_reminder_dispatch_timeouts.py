@@ -0,0 +1,101 @@
+"""
+발송 시간 초과 처리 (결과를 알 수 없는 채널은 다시 보내지 않음, 실패한 채널만 재시도)
+"""
+import asyncio
+import json
+from datetime import timedelta
+
+import pytest
+
+from app.models.models import Todo, ReminderJob, ReminderDelivery, DeviceToken
+from app.services.email_service import EmailService
+from app.services.fcm_service import FCMService
+from app.services.reminder_dispatcher import ReminderDispatcher
+from app.services.reminder_job_service import ReminderJobService
+
+
+@pytest.fixture
+def due_job(db, user):
+    user.notification_preference = "both"
+    db.add(DeviceToken(user_id=user.id, token="token-1"))
+    now = ReminderJobService.now()
+    start = now + timedelta(minutes=9)
+    todo = Todo(
+        user_id=user.id,
+        title="회의",
+        date=start.date(),
+        start_time=start.time(),
+        has_notification=True,
+        notification_reminders=json.dumps([{"value": 10, "unit": "minutes"}])
+    )
+    db.add(todo)
+    db.flush()
+    job = ReminderJob(
+        user_id=user.id, todo_id=todo.id, reminder_value=10, reminder_unit="minutes",
+        fire_at=now - timedelta(minutes=1), status="pending"
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+async def never_finishes(*args, **kwargs):
+    await asyncio.sleep(60)
+
+
+async def email_fails(*args, **kwargs):
+    return False
+
+
+async def push_succeeds(messages):
+    return [{'success': True, 'stale': False} for _ in messages]
+
+
+def dispatch(dispatcher):
+    deliveries, _ = dispatcher._prepare_batch()
+    results, stale_tokens = asyncio.run(dispatcher._deliver_batch(deliveries))
+    dispatcher._record_results(results, stale_tokens)
+    return results
+
+
+def ledger(db):
+    return {row.channel: row.status for row in db.query(ReminderDelivery).all()}
+
+
+def test_timed_out_channels_are_not_retried(db, monkeypatch, due_job):
+    monkeypatch.setattr(EmailService, "send_notification_email_async", never_finishes)
+    monkeypatch.setattr(FCMService, "send_each", never_finishes)
+
+    results = dispatch(ReminderDispatcher(email_concurrency=5, send_timeout_seconds=0.05))
+
+    assert results[0]['channels'] == []
+    assert results[0]['unknown_channels'] == ["email", "push"]
+    db.expire_all()
+    job = db.get(ReminderJob, due_job.id)
+    assert (job.status, job.attempts) == ("sent", 0)
+    assert ledger(db) == {"email": "sent", "push": "sent"}
+
+
+def test_failed_email_is_retried_but_timed_out_push_is_not(db, monkeypatch, due_job):
+    monkeypatch.setattr(EmailService, "send_notification_email_async", email_fails)
+    monkeypatch.setattr(FCMService, "send_each", never_finishes)
+
+    dispatch(ReminderDispatcher(email_concurrency=5, send_timeout_seconds=0.05))
+
+    db.expire_all()
+    job = db.get(ReminderJob, due_job.id)
+    assert (job.status, job.attempts) == ("retrying", 1)
+    # 실패한 이메일 기록만 지워져 재시도 때 다시 선점됨
+    assert ledger(db) == {"push": "sent"}
+
+
+def test_timed_out_email_with_sent_push(db, monkeypatch, due_job):
+    monkeypatch.setattr(EmailService, "send_notification_email_async", never_finishes)
+    monkeypatch.setattr(FCMService, "send_each", push_succeeds)
+
+    results = dispatch(ReminderDispatcher(email_concurrency=5, send_timeout_seconds=0.05))
+
+    assert (results[0]['channels'], results[0]['unknown_channels']) == (["push"], ["email"])
+    db.expire_all()
+    assert db.get(ReminderJob, due_job.id).status == "sent"
+    assert ledger(db) == {"email": "sent", "push": "sent"}
@@ -0,0 +1,136 @@
+"""
+알림 발송 재시도 (지수 백오프, dead 처리, 재시도 선점, 관리자 재시도 예약)
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.config import settings
+from app.models.models import Todo, ReminderJob
+from app.services.reminder_job_service import ReminderJobService
+
+
+@pytest.fixture
+def todo(db, user):
+    todo = Todo(user_id=user.id, title="회의", date=date(2026, 10, 20))
+    db.add(todo)
+    db.commit()
+    return todo
+
+
+@pytest.fixture
+def add_job(db, todo):
+    def _add_job(status="pending", fire_at=None, **values):
+        job = ReminderJob(
+            user_id=todo.user_id,
+            todo_id=todo.id,
+            reminder_value=10,
+            reminder_unit="minutes",
+            fire_at=fire_at or ReminderJobService.now(),
+            status=status,
+            **values
+        )
+        db.add(job)
+        db.commit()
+        return job
+    return _add_job
+
+
+def test_retry_delay_grows_exponentially_with_jitter_and_cap(monkeypatch):
+    monkeypatch.setattr(settings, "reminder_retry_base_seconds", 30)
+    monkeypatch.setattr(settings, "reminder_retry_max_seconds", 600)
+
+    for attempts, delay in ((1, 30), (2, 60), (3, 120), (10, 600)):
+        for _ in range(20):
+            assert delay / 2 <= ReminderJobService.retry_delay_seconds(attempts) <= delay
+
+
+def test_schedule_retry_until_max_attempts_then_dead(monkeypatch, add_job):
+    monkeypatch.setattr(settings, "reminder_retry_max_attempts", 3)
+    job = add_job(status="claimed")
+    now = ReminderJobService.now()
+
+    for attempt in (1, 2):
+        next_attempt_at = ReminderJobService.schedule_retry(job, "SMTP 오류", now)
+        assert job.status == "retrying"
+        assert job.attempts == attempt
+        assert next_attempt_at == job.next_attempt_at and next_attempt_at > now
+
+    assert ReminderJobService.schedule_retry(job, "SMTP 오류", now) is None
+    assert job.status == "dead"
+    assert job.next_attempt_at is None
+    assert job.last_error == "SMTP 오류"
+
+
+def test_claim_due_picks_up_retry_only_when_due(db, add_job):
+    now = ReminderJobService.now()
+    # 재시도 중인 알림은 발송 시각이 max_lateness보다 오래 지나도 만료하지 않음
+    late = now - timedelta(minutes=settings.reminder_max_lateness_minutes + 30)
+    due = add_job(status="retrying", fire_at=late, attempts=1, next_attempt_at=now - timedelta(seconds=1))
+    waiting = add_job(status="retrying", fire_at=late, attempts=1, next_attempt_at=now + timedelta(minutes=5))
+    stale_pending = add_job(status="pending", fire_at=late)
+
+    claimed = ReminderJobService.claim_due(db)
+
+    assert [job.id for job in claimed] == [due.id]
+    db.expire_all()
+    assert waiting.status == "retrying"
+    assert stale_pending.status == "expired"
+
+
+def test_claim_timeout_counts_as_failed_attempt(db, monkeypatch, add_job):
+    monkeypatch.setattr(settings, "reminder_retry_max_attempts", 3)
+    stale_at = datetime.utcnow() - timedelta(seconds=settings.reminder_claim_timeout_seconds + 60)
+    retried = add_job(status="claimed", attempts=0, claimed_at=stale_at, claim_token="lost")
+    exhausted = add_job(status="claimed", attempts=2, claimed_at=stale_at, claim_token="lost")
+
+    claimed = ReminderJobService.claim_due(db)
+
+    # 시도 수를 올리고 바로 다시 선점
+    assert [job.id for job in claimed] == [retried.id]
+    assert claimed[0].attempts == 1
+    db.expire_all()
+    assert exhausted.status == "dead"
+
+
+def test_requeue_resets_attempts_and_expires_stale_jobs(db, add_job):
+    now = ReminderJobService.now()
+    recent = add_job(status="dead", fire_at=now - timedelta(minutes=1), attempts=5)
+    stale = add_job(
+        status="dead", attempts=5,
+        fire_at=now - timedelta(minutes=settings.reminder_requeue_max_lateness_minutes + 1)
+    )
+    failed = add_job(status="failed", fire_at=now - timedelta(minutes=1))
+
+    requeued, expired = ReminderJobService.requeue(db, [recent.id, stale.id, failed.id])
+    db.commit()
+
+    assert (requeued, expired) == (1, 1)
+    db.expire_all()
+    assert (recent.status, recent.attempts) == ("retrying", 0)
+    assert recent.next_attempt_at <= ReminderJobService.now()
+    assert stale.status == "expired"
+    assert failed.status == "failed"
+
+
+def test_job_that_exhausted_real_retry_schedule_can_be_requeued(db, monkeypatch, add_job):
+    clock = [ReminderJobService.now()]
+    monkeypatch.setattr(ReminderJobService, "now", staticmethod(lambda: clock[0]))
+    job = add_job(fire_at=clock[0])
+
+    # 기본 재시도 설정 그대로 실패를 반복해 dead가 될 때까지 진행
+    while job.status != "dead":
+        assert [claimed.id for claimed in ReminderJobService.claim_due(db)] == [job.id]
+        ReminderJobService.schedule_retry(job, "SMTP 오류", clock[0])
+        db.commit()
+        if job.next_attempt_at:
+            clock[0] = job.next_attempt_at
+    assert job.attempts == settings.reminder_retry_max_attempts
+
+    # 관리자가 조금 뒤에 확인: 이미 claim_due의 max_lateness는 넘김
+    clock[0] += timedelta(minutes=30)
+    assert clock[0] - job.fire_at > timedelta(minutes=settings.reminder_max_lateness_minutes)
+
+    assert ReminderJobService.requeue(db, [job.id]) == (1, 0)
+    db.commit()
+    assert [claimed.id for claimed in ReminderJobService.claim_due(db)] == [job.id]
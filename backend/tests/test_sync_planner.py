@@ -0,0 +1,116 @@
+"""
+3-way 동기화 계획 (sync_planner.plan_sync)
+"""
+from datetime import datetime
+
+from app.services.sync_planner import (
+    plan_sync, fingerprint, OP_CREATE, OP_UPDATE, OP_DELETE, OP_IMPORT, OP_LINK, OP_UNLINK
+)
+
+START = datetime(2026, 10, 20, 9, 0)
+END = datetime(2026, 10, 20, 10, 0)
+SYNCED = fingerprint("회의", "메모", "", False, START, END)
+EDITED = fingerprint("회의 (변경)", "메모", "", False, START, END)
+REMOTE_EDITED = fingerprint("회의 (원격)", "메모", "", False, START, END)
+
+
+def synced_state(local_hash=SYNCED, remote_etag='"1"', remote_hash=SYNCED):
+    """마지막 동기화 이후 한쪽 또는 양쪽이 바뀐 일정 하나"""
+    local = {'todo-1': {'event_id': 'event-1', 'hash': local_hash}}
+    remote = {'event-1': {'etag': remote_etag, 'hash': remote_hash, 'source_id': 'todo-1'}}
+    snapshots = {'todo-1': {'event_id': 'event-1', 'etag': '"1"', 'hash': SYNCED}}
+    return local, remote, snapshots
+
+
+def ops(plan):
+    return {op: [(item['todo_id'], item['event_id']) for item in items] for op, items in plan.operations.items() if items}
+
+
+def test_fingerprint_ignores_source_tag_and_whitespace():
+    assert fingerprint(" 회의 ", "메모\nAlwaysPlanID:todo-1", None, False, START, END) == SYNCED
+    assert fingerprint("회의", "메모", "", True, START, END) != SYNCED
+
+
+def test_unchanged_item_needs_no_operation():
+    plan = plan_sync(*synced_state())
+
+    assert ops(plan) == {}
+    assert plan.unchanged_count == 1
+    assert plan.api_call_count == 0
+
+
+def test_local_change_updates_remote():
+    plan = plan_sync(*synced_state(local_hash=EDITED))
+
+    assert ops(plan) == {OP_UPDATE: [('todo-1', 'event-1')]}
+    assert plan.conflict_count == 0
+
+
+def test_remote_change_is_imported_only_when_requested():
+    state = synced_state(remote_etag='"2"', remote_hash=REMOTE_EDITED)
+
+    assert ops(plan_sync(*state)) == {}
+    assert ops(plan_sync(*state, include_imports=True)) == {OP_IMPORT: [('todo-1', 'event-1')]}
+
+
+def test_both_changed_prefers_local_and_counts_conflict():
+    plan = plan_sync(*synced_state(local_hash=EDITED, remote_etag='"2"', remote_hash=REMOTE_EDITED))
+
+    assert ops(plan) == {OP_UPDATE: [('todo-1', 'event-1')]}
+    assert plan.operations[OP_UPDATE][0]['conflict'] is True
+    assert plan.conflict_count == 1
+
+
+def test_etag_only_change_refreshes_snapshot_without_api_call():
+    plan = plan_sync(*synced_state(remote_etag='"2"'))
+
+    assert ops(plan) == {OP_LINK: [('todo-1', 'event-1')]}
+    assert plan.api_call_count == 0
+
+
+def test_new_local_todo_is_created_or_linked_by_source_id():
+    local = {'todo-1': {'event_id': None, 'hash': SYNCED}, 'todo-2': {'event_id': None, 'hash': SYNCED}}
+    # todo-2는 이전 실행에서 이미 만든 이벤트가 있음 (스냅샷 없이 source_id로 찾음)
+    remote = {'event-2': {'etag': '"1"', 'hash': SYNCED, 'source_id': 'todo-2'}}
+
+    plan = plan_sync(local, remote, {})
+
+    assert ops(plan) == {OP_CREATE: [('todo-1', None)], OP_LINK: [('todo-2', 'event-2')]}
+
+
+def test_remote_delete_unlinks_unless_local_changed():
+    local, _, snapshots = synced_state()
+    assert ops(plan_sync(local, {}, snapshots)) == {OP_UNLINK: [('todo-1', 'event-1')]}
+
+    local, _, snapshots = synced_state(local_hash=EDITED)
+    assert ops(plan_sync(local, {}, snapshots)) == {OP_CREATE: [('todo-1', None)]}
+
+
+def test_local_delete_removes_remote_event_and_duplicates():
+    _, remote, snapshots = synced_state()
+    remote['event-dup'] = {'etag': '"1"', 'hash': SYNCED, 'source_id': 'todo-1'}
+
+    plan = plan_sync({}, remote, snapshots)
+
+    assert sorted(ops(plan)[OP_DELETE]) == [('todo-1', 'event-1'), ('todo-1', 'event-dup')]
+
+
+def test_new_google_event_is_imported_but_deleted_import_is_not():
+    remote = {
+        'google-new': {'etag': '"1"', 'hash': SYNCED, 'source_id': None},
+        'google-old': {'etag': '"1"', 'hash': SYNCED, 'source_id': None},
+    }
+    # google-old는 가져온 뒤 로컬에서 지움
+    snapshots = {'todo-old': {'event_id': 'google-old', 'etag': '"1"', 'hash': SYNCED}}
+
+    plan = plan_sync({}, remote, snapshots, include_imports=True)
+
+    assert ops(plan) == {OP_IMPORT: [(None, 'google-new')]}
+    assert plan.stale_snapshot_todo_ids == []
+
+
+def test_snapshot_without_local_or_remote_is_stale():
+    plan = plan_sync({}, {}, {'todo-1': {'event_id': 'event-1', 'etag': '"1"', 'hash': SYNCED}})
+
+    assert plan.stale_snapshot_todo_ids == ['todo-1']
+    assert plan.summary()['stale_snapshot_count'] == 1
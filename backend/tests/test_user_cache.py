@@ -0,0 +1,211 @@
+"""
+인증된 사용자 캐시 (세션 이벤트 무효화, 버전 카운터, TTL/LRU)
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.database import SessionLocal, engine
+from app.models.user import User
+from app.repositories.user_repo import UserRepository
+from app.services import user_cache as user_cache_module
+from app.services.user_cache import AuthenticatedUserCache, user_cache
+
+
+@pytest.fixture(autouse=True)
+def clean_user_cache(monkeypatch):
+    """세션 이벤트는 전역 캐시를 무효화하므로 테스트마다 전역 캐시를 비우고 TTL을 켬"""
+    monkeypatch.setattr(user_cache, "ttl_seconds", 60)
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """user_cache 모듈이 보는 time.monotonic을 고정 (clock[0]을 바꿔 시간 이동)"""
+    now = [1000.0]
+    monkeypatch.setattr(user_cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+@contextmanager
+def count_selects():
+    """블록 안에서 실행된 SELECT 문 수"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def other_request():
+    """다른 요청의 DB 세션"""
+    return SessionLocal()
+
+
+def add_user(db, email: str) -> User:
+    user = User(email=email, name=email.split("@")[0])
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_cache_hit_returns_attached_user_without_select(db, user):
+    assert user_cache.get(db, user.id).email == "user@example.com"
+
+    session = other_request()
+    try:
+        with count_selects() as selects:
+            cached = user_cache.get(session, user.id)
+        assert selects == []
+        assert cached.email == "user@example.com"
+        # 요청 세션에 연결되어 있어 라우트에서 수정/커밋 가능
+        assert cached in session
+        cached.name = "변경"
+        session.commit()
+    finally:
+        session.close()
+
+    db.expire_all()
+    assert db.get(User, user.id).name == "변경"
+
+
+def test_update_in_another_session_invalidates_on_flush_and_commit(db, user):
+    user_cache.get(db, user.id)
+    db.commit()
+
+    session = other_request()
+    try:
+        changed = session.get(User, user.id)
+        changed.name = "새 이름"
+        session.flush()
+        # flush 시점에 무효화되고 commit 때 다시 무효화하기 위해 ID 기록
+        assert user.id not in user_cache._entries
+        assert session.info['flushed_user_ids'] == {user.id}
+
+        # flush와 commit 사이에 다른 요청이 값을 다시 캐시해도 commit 후 지워져야 함
+        user_cache._entries[user.id] = (float("inf"), {**user_cache._snapshot(changed), "name": "사용자"})
+        session.commit()
+        assert user.id not in user_cache._entries
+        assert 'flushed_user_ids' not in session.info
+    finally:
+        session.close()
+
+    db.expire_all()
+    assert user_cache.get(db, user.id).name == "새 이름"
+
+
+def test_soft_deleted_user_is_not_served_from_cache(db, user):
+    assert user_cache.get(db, user.id) is not None
+    db.commit()
+
+    session = other_request()
+    try:
+        assert UserRepository.delete(session, user.id)
+    finally:
+        session.close()
+
+    db.expire_all()
+    assert user_cache.get(db, user.id) is None
+
+
+def test_hard_deleted_user_is_not_served_from_cache(db, user):
+    user_id = user.id
+    user_cache.get(db, user_id)
+    db.commit()
+
+    # 계정 삭제 API처럼 캐시에서 받은 User를 그대로 삭제
+    session = other_request()
+    try:
+        current_user = user_cache.get(session, user_id)
+        session.delete(current_user)
+        session.commit()
+    finally:
+        session.close()
+
+    assert user_id not in user_cache._entries
+    db.expunge_all()
+    assert user_cache.get(db, user_id) is None
+
+
+def test_rollback_discards_recorded_user_ids(db, user):
+    user.name = "롤백될 이름"
+    db.flush()
+    assert db.info['flushed_user_ids'] == {user.id}
+
+    db.rollback()
+    assert 'flushed_user_ids' not in db.info
+    assert user_cache.get(db, user.id).name == "사용자"
+
+
+def test_invalidation_during_lookup_prevents_caching_stale_values(db, user, monkeypatch):
+    get_by_id = UserRepository.get_by_id
+
+    def racing_get_by_id(session, user_id):
+        found = get_by_id(session, user_id)
+        # 조회 직후 다른 요청이 사용자를 수정해 무효화
+        user_cache.invalidate(user_id)
+        return found
+
+    monkeypatch.setattr(UserRepository, "get_by_id", staticmethod(racing_get_by_id))
+    assert user_cache.get(db, user.id) is not None
+    assert user.id not in user_cache._entries
+
+    monkeypatch.setattr(UserRepository, "get_by_id", staticmethod(get_by_id))
+    user_cache.get(db, user.id)
+    assert user.id in user_cache._entries
+
+
+def test_entry_expires_after_ttl(db, user, clock):
+    cache = AuthenticatedUserCache(ttl_seconds=30, max_entries=10)
+    cache.get(db, user.id)
+
+    clock[0] += 29
+    with count_selects() as selects:
+        cache.get(db, user.id)
+    assert selects == []
+
+    clock[0] += 1
+    with count_selects() as selects:
+        cache.get(db, user.id)
+    assert len(selects) == 1
+    # 다시 조회한 값으로 새 TTL 시작
+    assert cache._entries[user.id][0] == clock[0] + 30
+
+
+def test_least_recently_used_entry_is_evicted(db, user):
+    cache = AuthenticatedUserCache(ttl_seconds=60, max_entries=2)
+    second = add_user(db, "second@example.com")
+    third = add_user(db, "third@example.com")
+
+    cache.get(db, user.id)
+    cache.get(db, second.id)
+    # user를 다시 사용해 가장 최근으로 이동 → second가 가장 오래됨
+    cache.get(db, user.id)
+    cache.get(db, third.id)
+
+    assert list(cache._entries) == [user.id, third.id]
+
+
+def test_missing_user_is_not_cached(db):
+    cache = AuthenticatedUserCache(ttl_seconds=60, max_entries=10)
+    assert cache.get(db, "missing") is None
+    assert cache._entries == {}
+
+
+def test_zero_ttl_bypasses_cache(db, user):
+    cache = AuthenticatedUserCache(ttl_seconds=0, max_entries=10)
+    cache.get(db, user.id)
+    assert cache._entries == {}
+
+    with count_selects() as selects:
+        assert cache.get(db, user.id).id == user.id
+    assert len(selects) == 1
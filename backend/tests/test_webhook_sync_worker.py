@@ -0,0 +1,109 @@
+"""
+웹훅 워커 (저장된 Watch 채널만 기록/예약, 메시지 번호 중복 제거, 추적 채널 수 제한)
+"""
+import asyncio
+
+import pytest
+
+from app.models.user import User
+from app.services import webhook_sync_worker
+from app.services.calendar_mirror_service import CalendarMirrorService
+from app.services.webhook_sync_worker import CalendarWebhookWorker
+
+
+def add_watch_user(db, index: int, token="secret-token", resource_id="resource-1"):
+    user = User(
+        email=f"watch{index}@example.com",
+        name=f"사용자 {index}",
+        google_calendar_token='{"token": "test"}',
+        google_calendar_watch_channel_id=f"channel-{index}",
+        google_calendar_watch_resource_id=resource_id,
+        google_calendar_watch_token=token
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def synced_user_ids(monkeypatch):
+    """sync_calendars 대신 호출된 사용자 ID 기록"""
+    synced = []
+
+    async def sync_calendars(user_id, calendar_ids):
+        synced.append(user_id)
+        return 0
+
+    monkeypatch.setattr(CalendarMirrorService, "sync_calendars", sync_calendars)
+    return synced
+
+
+def run(worker, scenario):
+    async def _run():
+        await worker.start()
+        try:
+            return await scenario()
+        finally:
+            await worker.stop()
+    return asyncio.run(_run())
+
+
+@pytest.mark.parametrize("channel_id, token", [
+    ("unknown-channel", "secret-token"),
+    ("channel-1", "wrong-token"),
+    ("channel-1", None),
+])
+def test_unverified_notifications_are_not_recorded(db, channel_id, token):
+    add_watch_user(db, 1)
+    worker = CalendarWebhookWorker(debounce_seconds=60)
+
+    queued = run(worker, lambda: worker.enqueue(channel_id, token, "resource-1", "5"))
+
+    assert queued is False
+    assert dict(worker._last_message_numbers) == {}
+
+
+def test_verified_notification_syncs_user_once(db, synced_user_ids):
+    user = add_watch_user(db, 1)
+    worker = CalendarWebhookWorker(debounce_seconds=0.01)
+
+    async def scenario():
+        results = [
+            await worker.enqueue("channel-1", "secret-token", "resource-1", "5"),
+            await worker.enqueue("channel-1", "secret-token", "resource-1", "6"),
+            # 재전송된 이전 메시지
+            await worker.enqueue("channel-1", "secret-token", "resource-1", "6"),
+        ]
+        await asyncio.sleep(0.05)
+        return results
+
+    assert run(worker, scenario) == [True, True, False]
+    assert synced_user_ids == [user.id]
+
+
+def test_channel_without_token_is_verified_by_resource_id(db):
+    add_watch_user(db, 1, token=None, resource_id="resource-1")
+    worker = CalendarWebhookWorker(debounce_seconds=60)
+
+    async def scenario():
+        return [
+            await worker.enqueue("channel-1", None, "other-resource", "1"),
+            await worker.enqueue("channel-1", None, "resource-1", "1"),
+        ]
+
+    assert run(worker, scenario) == [False, True]
+
+
+def test_tracked_channels_are_capped(db, monkeypatch):
+    monkeypatch.setattr(webhook_sync_worker, "MAX_TRACKED_CHANNELS", 2)
+    for index in range(3):
+        add_watch_user(db, index)
+    worker = CalendarWebhookWorker(debounce_seconds=60)
+
+    async def scenario():
+        for index in range(3):
+            await worker.enqueue(f"channel-{index}", "secret-token", "resource-1", "1")
+
+    run(worker, scenario)
+
+    assert list(worker._last_message_numbers) == ["channel-1", "channel-2"]
@@ -332,16 +332,59 @@ class APIClient {
     return this.client.delete(`/calendar/event/${eventId}`)
   }
 
+  // 일괄 동기화/내보내기는 서버에서 작업으로 실행되므로 작업 완료까지 진행 상황을 조회한 뒤 결과를 반환
   async syncAllTodosToGoogleCalendar() {
-    return this.client.post('/calendar/sync/all')
+    return this.runCalendarSyncJob('/calendar/sync/all')
   }
 
   async syncGoogleCalendar() {
-    return this.client.post('/calendar/sync/all')
+    return this.runCalendarSyncJob('/calendar/sync/all')
   }
 
   async exportTodosToGoogleCalendar() {
-    return this.client.post('/calendar/export')
+    return this.runCalendarSyncJob('/calendar/export')
+  }
+
+  async getCalendarSyncJob(jobId: string) {
+    return this.client.get(`/calendar/jobs/${jobId}`)
+  }
+
+  // timeoutMs: 전체 대기 한도, stallTimeoutMs: 실행 중 진행 상황(단계/처리 수)이 바뀌지 않는 최대 시간
+  // 한도를 넘으면 더 기다리지 않고 오류를 반환 (서버의 작업은 계속 진행되며 다시 요청하면 같은 작업을 이어서 조회)
+  private async runCalendarSyncJob(
+    path: string,
+    pollIntervalMs = 2000,
+    timeoutMs = 30 * 60 * 1000,
+    stallTimeoutMs = 5 * 60 * 1000
+  ) {
+    const response = await this.client.post(path)
+    let job = response.data
+
+    const startedAt = Date.now()
+    let lastProgress = ''
+    let lastProgressAt = startedAt
+    while (job.status === 'pending' || job.status === 'running') {
+      const now = Date.now()
+      const progress = `${job.status}:${job.phase}:${job.processed_count}`
+      if (progress !== lastProgress) {
+        lastProgress = progress
+        lastProgressAt = now
+      }
+      const stalled = job.status === 'running' && now - lastProgressAt > stallTimeoutMs
+      if (now - startedAt > timeoutMs || stalled) {
+        throw new Error('동기화 작업이 너무 오래 걸리고 있습니다. 잠시 후 다시 시도해주세요.')
+      }
+
+      await new Promise((resolve) => setTimeout(resolve, pollIntervalMs))
+      job = (await this.getCalendarSyncJob(job.job_id)).data
+    }
+
+    if (job.status === 'failed') {
+      throw new Error(job.error || '동기화 작업 실패')
+    }
+
+    // 기존 응답 형식({ data: 결과 })과 호환
+    return { ...response, data: job.result }
   }
 
   async toggleCalendarImport() {